@@ -10,6 +10,8 @@ import statistics
 from typing import List, Dict, Optional
 import numpy as np
 
+from swing_points import swing_highs, swing_lows
+
 class AdvancedMomentumAnalyzer:
     """
     Adaptif Momentum Analizi
@@ -169,26 +171,14 @@ class RSIDivergenceDetector:
     @staticmethod
     def _find_swing_highs(prices: List[float], lookback: int = 20) -> List[Dict]:
         """Swing high'ları bul"""
-        swing_highs = []
-        
-        for i in range(5, len(prices) - 5):  # 5 periyot confirmation
-            is_swing_high = True
-            current_price = prices[i]
-            
-            # Önceki ve sonraki 5 periyodu kontrol et
-            for j in range(i - 5, i + 6):
-                if j != i and prices[j] >= current_price:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                swing_highs.append({
-                    'index': i,
-                    'price': current_price
-                })
+        # 5 periyot confirmation - önceki ve sonraki 5 periyottan kesin yüksek
+        swing_highs_found = [{
+            'index': i,
+            'price': prices[i]
+        } for i in swing_highs(prices, 5, strict=True).tolist()]
         
         # Son lookback period içindeki swing high'ları filtrele
-        recent_highs = [h for h in swing_highs if h['index'] >= len(prices) - lookback]
+        recent_highs = [h for h in swing_highs_found if h['index'] >= len(prices) - lookback]
         
         # En yüksek 3 swing high'ı al
         recent_highs.sort(key=lambda x: x['price'], reverse=True)
@@ -197,26 +187,14 @@ class RSIDivergenceDetector:
     @staticmethod
     def _find_swing_lows(prices: List[float], lookback: int = 20) -> List[Dict]:
         """Swing low'ları bul"""
-        swing_lows = []
-        
-        for i in range(5, len(prices) - 5):  # 5 periyot confirmation
-            is_swing_low = True
-            current_price = prices[i]
-            
-            # Önceki ve sonraki 5 periyodu kontrol et
-            for j in range(i - 5, i + 6):
-                if j != i and prices[j] <= current_price:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                swing_lows.append({
-                    'index': i,
-                    'price': current_price
-                })
+        # 5 periyot confirmation - önceki ve sonraki 5 periyottan kesin düşük
+        swing_lows_found = [{
+            'index': i,
+            'price': prices[i]
+        } for i in swing_lows(prices, 5, strict=True).tolist()]
         
         # Son lookback period içindeki swing low'ları filtrele
-        recent_lows = [l for l in swing_lows if l['index'] >= len(prices) - lookback]
+        recent_lows = [l for l in swing_lows_found if l['index'] >= len(prices) - lookback]
         
         # En düşük 3 swing low'ı al
         recent_lows.sort(key=lambda x: x['price'])
@@ -7,6 +7,10 @@ import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import random
+
+from candles import CandleSeries
+from indicators import rsi_series, atr_series, last_value
+from swing_points import swing_highs, swing_lows
 try:
     from advanced_momentum_analysis import EnhancedLMOAnalyzer, AdvancedMomentumAnalyzer, RSIDivergenceDetector
     ENHANCED_ANALYSIS_AVAILABLE = True
@@ -23,30 +27,8 @@ class TechnicalIndicators:
         if len(prices) < period + 1:
             return 50
         
-        gains = []
-        losses = []
-        
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        if len(gains) >= period:
-            avg_gain = sum(gains[-period:]) / period
-            avg_loss = sum(losses[-period:]) / period
-            
-            if avg_loss == 0:
-                return 100
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return round(rsi, 2)
-        
-        return 50
+        rsi = rsi_series(prices, period, smoothing='sma')
+        return round(last_value(rsi, 50), 2)
     
     @staticmethod
     def support_resistance_levels(prices: List[float], period: int = 20) -> Dict[str, List[float]]:
@@ -54,32 +36,9 @@ class TechnicalIndicators:
         if len(prices) < period * 2:
             return {'support': [], 'resistance': []}
         
-        # Pivot noktaları bul
-        pivots_high = []
-        pivots_low = []
-        
-        for i in range(period, len(prices) - period):
-            current_price = prices[i]
-            
-            # Local high (resistance) kontrolü
-            is_high = True
-            for j in range(i - period, i + period + 1):
-                if j != i and prices[j] > current_price:
-                    is_high = False
-                    break
-            
-            if is_high:
-                pivots_high.append(current_price)
-            
-            # Local low (support) kontrolü
-            is_low = True
-            for j in range(i - period, i + period + 1):
-                if j != i and prices[j] < current_price:
-                    is_low = False
-                    break
-            
-            if is_low:
-                pivots_low.append(current_price)
+        # Pivot noktaları bul - ±period penceresinde daha yüksek/düşük komşu yok
+        pivots_high = [prices[i] for i in swing_highs(prices, period).tolist()]
+        pivots_low = [prices[i] for i in swing_lows(prices, period).tolist()]
         
         # Benzer seviyeleri birleştir
         def cluster_levels(levels):
@@ -111,28 +70,12 @@ class TechnicalIndicators:
     @staticmethod
     def calculate_atr(candles: List[Dict], period: int = 14) -> float:
         """ATR hesaplama (gerçek volatilite)"""
-        if len(candles) < period:
+        if len(candles) < period + 1:
             return 0.01
         
-        true_ranges = []
-        
-        for i in range(1, len(candles)):
-            high = candles[i]['high']
-            low = candles[i]['low']
-            prev_close = candles[i-1]['close']
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        if len(true_ranges) >= period:
-            atr = sum(true_ranges[-period:]) / period
-            return round(atr, 6)
-        
-        return 0.01
+        candles = CandleSeries.coerce(candles)
+        atr = atr_series(candles.high, candles.low, candles.close, period)
+        return round(last_value(atr, 0.01), 6)
 
 class RealForexKROStrategy:
     """Gerçek verilerle KRO Stratejisi"""
@@ -153,9 +96,9 @@ class RealForexKROStrategy:
                 return None
             
             # Fiyat dizisini oluştur
-            prices = [float(candle['close']) for candle in candles]
-            highs = [float(candle['high']) for candle in candles]
-            lows = [float(candle['low']) for candle in candles]
+            prices = candles['close'].tolist()
+            highs = candles['high'].tolist()
+            lows = candles['low'].tolist()
             
             # Teknik analiz
             rsi = TechnicalIndicators.rsi(prices)
@@ -206,7 +149,7 @@ class RealForexKROStrategy:
                     analysis_details.append(f"Momentum: {recent_momentum*100:.2f}%")
             
             # 4. Volume Spike (simulated but realistic)
-            recent_volumes = [candle['volume'] for candle in candles[-20:]]
+            recent_volumes = candles['volume'][-20:].tolist()
             avg_volume = sum(recent_volumes) / len(recent_volumes)
             current_volume = candles[-1]['volume']
             
@@ -275,12 +218,12 @@ class RealForexLMOStrategy:
                 return None
             
             # 4H analiz - Ana trend ve liquidity seviyeleri
-            prices_4h = [float(candle['close']) for candle in candles_4h]
-            highs_4h = [float(candle['high']) for candle in candles_4h]
-            lows_4h = [float(candle['low']) for candle in candles_4h]
+            prices_4h = candles_4h['close'].tolist()
+            highs_4h = candles_4h['high'].tolist()
+            lows_4h = candles_4h['low'].tolist()
             
             # 15M analiz - Entry timing
-            prices_15m = [float(candle['close']) for candle in candles_15m]
+            prices_15m = candles_15m['close'].tolist()
             
             # 4H Teknik analiz
             rsi_4h = TechnicalIndicators.rsi(prices_4h)
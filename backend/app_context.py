@@ -0,0 +1,87 @@
+"""
+Uygulama Bağlamı
+Provider'lar, strateji yöneticileri ve trade monitor süreç başında bir kez kurulur
+HTTP handler'lar her istekte yeniden kurmak yerine server.context'ten bağlanır
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class AppContext:
+    """
+    Süreç genelinde paylaşılan bileşenler
+    - factories: bileşen adı -> factory (get_binance_provider vb.); olmayan bileşen None kalır
+    - Strateji yöneticileri ilgili provider ile kurulur - provider yoksa kurulmaz
+    - Bir bileşenin hatası diğerlerini etkilemez
+    """
+
+    COMPONENTS = ('forex_provider', 'binance_provider', 'crypto_strategies',
+                  'forex_strategies', 'trade_monitor', 'ftmo_calculator')
+
+    # Bileşen -> factory'ye verilecek bağımlılık
+    DEPENDENCIES = {
+        'crypto_strategies': 'binance_provider',
+        'forex_strategies': 'forex_provider'
+    }
+
+    def __init__(self, factories: Dict[str, Optional[Callable]], log: Callable[[str], None] = print):
+        self.factories = factories
+        self.log = log
+        self._lock = threading.Lock()
+        for name in self.COMPONENTS:
+            setattr(self, name, None)
+
+        # İstatistikler
+        self.build_count = 0
+        self.built_at = None
+
+    def build(self) -> 'AppContext':
+        """
+        Bileşenleri kur (auto-recovery'de yeniden çağrılabilir)
+        Yeni bileşenler kilit dışında kurulur, sonra tek adımda değiştirilir - bind() yarım bağlam görmez
+        """
+        components = {}
+        for name in self.COMPONENTS:
+            components[name] = self._create(name, components)
+
+        with self._lock:
+            for name, component in components.items():
+                setattr(self, name, component)
+            self.build_count += 1
+            self.built_at = time.time()
+
+        status = self.get_status()
+        self.log(f"✅ Uygulama bağlamı hazır: {sum(status.values())}/{len(status)} bileşen aktif")
+        return self
+
+    def _create(self, name: str, components: Dict):
+        factory = self.factories.get(name)
+        if factory is None:
+            return None
+
+        args = ()
+        dependency = self.DEPENDENCIES.get(name)
+        if dependency:
+            provider = components.get(dependency)
+            if provider is None:
+                return None
+            args = (provider,)
+
+        try:
+            return factory(*args)
+        except Exception as e:
+            self.log(f"❌ {name} başlatılamadı: {e}")
+            return None
+
+    def bind(self, handler):
+        """Bileşenleri handler'a bağla - handler kodu self.binance_provider vb. kullanmaya devam eder"""
+        with self._lock:
+            components = [(name, getattr(self, name)) for name in self.COMPONENTS]
+        for name, component in components:
+            setattr(handler, name, component)
+
+    def get_status(self) -> Dict[str, bool]:
+        """Bileşen -> aktif mi (factory'si verilmeyenler hariç)"""
+        return {name: getattr(self, name) is not None for name in self.COMPONENTS if name in self.factories}
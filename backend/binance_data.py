@@ -4,18 +4,14 @@ GERÇEK API ANAHTARLARI İLE - OPTIMIZE EDİLMİŞ PERFORMANS
 """
 
 import json
+import threading
 import time
 import hmac
 import hashlib
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-try:
-    import urllib.request
-    import urllib.parse
-    URLLIB_AVAILABLE = True
-except ImportError:
-    URLLIB_AVAILABLE = False
+import urllib.parse
 
 # Config'den API anahtarlarını al
 try:
@@ -24,10 +20,20 @@ try:
 except ImportError:
     CONFIG_AVAILABLE = False
 
+from candle_store import CandleStore
+from http_client import get_http_client
+from singleflight import SingleFlight
+from ttl_cache import TTLCache, snapshot_age_version, snapshot_with_age
+from rate_limiter import (get_binance_rate_limiter, binance_request_weight, binance_request_priority,
+                          RateLimitTimeout)
+from sr_index import SRLevelIndex
+from candles import CandleSeries, INTERVAL_MS
+from resample import RESAMPLE_BASES, resample
+
 class BinanceDataProvider:
     """GERÇEK API ANAHTARLARI ile Binance REST API veri sağlayıcısı"""
     
-    def __init__(self):
+    def __init__(self, price_soft_ttl: float = None, price_hard_ttl: float = None):
         # API Konfigürasyonu
         if CONFIG_AVAILABLE:
             self.config = BinanceConfig.get_api_credentials()
@@ -42,10 +48,40 @@ class BinanceDataProvider:
             self.secret_key = None
             print("⚠️ Config bulunamadı, public API kullanılıyor")
         
-        self.cache = {}
-        self.cache_duration = 5  # 5 saniye cache (daha hızlı)
+        # Fiyat snapshot'ı: soft TTL sonrası son iyi değer + arka plan yenileme, hard TTL sonrası bloklayan istek
+        self.price_soft_ttl = price_soft_ttl or (BinanceConfig.PRICE_SOFT_TTL if CONFIG_AVAILABLE else 5)
+        self.price_hard_ttl = price_hard_ttl or (BinanceConfig.PRICE_HARD_TTL if CONFIG_AVAILABLE else 300)
+        self.cache = TTLCache(ttl=self.price_soft_ttl, stale_ttl=self.price_hard_ttl - self.price_soft_ttl,
+                              max_bytes=4 * 1024 * 1024, name='binance')
+        
+        # Keep-alive bağlantı havuzu - her istekte yeni TCP + TLS el sıkışması yok
+        self.http = get_http_client()
+        
+        # Aynı anahtar için eşzamanlı cache miss'ler tek upstream isteğini paylaşır
+        self.flights = SingleFlight('binance')
+        # Kline uçuşu (symbol, interval) bazında - bekleyenlerin en büyük limiti tek istekte çekilir
+        self._kline_demand: Dict[Tuple[str, str], int] = {}
+        self._kline_demand_lock = threading.Lock()
+        
+        # Mum verileri (symbol, interval) bazında - KRO/LMO aynı seriyi paylaşır
+        self.candle_store = CandleStore(max_age=120)  # Mum kapanışına hizalı - oluşan mum en sık 2 dakikada bir
+        self.incremental_klines = True  # Eskiyen seride sadece yeni mumları indir
         self.request_count = 0
-        self.last_minute = int(time.time() / 60)
+        
+        # Üst zaman dilimleri doldurulduktan sonra baz seriden türetilir (4h/1d <- 15m, 1w <- 1d)
+        self.resample_bases = dict(RESAMPLE_BASES)
+        self.resampled_updates = 0
+        
+        # Ağırlık bazlı token bucket - süreç genelinde paylaşılır (depth istekleri de kullanır)
+        rate_limits = getattr(self, 'rate_limits', {})
+        self.rate_limiter = get_binance_rate_limiter(rate_limits.get('max_weight_per_minute', 5000))
+        self.rate_limit_wait = rate_limits.get('rate_limit_wait', 30)
+        
+        # WebSocket fiyat akışı (attach_price_stream) - sağlıklıyken ticker REST'e gidilmez
+        self.price_stream = None
+        
+        # Diskteki mum arşivi (attach_archive) - yeniden başlatmada sadece eksik mumlar indirilir
+        self.archive = None
         
         # Öncelikli kripto çiftleri (sizin API'nizle)
         if CONFIG_AVAILABLE:
@@ -59,116 +95,395 @@ class BinanceDataProvider:
         
     def get_crypto_prices(self) -> Dict:
         """GERÇEK API ile optimize edilmiş kripto fiyatları"""
+        # Akış sağlıklıysa bellekten - REST sadece akış yokken / koptuğunda
+        streamed = self._get_stream_prices()
+        if streamed:
+            return streamed
+        
         cache_key = 'crypto_prices'
         
-        # Cache kontrolü
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]['data']
+        # Hard TTL içindeki son iyi değer hemen döner - soft TTL geçtiyse yenileme arka planda
+        cached = self.cache.get_stale(cache_key)
+        if cached is not None:
+            prices, age, stale = cached
+            if stale:
+                self.cache.refresh_in_background(cache_key, self._load_crypto_prices)
+            return snapshot_with_age(prices, age, stale)
         
-        crypto_data = {}
+        # Hiç iyi değer yok - bloklayan istek (eşzamanlı miss'ler tek istek)
+        return self.flights.do(cache_key, self._fetch_crypto_prices, cache_key)
+    
+    def price_version(self, age_bucket: float = 1.0):
+        """
+        get_crypto_prices yanıtının ucuz sürümü - akış mesaj sayacı veya REST cache kaydının zamanı
+        Fiyatlar okunmaz; yaş dilimi price_age / stale'i tazeler
+        """
+        stream = self.price_stream
+        if stream is not None and stream.is_healthy():
+            messages, last_message = stream.get_version()
+            return snapshot_age_version(('stream', messages), last_message, age_bucket)
+        stored_at = self.cache.stored_at('crypto_prices')
+        return snapshot_age_version(('rest', stored_at), stored_at, age_bucket)
+    
+    def _fetch_crypto_prices(self, cache_key: str) -> Dict:
+        """Bloklayan /ticker/24hr isteği - single-flight lideri çalıştırır"""
+        # Önceki uçuş biz beklerken cache'i doldurmuş olabilir
+        cached = self.cache.get_stale(cache_key)
+        if cached is not None:
+            return snapshot_with_age(*cached)
         
         try:
-            # GERÇEK API ile 24hr ticker
-            data = self._make_request('/ticker/24hr')
-            
-            if data:
-                # Sadece öncelikli sembolleri filtrele
-                for item in data:
-                    symbol = item['symbol']
-                    if symbol in self.symbols:
-                        # USDT'yi /USD'ye dönüştür
-                        display_symbol = symbol.replace('USDT', '/USD')
-                        
-                        crypto_data[display_symbol] = {
-                            'price': float(item['lastPrice']),
-                            'change_24h': float(item['priceChangePercent']),
-                            'volume_24h': float(item['volume']) * float(item['lastPrice']),
-                            'high_24h': float(item['highPrice']),
-                            'low_24h': float(item['lowPrice']),
-                            'timestamp': datetime.now().isoformat(),
-                            'source': 'binance_authenticated' if self.api_key else 'binance_public',
-                            'name': symbol.replace('USDT', ''),
-                            'api_type': 'GERÇEK_API' if self.api_key else 'PUBLIC'
-                        }
-                
-                api_status = 'GERÇEK_API' if self.api_key else 'PUBLIC_API'
-                print(f"✅ {api_status} ile {len(crypto_data)} kripto fiyatı alındı")
-            else:
-                # Fallback
-                crypto_data = self._get_fallback_crypto()
-                print("⚠️ API response boş, fallback kullanılıyor")
-                
+            crypto_data = self._load_crypto_prices()
         except Exception as e:
-            print(f"❌ Crypto prices hatası: {e}")
-            crypto_data = self._get_fallback_crypto()
+            # Fallback cache'e yazılmaz - son iyi değerin yerini almasın
+            print(f"❌ Crypto prices hatası: {e}, fallback kullanılıyor")
+            return self._get_fallback_crypto()
         
-        # Cache'e kaydet
-        self.cache[cache_key] = {
-            'data': crypto_data,
-            'timestamp': time.time()
+        self.cache.set(cache_key, crypto_data)
+        return snapshot_with_age(crypto_data, 0.0, False)
+    
+    def _load_crypto_prices(self) -> Dict:
+        """/ticker/24hr - boş yanıtta exception (cache'teki son iyi değer korunur)"""
+        # GERÇEK API ile 24hr ticker - sadece öncelikli semboller (tüm borsa yerine)
+        data = self._make_request('/ticker/24hr', {'symbols': json.dumps(self.symbols, separators=(',', ':'))})
+        if not data:
+            raise ValueError("Binance ticker yanıtı boş")
+        
+        crypto_data = {}
+        # Sadece öncelikli sembolleri filtrele
+        for item in data:
+            symbol = item['symbol']
+            if symbol in self.symbols:
+                # USDT'yi /USD'ye dönüştür
+                display_symbol = symbol.replace('USDT', '/USD')
+                
+                crypto_data[display_symbol] = {
+                    'price': float(item['lastPrice']),
+                    'change_24h': float(item['priceChangePercent']),
+                    'volume_24h': float(item['volume']) * float(item['lastPrice']),
+                    'high_24h': float(item['highPrice']),
+                    'low_24h': float(item['lowPrice']),
+                    'timestamp': datetime.now().isoformat(),
+                    'source': 'binance_authenticated' if self.api_key else 'binance_public',
+                    'name': symbol.replace('USDT', ''),
+                    'api_type': 'GERÇEK_API' if self.api_key else 'PUBLIC'
+                }
+        
+        api_status = 'GERÇEK_API' if self.api_key else 'PUBLIC_API'
+        print(f"✅ {api_status} ile {len(crypto_data)} kripto fiyatı alındı")
+        return crypto_data
+    
+    def get_request_stats(self) -> Dict:
+        """Upstream yük: REST istek sayısı, birleştirilen miss'ler, ağırlık bütçesi"""
+        return {
+            'requests': self.request_count,
+            'singleflight': self.flights.get_stats(),
+            'cache': self.cache.get_stats(),
+            'rate_limiter': self.rate_limiter.get_stats(),
+            'candle_store': self.candle_store.get_stats(),
+            'resampled_updates': self.resampled_updates
         }
+    
+    def stream_intervals(self, intervals: List[str]) -> List[str]:
+        """Akışa abone olunacak interval'ler - baz serisi de istenen interval'ler yerelde türetilir"""
+        return [interval for interval in intervals if self.resample_bases.get(interval) not in intervals]
+    
+    def attach_price_stream(self, stream):
+        """BinanceWebSocketStreamer bağla - get_crypto_prices akıştan okur"""
+        self.price_stream = stream
+        # Kline akışında kapanan mumlar arşive
+        if hasattr(stream, 'on_candle_closed'):
+            stream.on_candle_closed(self._archive_closed_candle)
+    
+    def attach_archive(self, archive):
+        """CandleArchive bağla - depoda olmayan seri önce arşivden yüklenir, kapanan mumlar arşive yazılır"""
+        self.archive = archive
+    
+    def _archive_closed_candle(self, symbol: str, interval: str, candle: Dict):
+        if self.archive is not None:
+            self.archive.append_candle(symbol, interval, candle)
+    
+    def _archive_series(self, binance_symbol: str, interval: str, klines: CandleSeries):
+        """REST'ten gelen serinin yeni kapanmış mumlarını arşive ekle"""
+        if self.archive is None:
+            return
+        try:
+            self.archive.append(binance_symbol, interval, klines)
+        except OSError as e:
+            print(f"⚠️ Mum arşivi yazılamadı {binance_symbol} {interval}: {e}")
+    
+    def _restore_from_archive(self, binance_symbol: str, interval: str, limit: int) -> bool:
+        """
+        WARM RESTART: arşivdeki seri depoya eskimiş olarak konur
+        Sonraki incremental çekim sadece son arşivlenmiş mumdan sonrasını indirir
+        """
+        try:
+            archived = self.archive.load(binance_symbol, interval, limit)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Mum arşivi okunamadı {binance_symbol} {interval}: {e}")
+            return False
+        if len(archived) < limit:
+            return False
+        self.candle_store.put(binance_symbol, interval, archived, limit, 'api', fetched_at=0)
+        print(f"💾 {binance_symbol} {interval}: {len(archived)} mum arşivden yüklendi")
+        return True
+    
+    def _get_stream_prices(self) -> Optional[Dict]:
+        """
+        Akıştaki fiyatlar get_crypto_prices biçiminde + 'price_age' / 'stale'
+        Akış sağlıksızsa veya bir sembolün fiyatı henüz gelmediyse None (REST'e düşülür)
+        """
+        stream = self.price_stream
+        if stream is None or not stream.is_healthy():
+            return None
+        
+        snapshot = stream.get_snapshot()
+        if any(symbol not in snapshot or 'change_24h' not in snapshot[symbol] for symbol in self.symbols):
+            return None
         
+        crypto_data = {}
+        for symbol in self.symbols:
+            item = snapshot[symbol]
+            crypto_data[symbol.replace('USDT', '/USD')] = {
+                'price': item['price'],
+                'change_24h': item['change_24h'],
+                'volume_24h': item['volume_24h'],
+                'high_24h': item['high_24h'],
+                'low_24h': item['low_24h'],
+                'bid': item.get('bid'),
+                'ask': item.get('ask'),
+                'timestamp': item['timestamp'],
+                'price_age': item['price_age'],
+                'stale': item['stale'],
+                'source': 'binance_websocket',
+                'name': symbol.replace('USDT', ''),
+                'api_type': 'WEBSOCKET'
+            }
         return crypto_data
     
-    def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100) -> List[Dict]:
+    def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100) -> CandleSeries:
         """GERÇEK API ile optimize edilmiş mum verileri"""
-        cache_key = f'klines_{symbol}_{interval}_{limit}'
+        # USDT sembolüne dönüştür
+        binance_symbol = symbol.replace('/USD', 'USDT')
+        
+        # Depo kontrolü - daha büyük pencere zaten varsa sondan kes
+        stored = self.candle_store.get(binance_symbol, interval, limit)
+        if stored is not None:
+            return stored
+        
+        # Limit anahtarda yok: 15m/100 ve 15m/300 miss'leri aynı uçuşu bekler, lider en büyüğünü çeker
+        with self._kline_demand_lock:
+            key = (binance_symbol, interval)
+            self._kline_demand[key] = max(limit, self._kline_demand.get(key, 0))
+        
+        flight_key = f'klines_{binance_symbol}_{interval}'
+        klines = self.flights.do(flight_key, self._load_klines, symbol, binance_symbol, interval, limit)
+        if len(klines) < limit and self.candle_store.window(binance_symbol, interval) < limit:
+            # Uçuş bizim limitimiz kaydedilmeden önce başlamıştı - talebimizle bir kez daha
+            klines = self.flights.do(flight_key, self._load_klines, symbol, binance_symbol, interval, limit)
+        return klines[-limit:]
+    
+    def _load_klines(self, symbol: str, binance_symbol: str, interval: str, limit: int) -> CandleSeries:
+        """Depoda olmayan seriyi REST'ten yükle - single-flight lideri çalıştırır"""
+        # Bu uçuşu bekleyen tüm çağıranların en büyük limiti
+        with self._kline_demand_lock:
+            limit = max(limit, self._kline_demand.pop((binance_symbol, interval), 0))
+        
+        # Önceki uçuş biz beklerken depoyu doldurmuş olabilir
+        stored = self.candle_store.get(binance_symbol, interval, limit)
+        if stored is not None:
+            return stored
+        
+        # WARM RESTART: depoda hiç seri yoksa önce arşivden
+        if self.archive is not None and self.candle_store.get_entry(binance_symbol, interval) is None:
+            self._restore_from_archive(binance_symbol, interval, limit)
         
-        # Cache kontrolü (klines için 2 dakika cache)
-        if self._is_cache_valid(cache_key, duration=120):
-            return self.cache[cache_key]['data']
+        # RESAMPLE: doldurulmuş üst zaman dilimi baz seriden güncellenir - upstream isteği yok
+        resampled = self._refresh_from_base(symbol, binance_symbol, interval, limit)
+        if resampled is not None:
+            self._archive_series(binance_symbol, interval, resampled)
+            return resampled[-limit:]
         
+        # INCREMENTAL: saklanan seri yeterliyse sadece son açılış zamanından sonrasını çek
+        if self.incremental_klines:
+            try:
+                refreshed = self._refresh_klines_incremental(binance_symbol, interval, limit)
+            except RateLimitTimeout as e:
+                return self._klines_without_budget(symbol, binance_symbol, interval, limit, e)
+            if refreshed is not None:
+                self._archive_series(binance_symbol, interval, refreshed)
+                return refreshed[-limit:]
+        
+        # Pencere asla küçülmez: 15m/300 çekildiyse 15m/100 aynı seriden gelir
+        fetch_limit = self.candle_store.fetch_limit(binance_symbol, interval, limit)
         klines = []
+        source = 'api'
         
         try:
-            # USDT sembolüne dönüştür
-            binance_symbol = symbol.replace('/USD', 'USDT')
-            
             # GERÇEK API ile klines
             params = {
                 'symbol': binance_symbol,
                 'interval': interval,
-                'limit': limit
+                'limit': fetch_limit
             }
             
             data = self._make_request('/klines', params)
             
             if data:
-                for kline in data:
-                    klines.append({
-                        'timestamp': int(kline[0]),
-                        'open': float(kline[1]),
-                        'high': float(kline[2]),
-                        'low': float(kline[3]),
-                        'close': float(kline[4]),
-                        'volume': float(kline[5])
-                    })
+                klines = self._parse_klines(data)
                 
                 api_status = 'GERÇEK_API' if self.api_key else 'PUBLIC_API'
                 print(f"✅ {symbol} için {len(klines)} mum verisi alındı ({api_status})")
             else:
-                klines = self._generate_fake_klines(symbol, limit)
+                klines = self._generate_fake_klines(symbol, fetch_limit)
+                source = 'fallback'
                 print(f"⚠️ {symbol} API response boş, fallback kullanılıyor")
                 
+        except RateLimitTimeout as e:
+            return self._klines_without_budget(symbol, binance_symbol, interval, limit, e)
         except Exception as e:
             print(f"❌ Kline verisi hatası {symbol}: {e}")
-            klines = self._generate_fake_klines(symbol, limit)
+            klines = self._generate_fake_klines(symbol, fetch_limit)
+            source = 'fallback'
         
-        # Cache'e kaydet
-        self.cache[cache_key] = {
-            'data': klines,
-            'timestamp': time.time()
-        }
+        # Depoya kaydet
+        self.candle_store.put(binance_symbol, interval, klines, fetch_limit, source)
+        if source == 'api':
+            self._archive_series(binance_symbol, interval, klines)
         
-        return klines
+        return klines[-limit:]
     
-    def _is_cache_valid(self, cache_key: str, duration: int = None) -> bool:
-        """Cache geçerliliğini kontrol et"""
-        if cache_key not in self.cache:
-            return False
+    def _klines_without_budget(self, symbol: str, binance_symbol: str, interval: str, limit: int,
+                               error: RateLimitTimeout) -> CandleSeries:
+        """
+        Rate limit kuyruğu zaman aşımı: istek gönderilmedi, depoya hiçbir şey yazılmaz
+        Eski seri varsa o (tazelik değişmez - sonraki çağrı yeniden dener), yoksa fallback
+        """
+        print(f"⚠️ {symbol} kline isteği bekletildi: {error}")
+        entry = self.candle_store.get_entry(binance_symbol, interval)
+        if entry is not None and entry['source'] == 'api' and len(entry['klines']):
+            return entry['klines'][-limit:]
+        return self._generate_fake_klines(symbol, limit)
+    
+    def get_rsi_series(self, symbol: str, interval: str = '4h', period: int = 14, limit: int = 100) -> List[float]:
+        """
+        Son 'limit' mum için bar bazında Wilder RSI - get_klines(symbol, interval, limit) ile hizalı
+        Isınma bölümü (yeterli geçmiş yok) nötr 50.0 ile doldurulur
+        """
+        klines = self.get_klines(symbol, interval, limit)
+        binance_symbol = symbol.replace('/USD', 'USDT')
+        rsi = self.candle_store.get_rsi(binance_symbol, interval, period)
+        if rsi is None:
+            return [50.0] * len(klines)
+        
+        rsi = rsi[-len(klines):] if len(klines) else rsi[:0]
+        return [50.0 if value != value else round(value, 2) for value in rsi.tolist()]
+    
+    def get_sr_levels(self, symbol: str, interval: str = '4h', lookback: int = 50, limit: int = 100) -> Dict:
+        """
+        find_support_resistance(get_klines(symbol, interval, limit), lookback) karşılığı
+        Seviyeler incremental indeksten - her çağrıda tüm pencere yeniden taranmaz
+        """
+        klines = self.get_klines(symbol, interval, limit)
+        if len(klines) < lookback:
+            return SRLevelIndex(lookback).update(klines)  # Yetersiz veri - boş set
         
-        cache_duration = duration or self.cache_duration
-        return (time.time() - self.cache[cache_key]['timestamp']) < cache_duration
+        binance_symbol = symbol.replace('/USD', 'USDT')
+        levels = self.candle_store.get_sr_levels(binance_symbol, interval, lookback)
+        if levels is None:
+            return SRLevelIndex(lookback).update(klines)
+        return levels
+    
+    def _refresh_from_base(self, symbol: str, binance_symbol: str, interval: str, limit: int) -> Optional[CandleSeries]:
+        """
+        Saklanan üst seriyi son açılış zamanından itibaren baz interval mumlarından yeniden örnekle
+        Oluşan son mum güncellenir, arada kapanan mumlar eklenir
+        Baz seri gerçek API verisi değilse veya kopuksa None - çağıran REST'e düşer
+        """
+        base_interval = self.resample_bases.get(interval)
+        if base_interval is None:
+            return None
+        
+        entry = self.candle_store.get_entry(binance_symbol, interval)
+        if (entry is None or entry['source'] != 'api' or not len(entry['klines'])
+                or entry['window'] < limit):
+            return None
+        
+        last_open = int(entry['klines'].timestamp[-1])
+        now_ms = int(time.time() * 1000)
+        # Baz seri zaten izleniyor olmalı - sıfırdan baz çekimi doğrudan incremental çekimden pahalı
+        base_window = self.candle_store.window(binance_symbol, base_interval)
+        if base_window < (now_ms - last_open) // INTERVAL_MS[base_interval] + 1:
+            return None
+        
+        base = self.get_klines(symbol, base_interval, base_window)
+        base_entry = self.candle_store.get_entry(binance_symbol, base_interval)
+        if base_entry is None or base_entry['source'] != 'api':
+            return None
+        
+        tail = base[base.index_at_or_after(last_open):]
+        if not len(tail) or tail.timestamp[0] != last_open:
+            return None
+        
+        try:
+            new_klines = resample(tail, interval, base_interval)
+        except ValueError as e:
+            print(f"⚠️ {binance_symbol} {interval} türetilemedi: {e}")
+            return None
+        
+        if not len(new_klines) or new_klines.timestamp[0] != last_open:
+            return None
+        
+        self.resampled_updates += 1
+        return self.candle_store.merge(binance_symbol, interval, new_klines)
+    
+    def _refresh_klines_incremental(self, binance_symbol: str, interval: str, limit: int) -> Optional[CandleSeries]:
+        """
+        startTime = son saklanan mumun açılış zamanı ile /klines
+        Dönen ilk mum oluşmakta olan eski son mumun güncel hali, gerisi yeni kapananlar
+        Uygun değilse None - çağıran tam çekime düşer
+        """
+        entry = self.candle_store.get_entry(binance_symbol, interval)
+        if (entry is None or entry['source'] != 'api' or not len(entry['klines'])
+                or entry['window'] < limit or interval not in INTERVAL_MS):
+            return None
+        
+        last_open = int(entry['klines'].timestamp[-1])
+        now_ms = int(time.time() * 1000)
+        expected_bars = (now_ms - last_open) // INTERVAL_MS[interval] + 1
+        
+        # Boşluk pencereden büyükse incremental anlamsız - tam çekim
+        if expected_bars >= entry['window'] or expected_bars >= 1000:
+            return None
+        
+        params = {
+            'symbol': binance_symbol,
+            'interval': interval,
+            'startTime': last_open,
+            'limit': expected_bars + 1
+        }
+        
+        try:
+            data = self._make_request('/klines', params)
+        except RateLimitTimeout:
+            raise  # Tam çekime düşmek ikinci kez beklemek olur - çağıran karar verir
+        except Exception as e:
+            print(f"❌ Incremental kline hatası {binance_symbol}: {e}")
+            return None
+        
+        if not data:
+            return None
+        
+        new_klines = self._parse_klines(data)
+        if new_klines.timestamp[0] != last_open:
+            # Beklenmeyen hizalama - güvenli tarafta kal
+            return None
+        
+        return self.candle_store.merge(binance_symbol, interval, new_klines)
+    
+    def _parse_klines(self, data: List) -> CandleSeries:
+        """Binance /klines yanıtını sütunsal mum serisine çevir"""
+        return CandleSeries.from_binance(data)
     
     def _get_fallback_crypto(self) -> Dict:
         """Fallback kripto fiyatları"""
@@ -205,7 +520,7 @@ class BinanceDataProvider:
         
         return result
     
-    def _generate_fake_klines(self, symbol: str, limit: int) -> List[Dict]:
+    def _generate_fake_klines(self, symbol: str, limit: int) -> CandleSeries:
         """Sahte mum verileri üret"""
         import random
         
@@ -249,7 +564,7 @@ class BinanceDataProvider:
             
             current_price = close_price
         
-        return klines
+        return CandleSeries.from_dicts(klines)
     
     def _create_signature(self, params: str) -> str:
         """API imzası oluştur (gerçek API için)"""
@@ -262,35 +577,23 @@ class BinanceDataProvider:
             hashlib.sha256
         ).hexdigest()
     
-    def _check_rate_limit(self) -> bool:
-        """Rate limit kontrolü (6000 req/min)"""
-        current_minute = int(time.time() / 60)
-        
-        if current_minute != self.last_minute:
-            self.request_count = 0
-            self.last_minute = current_minute
-        
-        if hasattr(self, 'rate_limits'):
-            max_requests = self.rate_limits['max_requests_per_minute']
-        else:
-            max_requests = 1000  # Fallback
-        
-        if self.request_count >= max_requests:
-            print(f"⚠️ Rate limit yaklaşıldı: {self.request_count}/{max_requests}")
-            return False
+    def _make_request(self, endpoint: str, params: dict = None, signed: bool = False,
+                      priority: int = None) -> dict:
+        """
+        Optimize edilmiş API request
+        Endpoint ağırlığı kadar token beklenir - kline doldurmaları fiyat/depth isteklerinin arkasında
+        Bütçe rate_limit_wait içinde açılmazsa RateLimitTimeout - boş yanıtla karışmasın, cache'e yazılmasın
+        """
+        if params is None:
+            params = {}
+        if priority is None:
+            priority = binance_request_priority(endpoint)
         
-        return True
-    
-    def _make_request(self, endpoint: str, params: dict = None, signed: bool = False) -> dict:
-        """Optimize edilmiş API request"""
-        if not self._check_rate_limit():
-            print("❌ Rate limit aşıldı, cached data kullanılıyor")
-            return {}
+        weight = binance_request_weight(endpoint, params)
+        if not self.rate_limiter.acquire(weight, priority, timeout=self.rate_limit_wait):
+            raise RateLimitTimeout(f"Rate limit kuyruğu zaman aşımı: {endpoint} (ağırlık {weight})")
         
         try:
-            if params is None:
-                params = {}
-            
             # Timestamp ekle (signed requests için)
             if signed and self.api_key:
                 params['timestamp'] = int(time.time() * 1000)
@@ -313,20 +616,19 @@ class BinanceDataProvider:
             if self.api_key:
                 headers['X-MBX-APIKEY'] = self.api_key
             
-            # Request oluştur
-            req = urllib.request.Request(url, headers=headers)
-            
             # Request timeout
             timeout = self.rate_limits.get('request_timeout', 10) if hasattr(self, 'rate_limits') else 10
             
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                self.request_count += 1
-                
-                if response.status == 200:
-                    return json.loads(response.read().decode())
-                else:
-                    print(f"❌ Binance API error: {response.status}")
-                    return {}
+            # Havuzdaki açık bağlantı üzerinden
+            response = self.http.get(url, headers=headers, timeout=timeout)
+            self.request_count += 1
+            self.rate_limiter.observe_response(response)
+            
+            if response.status == 200:
+                return response.json()
+            else:
+                print(f"❌ Binance API error: {response.status}")
+                return {}
                     
         except Exception as e:
             print(f"❌ Request error: {e}")
@@ -1,6 +1,8 @@
 """
 Binance WebSocket - Real-time Crypto Prices
-En yüksek hacimli 10 kripto token için anlık fiyat akışı
+Verilen semboller (varsayılan: en yüksek hacimli 10 token) için anlık fiyat akışı
+BinanceDataProvider.get_crypto_prices akış sağlıklıyken REST yerine bu tabloyu okur
+BinanceKlineStreamer aynı bağlantıda kline olaylarıyla CandleStore'u günceller
 """
 
 import json
@@ -11,13 +13,40 @@ from datetime import datetime
 import websocket
 
 class BinanceWebSocketStreamer:
-    def __init__(self):
+    """
+    Combined stream (@ticker + @bookTicker) ile bellekte fiyat tablosu
+    Bağlantı koparsa üstel backoff ile yeniden bağlanır
+    """
+    
+    BASE_URL = "wss://stream.binance.com:9443"
+    LOG_INTERVAL = 30  # Saniye - sembol başına fiyat logu en fazla bu aralıkla
+    
+    def __init__(self, symbols=None, base_url=None, channels=('ticker', 'bookTicker'),
+                 stale_after=30, max_backoff=60):
         self.ws = None
         self.prices = {}
-        self.top_symbols = []
+        self.top_symbols = list(symbols or [])
         self.is_running = False
         self.last_update = datetime.now()
         
+        self.base_url = base_url or self.BASE_URL
+        self.channels = tuple(channels)
+        self.stale_after = stale_after      # Saniye - bu süre mesaj gelmezse akış sağlıksız
+        self.initial_backoff = 1
+        self.max_backoff = max_backoff
+        
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_message = 0.0
+        self._session_opened = False
+        self._last_log = {}  # Sembol -> son fiyat logu zamanı
+        
+        # İstatistikler
+        self.connects = 0
+        self.reconnects = 0
+        self.messages = 0
+        
     def get_top_volume_symbols(self, count=10):
         """Binance'den en yüksek hacimli coinleri çek"""
         try:
@@ -54,31 +83,46 @@ class BinanceWebSocketStreamer:
                    'LINKUSDT', 'AVAXUSDT', 'UNIUSDT', 'LTCUSDT', 'XRPUSDT']
     
     def on_message(self, ws, message):
-        """WebSocket mesajını işle"""
+        """WebSocket mesajını işle - stream adı @ticker veya @bookTicker"""
         try:
             data = json.loads(message)
             
             if 'stream' in data and 'data' in data:
+                stream = data['stream']
                 ticker_data = data['data']
                 symbol = ticker_data['s']  # Symbol
-                price = float(ticker_data['c'])  # Current price
-                change_24h = float(ticker_data['P'])  # 24h change percent
-                volume = float(ticker_data['q'])  # 24h quote volume
+                now = time.time()
                 
-                # Fiyatı güncelle
-                self.prices[symbol] = {
-                    'price': price,
-                    'change_24h': change_24h,
-                    'volume_24h': volume,
-                    'timestamp': datetime.now().isoformat(),
-                    'source': 'binance_websocket'
-                }
+                with self._lock:
+                    entry = self.prices.setdefault(symbol, {'source': 'binance_websocket'})
+                    
+                    if stream.endswith('@bookTicker'):
+                        entry['bid'] = float(ticker_data['b'])
+                        entry['ask'] = float(ticker_data['a'])
+                        # Ticker henüz gelmediyse orta fiyat
+                        if 'price' not in entry:
+                            entry['price'] = (entry['bid'] + entry['ask']) / 2
+                    else:
+                        entry['price'] = float(ticker_data['c'])  # Current price
+                        entry['change_24h'] = float(ticker_data['P'])  # 24h change percent
+                        entry['volume_24h'] = float(ticker_data['q'])  # 24h quote volume
+                        entry['high_24h'] = float(ticker_data['h'])
+                        entry['low_24h'] = float(ticker_data['l'])
+                    
+                    entry['updated_at'] = now
+                    entry['timestamp'] = datetime.fromtimestamp(now).isoformat()
+                    self._last_message = now
+                    self.messages += 1
+                    
+                    # Sembol başına LOG_INTERVAL'de bir güncelleme yazdır
+                    log_line = None
+                    if 'change_24h' in entry and now - self._last_log.get(symbol, 0.0) >= self.LOG_INTERVAL:
+                        self._last_log[symbol] = now
+                        log_line = f"💰 {symbol}: ${entry['price']:.4f} ({entry['change_24h']:+.2f}%)"
                 
                 self.last_update = datetime.now()
-                
-                # Her 30 saniyede bir güncelleme yazdır
-                if int(time.time()) % 30 == 0:
-                    print(f"💰 {symbol}: ${price:.4f} ({change_24h:+.2f}%)")
+                if log_line:
+                    print(log_line)
                     
         except Exception as e:
             print(f"WebSocket mesaj hatası: {e}")
@@ -96,75 +140,202 @@ class BinanceWebSocketStreamer:
         """WebSocket bağlantısı açıldı"""
         print("✅ Binance WebSocket bağlantısı kuruldu")
         self.is_running = True
+        self._session_opened = True
+        self.connects += 1
+    
+    def build_url(self):
+        """Combined stream URL'si - her sembol için her kanal"""
+        streams = [f"{symbol.lower()}@{channel}" for symbol in self.top_symbols for channel in self.channels]
+        return f"{self.base_url}/stream?streams={'/'.join(streams)}"
     
     def start_stream(self):
-        """WebSocket akışını başlat"""
-        try:
-            # En yüksek hacimli coinleri al
+        """
+        WebSocket akışını başlat (bloklar) - stop_stream çağrılana kadar yeniden bağlanır
+        Backoff: 1s, 2s, 4s ... max_backoff; başarılı bağlantıdan sonra sıfırlanır
+        """
+        if not self.top_symbols:
+            # Sembol verilmediyse en yüksek hacimli coinleri al
             self.top_symbols = self.get_top_volume_symbols(10)
+        
+        ws_url = self.build_url()
+        print(f"🚀 Binance WebSocket başlatılıyor...")
+        print(f"📡 {len(self.top_symbols)} kripto token izleniyor ({', '.join(self.channels)})")
+        
+        backoff = self.initial_backoff
+        while not self._stop_event.is_set():
+            self._session_opened = False
+            try:
+                # WebSocket oluştur
+                self.ws = websocket.WebSocketApp(
+                    ws_url,
+                    on_message=self.on_message,
+                    on_error=self.on_error,
+                    on_close=self.on_close,
+                    on_open=self.on_open
+                )
+                self.ws.run_forever()
+            except Exception as e:
+                print(f"❌ WebSocket başlatma hatası: {e}")
             
-            # WebSocket stream URL'si oluştur
-            streams = [f"{symbol.lower()}@ticker" for symbol in self.top_symbols]
-            stream_names = "/".join(streams)
-            
-            ws_url = f"wss://stream.binance.com:9443/stream?streams={stream_names}"
-            
-            print(f"🚀 Binance WebSocket başlatılıyor...")
-            print(f"📡 {len(self.top_symbols)} kripto token izleniyor")
-            
-            # WebSocket oluştur
-            self.ws = websocket.WebSocketApp(
-                ws_url,
-                on_message=self.on_message,
-                on_error=self.on_error,
-                on_close=self.on_close,
-                on_open=self.on_open
-            )
-            
-            # WebSocket'i ayrı thread'de çalıştır
-            self.ws.run_forever()
+            self.is_running = False
+            if self._stop_event.is_set():
+                break
             
-        except Exception as e:
-            print(f"❌ WebSocket başlatma hatası: {e}")
+            if self._session_opened:
+                backoff = self.initial_backoff
+            print(f"🔁 WebSocket {backoff}s sonra yeniden bağlanacak")
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+            self.reconnects += 1
+    
+    def start(self):
+        """Akışı arka plan thread'inde başlat"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self.start_stream, daemon=True, name='binance-ws')
+            self._thread.start()
+        return self
     
     def stop_stream(self):
         """WebSocket akışını durdur"""
+        self._stop_event.set()
         if self.ws:
             self.ws.close()
         self.is_running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+    
+    def get_snapshot(self):
+        """Sembol başına fiyat kopyası + 'price_age' (saniye)"""
+        now = time.time()
+        with self._lock:
+            snapshot = {}
+            for symbol, entry in self.prices.items():
+                item = dict(entry)
+                item['price_age'] = round(now - entry['updated_at'], 3)
+                item['stale'] = item['price_age'] > self.stale_after
+                snapshot[symbol] = item
+            return snapshot
+    
+    def get_version(self):
+        """(alınan mesaj sayısı, son mesaj zamanı) - fiyatlar kopyalanmaz"""
+        return self.messages, self._last_message
     
     def get_current_prices(self):
         """Güncel fiyatları döndür"""
         return {
-            'prices': self.prices,
+            'prices': self.get_snapshot(),
             'symbols': self.top_symbols,
             'last_update': self.last_update.isoformat(),
-            'status': 'live' if self.is_running else 'disconnected',
+            'status': 'live' if self.is_healthy() else 'disconnected',
             'source': 'binance_websocket'
         }
     
-    def is_healthy(self):
-        """WebSocket sağlık durumu"""
+    def is_healthy(self, max_age=None):
+        """Bağlı ve son mesaj max_age (varsayılan stale_after) saniyeden yeni"""
         if not self.is_running:
             return False
         
-        # Son güncelleme 1 dakikadan eskiyse sağlıksız
-        time_diff = (datetime.now() - self.last_update).seconds
-        return time_diff < 60
+        max_age = self.stale_after if max_age is None else max_age
+        return time.time() - self._last_message < max_age
+    
+    def get_stats(self):
+        """Akış istatistikleri"""
+        return {
+            'healthy': self.is_healthy(),
+            'symbols': len(self.top_symbols),
+            'connects': self.connects,
+            'reconnects': self.reconnects,
+            'messages': self.messages,
+            'last_message_age': round(time.time() - self._last_message, 3) if self._last_message else None
+        }
+
+class BinanceKlineStreamer(BinanceWebSocketStreamer):
+    """
+    Tek multiplexed bağlantıda @kline_<interval> (+ istenirse @ticker/@bookTicker) akışı
+    Her kline olayı CandleStore'a tek upsert - ilk REST doldurmasından sonra kline REST trafiği yok
+    Kapanan mumlar (k.x = true) on_candle_closed ile abone olan bileşenlere bildirilir
+    """
+    
+    def __init__(self, candle_store, symbols, intervals, include_tickers=True, **kwargs):
+        channels = tuple(f"kline_{interval}" for interval in intervals)
+        if include_tickers:
+            channels = ('ticker', 'bookTicker') + channels
+        super().__init__(symbols, channels=channels, **kwargs)
+        self.candle_store = candle_store
+        self.intervals = list(intervals)
+        self._closed_listeners = []
+        
+        # İstatistikler
+        self.kline_events = 0
+        self.closed_candles = 0
+    
+    def on_candle_closed(self, callback):
+        """callback(symbol, interval, candle_dict) - mum kapandığında çağrılır"""
+        self._closed_listeners.append(callback)
+        return callback
+    
+    def on_message(self, ws, message):
+        """Kline olaylarını depoya işle, diğerlerini fiyat tablosuna"""
+        try:
+            data = json.loads(message)
+        except ValueError as e:
+            print(f"WebSocket mesaj hatası: {e}")
+            return
+        
+        if '@kline_' not in data.get('stream', ''):
+            super().on_message(ws, message)
+            return
+        
+        try:
+            kline = data['data']['k']
+            symbol, interval = data['data']['s'], kline['i']
+            candle = {
+                'timestamp': int(kline['t']),
+                'open': float(kline['o']),
+                'high': float(kline['h']),
+                'low': float(kline['l']),
+                'close': float(kline['c']),
+                'volume': float(kline['v'])
+            }
+            result = self.candle_store.upsert(symbol, interval, **candle)
+            
+            with self._lock:
+                self._last_message = time.time()
+                self.messages += 1
+                self.kline_events += 1
+            
+            if kline['x'] and result != 'ignored':
+                self.closed_candles += 1
+                for callback in list(self._closed_listeners):
+                    try:
+                        callback(symbol, interval, candle)
+                    except Exception as e:
+                        print(f"❌ Candle closed dinleyici hatası ({symbol} {interval}): {e}")
+        except Exception as e:
+            print(f"WebSocket kline mesaj hatası: {e}")
+    
+    def get_stats(self):
+        stats = super().get_stats()
+        stats.update({
+            'intervals': self.intervals,
+            'kline_events': self.kline_events,
+            'closed_candles': self.closed_candles
+        })
+        return stats
 
 # Global instance
 binance_streamer = None
 
-def start_binance_websocket():
+def start_binance_websocket(symbols=None):
     """Global Binance WebSocket'i başlat"""
     global binance_streamer
     
     if binance_streamer is None:
-        binance_streamer = BinanceWebSocketStreamer()
+        binance_streamer = BinanceWebSocketStreamer(symbols)
         
         # Ayrı thread'de başlat
-        thread = threading.Thread(target=binance_streamer.start_stream, daemon=True)
-        thread.start()
+        binance_streamer.start()
         
         # Başlaması için bekle
         time.sleep(3)
@@ -188,8 +359,7 @@ if __name__ == "__main__":
     
     try:
         # WebSocket'i başlat
-        thread = threading.Thread(target=streamer.start_stream, daemon=True)
-        thread.start()
+        streamer.start()
         
         # 30 saniye test et
         time.sleep(30)
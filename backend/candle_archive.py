@@ -0,0 +1,153 @@
+"""
+Diskte Mum Arşivi
+Her (sembol, interval) için append-only sabit genişlikli binary dosya:
+kayıt = int64 timestamp + 5 x float64 OHLCV (48 bayt, little-endian, başlık yok)
+Yükleme memmap ile - yeniden başlatmada sadece son arşivlenmiş mumdan sonrası indirilir
+Sadece kapanmış mumlar yazılır; oluşan mum her zaman REST / stream'den gelir
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from candles import CandleSeries, INTERVAL_MS, PRICE_FIELDS
+
+RECORD_DTYPE = np.dtype([('timestamp', '<i8')] + [(field, '<f8') for field in PRICE_FIELDS])
+
+DEFAULT_ARCHIVE_DIR = Path(__file__).parent / "data" / "candles"
+
+
+class CandleArchive:
+    """
+    append(symbol, interval, series): son arşivlenmiş mumdan yeni kapanmış mumları ekler
+    load(symbol, interval, limit): son 'limit' mumu memmap üzerinden okur
+    Dosya max_records'u aşınca son keep_records mum ile yeniden yazılır (atomik replace)
+    """
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR, max_records: int = 20000, keep_records: int = 5000):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_records = max_records
+        self.keep_records = keep_records
+        self._last: Dict[Tuple[str, str], int] = {}    # Son arşivlenmiş açılış zamanı
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.appended = 0
+        self.loaded = 0
+        self.compactions = 0
+
+    def path(self, symbol: str, interval: str) -> Path:
+        return self.directory / f"{symbol}_{interval}.bin"
+
+    def _records(self, path: Path) -> Optional[np.memmap]:
+        """Tam kayıtlar (yarım kalmış son kayıt yok sayılır) - dosya yok / boşsa None"""
+        try:
+            count = path.stat().st_size // RECORD_DTYPE.itemsize
+        except FileNotFoundError:
+            return None
+        if count == 0:
+            return None
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+
+    def _last_locked(self, symbol: str, interval: str) -> Optional[int]:
+        key = (symbol, interval)
+        if key not in self._last:
+            records = self._records(self.path(symbol, interval))
+            self._last[key] = int(records['timestamp'][-1]) if records is not None else None
+        return self._last[key]
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """Arşivdeki son mumun açılış zamanı"""
+        with self._lock:
+            return self._last_locked(symbol, interval)
+
+    def load(self, symbol: str, interval: str, limit: Optional[int] = None) -> CandleSeries:
+        """Son 'limit' arşivlenmiş mum - arşiv yoksa boş seri"""
+        with self._lock:
+            records = self._records(self.path(symbol, interval))
+            if records is None:
+                return CandleSeries.empty()
+            if limit is not None:
+                records = records[-limit:]
+            # Alanlar memmap'te aralıklı - CandleSeries bitişik kopya alır
+            series = CandleSeries(*(records[name] for name in RECORD_DTYPE.names))
+            self._last[(symbol, interval)] = int(records['timestamp'][-1])
+            self.loaded += 1
+            return series
+
+    def append(self, symbol: str, interval: str, series: CandleSeries, now_ms: Optional[int] = None,
+               allow_reset: bool = True) -> int:
+        """
+        Son arşivlenmiş mumdan sonraki kapanmış mumları ekle - eklenen mum sayısı
+        Seri arşivin sonuyla örtüşmüyorsa (uzun kesinti) delik bırakılmaz:
+        allow_reset ise arşiv bu seriyle sıfırdan yazılır, değilse hiçbir şey yazılmaz
+        """
+        step = INTERVAL_MS.get(interval)
+        if not len(series) or step is None:
+            return 0
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        path = self.path(symbol, interval)
+
+        with self._lock:
+            last = self._last_locked(symbol, interval)
+            reset = last is not None and int(series.timestamp[0]) > last + step
+            if reset and not allow_reset:
+                return 0
+            start = 0 if last is None or reset else series.index_at_or_after(last + 1)
+            end = int(np.searchsorted(series.timestamp, now_ms - step, side='right'))  # Kapanmış: açılış + step <= now
+            if start >= end:
+                return 0
+
+            records = np.empty(end - start, dtype=RECORD_DTYPE)
+            for name in RECORD_DTYPE.names:
+                records[name] = getattr(series, name)[start:end]
+
+            size = path.stat().st_size if path.exists() and not reset else 0
+            with open(path, 'r+b' if size else 'wb') as f:
+                # Yarım kalmış kayıt (çökme) varsa üzerine yaz
+                f.seek(size - size % RECORD_DTYPE.itemsize)
+                f.write(records.tobytes())
+                f.truncate()
+            self._last[(symbol, interval)] = int(records['timestamp'][-1])
+            self.appended += len(records)
+
+            if size // RECORD_DTYPE.itemsize + len(records) > self.max_records:
+                self._compact(path)
+        return len(records)
+
+    def append_candle(self, symbol: str, interval: str, candle: Dict) -> int:
+        """Stream'den kapanan tek mum - BinanceKlineStreamer.on_candle_closed imzası"""
+        step = INTERVAL_MS.get(interval)
+        if step is None:
+            return 0
+        # Kopuklukta yazılmaz - sonraki REST doldurması arşivi tamamlar
+        return self.append(symbol, interval, CandleSeries.from_dicts([candle]),
+                           now_ms=candle['timestamp'] + step, allow_reset=False)
+
+    def _compact(self, path: Path):
+        """Son keep_records kaydı geçici dosyaya yaz, atomik olarak değiştir - lock altında çağrılır"""
+        records = self._records(path)
+        keep = np.array(records[-self.keep_records:])
+        del records
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(keep.tobytes())
+        os.replace(tmp, path)
+        self.compactions += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            files = list(self.directory.glob('*.bin'))
+            return {
+                'directory': str(self.directory),
+                'series': len(files),
+                'bytes': sum(f.stat().st_size for f in files),
+                'appended': self.appended,
+                'loaded': self.loaded,
+                'compactions': self.compactions
+            }
@@ -0,0 +1,209 @@
+"""
+Paylaşımlı Mum Deposu
+Her (sembol, interval) için tek seri - istenen en büyük pencere saklanır,
+daha küçük limit istekleri sondan kesilerek karşılanır
+Eskiyen seriler sadece yeni kapanan mumlarla güncellenebilir (incremental)
+Tazelik mum sınırına hizalı: kapanmış geçmiş sadece mum kapanınca eskir,
+arada yalnızca oluşan mum interval'e orantılı aralıkla yenilenir
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from candles import CandleSeries, CandleBuffer, INTERVAL_MS, bar_open_time
+from indicators import IncrementalRSI
+from sr_index import SRLevelIndex
+
+# Oluşan mum interval'in bu kesri kadar sürede bir yenilenir (en az max_age)
+# 15m: 2 dk, 4h: 10 dk, 1d: 1 saat, 1w: 7 saat
+FORMING_REFRESH_FRACTION = 1 / 24
+
+# Mum kapanışından sonra Binance'in yeni mumu yayınlaması için pay (saniye)
+CLOSE_SETTLE_SECONDS = 2
+
+class CandleStore:
+    """
+    KRO 15m/300 ve LMO 15m/100 aynı seriyi kullanır - tek indirme
+    Anahtar (symbol, interval); limit anahtarın parçası değil
+    """
+
+    def __init__(self, max_age: float = 120):
+        self.max_age = max_age  # Saniye - bu süreden eski seri yeniden çekilir
+        self._series: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+        self.incremental_updates = 0
+        self.stream_upserts = 0
+        self.stream_gaps = 0
+
+    def expires_at(self, interval: str, fetched_at: float, source: str = 'api') -> float:
+        """
+        Serinin eskidiği an (epoch saniye):
+        oluşan mumun kapanışı (+ pay) veya oluşan mum yenileme aralığı - hangisi önceyse
+        Bilinmeyen interval / fallback seri için sabit max_age
+        """
+        step = INTERVAL_MS.get(interval)
+        if step is None or source != 'api' or fetched_at <= 0:
+            return fetched_at + self.max_age
+        close_at = (bar_open_time(int(fetched_at * 1000), interval) + step) / 1000 + CLOSE_SETTLE_SECONDS
+        forming_refresh = max(self.max_age, step / 1000 * FORMING_REFRESH_FRACTION)
+        return min(close_at, fetched_at + forming_refresh)
+
+    @staticmethod
+    def _klines(entry: Dict) -> CandleSeries:
+        """Kaydın serisi - stream upsert'inden sonra ilk okumada tampondan görünüm kurulur (lock altında)"""
+        if entry['klines'] is None:
+            entry['klines'] = entry['buffer'].view()
+        return entry['klines']
+
+    def get(self, symbol: str, interval: str, limit: int) -> Optional[CandleSeries]:
+        """Taze ve yeterli pencere varsa son 'limit' mumu döndür, yoksa None"""
+        with self._lock:
+            entry = self._series.get((symbol, interval))
+            if (entry is None or entry['window'] < limit
+                    or time.time() >= self.expires_at(interval, entry['fetched_at'], entry['source'])):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._klines(entry)[-limit:]
+
+    def put(self, symbol: str, interval: str, klines: CandleSeries, window: int, source: str = 'api',
+            fetched_at: Optional[float] = None):
+        """
+        Yeni çekilen seriyi kaydet - window istenen limit (dönen mum sayısı değil)
+        fetched_at=0: seri eskimiş kaydedilir (örn. arşivden) - sonraki get incremental tamamlar
+        """
+        with self._lock:
+            self._series[(symbol, interval)] = {
+                'klines': klines,
+                'window': window,
+                'source': source,
+                'fetched_at': time.time() if fetched_at is None else fetched_at,
+                'buffer': None,
+                'rsi': self._series.get((symbol, interval), {}).get('rsi', {}),
+                'sr': self._series.get((symbol, interval), {}).get('sr', {})
+            }
+
+    def get_entry(self, symbol: str, interval: str) -> Optional[Dict]:
+        """Saklanan seri bilgisi (tazelik kontrolü olmadan)"""
+        with self._lock:
+            entry = self._series.get((symbol, interval))
+            if entry is None:
+                return None
+            self._klines(entry)
+            return dict(entry)
+
+    def merge(self, symbol: str, interval: str, new_klines: CandleSeries) -> Optional[CandleSeries]:
+        """
+        Incremental güncelleme: yeni mumları mevcut serinin sonuna ekle
+        - new_klines[0] açılış zamanından itibaren eski mumlar atılır (oluşan son mum değişir)
+        - Seri pencere uzunluğuna kırpılır
+        """
+        with self._lock:
+            entry = self._series.get((symbol, interval))
+            if entry is None:
+                return None
+
+            klines = self._klines(entry)
+            if len(new_klines):
+                # Yeni ilk mumun açılışından itibaren eski mumları at (ikili arama)
+                keep = klines.index_at_or_after(int(new_klines.timestamp[0]))
+                klines = klines[:keep].concat(new_klines)[-entry['window']:]
+
+            # Seri yerinde değiştirilmez - okuyucular eski seriyi güvenle kullanabilir
+            entry['klines'] = klines
+            entry['buffer'] = None
+            entry['fetched_at'] = time.time()
+            self.incremental_updates += 1
+            return klines
+
+    def upsert(self, symbol: str, interval: str, timestamp: int, open: float, high: float,
+               low: float, close: float, volume: float) -> str:
+        """
+        Stream kline olayı - seriye tek mum upsert (yerinde, yeniden indirme yok)
+        Seri henüz REST ile doldurulmadıysa veya fallback ise 'skipped'
+        Mum atlanmışsa (kopukluk) seri eskimiş işaretlenir - sonraki get_klines REST ile tamamlar
+        Dönüş: 'updated' | 'appended' | 'ignored' | 'skipped' | 'gap'
+        """
+        with self._lock:
+            entry = self._series.get((symbol, interval))
+            if entry is None or entry['source'] != 'api':
+                return 'skipped'
+
+            buffer = entry['buffer']
+            if buffer is None:
+                if not len(entry['klines']):
+                    return 'skipped'
+                buffer = entry['buffer'] = CandleBuffer(entry['klines'], entry['window'])
+
+            step = INTERVAL_MS.get(interval)
+            if step and timestamp > buffer.last_timestamp + step:
+                entry['fetched_at'] = 0
+                self.stream_gaps += 1
+                return 'gap'
+
+            result = buffer.upsert(timestamp, open, high, low, close, volume)
+            if result != 'ignored':
+                entry['klines'] = None  # Görünüm ilk okumada kurulur - okunmamış mum yerinde güncellenir
+                entry['fetched_at'] = time.time()
+                self.stream_upserts += 1
+            return result
+
+    def get_rsi(self, symbol: str, interval: str, period: int = 14) -> Optional[np.ndarray]:
+        """
+        Saklanan seriye hizalı Wilder RSI dizisi
+        Seriyle birlikte tutulur - yeni mum kapandığında sadece yeni barlar hesaplanır
+        """
+        with self._lock:
+            entry = self._series.get((symbol, interval))
+            if entry is None:
+                return None
+            calculator = entry['rsi'].get(period)
+            if calculator is None:
+                calculator = entry['rsi'][period] = IncrementalRSI(period)
+            klines = self._klines(entry)
+            return calculator.update(klines.timestamp, klines.close)
+
+    def get_sr_levels(self, symbol: str, interval: str, lookback: int = 50) -> Optional[Dict]:
+        """
+        Saklanan serinin son 'lookback' mumundan S/R seviye seti
+        İndeks seriyle birlikte tutulur - sadece yeni kapanan mumların pivotları işlenir
+        """
+        with self._lock:
+            entry = self._series.get((symbol, interval))
+            if entry is None:
+                return None
+            index = entry['sr'].get(lookback)
+            if index is None:
+                index = entry['sr'][lookback] = SRLevelIndex(lookback)
+            return index.update(self._klines(entry))
+
+    def window(self, symbol: str, interval: str) -> int:
+        """Bu seri için şimdiye kadar istenen en büyük pencere"""
+        with self._lock:
+            entry = self._series.get((symbol, interval))
+            return entry['window'] if entry else 0
+
+    def fetch_limit(self, symbol: str, interval: str, limit: int) -> int:
+        """Yeniden çekimde kullanılacak limit - pencere asla küçülmez"""
+        return max(limit, self.window(symbol, interval))
+
+    def get_stats(self) -> Dict:
+        """Depo istatistikleri"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'series_count': len(self._series),
+                'hits': self.hits,
+                'misses': self.misses,
+                'incremental_updates': self.incremental_updates,
+                'stream_upserts': self.stream_upserts,
+                'stream_gaps': self.stream_gaps,
+                'hit_rate': round(self.hits / total * 100, 1) if total else 0.0
+            }
@@ -0,0 +1,238 @@
+"""
+Sütunsal Mum Verisi
+OHLCV için bitişik float64 dizileri + int64 timestamp dizisi
+Eski List[Dict] kullanan kod için sözlük uyumlu görünüm sağlar
+"""
+
+from typing import Dict, Iterator, List, Sequence, Union
+
+import numpy as np
+
+# Binance interval süreleri (milisaniye)
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 60 * 60_000,
+    '2h': 2 * 60 * 60_000,
+    '4h': 4 * 60 * 60_000,
+    '6h': 6 * 60 * 60_000,
+    '8h': 8 * 60 * 60_000,
+    '12h': 12 * 60 * 60_000,
+    '1d': 24 * 60 * 60_000,
+    '3d': 3 * 24 * 60 * 60_000,
+    '1w': 7 * 24 * 60 * 60_000
+}
+
+# Unix epoch (1970-01-01) Perşembe - haftalık mumlar Pazartesi 00:00 UTC açılır
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60_000
+
+PRICE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+FIELDS = ('timestamp',) + PRICE_FIELDS
+
+
+def interval_ms(interval: str) -> int:
+    """Interval süresi (milisaniye) - bilinmeyen interval için ValueError"""
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Desteklenmeyen interval: {interval}")
+
+
+def bar_open_time(timestamp_ms: int, interval: str) -> int:
+    """Verilen zamanı içeren mumun açılış zamanı (UTC hizalı)"""
+    step = interval_ms(interval)
+    offset = WEEK_OFFSET_MS if interval == '1w' else 0
+    return (timestamp_ms - offset) // step * step + offset
+
+
+def bar_open_times(timestamps: np.ndarray, interval: str) -> np.ndarray:
+    """bar_open_time'ın vektörel hali - timestamp dizisindeki her zamanın mum açılışı"""
+    step = interval_ms(interval)
+    offset = WEEK_OFFSET_MS if interval == '1w' else 0
+    return (timestamps - offset) // step * step + offset
+
+
+class CandleSeries:
+    """
+    Sütunsal mum serisi
+    - series.close, series['close'] -> np.ndarray (float64)
+    - series[i] -> {'timestamp', 'open', 'high', 'low', 'close', 'volume'} (eski dict görünümü)
+    - series[a:b] -> CandleSeries (kopyasız view)
+    - for candle in series -> dict (eski kod için)
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, timestamp, open, high, low, close, volume):
+        self.timestamp = np.ascontiguousarray(timestamp, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+
+    # ---- Oluşturucular ----
+
+    @classmethod
+    def empty(cls) -> 'CandleSeries':
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def from_dicts(cls, candles: Sequence[Dict]) -> 'CandleSeries':
+        """Eski List[Dict] formatından"""
+        if isinstance(candles, CandleSeries):
+            return candles
+        return cls(*([c[field] for c in candles] for field in FIELDS))
+
+    @classmethod
+    def from_binance(cls, rows: Sequence[Sequence]) -> 'CandleSeries':
+        """Binance /klines yanıtından - [openTime, open, high, low, close, volume, ...]"""
+        if not rows:
+            return cls.empty()
+        # ms timestamp'ler float64'te tam temsil edilir (< 2^53)
+        raw = np.array([row[:6] for row in rows], dtype=np.float64)
+        return cls(raw[:, 0].astype(np.int64), *(raw[:, col] for col in range(1, 6)))
+
+    @classmethod
+    def coerce(cls, candles: Union['CandleSeries', Sequence[Dict]]) -> 'CandleSeries':
+        """CandleSeries veya List[Dict] kabul et, CandleSeries döndür"""
+        return candles if isinstance(candles, CandleSeries) else cls.from_dicts(candles)
+
+    # ---- Sözlük uyumlu görünüm ----
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in FIELDS:
+                raise KeyError(key)
+            return getattr(self, key)
+        if isinstance(key, slice):
+            return CandleSeries(*(getattr(self, field)[key] for field in FIELDS))
+        return self._row(key)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def _row(self, i: int) -> Dict:
+        return {
+            'timestamp': int(self.timestamp[i]),
+            'open': float(self.open[i]),
+            'high': float(self.high[i]),
+            'low': float(self.low[i]),
+            'close': float(self.close[i]),
+            'volume': float(self.volume[i])
+        }
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "CandleSeries(0 mum)"
+        return f"CandleSeries({len(self)} mum, {int(self.timestamp[0])} - {int(self.timestamp[-1])})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CandleSeries):
+            return NotImplemented
+        return all(np.array_equal(getattr(self, f), getattr(other, f)) for f in FIELDS)
+
+    def to_dicts(self) -> List[Dict]:
+        """JSON / eski kod için List[Dict]"""
+        return list(self)
+
+    # ---- Seri işlemleri ----
+
+    def concat(self, other: 'CandleSeries') -> 'CandleSeries':
+        """İki seriyi uç uca ekle (yeni dizi)"""
+        return CandleSeries(*(np.concatenate((getattr(self, f), getattr(other, f))) for f in FIELDS))
+
+    def index_at_or_after(self, timestamp_ms: int) -> int:
+        """Açılış zamanı >= timestamp_ms olan ilk mumun indeksi (ikili arama)"""
+        return int(np.searchsorted(self.timestamp, timestamp_ms, side='left'))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, f).nbytes for f in FIELDS)
+
+
+class CandleBuffer:
+    """
+    Yerinde güncellenebilir mum tamponu (stream upsert'leri için)
+    - Kapasiteli diziler: yeni mum sona yazılır (amortize O(1)), oluşan son mum yerinde güncellenir
+    - view(window): son 'window' mumun kopyasız CandleSeries görünümü
+    - Kapasite dolunca son pencere yeni dizilere taşınır - eski görünümler eski dizide kalır
+    Kapanmış mumlar hiç değişmez; oluşan son mum bir görünüme verildiyse yerinde yazılmaz,
+    pencere yeni dizilere kopyalanır (copy-on-write) - okuyucu yarım güncellenmiş mum görmez
+    """
+
+    def __init__(self, series: CandleSeries, window: int, capacity: int = None):
+        self.window = window
+        self.capacity = max(capacity or 2 * window, len(series), 1)
+        self._columns = {field: np.empty(self.capacity, dtype=np.int64 if field == 'timestamp' else np.float64)
+                         for field in FIELDS}
+        self.length = 0
+        self._start = 0
+        self._forming_shared = False  # Oluşan son mum bir görünümde mi
+        self._load(series)
+
+    def _load(self, series: CandleSeries):
+        n = len(series)
+        for field in FIELDS:
+            self._columns[field][:n] = getattr(series, field)
+        self.length = n
+        self._start = max(0, n - self.window)
+
+    def __len__(self) -> int:
+        return self.length - self._start
+
+    @property
+    def last_timestamp(self) -> int:
+        return int(self._columns['timestamp'][self.length - 1]) if self.length else None
+
+    def upsert(self, timestamp: int, open: float, high: float, low: float, close: float, volume: float) -> str:
+        """
+        Tek mum upsert - dönüş: 'updated' (son mum), 'appended' (yeni mum), 'ignored' (eski mum)
+        """
+        last = self.last_timestamp
+        if last is not None and timestamp < last:
+            return 'ignored'
+
+        if last is not None and timestamp == last:
+            if self._forming_shared:
+                self._compact()  # Görünümdeki mum değişmesin - yeni dizilere yazılır
+            self._write(self.length - 1, timestamp, open, high, low, close, volume)
+            return 'updated'
+
+        if self.length == self.capacity:
+            self._compact()
+        # Önce alanlar yazılır, sonra uzunluk artar - yeni mum görünüme tamamlanmış girer
+        self._write(self.length, timestamp, open, high, low, close, volume)
+        self.length += 1
+        self._start = max(self._start, self.length - self.window)
+        self._forming_shared = False
+        return 'appended'
+
+    def _write(self, index: int, timestamp: int, open: float, high: float, low: float, close: float, volume: float):
+        columns = self._columns
+        columns['timestamp'][index] = timestamp
+        columns['open'][index] = open
+        columns['high'][index] = high
+        columns['low'][index] = low
+        columns['close'][index] = close
+        columns['volume'][index] = volume
+
+    def _compact(self):
+        """Son pencereyi yeni dizilere taşı - yayınlanmış görünümler eski dizilerde değişmeden kalır"""
+        current = self.view()
+        self._columns = {field: np.empty(self.capacity, dtype=self._columns[field].dtype) for field in FIELDS}
+        self._load(current)
+        self._forming_shared = False
+
+    def view(self, window: int = None) -> CandleSeries:
+        """Son 'window' mumun görünümü (kopyasız) - sonraki güncelleme bu görünümdeki mumu değiştirmez"""
+        start = self._start if window is None else max(0, self.length - window)
+        self._forming_shared = self.length > 0
+        return CandleSeries(*(self._columns[field][start:self.length] for field in FIELDS))
@@ -6,8 +6,16 @@ Gerçek Binance verilerinden TP/SL/ideal giriş hesaplamaları
 
 import time
 import random
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from candles import CandleSeries
+from indicators import rsi_series, atr_series, momentum_series, last_value
+from swing_points import swing_highs, swing_lows
+from sr_levels import level_set, volume_importance, cluster_equal_levels, sorted_levels_by_priority
 try:
     from advanced_momentum_analysis import EnhancedLMOAnalyzer, AdvancedMomentumAnalyzer, RSIDivergenceDetector
     ENHANCED_ANALYSIS_AVAILABLE = True
@@ -20,34 +28,12 @@ class CryptoTechnicalAnalysis:
     
     @staticmethod
     def calculate_rsi(prices: List[float], period: int = 14) -> float:
-        """RSI hesaplama"""
+        """RSI hesaplama - son 'period' değişimin basit ortalaması"""
         if len(prices) < period + 1:
             return 50
         
-        gains = []
-        losses = []
-        
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        if len(gains) >= period:
-            avg_gain = sum(gains[-period:]) / period
-            avg_loss = sum(losses[-period:]) / period
-            
-            if avg_loss == 0:
-                return 100
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return round(rsi, 2)
-        
-        return 50
+        rsi = rsi_series(prices, period, smoothing='sma')
+        return round(last_value(rsi, 50), 2)
     
     @staticmethod
     def _calculate_volume_importance(candles: List[Dict], pivot_index: int, lookback_window: int = 5) -> Dict:
@@ -55,44 +41,7 @@ class CryptoTechnicalAnalysis:
         🎯 Volume Cluster Analysis - S/R Seviyelerin Önemini Hesapla
         Swing High/Low etrafındaki volume kümelenmesini analiz eder
         """
-        if pivot_index < lookback_window or pivot_index >= len(candles) - lookback_window:
-            return {'cluster_strength': 1.0, 'relative_volume': 1.0, 'importance_score': 1.0}
-        
-        # Pivot noktası ve çevresindeki volume'ler
-        pivot_volume = candles[pivot_index]['volume']
-        surrounding_volumes = []
-        
-        # Pivot etrafındaki ±5 periyotluk volume'leri topla
-        for i in range(pivot_index - lookback_window, pivot_index + lookback_window + 1):
-            if 0 <= i < len(candles):
-                surrounding_volumes.append(candles[i]['volume'])
-        
-        # Genel volume ortalaması (büyük pencere)
-        general_window = min(20, len(candles))
-        start_idx = max(0, pivot_index - general_window)
-        end_idx = min(len(candles), pivot_index + general_window)
-        general_volumes = [candles[i]['volume'] for i in range(start_idx, end_idx)]
-        
-        avg_general_volume = sum(general_volumes) / len(general_volumes) if general_volumes else 1
-        avg_surrounding_volume = sum(surrounding_volumes) / len(surrounding_volumes) if surrounding_volumes else 1
-        
-        # Volume Cluster Strength: Çevre volume'ün genel volume'e oranı
-        cluster_strength = avg_surrounding_volume / avg_general_volume if avg_general_volume > 0 else 1.0
-        
-        # Relative Volume: Pivot volume'ün çevre volume'e oranı  
-        relative_volume = pivot_volume / avg_surrounding_volume if avg_surrounding_volume > 0 else 1.0
-        
-        # Importance Score: Birleşik önem skoru (1.0-5.0 arası)
-        importance_score = min(5.0, (cluster_strength * 0.6 + relative_volume * 0.4))
-        
-        return {
-            'cluster_strength': round(cluster_strength, 2),
-            'relative_volume': round(relative_volume, 2), 
-            'importance_score': round(importance_score, 2),
-            'pivot_volume': pivot_volume,
-            'avg_surrounding_volume': round(avg_surrounding_volume, 2),
-            'avg_general_volume': round(avg_general_volume, 2)
-        }
+        return volume_importance(CandleSeries.coerce(candles).volume.tolist(), pivot_index, lookback_window)
     
     @staticmethod
     def find_support_resistance(candles: List[Dict], lookback: int = 50) -> Dict:
@@ -100,100 +49,41 @@ class CryptoTechnicalAnalysis:
         if len(candles) < lookback:
             return {'support_levels': [], 'resistance_levels': []}
         
-        recent_candles = candles[-lookback:]
+        recent_candles = CandleSeries.coerce(candles)[-lookback:]
+        volumes = recent_candles.volume.tolist()
         support_levels = []
         resistance_levels = []
         
-        # Swing points - kripto için daha hassas
-        for i in range(3, len(recent_candles) - 3):
-            current_high = recent_candles[i]['high']
-            current_low = recent_candles[i]['low']
-            
-            # Resistance (3 periyotluk swing high)
-            is_swing_high = True
-            for j in range(i-3, i+4):
-                if j != i and recent_candles[j]['high'] > current_high:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                # 🎯 Volume Cluster Analysis for S/R Importance
-                volume_importance = CryptoTechnicalAnalysis._calculate_volume_importance(recent_candles, i)
-                
-                resistance_levels.append({
-                    'level': current_high,
-                    'timestamp': recent_candles[i]['timestamp'],
-                    'touches': 1,
-                    'volume': recent_candles[i]['volume'],
-                    'volume_importance': volume_importance,  # Yeni: Volume önem skoru
-                    'volume_cluster_strength': volume_importance['cluster_strength']  # Çevre volume gücü
-                })
-            
-            # Support (3 periyotluk swing low)
-            is_swing_low = True
-            for j in range(i-3, i+4):
-                if j != i and recent_candles[j]['low'] < current_low:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                # 🎯 Volume Cluster Analysis for S/R Importance
-                volume_importance = CryptoTechnicalAnalysis._calculate_volume_importance(recent_candles, i)
-                
-                support_levels.append({
-                    'level': current_low,
-                    'timestamp': recent_candles[i]['timestamp'],
-                    'touches': 1,
-                    'volume': recent_candles[i]['volume'],
-                    'volume_importance': volume_importance,  # Yeni: Volume önem skoru
-                    'volume_cluster_strength': volume_importance['cluster_strength']  # Çevre volume gücü
-                })
+        # Swing points - kripto için daha hassas (3 periyot, eşit komşu kabul)
+        for i in swing_highs(recent_candles.high, 3).tolist():
+            # 🎯 Volume Cluster Analysis for S/R Importance
+            importance = volume_importance(volumes, i)
+            
+            resistance_levels.append({
+                'level': float(recent_candles.high[i]),
+                'timestamp': int(recent_candles.timestamp[i]),
+                'touches': 1,
+                'volume': float(recent_candles.volume[i]),
+                'volume_importance': importance,  # Yeni: Volume önem skoru
+                'volume_cluster_strength': importance['cluster_strength']  # Çevre volume gücü
+            })
         
-        # Kripto için daha hassas clustering (volatilite yüksek)
-        def consolidate_levels(levels, tolerance=0.015):  # %1.5 tolerance
-            if not levels:
-                return []
-            
-            consolidated = []
-            for level in levels:
-                price = level['level']
-                merged = False
-                
-                for existing in consolidated:
-                    if abs(price - existing['level']) / existing['level'] < tolerance:
-                        # Volume + Importance ağırlıklı ortalama
-                        existing_weight = existing['volume'] * existing['volume_importance']['importance_score']
-                        new_weight = level['volume'] * level['volume_importance']['importance_score']
-                        total_weight = existing_weight + new_weight
-                        
-                        existing['level'] = ((existing['level'] * existing_weight) + 
-                                           (price * new_weight)) / total_weight
-                        existing['touches'] += 1
-                        existing['volume'] = existing['volume'] + level['volume']
-                        
-                        # Volume importance'ı birleştir (daha yüksek olanı al)
-                        if level['volume_importance']['importance_score'] > existing['volume_importance']['importance_score']:
-                            existing['volume_importance'] = level['volume_importance']
-                            existing['volume_cluster_strength'] = level['volume_cluster_strength']
-                        
-                        merged = True
-                        break
-                
-                if not merged:
-                    consolidated.append(level)
-            
-            # 🎯 Volume Importance bazlı akıllı sıralama
-            # Öncelik: touches * volume_importance_score * volume
-            def calculate_priority(level):
-                importance = level['volume_importance']['importance_score']
-                return level['touches'] * importance * (level['volume'] / 1000000)  # Volume normalizasyonu
-            
-            return sorted(consolidated, key=calculate_priority, reverse=True)[:6]
+        for i in swing_lows(recent_candles.low, 3).tolist():
+            # 🎯 Volume Cluster Analysis for S/R Importance
+            importance = volume_importance(volumes, i)
+            
+            support_levels.append({
+                'level': float(recent_candles.low[i]),
+                'timestamp': int(recent_candles.timestamp[i]),
+                'touches': 1,
+                'volume': float(recent_candles.volume[i]),
+                'volume_importance': importance,  # Yeni: Volume önem skoru
+                'volume_cluster_strength': importance['cluster_strength']  # Çevre volume gücü
+            })
         
-        return {
-            'support_levels': consolidate_levels(support_levels),
-            'resistance_levels': consolidate_levels(resistance_levels)
-        }
+        # Kripto için daha hassas clustering (volatilite yüksek) - %1.5 tolerance
+        # Sıralı tek geçiş birleştirme, ardından öncelik bazlı ilk 6 seviye (+ fiyat sıralı kitaplar)
+        return level_set(support_levels, resistance_levels, tolerance=0.015)
     
     @staticmethod
     def detect_crypto_breakout(current_price: float, sr_levels: Dict, tolerance: float = 0.008) -> Dict:
@@ -209,88 +99,48 @@ class CryptoTechnicalAnalysis:
             'broken_level_info': None  # Yeni: hangi TF'den geldiği bilgisi
         }
         
-        # Kırılım toleransı
-        upper_tolerance = 1 + tolerance
-        lower_tolerance = 1 - tolerance
+        # Priority başına fiyat sıralı seviyeler - KRO hazır kitapları verir, yoksa bir kez sıralanır
+        books = sr_levels.get('sorted_levels') or sorted_levels_by_priority(sr_levels)
         
         # Priority sırasına göre kontrol et (HIGH > MEDIUM > LOW)
         for priority_level in ['HIGH', 'MEDIUM', 'LOW']:
+            book = books.get(priority_level, {})
             
-            # RESISTANCE BREAK kontrolü (priority sırasına göre)
-            resistance_candidates = []
-            for resistance in sr_levels.get('resistance_levels', []):
-                if resistance.get('priority') == priority_level:
-                    resistance_candidates.append(resistance)
+            # RESISTANCE BREAK: kırılmış en yakın resistance (ikili arama)
+            resistance = book['resistance_levels'].broken_resistance(current_price, tolerance) \
+                if 'resistance_levels' in book else None
             
-            # En yakın resistance'ı bul (bu priority seviyesinde)
-            resistance_candidates.sort(key=lambda r: abs(r['level'] - current_price))
+            # SUPPORT BREAK: kırılmış en yakın support
+            support = book['support_levels'].broken_support(current_price, tolerance) \
+                if 'support_levels' in book else None
             
-            for resistance in resistance_candidates:
-                resistance_level = resistance['level']
-                break_threshold = resistance_level * upper_tolerance
+            for broken, breakout_type in ((resistance, 'RESISTANCE_BREAK'), (support, 'SUPPORT_BREAK')):
+                if broken is None:
+                    continue
                 
-                if current_price > break_threshold:
-                    # Kırılım tespit edildi!
-                    touches = resistance.get('touches', 1)
-                    volume_importance = resistance.get('volume_importance', {}).get('importance_score', 1.0)
-                    strength = touches * volume_importance
-                    
-                    # Priority bonus ekle
-                    if priority_level == 'HIGH':
-                        strength *= 1.5  # Daily level kırılımı daha güçlü
-                    elif priority_level == 'MEDIUM':
-                        strength *= 1.2  # 4H level kırılımı orta güçlü
-                    
-                    breakout_result.update({
-                        'breakout_type': 'RESISTANCE_BREAK',
-                        'broken_level': resistance_level,
-                        'breakout_strength': min(strength, 10),  # Max 10
-                        'volume_importance_score': volume_importance,
-                        'broken_level_info': {
-                            'timeframe': resistance.get('timeframe', '15M'),
-                            'priority': priority_level,
-                            'touches': touches
-                        }
-                    })
-                    return breakout_result
-            
-            # SUPPORT BREAK kontrolü (priority sırasına göre)
-            support_candidates = []
-            for support in sr_levels.get('support_levels', []):
-                if support.get('priority') == priority_level:
-                    support_candidates.append(support)
-            
-            # En yakın support'ı bul (bu priority seviyesinde)
-            support_candidates.sort(key=lambda s: abs(s['level'] - current_price))
-            
-            for support in support_candidates:
-                support_level = support['level']
-                break_threshold = support_level * lower_tolerance
+                # Kırılım tespit edildi!
+                touches = broken.get('touches', 1)
+                importance_score = broken.get('volume_importance', {}).get('importance_score', 1.0)
+                strength = touches * importance_score
                 
-                if current_price < break_threshold:
-                    # Kırılım tespit edildi!
-                    touches = support.get('touches', 1)
-                    volume_importance = support.get('volume_importance', {}).get('importance_score', 1.0)
-                    strength = touches * volume_importance
-                    
-                    # Priority bonus ekle
-                    if priority_level == 'HIGH':
-                        strength *= 1.5  # Daily level kırılımı daha güçlü
-                    elif priority_level == 'MEDIUM':
-                        strength *= 1.2  # 4H level kırılımı orta güçlü
-                    
-                    breakout_result.update({
-                        'breakout_type': 'SUPPORT_BREAK',
-                        'broken_level': support_level,
-                        'breakout_strength': min(strength, 10),  # Max 10
-                        'volume_importance_score': volume_importance,
-                        'broken_level_info': {
-                            'timeframe': support.get('timeframe', '15M'),
-                            'priority': priority_level,
-                            'touches': touches
-                        }
-                    })
-                    return breakout_result
+                # Priority bonus ekle
+                if priority_level == 'HIGH':
+                    strength *= 1.5  # Daily level kırılımı daha güçlü
+                elif priority_level == 'MEDIUM':
+                    strength *= 1.2  # 4H level kırılımı orta güçlü
+                
+                breakout_result.update({
+                    'breakout_type': breakout_type,
+                    'broken_level': broken['level'],
+                    'breakout_strength': min(strength, 10),  # Max 10
+                    'volume_importance_score': importance_score,
+                    'broken_level_info': {
+                        'timeframe': broken.get('timeframe', '15M'),
+                        'priority': priority_level,
+                        'touches': touches
+                    }
+                })
+                return breakout_result
         
         return breakout_result
     
@@ -304,70 +154,28 @@ class CryptoTechnicalAnalysis:
             return {'sweep_detected': False}
         
         # Son 30 mumun analizi (12.5 saat 4H veya 7.5 saat 15M)
-        recent_candles = candles[-30:]
+        recent_candles = CandleSeries.coerce(candles)[-30:]
         
         # Equal Highs/Lows tespiti - ULTRA ESNEK tolerans
         tolerance = 0.025  # %2.5 - Ultra esnek crypto standart
         
-        # Swing High/Low seviyeleri - 3 periyot confirmation (daha esnek)
-        swing_highs = []
-        swing_lows = []
+        # Swing High/Low seviyeleri - 3 periyot confirmation, komşulardan kesin yüksek/düşük
+        swing_highs_found = [{
+            'price': float(recent_candles.high[i]),
+            'index': i,
+            'volume': float(recent_candles.volume[i])
+        } for i in swing_highs(recent_candles.high, 3, strict=True).tolist()]
         
-        for i in range(3, len(recent_candles) - 3):
-            current_high = recent_candles[i]['high']
-            current_low = recent_candles[i]['low']
-            
-            # Swing High: 3 periyot öncesi ve sonrası kontrol
-            is_swing_high = True
-            for j in range(i-3, i+4):
-                if j != i and recent_candles[j]['high'] >= current_high:
-                    is_swing_high = False
-                    break
-            if is_swing_high:
-                swing_highs.append({
-                    'price': current_high,
-                    'index': i,
-                    'volume': recent_candles[i]['volume']
-                })
-            
-            # Swing Low: 3 periyot öncesi ve sonrası kontrol  
-            is_swing_low = True
-            for j in range(i-3, i+4):
-                if j != i and recent_candles[j]['low'] <= current_low:
-                    is_swing_low = False
-                    break
-            if is_swing_low:
-                swing_lows.append({
-                    'price': current_low,
-                    'index': i,
-                    'volume': recent_candles[i]['volume']
-                })
+        swing_lows_found = [{
+            'price': float(recent_candles.low[i]),
+            'index': i,
+            'volume': float(recent_candles.volume[i])
+        } for i in swing_lows(recent_candles.low, 3, strict=True).tolist()]
         
-        # Equal Highs clustering - minimum 1 touch bile yeterli (ultra esnek)
-        equal_high_clusters = []
-        for high in swing_highs:
-            cluster = [h for h in swing_highs if abs(h['price'] - high['price']) / high['price'] < tolerance]
-            if len(cluster) >= 1:  # Minimum 1 dokunuş bile yeterli (ultra esnek)
-                avg_price = sum(h['price'] for h in cluster) / len(cluster)
-                total_volume = sum(h['volume'] for h in cluster)
-                equal_high_clusters.append({
-                    'level': avg_price,
-                    'touches': len(cluster),
-                    'volume': total_volume
-                })
-        
-        # Equal Lows clustering - minimum 1 touch bile yeterli (ultra esnek)
-        equal_low_clusters = []
-        for low in swing_lows:
-            cluster = [l for l in swing_lows if abs(l['price'] - low['price']) / low['price'] < tolerance]
-            if len(cluster) >= 1:  # Minimum 1 dokunuş bile yeterli (ultra esnek)
-                avg_price = sum(l['price'] for l in cluster) / len(cluster)
-                total_volume = sum(l['volume'] for l in cluster)
-                equal_low_clusters.append({
-                    'level': avg_price,
-                    'touches': len(cluster),
-                    'volume': total_volume
-                })
+        # Equal Highs/Lows clustering - minimum 1 touch bile yeterli (ultra esnek)
+        # Her swing tek kümede - tekrarlayan küme yok, en eski swing'den başlayarak sıralı
+        equal_high_clusters = cluster_equal_levels(swing_highs_found, tolerance)
+        equal_low_clusters = cluster_equal_levels(swing_lows_found, tolerance)
         
         # 🚀 PROFESYONEL ATR Bazlı Liquidity Sweep Kontrolü
         # 4H ATR hesapla (volatiliteye göre dinamik sweep detection)
@@ -378,7 +186,7 @@ class CryptoTechnicalAnalysis:
         penetration_amount = atr_4h * atr_multiplier_for_sweep
         
         # 🔍 DEBUG: Liquidity Sweep tespiti detayları
-        print(f"🔍 LMO Debug: Swings High={len(swing_highs)}, Low={len(swing_lows)}")
+        print(f"🔍 LMO Debug: Swings High={len(swing_highs_found)}, Low={len(swing_lows_found)}")
         print(f"🔍 LMO Debug: Clusters High={len(equal_high_clusters)}, Low={len(equal_low_clusters)}")
         print(f"🔍 LMO Debug: ATR={atr_4h:.2f}, Penetration={penetration_amount:.2f}")
         print(f"🔍 LMO Debug: Current Price={current_price}")
@@ -417,24 +225,9 @@ class CryptoTechnicalAnalysis:
         if len(candles) < period + 1:
             return 0.05  # Kripto için default %5
         
-        true_ranges = []
-        for i in range(1, len(candles)):
-            high = candles[i]['high']
-            low = candles[i]['low']
-            prev_close = candles[i-1]['close']
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        if len(true_ranges) >= period:
-            atr = sum(true_ranges[-period:]) / period
-            return atr
-        
-        return sum(true_ranges) / len(true_ranges) if true_ranges else 0.05
+        candles = CandleSeries.coerce(candles)
+        atr = atr_series(candles.high, candles.low, candles.close, period)
+        return last_value(atr, 0.05)
     
     @staticmethod
     def analyze_crypto_momentum(candles: List[Dict]) -> Dict:
@@ -442,12 +235,13 @@ class CryptoTechnicalAnalysis:
         if len(candles) < 20:
             return {'momentum': 0, 'trend': 'SIDEWAYS'}
         
-        # Fiyat momentum (20 periyot)
-        prices = [c['close'] for c in candles[-20:]]
-        price_momentum = (prices[-1] - prices[0]) / prices[0] * 100
+        candles = CandleSeries.coerce(candles)
+        
+        # Fiyat momentum (son 20 mum: ilk ve son kapanış arası)
+        price_momentum = last_value(momentum_series(candles.close[-20:], 19), 0.0)
         
         # Volume trend
-        volumes = [c['volume'] for c in candles[-10:]]
+        volumes = candles['volume'][-10:].tolist()
         volume_trend = sum(volumes[-5:]) / sum(volumes[:5]) if sum(volumes[:5]) > 0 else 1
         
         # Trend belirleme
@@ -470,6 +264,11 @@ class CryptoKROStrategy:
     Forex ile aynı detay seviyesinde
     """
     
+    # analyze() içinde çekilen (interval, limit) çiftleri - toplu prefetch için
+    REQUIRED_KLINES = [('15m', 300), ('1d', 90), ('4h', 200)]
+    # (interval, lookback, limit) S/R seviye setleri - ana process'te incremental indeksten
+    REQUIRED_SR = [('4h', 100, 200), ('1d', 60, 90), ('15m', 150, 300)]
+    
     def __init__(self, binance_provider):
         self.name = "Crypto KRO"
         self.description = "Kripto Kırılım + Retest + Onay (15M Binance Verileri)"
@@ -498,21 +297,24 @@ class CryptoKROStrategy:
             print(f"✅ {symbol} KRO Professional: 15M:{len(klines_15m)}, 1D:{len(klines_1d)}, 4H:{len(klines_4h)} mum verisi")
             
             # DAILY TREND CONTEXT ANALİZİ
-            daily_prices = [k['close'] for k in klines_1d]
+            daily_prices = klines_1d['close'].tolist()
             daily_trend = 'BULLISH' if daily_prices[-1] > daily_prices[-10] else 'BEARISH'
             weekly_trend = 'BULLISH' if daily_prices[-1] > daily_prices[-30] else 'BEARISH'
             
             print(f"📊 {symbol} Context: Daily={daily_trend}, Weekly={weekly_trend}")
             
-            # MAJÖR SUPPORT/RESISTANCE (4H + 1D kombine)
-            sr_levels_4h = CryptoTechnicalAnalysis.find_support_resistance(klines_4h, lookback=100)
-            sr_levels_1d = CryptoTechnicalAnalysis.find_support_resistance(klines_1d, lookback=60)
-            
-            # 15M için detaylı analiz
-            sr_levels_15m = CryptoTechnicalAnalysis.find_support_resistance(klines_15m, lookback=150)
+            # MAJÖR SUPPORT/RESISTANCE (4H + 1D kombine) + 15M detaylı analiz
+            # Provider incremental S/R indeksi tutuyorsa sadece yeni kapanan mumlar işlenir
+            sr_sets = {}
+            for (interval, lookback, limit), klines in zip(self.REQUIRED_SR, (klines_4h, klines_1d, klines_15m)):
+                if hasattr(self.binance_provider, 'get_sr_levels'):
+                    sr_sets[interval] = self.binance_provider.get_sr_levels(symbol, interval, lookback, limit)
+                else:
+                    sr_sets[interval] = CryptoTechnicalAnalysis.find_support_resistance(klines, lookback=lookback)
+            sr_levels_4h, sr_levels_1d, sr_levels_15m = sr_sets['4h'], sr_sets['1d'], sr_sets['15m']
             
             # Teknik analiz
-            prices = [k['close'] for k in klines_15m]
+            prices = klines_15m['close'].tolist()
             rsi = CryptoTechnicalAnalysis.calculate_rsi(prices)
             atr = CryptoTechnicalAnalysis.calculate_crypto_atr(klines_15m)
             momentum = CryptoTechnicalAnalysis.analyze_crypto_momentum(klines_15m)
@@ -558,10 +360,17 @@ class CryptoKROStrategy:
                 level['timeframe'] = '15M'
                 all_resistance_levels.append(level)
             
-            # Kombine S/R levels
+            # Kombine S/R levels - priority başına fiyat sıralı kitaplar breakout'ta ikili arama için
             combined_sr_levels = {
                 'support_levels': all_support_levels,
-                'resistance_levels': all_resistance_levels
+                'resistance_levels': all_resistance_levels,
+                'sorted_levels': {
+                    priority: {
+                        'support_levels': sr_set['support_sorted'],
+                        'resistance_levels': sr_set['resistance_sorted']
+                    }
+                    for priority, sr_set in (('HIGH', sr_levels_1d), ('MEDIUM', sr_levels_4h), ('LOW', sr_levels_15m))
+                }
             }
             
             # KRO 15M Analizi - MULTI-TIMEFRAME Kırılım tespiti
@@ -651,7 +460,7 @@ class CryptoKROStrategy:
             
             # Volume kontrolü - Tam sayı puan
             if len(klines_15m) >= 20:
-                recent_volumes = [k['volume'] for k in klines_15m[-20:]]
+                recent_volumes = klines_15m['volume'][-20:].tolist()
                 avg_volume = sum(recent_volumes) / len(recent_volumes)
                 current_volume = klines_15m[-1]['volume']
                 
@@ -802,6 +611,11 @@ class CryptoLMOStrategy:
     Forex ile aynı detay seviyesinde
     """
     
+    # analyze() içinde çekilen (interval, limit) çiftleri - toplu prefetch için
+    REQUIRED_KLINES = [('4h', 200), ('1w', 52), ('1d', 120), ('15m', 100)]
+    # analyze() içinde kullanılan RSI serileri (interval, period, limit)
+    REQUIRED_RSI = [('4h', 14, 200)]
+    
     def __init__(self, binance_provider):
         self.name = "Crypto LMO"
         self.description = "Kripto Liquidity Sweep + Momentum Onayı (4H Binance Verileri)"
@@ -833,8 +647,8 @@ class CryptoLMOStrategy:
             print(f"✅ {symbol} LMO Professional: 4H:{len(klines_4h)}, 1D:{len(klines_1d)}, 1W:{len(klines_1w)}, 15M:{len(klines_15m)} mum verisi")
             
             # WEEKLY/DAILY TREND CONTEXT ANALİZİ
-            weekly_prices = [k['close'] for k in klines_1w]
-            daily_prices = [k['close'] for k in klines_1d]
+            weekly_prices = klines_1w['close'].tolist()
+            daily_prices = klines_1d['close'].tolist()
             
             weekly_trend = 'BULLISH' if weekly_prices[-1] > weekly_prices[-8] else 'BEARISH'  # 8 hafta
             monthly_trend = 'BULLISH' if weekly_prices[-1] > weekly_prices[-16] else 'BEARISH'  # 16 hafta ~ 4 ay
@@ -844,22 +658,22 @@ class CryptoLMOStrategy:
             
             # MAJÖR LIQUIDITY ZONES (1W + 1D + 4H kombine)
             # Weekly zones - en güçlü liquidity seviyeleri
-            weekly_highs = [k['high'] for k in klines_1w[-20:]]  # Son 20 hafta
-            weekly_lows = [k['low'] for k in klines_1w[-20:]]
+            weekly_highs = klines_1w['high'][-20:].tolist()  # Son 20 hafta
+            weekly_lows = klines_1w['low'][-20:].tolist()
             major_weekly_high = max(weekly_highs)
             major_weekly_low = min(weekly_lows)
             
             # Daily zones
-            daily_highs = [k['high'] for k in klines_1d[-30:]]  # Son 30 gün
-            daily_lows = [k['low'] for k in klines_1d[-30:]]
+            daily_highs = klines_1d['high'][-30:].tolist()  # Son 30 gün
+            daily_lows = klines_1d['low'][-30:].tolist()
             
             # 4H teknik analiz
-            prices_4h = [k['close'] for k in klines_4h]
-            highs_4h = [k['high'] for k in klines_4h]
-            lows_4h = [k['low'] for k in klines_4h]
+            prices_4h = klines_4h['close'].tolist()
+            highs_4h = klines_4h['high'].tolist()
+            lows_4h = klines_4h['low'].tolist()
             
             # 15M teknik analiz  
-            prices_15m = [k['close'] for k in klines_15m]
+            prices_15m = klines_15m['close'].tolist()
             
             rsi_4h = CryptoTechnicalAnalysis.calculate_rsi(prices_4h)
             rsi_15m = CryptoTechnicalAnalysis.calculate_rsi(prices_15m)
@@ -905,11 +719,18 @@ class CryptoLMOStrategy:
             if ENHANCED_ANALYSIS_AVAILABLE:
                 print(f"🚀 {symbol} Enhanced LMO analizi başlatılıyor...")
                 
+                # Divergence tespiti için 4H RSI serisi - provider'da 4H mumlarla birlikte cache'li
+                if hasattr(self.binance_provider, 'get_rsi_series'):
+                    rsi_4h_values = self.binance_provider.get_rsi_series(symbol, '4h', 14, len(klines_4h))
+                else:
+                    rsi_4h_values = [50.0 if value != value else round(value, 2)
+                                     for value in rsi_series(prices_4h).tolist()]
+                
                 # Gelişmiş analiz çalıştır
                 enhanced_result = EnhancedLMOAnalyzer.enhanced_lmo_analysis(
                     prices_4h=prices_4h,
                     prices_15m=prices_15m, 
-                    rsi_4h_values=[rsi_4h] * len(prices_4h),  # RSI array simulation
+                    rsi_4h_values=rsi_4h_values,  # Bar bazında gerçek Wilder RSI
                     current_price=current_price,
                     liquidity_sweep=sweep
                 )
@@ -1061,6 +882,53 @@ class CryptoLMOStrategy:
             print(f"❌ Crypto LMO analiz hatası {symbol}: {e}")
             return None
 
+class _PrefetchedKlineProvider:
+    """
+    Önceden çekilmiş mum verilerini get_klines arayüzüyle sunar
+    Process pool worker'larında HTTP yapılmaz - sadece bu sözlük okunur
+    """
+    
+    def __init__(self, klines_by_key: Dict[Tuple[str, int], CandleSeries],
+                 rsi_by_key: Optional[Dict[Tuple[str, int], List[float]]] = None,
+                 sr_by_key: Optional[Dict[Tuple[str, int], Dict]] = None):
+        self.klines_by_key = klines_by_key
+        self.rsi_by_key = rsi_by_key or {}
+        self.sr_by_key = sr_by_key or {}
+    
+    def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100) -> CandleSeries:
+        klines = self.klines_by_key.get((interval, limit))
+        if klines is not None:
+            return klines
+        
+        # Aynı interval için daha uzun seri varsa son 'limit' mumu kullan
+        longer = [data for (tf, size), data in self.klines_by_key.items() if tf == interval and size >= limit]
+        if longer:
+            return max(longer, key=len)[-limit:]
+        return CandleSeries.empty()
+    
+    def get_rsi_series(self, symbol: str, interval: str = '4h', period: int = 14, limit: int = 100) -> List[float]:
+        values = self.rsi_by_key.get((interval, period))
+        if values is None:
+            # Ana process'te hesaplanmamışsa mumlardan hesapla
+            values = [50.0 if value != value else round(value, 2)
+                      for value in rsi_series(self.get_klines(symbol, interval, limit).close, period).tolist()]
+        return values[-limit:] if limit else []
+    
+    def get_sr_levels(self, symbol: str, interval: str = '4h', lookback: int = 50, limit: int = 100) -> Dict:
+        levels = self.sr_by_key.get((interval, lookback))
+        if levels is None:
+            # Ana process'te hesaplanmamışsa mumlardan hesapla
+            levels = CryptoTechnicalAnalysis.find_support_resistance(self.get_klines(symbol, interval, limit), lookback)
+        return levels
+
+def _analyze_prefetched_symbol(symbol: str, current_price: float,
+                               klines_by_key: Dict[Tuple[str, int], CandleSeries],
+                               rsi_by_key: Optional[Dict[Tuple[str, int], List[float]]] = None,
+                               sr_by_key: Optional[Dict[Tuple[str, int], Dict]] = None) -> List[Dict]:
+    """Process pool worker: önceden çekilmiş veriyle KRO + LMO analizi"""
+    manager = CryptoStrategyManager(_PrefetchedKlineProvider(klines_by_key, rsi_by_key, sr_by_key))
+    return manager.analyze_symbol(symbol, current_price)
+
 class CryptoStrategyManager:
     """
     Gelişmiş Kripto Strateji Yöneticisi
@@ -1072,6 +940,14 @@ class CryptoStrategyManager:
         self.kro_strategy = CryptoKROStrategy(binance_provider)
         self.lmo_strategy = CryptoLMOStrategy(binance_provider)
         self.min_combined_reliability = 4  # Kripto için daha düşük eşik
+        
+        # Toplu analiz ayarları
+        self.io_workers = 16        # Eşzamanlı kline HTTP isteği
+        self.compute_workers = None  # None = CPU sayısı
+        self.symbol_timeout = 10    # Sembol başına süre sınırı (saniye) - sembolün işi başladığı andan
+        self._compute_pool = None
+        self._compute_pool_workers = 0  # Kurulan pool'un worker sayısı
+        self.pool_recycles = 0      # Takılan worker yüzünden yenilenen pool sayısı
     
     def analyze_symbol(self, symbol: str, current_price: float) -> List[Dict]:
         """
@@ -1105,6 +981,209 @@ class CryptoStrategyManager:
         
         return signals
     
+    @staticmethod
+    def required_klines() -> List[Tuple[str, int]]:
+        """
+        KRO + LMO için (interval, limit) - her interval için en uzun seri yeterli,
+        kısa istekler sondan kesilerek karşılanır
+        """
+        longest = {}
+        for interval, limit in CryptoKROStrategy.REQUIRED_KLINES + CryptoLMOStrategy.REQUIRED_KLINES:
+            longest[interval] = max(limit, longest.get(interval, 0))
+        return sorted(longest.items())
+    
+    def analyze_symbols(self, prices: Dict) -> Dict[str, List[Dict]]:
+        """
+        TOPLU ANALİZ: Tüm semboller için KRO + LMO
+        1. Tüm kline istekleri thread pool'da paralel çekilir (I/O)
+        2. Strateji hesapları process pool'da paralel çalışır (CPU)
+        Sembol başına süre sınırı aşılırsa o sembol atlanır
+        
+        prices: {symbol: current_price} veya {symbol: {'price': ...}}
+        """
+        results = {}
+        current_prices = {}
+        for symbol, price_data in prices.items():
+            current_prices[symbol] = price_data['price'] if isinstance(price_data, dict) else price_data
+        
+        if not current_prices:
+            return results
+        
+        start_time = time.time()
+        required = self.required_klines()
+        
+        # ADIM 1: Kline prefetch - her (sembol, interval) ayrı iş
+        klines, timed_out_symbols = self._prefetch_klines(current_prices, required)
+        
+        for symbol in timed_out_symbols:
+            print(f"⏱️ {symbol} kline prefetch timeout - analiz atlandı")
+            klines.pop(symbol, None)
+        
+        print(f"📥 Kline prefetch tamamlandı: {len(klines)} sembol, {time.time() - start_time:.2f}s")
+        
+        # RSI serileri ana process'te - provider cache'i incremental güncellenir, worker'a hazır gider
+        rsi = {symbol: {} for symbol in klines}
+        if hasattr(self.binance_provider, 'get_rsi_series'):
+            for symbol in klines:
+                for interval, period, limit in CryptoLMOStrategy.REQUIRED_RSI:
+                    try:
+                        rsi[symbol][(interval, period)] = self.binance_provider.get_rsi_series(symbol, interval, period, limit)
+                    except Exception as e:
+                        print(f"⚠️ {symbol} {interval} RSI serisi hatası: {e}")
+        
+        # S/R seviyeleri de ana process'te - indeks sadece yeni kapanan mumları işler
+        sr = {symbol: {} for symbol in klines}
+        if hasattr(self.binance_provider, 'get_sr_levels'):
+            for symbol in klines:
+                for interval, lookback, limit in CryptoKROStrategy.REQUIRED_SR:
+                    try:
+                        sr[symbol][(interval, lookback)] = self.binance_provider.get_sr_levels(symbol, interval, lookback, limit)
+                    except Exception as e:
+                        print(f"⚠️ {symbol} {interval} S/R seviye hatası: {e}")
+        
+        # ADIM 2: Strateji hesapları - process pool
+        jobs = {symbol: (symbol, current_prices[symbol], symbol_klines, rsi[symbol], sr[symbol])
+                for symbol, symbol_klines in klines.items()}
+        pool = self._get_compute_pool()
+        if pool is None:
+            # Process pool kurulamadıysa aynı process'te sırayla hesapla
+            for symbol, args in jobs.items():
+                results[symbol] = _analyze_prefetched_symbol(*args)
+        else:
+            try:
+                results.update(self._compute_signals(jobs))
+            except Exception as e:
+                # BrokenProcessPool vb. - pool'u sıfırla, bir sonraki turda yeniden kurulur
+                print(f"❌ Process pool hatası: {e}")
+                self.shutdown()
+        
+        print(f"⚡ Toplu analiz tamamlandı: {len(results)} sembol, {time.time() - start_time:.2f}s")
+        return results
+    
+    def _prefetch_klines(self, current_prices: Dict, required: List[Tuple[str, int]]):
+        """
+        Kline'ları thread pool'da çek - ({sembol: {(interval, limit): seri}}, süre aşan semboller)
+        Sembolün süresi ilk isteği başladığında işler; kuyrukta bekleyen sembolün süresi işlemez
+        Takılan istekler için toplam üst sınır: symbol_timeout x tur sayısı
+        """
+        klines = {symbol: {} for symbol in current_prices}
+        started = {}  # Sembol -> ilk isteğin başladığı an
+        
+        def fetch(symbol, interval, limit):
+            started.setdefault(symbol, time.time())
+            return self.binance_provider.get_klines(symbol, interval, limit)
+        
+        io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix='kline-fetch')
+        timed_out_symbols = set()
+        try:
+            pending = {
+                io_pool.submit(fetch, symbol, interval, limit): (symbol, interval, limit)
+                for symbol in current_prices
+                for interval, limit in required
+            }
+            batch_deadline = time.time() + self.symbol_timeout * math.ceil(len(pending) / self.io_workers)
+            
+            while pending:
+                now = time.time()
+                deadlines = [started[symbol] + self.symbol_timeout
+                             for symbol in {key[0] for key in pending.values()} if symbol in started]
+                timeout = max(0.0, min(deadlines + [batch_deadline]) - now)
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    symbol, interval, limit = pending.pop(future)
+                    try:
+                        klines[symbol][(interval, limit)] = future.result()
+                    except Exception as e:
+                        print(f"❌ {symbol} {interval} kline prefetch hatası: {e}")
+                
+                # Süresi dolan sembolün kalan istekleri iptal - diğer semboller beklemeye devam eder
+                now = time.time()
+                for future, (symbol, _, _) in list(pending.items()):
+                    if now >= batch_deadline or (symbol in started and now >= started[symbol] + self.symbol_timeout):
+                        future.cancel()
+                        del pending[future]
+                        timed_out_symbols.add(symbol)
+        finally:
+            # Takılan HTTP isteklerini bekleme - sonuçları zaten kullanılmayacak
+            io_pool.shutdown(wait=False, cancel_futures=True)
+        
+        return klines, timed_out_symbols
+    
+    def _compute_signals(self, jobs: Dict[str, Tuple]) -> Dict[str, List[Dict]]:
+        """
+        Strateji hesapları process pool'da - pool'un worker sayısı kadar iş aynı anda gönderilir,
+        böylece sembolün süresi worker'a verildiği anda başlar
+        Süresi dolan iş hâlâ çalışıyorsa worker'ı takılıdır: pool yenilenir, kalan işler yeni pool'a gider
+        (eski pool'daki diğer işler orada tamamlanır)
+        """
+        results = {}
+        queue = list(jobs)
+        running = {}  # future -> (sembol, son an, gönderildiği pool)
+        pool = self._get_compute_pool()
+        
+        while queue or running:
+            in_flight = sum(1 for _, _, owner in running.values() if owner is pool)
+            while queue and in_flight < self._compute_pool_workers:
+                symbol = queue.pop(0)
+                future = pool.submit(_analyze_prefetched_symbol, *jobs[symbol])
+                running[future] = (symbol, time.time() + self.symbol_timeout, pool)
+                in_flight += 1
+            
+            timeout = max(0.0, min(deadline for _, deadline, _ in running.values()) - time.time())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                symbol, _, _ = running.pop(future)
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    print(f"❌ {symbol} analiz hatası: {e}")
+                    results[symbol] = []
+            
+            now = time.time()
+            expired = [future for future, (_, deadline, _) in running.items() if now >= deadline]
+            stuck_pool = False
+            for future in expired:
+                symbol, _, owner = running.pop(future)
+                print(f"⏱️ {symbol} analiz timeout ({self.symbol_timeout}s) - atlandı")
+                results[symbol] = []
+                stuck_pool = stuck_pool or owner is pool
+            if stuck_pool:
+                # cancel() çalışan process işini durdurmaz - takılan worker yeni pool'a taşınmaz
+                self._recycle_compute_pool()
+                pool = self._get_compute_pool()
+                if pool is None:
+                    for symbol in queue:
+                        results[symbol] = _analyze_prefetched_symbol(*jobs[symbol])
+                    queue = []
+        
+        return results
+    
+    def _get_compute_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Kalıcı process pool - her turda yeniden process başlatma maliyeti olmasın"""
+        if self._compute_pool is None:
+            workers = self.compute_workers or os.cpu_count() or 1
+            try:
+                self._compute_pool = ProcessPoolExecutor(max_workers=workers)
+            except (OSError, NotImplementedError) as e:
+                print(f"⚠️ Process pool başlatılamadı, seri hesaplama kullanılacak: {e}")
+                return None
+            self._compute_pool_workers = workers
+        return self._compute_pool
+    
+    def _recycle_compute_pool(self):
+        """Takılan worker'lı pool'u bırak - çalışan işler eski pool'da biter, yeni işler yeni pool'a"""
+        print("♻️ Analiz process pool'u yenileniyor (takılan worker)")
+        self.pool_recycles += 1
+        self.shutdown()
+    
+    def shutdown(self):
+        """Process pool'u kapat"""
+        if self._compute_pool is not None:
+            self._compute_pool.shutdown(wait=False, cancel_futures=True)
+            self._compute_pool = None
+    
     def _combine_crypto_strategies(self, kro_result, lmo_result, symbol: str, current_price: float) -> Optional[Dict]:
         """
         KRİTİK: Crypto KRO ve LMO'yu birleştirip tek güçlü sinyal oluştur
@@ -8,13 +8,13 @@ import main
 def debug_cache():
     print("🔍 CACHE DEBUG")
     print("===============")
-    print(f"📊 Cache Size: {len(main.ACTIVE_SIGNALS_CACHE)}")
+    print(f"📊 Cache Size: {len(main.SIGNAL_STORE)}")
     
-    if not main.ACTIVE_SIGNALS_CACHE:
+    if not len(main.SIGNAL_STORE):
         print("❌ Cache boş!")
         return
         
-    for signal_id, signal in main.ACTIVE_SIGNALS_CACHE.items():
+    for signal_id, signal in main.SIGNAL_STORE.snapshot().items():
         print(f"\n🎯 ID: {signal_id}")
         print(f"   Symbol: {signal.get('symbol', 'N/A')}")
         print(f"   Asset Type: {signal.get('asset_type', 'N/A')}")
@@ -0,0 +1,90 @@
+"""
+Sürümlü Değişiklik Günlüğü
+Sinyal deposu için ?since=<sürüm> delta'ları
+- Her yayın sürümünde eklenen / güncellenen / silinen anahtarlar saklanır (değişiklik yoksa kayıt yok)
+- since(v): v'den sonraki değişikliklerin birleşimi; v günlükten eskiyse None -> tam senkron
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
+
+
+class DeltaLog:
+    """
+    record(version, added, updated, removed): sürüm monoton artar, eski / tekrar sürüm yok sayılır
+    max_entries: saklanan değişiklikli sürüm sayısı - daha gerideki istemciler tam senkron alır
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = deque()  # (version, added, updated, removed)
+        self._lock = threading.Lock()
+        self.version = 0
+        self.floor = 0           # Bundan eski since değerleri için değişiklikler atıldı
+
+        # İstatistikler
+        self.deltas_served = 0
+        self.resyncs = 0
+
+    def record(self, version: int, added: Iterable = (), updated: Iterable = (), removed: Iterable = ()):
+        added, updated, removed = frozenset(added), frozenset(updated), frozenset(removed)
+        with self._lock:
+            if version <= self.version:
+                return
+            self.version = version
+            if added or updated or removed:
+                self._entries.append((version, added, updated, removed))
+                while len(self._entries) > self.max_entries:
+                    self.floor = self._entries.popleft()[0]
+
+    def record_diff(self, version: int, previous: Mapping, current: Mapping):
+        """İki snapshot arasındaki farkı kaydet - değeri değişen ortak anahtarlar 'updated'"""
+        common = current.keys() & previous.keys()
+        self.record(version,
+                    added=current.keys() - previous.keys(),
+                    updated=[key for key in common if current[key] != previous[key]],
+                    removed=previous.keys() - current.keys())
+
+    def since(self, version: int, until: Optional[int] = None) -> Optional[Tuple[Dict[str, Set], int]]:
+        """
+        ({'added', 'updated', 'removed'} anahtar kümeleri, kapsanan son sürüm)
+        until: okuyucunun snapshot sürümü - günlük ondan ileride olabilir
+        İstemci çok gerideyse veya sürümü sunucudan ilerideyse (yeniden başlatma) None
+        """
+        with self._lock:
+            until = self.version if until is None else min(until, self.version)
+            if version < self.floor or version > until:
+                self.resyncs += 1
+                return None
+            entries = [entry for entry in self._entries if version < entry[0] <= until]
+            self.deltas_served += 1
+
+        # Sürüm sırasıyla birleştir: eklenip silinen istemciye hiç gitmez,
+        # silinip yeniden eklenen istemcide zaten var -> güncelleme
+        state = {}
+        for _, added, updated, removed in entries:
+            for key in added:
+                state[key] = 'updated' if state.get(key) == 'removed' else 'added'
+            for key in updated:
+                state.setdefault(key, 'updated')
+            for key in removed:
+                if state.get(key) == 'added':
+                    del state[key]
+                else:
+                    state[key] = 'removed'
+
+        changes = {'added': set(), 'updated': set(), 'removed': set()}
+        for key, kind in state.items():
+            changes[kind].add(key)
+        return changes, until
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'version': self.version,
+                'floor': self.floor,
+                'entries': len(self._entries),
+                'deltas_served': self.deltas_served,
+                'resyncs': self.resyncs
+            }
@@ -4,25 +4,40 @@ Gerçek order book depth ve volume profile analizi
 """
 
 import time
-import requests
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from http_client import get_http_client
+from singleflight import SingleFlight
+from ttl_cache import TTLCache
+from rate_limiter import get_binance_rate_limiter, binance_request_weight, PRIORITY_HIGH
+
 class EnhancedVolumeAnalyzer:
     """Gerçek exchange depth ve volume analizi"""
     
     def __init__(self, binance_provider):
         self.binance_provider = binance_provider
-        self.cache = {}
-        self.cache_duration = 30  # 30 saniye cache
+        self.cache = TTLCache(ttl=30, max_bytes=4 * 1024 * 1024, name='depth')  # 30 saniye cache
+        self.http = get_http_client()  # Binance ile paylaşılan keep-alive havuzu
+        self.rate_limiter = get_binance_rate_limiter()  # Binance ile paylaşılan ağırlık bütçesi
+        self.flights = SingleFlight('depth')  # Eşzamanlı miss'ler tek isteği paylaşır
     
     def get_order_book_depth(self, symbol: str, limit: int = 100) -> Dict:
         """Gerçek order book depth analizi"""
         cache_key = f'depth_{symbol}_{limit}'
         
         # Cache kontrolü
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]['data']
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        return self.flights.do(cache_key, self._fetch_order_book_depth, cache_key, symbol, limit)
+    
+    def _fetch_order_book_depth(self, cache_key: str, symbol: str, limit: int) -> Dict:
+        """/depth isteği - single-flight lideri çalıştırır"""
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             # Binance symbol formatına çevir
@@ -32,17 +47,18 @@ class EnhancedVolumeAnalyzer:
             url = f"https://api.binance.com/api/v3/depth"
             params = {'symbol': binance_symbol, 'limit': limit}
             
-            response = requests.get(url, params=params, timeout=5)
+            if not self.rate_limiter.acquire(binance_request_weight('/depth', params), PRIORITY_HIGH, timeout=5):
+                return self._get_fallback_depth_analysis(symbol)
+            
+            response = self.http.get(url, params=params, timeout=5)
+            self.rate_limiter.observe_response(response)
             data = response.json()
             
             if 'bids' in data and 'asks' in data:
                 depth_analysis = self._analyze_order_book_depth(data, symbol)
                 
                 # Cache'e kaydet
-                self.cache[cache_key] = {
-                    'data': depth_analysis,
-                    'timestamp': time.time()
-                }
+                self.cache.set(cache_key, depth_analysis)
                 
                 return depth_analysis
                 
@@ -133,8 +149,8 @@ class EnhancedVolumeAnalyzer:
                 return self._get_fallback_volume_profile(symbol)
             
             # Volume profiling
-            volumes = [k['volume'] for k in klines]
-            prices = [k['close'] for k in klines]
+            volumes = klines['volume'].tolist()
+            prices = klines['close'].tolist()
             
             # Volume-weighted average price (VWAP)
             total_volume = sum(volumes)
@@ -193,12 +209,6 @@ class EnhancedVolumeAnalyzer:
             'source': 'fallback'
         }
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Cache geçerliliği"""
-        if cache_key not in self.cache:
-            return False
-        return (time.time() - self.cache[cache_key]['timestamp']) < self.cache_duration
-
 
 class VolumeEnhancedSignalAnalyzer:
     """Volume enhanced signal analysis"""
@@ -0,0 +1,304 @@
+"""
+Server-Sent Events Yayın Kanalı
+Fiyat tick'leri, yeni / kapanan sinyaller ve istatistikler /stream bağlantılarına itilir
+- Olay bir kez kodlanır, tüm istemcilere aynı baytlar gider
+- İstemci başına birleştirme: aynı anahtarlı (ör. 'crypto_prices') bekleyen olay yenisiyle değişir
+- Yeni istemci her anahtarın son olayını hemen alır - değişiklik beklemez
+- Sınırlı gönderim tamponu: tamponu dolan yavaş istemci düşürülür, yayıncı asla beklemez
+- Tüm soketler tek yazıcı thread'inde non-blocking yazılır - HTTP worker'ı tutulmaz
+"""
+
+import json
+import selectors
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+SSE_HEADERS = {
+    'Content-Type': 'text/event-stream; charset=utf-8',
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'   # Proxy tamponlamasın
+}
+
+
+def format_event(event: str, data: bytes, event_id: Optional[int] = None) -> bytes:
+    """SSE çerçevesi - data çok satırlıysa her satır ayrı 'data:' alanı"""
+    lines = [b'event: ' + event.encode('utf-8')]
+    if event_id is not None:
+        lines.append(b'id: %d' % event_id)
+    lines.extend(b'data: ' + line for line in data.split(b'\n'))
+    return b'\n'.join(lines) + b'\n\n'
+
+
+class _SSEClient:
+    __slots__ = ('sock', 'address', 'pending', 'pending_bytes', 'outbuf', 'last_write',
+                 'overflow', 'connected_at', 'registered')
+
+    def __init__(self, sock: socket.socket, address):
+        self.sock = sock
+        self.address = address
+        self.pending = OrderedDict()    # Birleştirme anahtarı -> kodlanmış olay
+        self.pending_bytes = 0
+        self.outbuf = bytearray()       # Sokete yazılmayı bekleyen baytlar
+        self.last_write = time.time()
+        self.overflow = False
+        self.connected_at = time.time()
+        self.registered = 0             # Selector'a kayıtlı olay maskesi
+
+
+class EventBroadcaster:
+    """
+    publish(event, payload, key): tüm bağlı istemcilere olay
+    add_client(sock, address): HTTP başlıkları yazılmış soket yazıcı thread'e devredilir
+    max_buffer_bytes: istemci başına bekleyen + yazılmamış bayt sınırı
+    heartbeat: bu süre olay yoksa yorum satırı (proxy / istemci zaman aşımı için)
+    """
+
+    def __init__(self, max_buffer_bytes: int = 256 * 1024, heartbeat: float = 15.0,
+                 max_clients: int = 256, retry_ms: int = 3000):
+        self.max_buffer_bytes = max_buffer_bytes
+        self.heartbeat = heartbeat
+        self.max_clients = max_clients
+        self.retry_ms = retry_ms
+
+        self._clients: Dict[int, _SSEClient] = {}
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._seq = 0
+        self._latest: Dict[Hashable, bytes] = OrderedDict()  # Birleştirme anahtarı -> son kodlanmış olay
+
+        # İstatistikler
+        self.published = 0
+        self.coalesced = 0
+        self.dropped_slow = 0
+        self.disconnected = 0
+        self.bytes_sent = 0
+
+    def start(self) -> 'EventBroadcaster':
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name='sse-writer', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout)
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.sock.close()
+
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def add_client(self, sock: socket.socket, address=None) -> bool:
+        """
+        Soketi devral - istemci sınırı doluysa False (çağıran 503 döner)
+        Anahtarlı olayların (fiyatlar, istatistikler) sonuncusu istemcinin kuyruğuna hemen konur
+        """
+        with self._lock:
+            if len(self._clients) >= self.max_clients:
+                return False
+            sock.setblocking(False)
+            client = _SSEClient(sock, address)
+            client.outbuf += b'retry: %d\n\n' % self.retry_ms
+            client.pending.update(self._latest)
+            client.pending_bytes = sum(len(message) for message in self._latest.values())
+            self._clients[sock.fileno()] = client
+        self._wake()
+        return True
+
+    def publish(self, event: str, payload=None, key: Hashable = None, data: bytes = None):
+        """
+        Olayı kodla ve istemci kuyruklarına ekle - soket yazmaz, beklemez
+        key verilirse istemcinin henüz gönderilmemiş aynı anahtarlı olayı yenisiyle değişir
+        data: önceden kodlanmış JSON (ör. EncodedResponse.body) - tekrar serileştirilmez
+        """
+        if data is None:
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        with self._lock:
+            self._seq += 1
+            message = format_event(event, data, self._seq)
+            slot = ('key', key) if key is not None else self._seq
+            if key is not None:
+                self._latest[slot] = message
+            for client in self._clients.values():
+                previous = client.pending.get(slot)
+                if previous is not None:
+                    client.pending_bytes -= len(previous)
+                    self.coalesced += 1
+                client.pending[slot] = message
+                client.pending_bytes += len(message)
+                if client.pending_bytes + len(client.outbuf) > self.max_buffer_bytes:
+                    client.overflow = True
+            self.published += 1
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b'\0')
+        except OSError:
+            pass  # Uyandırma zaten bekliyor (tampon dolu) veya kapandı
+
+    def _drop(self, selector, client: _SSEClient, slow: bool = False):
+        if client.sock.fileno() < 0:
+            return  # Aynı döngüde zaten düşürüldü
+        with self._lock:
+            self._clients.pop(client.sock.fileno(), None)
+            if slow:
+                self.dropped_slow += 1
+            else:
+                self.disconnected += 1
+        if client.registered:
+            try:
+                selector.unregister(client.sock)
+            except (KeyError, ValueError):
+                pass
+        client.sock.close()
+
+    def _flush(self, selector, client: _SSEClient) -> bool:
+        """Yazılabildiği kadar yaz - istemci düştüyse False"""
+        try:
+            sent = client.sock.send(client.outbuf)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(selector, client)
+            return False
+        if sent:
+            del client.outbuf[:sent]
+            client.last_write = time.time()
+            with self._lock:
+                self.bytes_sent += sent
+        if len(client.outbuf) > self.max_buffer_bytes:
+            self._drop(selector, client, slow=True)
+            return False
+        return True
+
+    def _run_loop(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        try:
+            while not self._stop_event.is_set():
+                now = time.time()
+                with self._lock:
+                    clients = list(self._clients.values())
+                    for client in clients:
+                        if client.pending:
+                            client.outbuf += b''.join(client.pending.values())
+                            client.pending.clear()
+                            client.pending_bytes = 0
+
+                timeout = self.heartbeat
+                for client in clients:
+                    if client.overflow:
+                        self._drop(selector, client, slow=True)
+                        continue
+                    if not client.outbuf and now - client.last_write >= self.heartbeat:
+                        client.outbuf += b': ping\n\n'
+                    if client.outbuf and not self._flush(selector, client):
+                        continue
+
+                    # Kopma (EOF) için okuma, yazılmamış bayt varsa yazılabilirlik izlenir
+                    events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outbuf else 0)
+                    if client.registered != events:
+                        if client.registered:
+                            selector.modify(client.sock, events, client)
+                        else:
+                            selector.register(client.sock, events, client)
+                        client.registered = events
+                    timeout = min(timeout, max(0.05, client.last_write + self.heartbeat - now))
+
+                for key, mask in selector.select(timeout):
+                    if key.fileobj is self._wake_r:
+                        try:
+                            while self._wake_r.recv(4096):
+                                pass
+                        except BlockingIOError:
+                            pass
+                        continue
+                    client = key.data
+                    if mask & selectors.EVENT_READ:
+                        try:
+                            if not client.sock.recv(1024):
+                                self._drop(selector, client)
+                                continue
+                        except BlockingIOError:
+                            pass
+                        except OSError:
+                            self._drop(selector, client)
+                            continue
+                    if mask & selectors.EVENT_WRITE:
+                        self._flush(selector, client)
+        finally:
+            selector.close()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'published': self.published,
+                'coalesced': self.coalesced,
+                'dropped_slow': self.dropped_slow,
+                'disconnected': self.disconnected,
+                'bytes_sent': self.bytes_sent
+            }
+
+
+class PollingPublisher:
+    """
+    source() sonucunu interval'de bir oku, version(payload) değişince 'event' olarak yayınla
+    Bağlı istemci yokken kaynak okunmaz; olaylar event adıyla birleştirilir
+    """
+
+    def __init__(self, broadcaster: EventBroadcaster, event: str, source: Callable[[], object],
+                 interval: float, version: Callable[[object], Hashable] = None):
+        self.broadcaster = broadcaster
+        self.event = event
+        self.source = source
+        self.interval = interval
+        self.version = version
+        self._last_version = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> 'PollingPublisher':
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name=f'sse-{self.event}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+
+    def poll_once(self) -> bool:
+        """Kaynağı oku, değiştiyse yayınla - yayınlandıysa True"""
+        if not self.broadcaster.client_count():
+            self._last_version = None  # Yeni istemci ilk olayı alsın
+            return False
+        payload = self.source()
+        version = self.version(payload) if self.version else json.dumps(payload, sort_keys=True, default=str)
+        if version == self._last_version:
+            return False
+        self._last_version = version
+        self.broadcaster.publish(self.event, payload, key=self.event)
+        return True
+
+    def _run_loop(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"❌ {self.event} yayın hatası: {e}")
@@ -8,23 +8,15 @@ import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    try:
-        import urllib.request
-        import urllib.parse
-        URLLIB_AVAILABLE = True
-        REQUESTS_AVAILABLE = False
-    except ImportError:
-        URLLIB_AVAILABLE = False
-        REQUESTS_AVAILABLE = False
+from candles import CandleSeries
+from http_client import get_http_client
+from singleflight import SingleFlight
+from ttl_cache import TTLCache, snapshot_age_version, snapshot_with_age
 
 class ForexDataProvider:
     """Gerçek forex veri sağlayıcısı"""
     
-    def __init__(self):
+    def __init__(self, price_soft_ttl: float = 60, price_hard_ttl: float = 900):
         # Ücretsiz API'ler
         self.apis = {
             'exchangerate': 'https://api.exchangerate-api.com/v4/latest',
@@ -32,8 +24,13 @@ class ForexDataProvider:
             'currencyapi': 'https://api.currencyapi.com/v3/latest'
         }
         
-        self.cache = {}
-        self.cache_duration = 60  # 1 dakika cache
+        # Fiyat snapshot'ı: soft TTL sonrası son iyi değer + arka plan yenileme, hard TTL sonrası bloklayan istek
+        self.price_soft_ttl = price_soft_ttl
+        self.price_hard_ttl = price_hard_ttl
+        self.cache = TTLCache(ttl=price_soft_ttl, stale_ttl=price_hard_ttl - price_soft_ttl,
+                              max_bytes=8 * 1024 * 1024, name='forex')
+        self.http = get_http_client()  # Keep-alive bağlantı havuzu
+        self.flights = SingleFlight('forex')  # Eşzamanlı miss'ler tek isteği paylaşır
         
         # Ana forex çiftleri
         self.symbols = ['EURUSD', 'GBPUSD', 'GBPJPY', 'EURCAD', 'XAUUSD']
@@ -42,149 +39,104 @@ class ForexDataProvider:
         """Gerçek forex fiyatlarını çek"""
         cache_key = 'forex_prices'
         
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]['data']
+        # Hard TTL içindeki son iyi değer hemen döner - soft TTL geçtiyse yenileme arka planda
+        cached = self.cache.get_stale(cache_key)
+        if cached is not None:
+            prices, age, stale = cached
+            if stale:
+                self.cache.refresh_in_background(cache_key, self._load_forex_prices)
+            return snapshot_with_age(prices, age, stale)
         
-        forex_data = {}
+        return self.flights.do(cache_key, self._fetch_forex_prices, cache_key)
+    
+    def price_version(self, age_bucket: float = 1.0):
+        """get_forex_prices yanıtının ucuz sürümü - cache kaydının zamanı + yaş dilimi, fiyatlar okunmaz"""
+        stored_at = self.cache.stored_at('forex_prices')
+        return snapshot_age_version(stored_at, stored_at, age_bucket)
+    
+    def _fetch_forex_prices(self, cache_key: str) -> Dict:
+        """Bloklayan ExchangeRate API isteği - single-flight lideri çalıştırır"""
+        cached = self.cache.get_stale(cache_key)
+        if cached is not None:
+            return snapshot_with_age(*cached)
         
         try:
-            # Requests kullan (daha güvenilir)
-            if REQUESTS_AVAILABLE:
-                url = f"{self.apis['exchangerate']}/USD"
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    rates = data.get('rates', {})
-                    
-                    # Ana pariteler için hesapla
-                    if 'EUR' in rates and 'GBP' in rates:
-                        forex_data['EURUSD'] = {
-                            'price': round(1/rates['EUR'], 5),
-                            'timestamp': datetime.now().isoformat(),
-                            'source': 'exchangerate-api'
-                        }
-                        
-                        forex_data['GBPUSD'] = {
-                            'price': round(1/rates['GBP'], 5),
-                            'timestamp': datetime.now().isoformat(),
-                            'source': 'exchangerate-api'
-                        }
-                        
-                        # Cross pairs hesapla
-                        if 'JPY' in rates:
-                            gbp_usd = 1/rates['GBP']
-                            forex_data['GBPJPY'] = {
-                                'price': round(gbp_usd * rates['JPY'], 3),
-                                'timestamp': datetime.now().isoformat(),
-                                'source': 'calculated'
-                            }
-                        
-                        if 'CAD' in rates:
-                            eur_usd = 1/rates['EUR']
-                            forex_data['EURCAD'] = {
-                                'price': round(eur_usd * rates['CAD'], 5),
-                                'timestamp': datetime.now().isoformat(),
-                                'source': 'calculated'
-                            }
-                    
-                    print(f"✅ ExchangeRate API'den {len(forex_data)} forex fiyatı alındı")
-                
-                # Altın fiyatı için fallback
-                try:
-                    import random
-                    forex_data['XAUUSD'] = {
-                        'price': 2650.0 + random.uniform(-30, 30),  # Realistic gold price
-                        'timestamp': datetime.now().isoformat(),
-                        'source': 'realistic-simulation'
-                    }
-                except:
-                    forex_data['XAUUSD'] = {
-                        'price': 2650.0,
-                        'timestamp': datetime.now().isoformat(),
-                        'source': 'fallback'
-                    }
-                    
-                else:
-                    print(f"⚠️ ExchangeRate API hatası: Status {response.status_code}")
-                    if response.status_code == 429:
-                        print("⚠️ API limit aşıldı, fallback kullanılıyor")
-                    elif response.status_code == 403:
-                        print("⚠️ API erişimi reddedildi, fallback kullanılıyor")
-                    forex_data = self._get_fallback_forex()
+            forex_data = self._load_forex_prices()
+        except Exception as e:
+            # Fallback cache'e yazılmaz - son iyi değerin yerini almasın
+            print(f"❌ Forex API hatası: {e}, fallback kullanılıyor")
+            return self._get_fallback_forex()
+        
+        self.cache.set(cache_key, forex_data)
+        return snapshot_with_age(forex_data, 0.0, False)
+    
+    def _load_forex_prices(self) -> Dict:
+        """ExchangeRate API - hata durumunda exception (cache'teki son iyi değer korunur)"""
+        forex_data = {}
+        
+        url = f"{self.apis['exchangerate']}/USD"
+        response = self.http.get(url, timeout=10)
+        
+        if response.status_code != 200:
+            if response.status_code == 429:
+                print("⚠️ ExchangeRate API limit aşıldı")
+            elif response.status_code == 403:
+                print("⚠️ ExchangeRate API erişimi reddedildi")
+            raise ValueError(f"ExchangeRate API hatası: Status {response.status_code}")
+        
+        data = response.json()
+        rates = data.get('rates', {})
+        
+        # Ana pariteler için hesapla
+        if 'EUR' in rates and 'GBP' in rates:
+            forex_data['EURUSD'] = {
+                'price': round(1/rates['EUR'], 5),
+                'timestamp': datetime.now().isoformat(),
+                'source': 'exchangerate-api'
+            }
             
-            # urllib fallback
-            elif URLLIB_AVAILABLE:
-                url = f"{self.apis['exchangerate']}/USD"
-                
-                with urllib.request.urlopen(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = json.loads(response.read().decode())
-                        rates = data.get('rates', {})
-                        
-                        # Same logic as above
-                        if 'EUR' in rates and 'GBP' in rates:
-                            forex_data['EURUSD'] = {
-                                'price': round(1/rates['EUR'], 5),
-                                'timestamp': datetime.now().isoformat(),
-                                'source': 'exchangerate-api'
-                            }
-                            
-                            forex_data['GBPUSD'] = {
-                                'price': round(1/rates['GBP'], 5),
-                                'timestamp': datetime.now().isoformat(),
-                                'source': 'exchangerate-api'
-                            }
-                            
-                            if 'JPY' in rates:
-                                gbp_usd = 1/rates['GBP']
-                                forex_data['GBPJPY'] = {
-                                    'price': round(gbp_usd * rates['JPY'], 3),
-                                    'timestamp': datetime.now().isoformat(),
-                                    'source': 'calculated'
-                                }
-                            
-                            if 'CAD' in rates:
-                                eur_usd = 1/rates['EUR']
-                                forex_data['EURCAD'] = {
-                                    'price': round(eur_usd * rates['CAD'], 5),
-                                    'timestamp': datetime.now().isoformat(),
-                                    'source': 'calculated'
-                                }
-                        
-                        print(f"✅ ExchangeRate API'den {len(forex_data)} forex fiyatı alındı")
-                
-                # Altın için fallback
-                import random
-                forex_data['XAUUSD'] = {
-                    'price': 2650.0 + random.uniform(-30, 30),
+            forex_data['GBPUSD'] = {
+                'price': round(1/rates['GBP'], 5),
+                'timestamp': datetime.now().isoformat(),
+                'source': 'exchangerate-api'
+            }
+            
+            # Cross pairs hesapla
+            if 'JPY' in rates:
+                gbp_usd = 1/rates['GBP']
+                forex_data['GBPJPY'] = {
+                    'price': round(gbp_usd * rates['JPY'], 3),
                     'timestamp': datetime.now().isoformat(),
-                    'source': 'realistic-simulation'
+                    'source': 'calculated'
                 }
             
-            else:
-                # Her iki import da başarısızsa
-                forex_data = self._get_fallback_forex()
-                print("⚠️  Network library yok, fallback kullanılıyor")
-                
-        except Exception as e:
-            print(f"❌ Forex API hatası: {e}")
-            forex_data = self._get_fallback_forex()
+            if 'CAD' in rates:
+                eur_usd = 1/rates['EUR']
+                forex_data['EURCAD'] = {
+                    'price': round(eur_usd * rates['CAD'], 5),
+                    'timestamp': datetime.now().isoformat(),
+                    'source': 'calculated'
+                }
         
-        # Cache'e kaydet
-        self.cache[cache_key] = {
-            'data': forex_data,
-            'timestamp': time.time()
+        print(f"✅ ExchangeRate API'den {len(forex_data)} forex fiyatı alındı")
+        
+        # Altın fiyatı için fallback
+        import random
+        forex_data['XAUUSD'] = {
+            'price': 2650.0 + random.uniform(-30, 30),  # Realistic gold price
+            'timestamp': datetime.now().isoformat(),
+            'source': 'realistic-simulation'
         }
         
         return forex_data
     
-    def get_historical_data(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> List[Dict]:
+    def get_historical_data(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> CandleSeries:
         """Geçmiş forex verilerini simüle et"""
         cache_key = f'forex_history_{symbol}_{timeframe}_{limit}'
         
-        if self._is_cache_valid(cache_key, duration=1800):  # 30 dakika cache
-            return self.cache[cache_key]['data']
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Base fiyatlar
         base_prices = {
@@ -238,11 +190,10 @@ class ForexDataProvider:
             
             current_price = close_price
         
+        candles = CandleSeries.from_dicts(candles)
+        
         # Cache'e kaydet
-        self.cache[cache_key] = {
-            'data': candles,
-            'timestamp': time.time()
-        }
+        self.cache.set(cache_key, candles, ttl=1800)  # 30 dakika cache
         
         return candles
     
@@ -258,14 +209,6 @@ class ForexDataProvider:
         }
         return multipliers.get(timeframe, 60 * 60 * 1000)  # Default 1h
     
-    def _is_cache_valid(self, cache_key: str, duration: int = None) -> bool:
-        """Cache geçerliliğini kontrol et"""
-        if cache_key not in self.cache:
-            return False
-        
-        cache_duration = duration or self.cache_duration
-        return (time.time() - self.cache[cache_key]['timestamp']) < cache_duration
-    
     def _get_fallback_forex(self) -> Dict:
         """Fallback forex fiyatları"""
         import random
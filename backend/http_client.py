@@ -0,0 +1,200 @@
+"""
+Paylaşımlı HTTP Bağlantı Havuzu
+Host başına keep-alive bağlantılar - her istekte yeni TCP + TLS el sıkışması yok
+binance_data, enhanced_volume_analysis, forex_data ve live_prices ortak kullanır
+"""
+
+import json
+import ssl
+import threading
+import time
+from collections import deque
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from typing import Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+
+class HTTPResponse:
+    """Tamamen okunmuş yanıt - bağlantı havuza döndükten sonra da kullanılabilir"""
+
+    def __init__(self, status: int, headers, body: bytes, url: str):
+        self.status = status
+        self.headers = headers      # http.client.HTTPMessage - büyük/küçük harf duyarsız
+        self.body = body
+        self.url = url
+
+    @property
+    def status_code(self) -> int:
+        """requests uyumlu ad"""
+        return self.status
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.body.decode())
+
+
+class _HostPool:
+    """Tek host için boşta bağlantılar (LIFO) + eşzamanlı bağlantı sınırı"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.idle = []
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+
+        # İstatistikler
+        self.requests = 0
+        self.errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.latencies = deque(maxlen=500)  # Saniye - son istekler
+
+
+class PooledHTTPClient:
+    """
+    Thread-safe keep-alive HTTP(S) istemcisi
+    - (scheme, host, port) başına en fazla pool_size bağlantı; dolu havuzda çağıran bekler
+    - Yanıt tamamen okunur, sunucu kapatmadıysa bağlantı havuza döner
+    - Boşta kapanmış bağlantıda idempotent istek bir kez yeni bağlantıyla tekrarlanır
+    - Host başına gecikme kaydı (get_stats)
+    """
+
+    def __init__(self, pool_size: int = 10, timeout: float = 10, pool_sizes: Optional[Dict[str, int]] = None,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.pool_sizes = dict(pool_sizes or {})  # host -> havuz boyutu
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._pools: Dict[tuple, _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def set_pool_size(self, host: str, size: int):
+        """Host için havuz boyutu - sonradan oluşturulan havuzlara uygulanır"""
+        self.pool_sizes[host] = size
+
+    def _pool(self, key: tuple) -> _HostPool:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = _HostPool(self.pool_sizes.get(key[1], self.pool_size))
+            return pool
+
+    def _connect(self, scheme: str, host: str, port: int, timeout: float):
+        if scheme == 'https':
+            return HTTPSConnection(host, port, timeout=timeout, context=self.ssl_context)
+        return HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, method: str, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                body: Optional[bytes] = None, timeout: Optional[float] = None) -> HTTPResponse:
+        """HTTP isteği - ağ hatalarında exception, HTTP hata kodlarında status ile yanıt"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'https'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = parts.path or '/'
+        query = parts.query
+        if params:
+            query = f"{query}&{urlencode(params)}" if query else urlencode(params)
+        if query:
+            path = f"{path}?{query}"
+        timeout = self.timeout if timeout is None else timeout
+
+        key = (scheme, parts.hostname, port)
+        pool = self._pool(key)
+        if not pool.slots.acquire(timeout=timeout):
+            raise TimeoutError(f"HTTP havuzu dolu: {parts.hostname} ({pool.size} bağlantı)")
+
+        try:
+            attempts = 2 if method in ('GET', 'HEAD') else 1
+            for attempt in range(attempts):
+                with pool.lock:
+                    conn = pool.idle.pop() if pool.idle else None
+                reused = conn is not None
+                if conn is None:
+                    conn = self._connect(scheme, parts.hostname, port, timeout)
+                    with pool.lock:
+                        pool.connections_created += 1
+                else:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+
+                start = time.perf_counter()
+                try:
+                    conn.request(method, path, body=body, headers=headers or {})
+                    raw = conn.getresponse()
+                    data = raw.read()
+                except (HTTPException, OSError) as e:
+                    conn.close()
+                    # Sunucunun kapattığı keep-alive bağlantı - yeni bağlantıyla bir kez dene (timeout hariç)
+                    if reused and attempt + 1 < attempts and not isinstance(e, TimeoutError):
+                        continue
+                    with pool.lock:
+                        pool.errors += 1
+                    raise
+
+                elapsed = time.perf_counter() - start
+                with pool.lock:
+                    pool.requests += 1
+                    pool.latencies.append(elapsed)
+                    if reused:
+                        pool.connections_reused += 1
+                    if raw.will_close:
+                        conn.close()
+                    else:
+                        pool.idle.append(conn)
+                return HTTPResponse(raw.status, raw.headers, data, url)
+        finally:
+            pool.slots.release()
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None) -> HTTPResponse:
+        return self.request('GET', url, params=params, headers=headers, timeout=timeout)
+
+    def get_stats(self) -> Dict:
+        """Host başına istek, bağlantı ve gecikme istatistikleri (ms)"""
+        stats = {}
+        with self._lock:
+            pools = list(self._pools.items())
+        for (scheme, host, port), pool in pools:
+            with pool.lock:
+                latencies = sorted(pool.latencies)
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+                stats[f"{scheme}://{host}:{port}"] = {
+                    'requests': pool.requests,
+                    'errors': pool.errors,
+                    'connections_created': pool.connections_created,
+                    'connections_reused': pool.connections_reused,
+                    'idle_connections': len(pool.idle),
+                    'pool_size': pool.size,
+                    'avg_latency_ms': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+                    'p95_latency_ms': round(p95 * 1000, 2) if latencies else None,
+                    'last_latency_ms': round(pool.latencies[-1] * 1000, 2) if latencies else None
+                }
+        return stats
+
+    def close(self):
+        """Boştaki tüm bağlantıları kapat"""
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            with pool.lock:
+                for conn in pool.idle:
+                    conn.close()
+                pool.idle.clear()
+
+
+# Global instance
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHTTPClient:
+    """Süreç genelinde paylaşılan istemci"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = PooledHTTPClient(pool_size=10, pool_sizes={'api.binance.com': 16})
+        return _http_client
@@ -0,0 +1,218 @@
+"""
+Vektörel İndikatör Motoru
+RSI, ATR ve momentum için tüm seriyi tek geçişte hesaplar (NumPy)
+crypto_strategies, real_strategies ve advanced_strategies ortak kullanır
+"""
+
+from typing import Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _as_array(values: Sequence[float]) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Son 'period' elemanın ortalaması - pencere başına tam toplam (kümülatif kayma yok)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1:] = sliding_window_view(values, period).sum(axis=1) / period
+    return out
+
+
+def _wilder_smooth(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder yumuşatması: ilk değer basit ortalama,
+    sonrası avg = (önceki * (period - 1) + değer) / period
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+
+    avg = float(values[:period].sum()) / period
+    out[period - 1] = avg
+    decay = period - 1
+    # Özyinelemeli filtre - Python float döngüsü numpy skaler erişiminden hızlı
+    tail = values[period:].tolist()
+    smoothed = []
+    for value in tail:
+        avg = (avg * decay + value) / period
+        smoothed.append(avg)
+    out[period:] = smoothed
+    return out
+
+
+def rsi_series(prices: Sequence[float], period: int = 14, smoothing: str = 'wilder') -> np.ndarray:
+    """
+    Her bar için RSI (len(prices) uzunluğunda)
+    İlk 'period' değer NaN - yeterli geçmiş yok
+    smoothing='wilder': klasik Wilder RSI
+    smoothing='sma': son 'period' değişimin basit ortalaması (eski calculate_rsi davranışı)
+    """
+    prices = _as_array(prices)
+    out = np.full(len(prices), np.nan)
+    if len(prices) < period + 1:
+        return out
+
+    deltas = np.diff(prices)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    if smoothing == 'wilder':
+        avg_gain = _wilder_smooth(gains, period)
+        avg_loss = _wilder_smooth(losses, period)
+    elif smoothing == 'sma':
+        avg_gain = _rolling_mean(gains, period)
+        avg_loss = _rolling_mean(losses, period)
+    else:
+        raise ValueError(f"Bilinmeyen RSI yumuşatma: {smoothing}")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # Kayıp yoksa RSI = 100 (eski implementasyonlarla aynı)
+    rsi = np.where(avg_loss == 0, 100.0, rsi)
+
+    # deltas[i] -> prices[i + 1]
+    out[1:] = rsi
+    return out
+
+
+def true_range(high: Sequence[float], low: Sequence[float], close: Sequence[float]) -> np.ndarray:
+    """True Range serisi - ilk bar için önceki kapanış yok, high - low kullanılır"""
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    tr = high - low
+    if len(tr) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce([high[1:] - low[1:],
+                                    np.abs(high[1:] - prev_close),
+                                    np.abs(low[1:] - prev_close)])
+    return tr
+
+
+def atr_series(high: Sequence[float], low: Sequence[float], close: Sequence[float],
+               period: int = 14, smoothing: str = 'sma') -> np.ndarray:
+    """
+    Her bar için ATR (len(close) uzunluğunda), ilk 'period' değer NaN
+    smoothing='sma': son 'period' TR ortalaması (mevcut calculate_*atr davranışı)
+    smoothing='wilder': Wilder yumuşatması
+    """
+    tr = true_range(high, low, close)
+    out = np.full(len(tr), np.nan)
+    if len(tr) < period + 1:
+        return out
+
+    # İlk bar TR'si (önceki kapanışsız) ortalamaya girmez
+    if smoothing == 'sma':
+        out[1:] = _rolling_mean(tr[1:], period)
+    elif smoothing == 'wilder':
+        out[1:] = _wilder_smooth(tr[1:], period)
+    else:
+        raise ValueError(f"Bilinmeyen ATR yumuşatma: {smoothing}")
+    return out
+
+
+def momentum_series(prices: Sequence[float], period: int = 10) -> np.ndarray:
+    """N periyot yüzde momentum: (p[i] - p[i-N]) / p[i-N] * 100, ilk N değer NaN"""
+    prices = _as_array(prices)
+    out = np.full(len(prices), np.nan)
+    if len(prices) > period:
+        base = prices[:-period]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[period:] = (prices[period:] - base) / base * 100
+    return out
+
+
+def last_value(series: np.ndarray, default: float) -> float:
+    """Serinin son değeri - yoksa/NaN ise varsayılan"""
+    if len(series) == 0 or np.isnan(series[-1]):
+        return default
+    return float(series[-1])
+
+
+class IncrementalRSI:
+    """
+    Wilder RSI serisi - yeni mum kapandığında sadece yeni barlar hesaplanır
+    Son bar oluşmakta kabul edilir: değeri hesaplanır ama duruma işlenmez
+    Durum (avg_gain, avg_loss) son kapanmış barın timestamp'i ile saklanır
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0)
+        self._state_ts = None     # Son işlenmiş kapanmış barın açılış zamanı
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self.full_recomputes = 0
+        self.incremental_updates = 0
+
+    def _rsi(self, avg_gain: float, avg_loss: float) -> float:
+        if avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def _step(self, avg_gain: float, avg_loss: float, delta: float):
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        return ((avg_gain * (self.period - 1) + gain) / self.period,
+                (avg_loss * (self.period - 1) + loss) / self.period)
+
+    def update(self, timestamps: np.ndarray, closes: np.ndarray) -> np.ndarray:
+        """Verilen seriye hizalı RSI dizisi (ısınma bölümü NaN)"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        closes = _as_array(closes)
+        n = len(closes)
+
+        start = None
+        if self._state_ts is not None and n:
+            k = int(np.searchsorted(timestamps, self._state_ts))
+            old_k = int(np.searchsorted(self.timestamps, self._state_ts))
+            old_first = int(np.searchsorted(self.timestamps, timestamps[0]))
+            if (k < n and timestamps[k] == self._state_ts and k < n - 1 and old_first < len(self.timestamps)
+                    and self.timestamps[old_first] == timestamps[0] and old_k - old_first == k):
+                start = k
+
+        if start is None:
+            return self._recompute(timestamps, closes)
+
+        # Kapanmış yeni barları duruma işle
+        tail = closes[start:].tolist()
+        avg_gain, avg_loss = self._avg_gain, self._avg_loss
+        new_values = []
+        for i in range(1, len(tail) - 1):
+            avg_gain, avg_loss = self._step(avg_gain, avg_loss, tail[i] - tail[i - 1])
+            new_values.append(self._rsi(avg_gain, avg_loss))
+        self._avg_gain, self._avg_loss = avg_gain, avg_loss
+        self._state_ts = int(timestamps[n - 2])
+
+        # Oluşan son bar - duruma işlenmez
+        forming_gain, forming_loss = self._step(avg_gain, avg_loss, tail[-1] - tail[-2])
+        new_values.append(self._rsi(forming_gain, forming_loss))
+
+        old_first = int(np.searchsorted(self.timestamps, timestamps[0]))
+        self.values = np.concatenate((self.values[old_first:old_first + start + 1], new_values))
+        self.timestamps = timestamps.copy()
+        self.incremental_updates += 1
+        return self.values
+
+    def _recompute(self, timestamps: np.ndarray, closes: np.ndarray) -> np.ndarray:
+        """Tam hesap - ilk çağrı veya seride kopukluk"""
+        self.full_recomputes += 1
+        self.timestamps = timestamps.copy()
+        self.values = rsi_series(closes, self.period, smoothing='wilder')
+        n = len(closes)
+
+        # Durum: son kapanmış bar (n - 2) - Wilder ortalamaları yeniden kurulur
+        if n < self.period + 2:
+            self._state_ts = None
+            return self.values
+
+        deltas = np.diff(closes[:n - 1])
+        gains = np.where(deltas > 0, deltas, 0.0)
+        losses = np.where(deltas < 0, -deltas, 0.0)
+        self._avg_gain = float(_wilder_smooth(gains, self.period)[-1])
+        self._avg_loss = float(_wilder_smooth(losses, self.period)[-1])
+        self._state_ts = int(timestamps[n - 2])
+        return self.values
@@ -8,12 +8,13 @@ import random
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
+from ttl_cache import TTLCache
+
 class IntelligentFallbackSystem:
     """Akıllı fallback sistemi - güvenilirlik koruma odaklı"""
     
     def __init__(self):
-        self.cache = {}
-        self.cache_duration = 300  # 5 dakika cache
+        self.cache = TTLCache(ttl=300, max_bytes=1024 * 1024, name='fallback')  # 5 dakika cache
         self.confidence_threshold = 0.8  # Minimum güven eşiği
         
     def get_intelligent_fallback_signal(self, strategy_type: str, symbol: str, 
@@ -29,8 +30,8 @@ class IntelligentFallbackSystem:
         cache_key = f"fallback_{strategy_type}_{symbol}"
         
         # Cache kontrolü
-        if self._is_cache_valid(cache_key):
-            cached_result = self.cache[cache_key]['data']
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
             print(f"ℹ️ {symbol} fallback cache'den alındı")
             return cached_result
         
@@ -48,10 +49,7 @@ class IntelligentFallbackSystem:
         
         if fallback_signal:
             # Cache'e kaydet
-            self.cache[cache_key] = {
-                'data': fallback_signal,
-                'timestamp': time.time()
-            }
+            self.cache.set(cache_key, fallback_signal)
             
             print(f"⚠️ {symbol} conservative fallback signal oluşturuldu (confidence: {market_confidence:.2f})")
         
@@ -172,12 +170,6 @@ class IntelligentFallbackSystem:
             momentum = market_context.get('momentum', 0)
             return 'BUY' if momentum > 0 else 'SELL'
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Cache geçerliliği"""
-        if cache_key not in self.cache:
-            return False
-        return (time.time() - self.cache[cache_key]['timestamp']) < self.cache_duration
-
 
 class NoFallbackPolicy:
     """No-fallback policy - hiç fallback kullanma"""
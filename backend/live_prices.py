@@ -3,13 +3,15 @@ Gerçek Anlık Fiyat Kaynakları
 Birden fazla API'den fiyat çeker ve en güncel veriyi sağlar
 """
 
-import urllib.request
 import json
 import time
 from datetime import datetime
 
+from http_client import get_http_client
+
 class LivePriceFeeder:
     def __init__(self):
+        self.http = get_http_client()  # Keep-alive bağlantı havuzu
         self.api_keys = {
             'alpha_vantage': 'YOUR_FREE_KEY',  # alphavantage.co'dan ücretsiz alın
             'finhub': 'YOUR_FREE_KEY',        # finnhub.io'dan ücretsiz alın
@@ -24,8 +26,7 @@ class LivePriceFeeder:
             
             url = f"https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency={from_curr}&to_currency={to_curr}&apikey={self.api_keys['alpha_vantage']}"
             
-            with urllib.request.urlopen(url, timeout=5) as response:
-                data = json.loads(response.read())
+            data = self.http.get(url, timeout=5).json()
             
             if 'Realtime Currency Exchange Rate' in data:
                 rate_data = data['Realtime Currency Exchange Rate']
@@ -44,8 +45,7 @@ class LivePriceFeeder:
         try:
             url = f"https://finnhub.io/api/v1/quote?symbol=OANDA:XAU_USD&token={self.api_keys['finhub']}"
             
-            with urllib.request.urlopen(url, timeout=5) as response:
-                data = json.loads(response.read())
+            data = self.http.get(url, timeout=5).json()
             
             if 'c' in data:  # current price
                 return {
@@ -65,8 +65,7 @@ class LivePriceFeeder:
             yahoo_symbol = f"{symbol}=X"  # Forex için
             url = f"https://query1.finance.yahoo.com/v8/finance/chart/{yahoo_symbol}"
             
-            with urllib.request.urlopen(url, timeout=5) as response:
-                data = json.loads(response.read())
+            data = self.http.get(url, timeout=5).json()
             
             if 'chart' in data and data['chart']['result']:
                 result = data['chart']['result'][0]
@@ -8,9 +8,25 @@ import json
 import time
 import random
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 
+from signal_scheduler import SignalScheduler, SignalSnapshot
+from signal_store import SignalStore
+from ttl_cache import snapshot_age, snapshot_version
+from candle_archive import CandleArchive
+from app_context import AppContext
+from pooled_server import PooledHTTPServer
+from response_cache import ResponseCache, EncodedResponse
+from delta_log import DeltaLog
+from event_stream import EventBroadcaster, PollingPublisher, SSE_HEADERS
+
+try:
+    from config import SERVER_WORKERS, SERVER_REQUEST_TIMEOUT
+except ImportError:
+    SERVER_WORKERS = 16
+    SERVER_REQUEST_TIMEOUT = 30
+
 # Gerçek veri sağlayıcıları ve GERÇEK STRATEJI SİSTEMLERİ
 try:
     from forex_data import get_forex_provider
@@ -32,96 +48,257 @@ except ImportError as e:
     get_trade_monitor = None
     # FTMO modülü tamamen kaldırıldı
 
+# Binance WebSocket fiyat akışı (websocket-client gerekli)
+try:
+    from binance_websocket import BinanceKlineStreamer
+    PRICE_STREAM_AVAILABLE = True
+except ImportError:
+    PRICE_STREAM_AVAILABLE = False
+    print("⚠️ websocket-client bulunamadı, kripto fiyatları REST ile alınacak")
+
 # KRİTİK: SABIT SİNYAL CACHE SİSTEMİ - NO MOCK DATA - CLEAN SLATE
-ACTIVE_SIGNALS_CACHE = {}  # ✅ Temizlendi
+SIGNAL_STORE = SignalStore(max_signals=10)  # Aktif sinyaller (symbol/asset_type/status indeksli) + kapanan trade'ler
 SIGNAL_GENERATION_INTERVAL = 300  # 5 dakikada bir yeni sinyal üret
 LAST_SIGNAL_GENERATION = 0  # ✅ Reset
-ACTIVE_TRADES_BY_SYMBOL = {}  # ✅ Temizlendi - Her symbol için aktif trade tracking  
-COMPLETED_TRADES_HISTORY = []  # ✅ Temizlendi - TP/SL ile sonuçlanan trade'ler
+SIGNAL_SCHEDULER = None  # Arka plan sinyal zamanlayıcısı - start_server() başlatır
+APP_CONTEXT = None  # Provider / strateji / trade monitor - süreçte bir kez kurulur
+RESPONSE_CACHE = ResponseCache('main')  # Sürüm başına bir kez kodlanmış JSON yanıtlar
+CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+EVENT_BROADCASTER = EventBroadcaster()  # /stream (SSE) istemcilerine fiyat / sinyal / istatistik olayları
+SIGNAL_DELTAS = DeltaLog()  # /signals?since= - snapshot sürümleri arası eklenen / güncellenen / silinen sinyaller
 
-class TradingSignalHandler(BaseHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        # Global providers'ı ayrı ayrı başlat - bir tanesi fail olursa diğerleri etkilenmesin
-        
-        # Forex Provider
-        try:
-            if get_forex_provider:
-                self.forex_provider = get_forex_provider()
-                print("✅ Forex provider aktif")
-            else:
-                self.forex_provider = None
-                print("❌ Forex provider başlatılamadı")
-        except Exception as e:
-            print(f"❌ Forex provider hatası: {e}")
-            self.forex_provider = None
-        
-        # Binance Provider
-        try:
-            if get_binance_provider:
-                self.binance_provider = get_binance_provider()
-                print("✅ Binance provider aktif")
-            else:
-                self.binance_provider = None
-                print("❌ Binance provider başlatılamadı")
-        except Exception as e:
-            print(f"❌ Binance provider hatası: {e}")
-            self.binance_provider = None
-        
-        # Crypto Strategies
-        try:
-            if get_crypto_strategy_manager and self.binance_provider:
-                self.crypto_strategies = get_crypto_strategy_manager(self.binance_provider)
-                print("✅ Crypto strategies aktif")
-            else:
-                self.crypto_strategies = None
-                print("❌ Crypto strategies başlatılamadı")
-        except Exception as e:
-            print(f"❌ Crypto strategies hatası: {e}")
-            self.crypto_strategies = None
-        
-        # Forex Strategies
-        try:
-            if get_real_strategy_manager and self.forex_provider:
-                self.forex_strategies = get_real_strategy_manager(self.forex_provider)
-                print("✅ GERÇEK Forex KRO/LMO strategies aktif")
-            else:
-                self.forex_strategies = None
-                print("❌ Forex strategies başlatılamadı")
-        except Exception as e:
-            print(f"❌ Forex strategies hatası: {e}")
-            self.forex_strategies = None
-        
-        # Trade Monitor
-        try:
-            if get_trade_monitor:
-                self.trade_monitor = get_trade_monitor()
-                print("✅ Trade monitor aktif")
+def get_app_context():
+    """Handler'ların paylaştığı uygulama bağlamı (ilk çağrıda kurulur)"""
+    global APP_CONTEXT
+    if APP_CONTEXT is None:
+        APP_CONTEXT = AppContext({
+            'forex_provider': get_forex_provider,
+            'binance_provider': get_binance_provider,
+            'crypto_strategies': get_crypto_strategy_manager,
+            'forex_strategies': get_real_strategy_manager,
+            'trade_monitor': get_trade_monitor
+        }).build()
+    return APP_CONTEXT
+
+def build_trade_statistics():
+    """Trade istatistikleri - depodaki toplamlardan (geçmiş her çağrıda taranmaz)"""
+    totals = SIGNAL_STORE.trade_totals()
+    total_trades = totals['total_trades']
+    win_rate = (totals['winning_trades'] / total_trades * 100) if total_trades > 0 else 0.0
+    
+    return {
+        'win_rate': round(win_rate, 1),
+        'total_trades': total_trades,
+        'winning_trades': totals['winning_trades'],
+        'losing_trades': totals['losing_trades'],
+        'total_pips': totals['total_pips'],
+        'active_signals': len(SIGNAL_STORE),
+        'recent_history': SIGNAL_STORE.completed_trades(10),  # Son 10 trade
+        'history_version': total_trades,  # Geçmiş sadece eklenir - /statistics?since= sürümü
+        'data_source': 'real_tracking'
+    }
+
+def get_signal_snapshot():
+    """Handler'ların okuduğu son sinyal snapshot'ı"""
+    if SIGNAL_SCHEDULER:
+        return SIGNAL_SCHEDULER.get_snapshot()
+    # Zamanlayıcı yoksa (ör. modül import edilip kullanıldığında) depodan anlık görüntü
+    return SignalSnapshot(0, SIGNAL_STORE.snapshot(), time.time(), {'statistics': build_trade_statistics()})
+
+def publish_snapshot_events(previous, snapshot):
+    """Zamanlayıcı her yayında: yeni / kapanan sinyaller ve değişen istatistikler /stream'e"""
+    for signal_id in snapshot.signals.keys() - previous.signals.keys():
+        EVENT_BROADCASTER.publish('signal_added', dict(snapshot.signals[signal_id], signal_id=signal_id))
+    for signal_id in previous.signals.keys() - snapshot.signals.keys():
+        EVENT_BROADCASTER.publish('signal_removed', {'signal_id': signal_id,
+                                                     'symbol': previous.signals[signal_id].get('symbol')})
+    
+    statistics = snapshot.extra.get('statistics')
+    if statistics and statistics != previous.extra.get('statistics'):
+        EVENT_BROADCASTER.publish('statistics', dict(statistics, timestamp=datetime.now().isoformat()),
+                                  key='statistics')
+
+def record_signal_deltas(previous, snapshot):
+    """Zamanlayıcı her yayında: snapshot farkı SIGNAL_DELTAS'a"""
+    SIGNAL_DELTAS.record_diff(snapshot.version, previous.signals, snapshot.signals)
+
+def build_signal_list(snapshot):
+    """/signals - snapshot'taki tüm sinyaller + sürüm (sonraki ?since= isteğinin başlangıcı)"""
+    signals = [dict(signal, signal_id=signal_id) for signal_id, signal in snapshot.signals.items()]
+    return {
+        'version': snapshot.version,
+        'full': True,
+        'signals': signals,
+        'count': len(signals),
+        'timestamp': datetime.now().isoformat()
+    }
+
+def build_signal_delta(snapshot, since):
+    """
+    /signals?since=<sürüm> - sadece eklenen / güncellenen / silinen sinyaller
+    Negatif since, günlükten geride kalan istemci veya tam listeden büyük delta -> tam senkron
+    """
+    delta = SIGNAL_DELTAS.since(since, snapshot.version) if since >= 0 else None
+    if delta is not None:
+        changes, version = delta
+        changed = len(changes['added']) + len(changes['updated'])
+        if not snapshot.signals or changed < len(snapshot.signals):
+            entries = {}
+            removed = set(changes['removed'])
+            for kind in ('added', 'updated'):
+                entries[kind] = []
+                for signal_id in changes[kind]:
+                    if signal_id in snapshot.signals:
+                        entries[kind].append(dict(snapshot.signals[signal_id], signal_id=signal_id))
+                    else:
+                        removed.add(signal_id)  # Günlük snapshot'tan ileride - sonraki delta'da gelir
+            return {
+                'version': version,
+                'since': since,
+                'full': False,
+                'added': entries['added'],
+                'updated': entries['updated'],
+                'removed': sorted(removed),
+                'timestamp': datetime.now().isoformat()
+            }
+    
+    return dict(build_signal_list(snapshot), since=since)
+
+def build_statistics_delta(statistics, since):
+    """
+    /statistics?since=<history_version> - özet alanlar + sadece yeni kapanan trade'ler
+    Negatif since veya recent_history'nin kapsamadığı kadar geride kalan istemci tam yanıt alır
+    """
+    response = dict(statistics)
+    recent_history = response.pop('recent_history', [])
+    version = response.get('history_version', 0)
+    missed = version - since
+    
+    if since >= 0 and 0 <= missed <= len(recent_history):
+        response['new_trades'] = recent_history[len(recent_history) - missed:]
+        response['full'] = False
+    else:
+        response['recent_history'] = recent_history
+        response['full'] = True
+    response['since'] = since
+    response['timestamp'] = datetime.now().isoformat()
+    return response
+
+def build_market_data_response(forex_provider):
+    """Market verilerini döndür (Forex fiyatları) - Frontend formatında"""
+    try:
+        if forex_provider:
+            forex_data = forex_provider.get_forex_prices()
+            
+            # Veri kontrol et
+            if forex_data and len(forex_data) > 0:
+                return {
+                    'prices': forex_data,
+                    'last_update': datetime.now().isoformat(),
+                    'price_age': snapshot_age(forex_data),  # Saniye - son iyi fiyatın yaşı
+                    'stale': any(p.get('stale') for p in forex_data.values()),
+                    'api_status': 'live',
+                    'data_source': 'exchangerate-api'
+                }
             else:
-                self.trade_monitor = None
-                print("❌ Trade monitor başlatılamadı")
-        except Exception as e:
-            print(f"❌ Trade monitor hatası: {e}")
-            self.trade_monitor = None
-        
-        # FTMO modülü tamamen kaldırıldı - basitlik için
-        
-        super().__init__(*args, **kwargs)
+                print("⚠️ Forex provider veri dönmedi, fallback kullanılıyor")
+                # Fallback'e geç
+                fallback_prices = build_emergency_fallback_prices()
+                return {
+                    'prices': fallback_prices,
+                    'last_update': datetime.now().isoformat(),
+                    'api_status': 'fallback',
+                    'data_source': 'fallback'
+                }
+        else:
+            # Fallback data
+            fallback_prices = build_emergency_fallback_prices()
+            return {
+                'prices': fallback_prices,
+                'last_update': datetime.now().isoformat(),
+                'api_status': 'fallback',
+                'data_source': 'fallback'
+            }
+            
+    except Exception as e:
+        print(f"❌ Market data error: {e}")
+        import traceback
+        print(f"❌ Market data traceback: {traceback.format_exc()}")
+        return {
+            'error': str(e),
+            'api_status': 'error',
+            'fallback_prices': build_emergency_fallback_prices()
+        }
+
+def build_crypto_prices_response(binance_provider):
+    """Kripto fiyatları ve durum bilgisi"""
+    try:
+        if binance_provider:
+            crypto_prices = binance_provider.get_crypto_prices()
+            
+            return {
+                'prices': crypto_prices,
+                'api_status': 'live',  # Gerçek API'den geldiği için live
+                'source': 'binance',
+                'timestamp': datetime.now().isoformat(),
+                'price_age': snapshot_age(crypto_prices),  # Saniye - son iyi fiyatın yaşı
+                'stale': any(p.get('stale') for p in crypto_prices.values()),
+                'count': len(crypto_prices)
+            }
+        else:
+            return {
+                'prices': {},
+                'api_status': 'error',
+                'source': 'none',
+                'timestamp': datetime.now().isoformat(),
+                'count': 0
+            }
+    except Exception as e:
+        print(f"❌ Crypto prices hatası: {e}")
+        return {
+            'prices': {},
+            'api_status': 'error',
+            'source': 'error',
+            'timestamp': datetime.now().isoformat(),
+            'count': 0
+        }
+
+def price_cache_version(provider):
+    """
+    /prices ve /crypto/prices yanıt sürümü - sağlayıcının fiyat sürümü (akış sırası / cache yazma zamanı + yaş dilimi)
+    Fiyatlar okunmaz, hash'lenmez: istek başına maliyet istemci sayısından bağımsız
+    """
+    return provider.price_version() if provider is not None else None
+
+def build_emergency_fallback_prices():
+    """❌ EMERGENCY FALLBACK DEVRE DIŞI - GERÇEK VERİ YOKSA HİÇ VERİ YOK"""
+    # Mock data yerine boş response döndür
+    return {
+        'error': 'No real market data available',
+        'source': 'no_emergency_fallback',
+        'timestamp': datetime.now().isoformat()
+    }
+
+class SignalEngine:
+    """
+    Sinyal üretimi + fiyat güncelleme + TP/SL takibi
+    KRİTİK: HTTP isteklerinden bağımsız - SignalScheduler thread'inde çalışır
+    """
+    
+    def __init__(self, forex_provider=None, binance_provider=None, crypto_strategies=None,
+                 forex_strategies=None, trade_monitor=None):
+        self.forex_provider = forex_provider
+        self.binance_provider = binance_provider
+        self.crypto_strategies = crypto_strategies
+        self.forex_strategies = forex_strategies
+        self.trade_monitor = trade_monitor
     
     def has_active_trade_for_symbol(self, symbol):
-        """Bu symbol için aktif trade var mı kontrol et"""
-        global ACTIVE_TRADES_BY_SYMBOL
-        
-        # Cache'de bu symbol için aktif signal var mı?
-        for signal_id, signal in ACTIVE_SIGNALS_CACHE.items():
-            if signal.get('symbol') == symbol and signal.get('status') == 'ACTIVE':
-                return True
-        
-        return False
+        """Bu symbol için aktif trade var mı kontrol et - sembol indeksinden"""
+        return SIGNAL_STORE.has_active_signal(symbol)
     
     def mark_trade_completed(self, signal, result_type, close_price, pips_earned):
         """Trade sonuçlandığında kaydet ve symbol'u serbest bırak"""
-        global ACTIVE_TRADES_BY_SYMBOL, COMPLETED_TRADES_HISTORY, ACTIVE_SIGNALS_CACHE
-        
         # Completed trades history'e ekle
         completed_trade = {
             'signal_id': signal['id'],
@@ -140,364 +317,168 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
             'reliability_score': signal['fixed_reliability']
         }
         
-        COMPLETED_TRADES_HISTORY.append(completed_trade)
-        
-        # Cache'den aktif signal'ı sil
-        if signal['id'] in ACTIVE_SIGNALS_CACHE:
-            del ACTIVE_SIGNALS_CACHE[signal['id']]
-        
-        # Symbol'u serbest bırak (yeni signal aranabilir)
-        if signal['symbol'] in ACTIVE_TRADES_BY_SYMBOL:
-            del ACTIVE_TRADES_BY_SYMBOL[signal['symbol']]
+        # Geçmişe ekle + aktif sinyali sil (symbol serbest kalır) - tek adımda
+        SIGNAL_STORE.complete(signal.get('signal_id', signal['id']), completed_trade)
+        EVENT_BROADCASTER.publish('trade_closed', completed_trade)
         
         print(f"✅ {signal['symbol']} trade sonuçlandı: {result_type} - {pips_earned:.1f} pips")
         print(f"🆓 {signal['symbol']} yeni signal aranmaya açık")
     
-    def do_OPTIONS(self):
-        """CORS pre-flight requests"""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-    
-    def do_GET(self):
-        """GET requests handler"""
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
+    def generate_new_signals(self):
+        """Yeni sinyal üret - ENTRY/TP/SL SABİT KALSIN (zamanlamayı SignalScheduler yönetir)"""
+        global LAST_SIGNAL_GENERATION
         
-        path = urlparse(self.path).path
-        query_params = parse_qs(urlparse(self.path).query)
+        current_time = time.time()
+        
+        print(f"🔄 Optimize edilmiş sinyal üretimi başlıyor (NO MOCK DATA)...")
+        
+        # YENİ SİNYALLER ÜRET - TÜM SEMBOLLER İŞLENECEK
+        new_signals = {}
+        total_symbols_processed = 0
         
+        # CRYPTO SİNYALLERİ - SINIRLI
         try:
-            if path == '/' or path == '':
-                # Ana sayfa - API durumu
-                response = {
-                    'status': 'Trading Signal Server Running',
-                    'version': '2.0',
-                    'endpoints': [
-                        '/signals - Tüm sinyaller',
-                        '/crypto/signals - Kripto sinyalleri', 
-                        '/prices - Forex fiyatları',
-                        '/crypto/prices - Kripto fiyatları',
-                        '/statistics - Trade istatistikleri'
-                    ],
-                    'data_sources': {
-                        'crypto': 'Binance API',
-                        'forex': 'ExchangeRate API'
-                    },
-                    'strategies': ['KRO (Breakout+Retest)', 'LMO (Liquidity+Momentum)'],
-                    'features': ['Real Data Only', 'No Mock Data'],
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-            elif path == '/signals':
-                # Ana signals endpoint - DIRECT ALL SIGNALS
-                response = {
-                    "signals": [
-                        {
-                            "id": "CRYPTO_BTC_USD_LIVE",
-                            "symbol": "BTC/USD", 
-                            "strategy": "Crypto LMO (Strong)",
-                            "signal_type": "BUY",
-                            "current_price": 105200.0,
-                            "ideal_entry": 105200.0,
-                            "take_profit": 110000.0,
-                            "stop_loss": 104800.0,
-                            "reliability_score": 6,
-                            "asset_type": "crypto",
-                            "data_source": "binance",
-                            "creation_time": datetime.now().isoformat(),
-                            "status": "ACTIVE",
-                            "fixed_entry": 105200.0,
-                            "fixed_tp": 110000.0,
-                            "fixed_sl": 104800.0,
-                            "fixed_strategy": "Crypto LMO (Strong)",
-                            "fixed_signal_type": "BUY",
-                            "fixed_reliability": 7
-                        },
-                        {
-                            "id": "CRYPTO_ETH_USD_LIVE",
-                            "symbol": "ETH/USD",
-                            "strategy": "Crypto KRO (Breakout)",
-                            "signal_type": "BUY", 
-                            "current_price": 2540.0,
-                            "ideal_entry": 2540.0,
-                            "take_profit": 2650.0,
-                            "stop_loss": 2510.0,
-                            "reliability_score": 8,
-                            "asset_type": "crypto",
-                            "data_source": "binance",
-                            "creation_time": datetime.now().isoformat(),
-                            "status": "ACTIVE",
-                            "fixed_entry": 2540.0,
-                            "fixed_tp": 2650.0, 
-                            "fixed_sl": 2510.0,
-                            "fixed_strategy": "Crypto KRO (Breakout)",
-                            "fixed_signal_type": "BUY",
-                            "fixed_reliability": 6
-                        },
-                        {
-                            "id": "FOREX_EURUSD_LIVE", 
-                            "symbol": "EURUSD",
-                            "strategy": "Forex LMO (Smart Money)",
-                            "signal_type": "SELL",
-                            "current_price": 1.0890,
-                            "ideal_entry": 1.0890,
-                            "take_profit": 1.0850,
-                            "stop_loss": 1.0910,
-                            "reliability_score": 5,
-                            "asset_type": "forex",
-                            "data_source": "exchangerate-api",
-                            "creation_time": datetime.now().isoformat(),
-                            "status": "ACTIVE",
-                            "fixed_entry": 1.0890,
-                            "fixed_tp": 1.0850,
-                            "fixed_sl": 1.0910,
-                            "fixed_strategy": "Forex LMO (Smart Money)",
-                            "fixed_signal_type": "SELL",
-                            "fixed_reliability": 5
-                        }
-                    ],
-                    "count": 3,
-                    "asset_types": ["crypto", "forex"],
-                    "data_source": "real_optimized",
-                    "last_update": datetime.now().isoformat(),
-                    "filter_applied": "reliability > 6"
-                }
-                
-            elif path == '/crypto/signals':
-                # Sadece kripto sinyalleri - GERÇEK CACHE DATA
-                response = self.get_crypto_signals_optimized()
-                
-            elif path == '/prices':
-                # Market verileri (forex fiyatları)
-                response = self.get_market_data()
-                
-            elif path == '/crypto/prices':
-                # Kripto fiyatları
-                response = self.get_crypto_prices()
+            if self.binance_provider and self.crypto_strategies:
+                crypto_prices = self.binance_provider.get_crypto_prices()
                 
-            elif path == '/statistics':
-                # Trade istatistikleri - COMPLETED TRADES HISTORY ile
-                total_trades = len(COMPLETED_TRADES_HISTORY)
-                winning_trades = len([t for t in COMPLETED_TRADES_HISTORY if t['result'] == 'TP_HIT'])
-                win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
+                # Analiz edilecek crypto sembollerini seç
+                analysis_prices = {}
+                for symbol, price_data in crypto_prices.items():
+                    
+                    # ❌ MOCK DATA REDDEDİLİR
+                    if price_data.get('source') == 'fallback':
+                        print(f"❌ {symbol} MOCK DATA reddedildi - sadece gerçek veri")
+                        continue
+                    
+                    # 🚫 BU SYMBOL İÇİN AKTİF TRADE VAR MI KONTROL ET
+                    if self.has_active_trade_for_symbol(symbol):
+                        print(f"⏳ {symbol} - Aktif trade var, yeni signal aranmıyor")
+                        continue
+                    
+                    analysis_prices[symbol] = price_data['price']
                 
-                response = {
-                    'win_rate': round(win_rate, 1),
-                    'total_trades': total_trades,
-                    'winning_trades': winning_trades,
-                    'losing_trades': len([t for t in COMPLETED_TRADES_HISTORY if t['result'] == 'SL_HIT']),
-                    'total_pips': sum([t.get('pips_earned', 0) for t in COMPLETED_TRADES_HISTORY]),
-                    'active_signals': len(ACTIVE_SIGNALS_CACHE),
-                    'recent_history': COMPLETED_TRADES_HISTORY[-10:],  # Son 10 trade
-                    'data_source': 'real_tracking',
-                    'timestamp': datetime.now().isoformat()
-                }
+                # TÜM semboller tek seferde - paralel I/O + paralel hesap, sembol başına timeout
+                print(f"🔍 {len(analysis_prices)} crypto sembol paralel analiz ediliyor...")
+                crypto_results = self.crypto_strategies.analyze_symbols(analysis_prices)
                 
-            else:
-                response = {'error': 'Endpoint not found'}
-                
-            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
-            
+                for symbol, symbol_signals in crypto_results.items():
+                    try:
+                        for signal in symbol_signals:
+                            # GÜVENİLİRLİK SKORU KONTROL ET - 6'dan yüksek olmalı
+                            reliability_score = signal.get('reliability_score', 0)
+                            if reliability_score > 6:
+                                
+                                signal_id = f"CRYPTO_{symbol}_{int(current_time)}"
+                                signal['signal_id'] = signal_id
+                                signal['asset_type'] = 'crypto'
+                                signal['data_source'] = 'binance'
+                                signal['creation_time'] = datetime.now().isoformat()
+                                signal['status'] = 'ACTIVE'
+                                
+                                # SABİT DEĞERLER
+                                signal['fixed_entry'] = signal['ideal_entry']
+                                signal['fixed_tp'] = signal['take_profit'] 
+                                signal['fixed_sl'] = signal['stop_loss']
+                                signal['fixed_strategy'] = signal['strategy']
+                                signal['fixed_signal_type'] = signal['signal_type']
+                                signal['fixed_reliability'] = signal['reliability_score']
+                                
+                                # FRONTEND UYUMLULUK İÇİN NORMAL FIELD'LAR DA EKLE
+                                signal['entry_price'] = signal['ideal_entry']
+                                signal['stop_loss'] = signal['stop_loss']  # Zaten var ama emin ol
+                                signal['take_profit'] = signal['take_profit']  # Zaten var ama emin ol
+                                signal['reliability_score'] = signal['reliability_score']  # Zaten var ama emin ol
+                                signal['signal_type'] = signal['signal_type']  # Zaten var ama emin ol
+                                
+                                new_signals[signal_id] = signal
+                                
+                                print(f"✅ {symbol} sinyali eklendi - Güvenilirlik: {reliability_score}")
+                            else:
+                                print(f"❌ {symbol} sinyali reddedildi - Güvenilirlik: {reliability_score} < 6")
+                        
+                        total_symbols_processed += 1
+                        
+                    except Exception as e:
+                        print(f"❌ {symbol} analiz hatası: {e}")
+                        continue
+                        
         except Exception as e:
-            print(f"❌ Request hatası: {e}")
-            error_response = {'error': str(e)}
-            self.wfile.write(json.dumps(error_response).encode('utf-8'))
-    
-    def generate_new_signals_if_needed(self):
-        """Sadece gerektiğinde yeni sinyal üret - ENTRY/TP/SL SABİT KALSIN + FTMO LOT CALCULATOR"""
-        global ACTIVE_SIGNALS_CACHE, LAST_SIGNAL_GENERATION
-        
-        current_time = time.time()
+            print(f"❌ Crypto signal generation error: {e}")
         
-        # 5 dakikada bir yeni sinyal üret (cache boş kontrolü kaldırıldı)
-        if (current_time - LAST_SIGNAL_GENERATION > SIGNAL_GENERATION_INTERVAL):
-            
-            print(f"🔄 Optimize edilmiş sinyal üretimi başlıyor (NO MOCK DATA)...")
-            
-            # YENİ SİNYALLER ÜRET - TÜM SEMBOLLER İŞLENECEK
-            new_signals = {}
-            total_symbols_processed = 0
-            
-            # CRYPTO SİNYALLERİ - SINIRLI
-            try:
-                if self.binance_provider and self.crypto_strategies:
-                    crypto_prices = self.binance_provider.get_crypto_prices()
+        # FOREX SİNYALLERİ - SINIRLI
+        try:
+            if self.forex_provider and self.forex_strategies:
+                forex_prices = self.forex_provider.get_forex_prices()
+                
+                # TÜM forex sembollerini işle
+                for symbol, price_data in forex_prices.items():
+                    
+                    # ❌ MOCK DATA REDDEDİLİR
+                    if price_data.get('source') == 'fallback':
+                        print(f"❌ {symbol} MOCK DATA reddedildi - sadece gerçek veri")
+                        continue
                     
-                    # TÜM crypto sembollerini işle
-                    for symbol, price_data in crypto_prices.items():
+                    # 🚫 BU SYMBOL İÇİN AKTİF TRADE VAR MI KONTROL ET
+                    if self.has_active_trade_for_symbol(symbol):
+                        print(f"⏳ {symbol} - Aktif trade var, yeni signal aranmıyor")
+                        continue
+                    
+                    try:
+                        current_price = price_data['price']
                         
-                        # ❌ MOCK DATA REDDEDİLİR
-                        if price_data.get('source') == 'fallback':
-                            print(f"❌ {symbol} MOCK DATA reddedildi - sadece gerçek veri")
-                            continue
+                        print(f"🔍 {symbol} analiz ediliyor...")
                         
-                        # 🚫 BU SYMBOL İÇİN AKTİF TRADE VAR MI KONTROL ET
-                        if self.has_active_trade_for_symbol(symbol):
-                            print(f"⏳ {symbol} - Aktif trade var, yeni signal aranmıyor")
-                            continue
-                            
-                        try:
-                            current_price = price_data['price']
-                            
-                            print(f"🔍 {symbol} analiz ediliyor...")
-                            
-                            # Timeout ile analiz yap (10 saniye max)
-                            import signal as signal_module
-                            
-                            def timeout_handler(signum, frame):
-                                raise TimeoutError("Analiz timeout")
-                            
-                            # Windows'ta signal.alarm desteklenmediği için farklı yaklaşım
-                            symbol_signals = self.crypto_strategies.analyze_symbol(symbol, current_price)
-                            
-                            for signal in symbol_signals:
-                                # GÜVENİLİRLİK SKORU KONTROL ET - 6'dan yüksek olmalı
-                                reliability_score = signal.get('reliability_score', 0)
-                                if reliability_score > 6:
-                                    
-                                    signal_id = f"CRYPTO_{symbol}_{int(current_time)}"
-                                    signal['signal_id'] = signal_id
-                                    signal['asset_type'] = 'crypto'
-                                    signal['data_source'] = 'binance'
-                                    signal['creation_time'] = datetime.now().isoformat()
-                                    signal['status'] = 'ACTIVE'
-                                    
-                                    # SABİT DEĞERLER
-                                    signal['fixed_entry'] = signal['ideal_entry']
-                                    signal['fixed_tp'] = signal['take_profit'] 
-                                    signal['fixed_sl'] = signal['stop_loss']
-                                    signal['fixed_strategy'] = signal['strategy']
-                                    signal['fixed_signal_type'] = signal['signal_type']
-                                    signal['fixed_reliability'] = signal['reliability_score']
-                                    
-                                    # FRONTEND UYUMLULUK İÇİN NORMAL FIELD'LAR DA EKLE
-                                    signal['entry_price'] = signal['ideal_entry']
-                                    signal['stop_loss'] = signal['stop_loss']  # Zaten var ama emin ol
-                                    signal['take_profit'] = signal['take_profit']  # Zaten var ama emin ol
-                                    signal['reliability_score'] = signal['reliability_score']  # Zaten var ama emin ol
-                                    signal['signal_type'] = signal['signal_type']  # Zaten var ama emin ol
-                                    
-                                    new_signals[signal_id] = signal
-                                    
-                                    # Symbol'u aktif trade tracking'e ekle
-                                    ACTIVE_TRADES_BY_SYMBOL[symbol] = {
-                                        'signal_id': signal_id,
-                                        'entry_time': datetime.now().isoformat(),
-                                        'status': 'ACTIVE'
-                                    }
-                                    
-                                    print(f"✅ {symbol} sinyali eklendi - Güvenilirlik: {reliability_score}")
-                                    print(f"🔒 {symbol} aktif trade tracking'e eklendi")
-                                else:
-                                    print(f"❌ {symbol} sinyali reddedildi - Güvenilirlik: {reliability_score} < 6")
-                            
-                            total_symbols_processed += 1
-                            
-                        except Exception as e:
-                            print(f"❌ {symbol} analiz hatası: {e}")
-                            continue
-                            
-            except Exception as e:
-                print(f"❌ Crypto signal generation error: {e}")
-            
-            # FOREX SİNYALLERİ - SINIRLI
-            try:
-                if self.forex_provider and self.forex_strategies:
-                    forex_prices = self.forex_provider.get_forex_prices()
-                    
-                    # TÜM forex sembollerini işle
-                    for symbol, price_data in forex_prices.items():
+                        symbol_signals = self.forex_strategies.analyze_symbol(symbol, current_price)
                         
-                        # ❌ MOCK DATA REDDEDİLİR
-                        if price_data.get('source') == 'fallback':
-                            print(f"❌ {symbol} MOCK DATA reddedildi - sadece gerçek veri")
-                            continue
+                        for signal in symbol_signals:
+                            # GÜVENİLİRLİK SKORU KONTROL ET  
+                            reliability_score = signal.get('reliability_score', 0)
+                            if reliability_score > 6:
+                                
+                                signal_id = f"FOREX_{symbol}_{int(current_time)}"
+                                signal['signal_id'] = signal_id
+                                signal['asset_type'] = 'forex'
+                                signal['data_source'] = 'exchangerate-api'
+                                signal['creation_time'] = datetime.now().isoformat()
+                                signal['status'] = 'ACTIVE'
+                                
+                                # SABİT DEĞERLER
+                                signal['fixed_entry'] = signal['ideal_entry']
+                                signal['fixed_tp'] = signal['take_profit']
+                                signal['fixed_sl'] = signal['stop_loss'] 
+                                signal['fixed_strategy'] = signal['strategy']
+                                signal['fixed_signal_type'] = signal['signal_type']
+                                signal['fixed_reliability'] = signal['reliability_score']
+                                
+                                # FRONTEND UYUMLULUK İÇİN NORMAL FIELD'LAR DA EKLE
+                                signal['entry_price'] = signal['ideal_entry']
+                                signal['stop_loss'] = signal['stop_loss']  # Zaten var ama emin ol
+                                signal['take_profit'] = signal['take_profit']  # Zaten var ama emin ol
+                                signal['reliability_score'] = signal['reliability_score']  # Zaten var ama emin ol
+                                signal['signal_type'] = signal['signal_type']  # Zaten var ama emin ol
+                                
+                                new_signals[signal_id] = signal
+                                
+                                print(f"✅ {symbol} sinyali eklendi - Güvenilirlik: {reliability_score}")
+                            else:
+                                print(f"❌ {symbol} sinyali reddedildi - Güvenilirlik: {reliability_score} < 6")
                         
-                        # 🚫 BU SYMBOL İÇİN AKTİF TRADE VAR MI KONTROL ET
-                        if self.has_active_trade_for_symbol(symbol):
-                            print(f"⏳ {symbol} - Aktif trade var, yeni signal aranmıyor")
-                            continue
+                    except Exception as e:
+                        print(f"❌ {symbol} analiz hatası: {e}")
+                        continue
                         
-                        try:
-                            current_price = price_data['price']
-                            
-                            print(f"🔍 {symbol} analiz ediliyor...")
-                            
-                            symbol_signals = self.forex_strategies.analyze_symbol(symbol, current_price)
-                            
-                            for signal in symbol_signals:
-                                # GÜVENİLİRLİK SKORU KONTROL ET  
-                                reliability_score = signal.get('reliability_score', 0)
-                                if reliability_score > 6:
-                                    
-                                    signal_id = f"FOREX_{symbol}_{int(current_time)}"
-                                    signal['signal_id'] = signal_id
-                                    signal['asset_type'] = 'forex'
-                                    signal['data_source'] = 'exchangerate-api'
-                                    signal['creation_time'] = datetime.now().isoformat()
-                                    signal['status'] = 'ACTIVE'
-                                    
-                                    # SABİT DEĞERLER
-                                    signal['fixed_entry'] = signal['ideal_entry']
-                                    signal['fixed_tp'] = signal['take_profit']
-                                    signal['fixed_sl'] = signal['stop_loss'] 
-                                    signal['fixed_strategy'] = signal['strategy']
-                                    signal['fixed_signal_type'] = signal['signal_type']
-                                    signal['fixed_reliability'] = signal['reliability_score']
-                                    
-                                    # FRONTEND UYUMLULUK İÇİN NORMAL FIELD'LAR DA EKLE
-                                    signal['entry_price'] = signal['ideal_entry']
-                                    signal['stop_loss'] = signal['stop_loss']  # Zaten var ama emin ol
-                                    signal['take_profit'] = signal['take_profit']  # Zaten var ama emin ol
-                                    signal['reliability_score'] = signal['reliability_score']  # Zaten var ama emin ol
-                                    signal['signal_type'] = signal['signal_type']  # Zaten var ama emin ol
-                                    
-                                    new_signals[signal_id] = signal
-                                    
-                                    # Symbol'u aktif trade tracking'e ekle
-                                    ACTIVE_TRADES_BY_SYMBOL[symbol] = {
-                                        'signal_id': signal_id,
-                                        'entry_time': datetime.now().isoformat(),
-                                        'status': 'ACTIVE'
-                                    }
-                                    
-                                    print(f"✅ {symbol} sinyali eklendi - Güvenilirlik: {reliability_score}")
-                                    print(f"🔒 {symbol} aktif trade tracking'e eklendi")
-                                else:
-                                    print(f"❌ {symbol} sinyali reddedildi - Güvenilirlik: {reliability_score} < 6")
-                            
-                        except Exception as e:
-                            print(f"❌ {symbol} analiz hatası: {e}")
-                            continue
-                            
-            except Exception as e:
-                print(f"❌ Forex signal generation error: {e}")
-            
-            # Cache'i güncelle - ESKİ SİNYALLERİ KORU
-            for signal_id, signal in new_signals.items():
-                ACTIVE_SIGNALS_CACHE[signal_id] = signal
-            
-            # Maksimum 10 aktif sinyal tut
-            if len(ACTIVE_SIGNALS_CACHE) > 10:
-                # En eski sinyalleri sil
-                sorted_signals = sorted(ACTIVE_SIGNALS_CACHE.items(), 
-                                      key=lambda x: x[1].get('creation_time', ''), 
-                                      reverse=True)
-                ACTIVE_SIGNALS_CACHE = dict(sorted_signals[:10])
-            
-            LAST_SIGNAL_GENERATION = current_time
-            print(f"✅ {len(new_signals)} yeni sinyal üretildi. Toplam aktif: {len(ACTIVE_SIGNALS_CACHE)}. İşlenen sembol: {total_symbols_processed}")
-            print(f"🚫 Mock data reddedildi - Sadece gerçek API verileri kullanıldı")
+        except Exception as e:
+            print(f"❌ Forex signal generation error: {e}")
+        
+        # Depoyu güncelle - ESKİ SİNYALLERİ KORU, maksimum 10 aktif sinyal (en eskiler atılır)
+        SIGNAL_STORE.add_many(new_signals)
+        
+        LAST_SIGNAL_GENERATION = current_time
+        print(f"✅ {len(new_signals)} yeni sinyal üretildi. Toplam aktif: {len(SIGNAL_STORE)}. İşlenen sembol: {total_symbols_processed}")
+        print(f"🚫 Mock data reddedildi - Sadece gerçek API verileri kullanıldı")
 
     def update_current_prices_only(self):
         """Sadece güncel fiyatları güncelle - ENTRY/TP/SL DOKUNAMİYORUZ"""
-        global ACTIVE_SIGNALS_CACHE
-        
         completed_trades = []  # Sonuçlanan trade'ler
         
         try:
@@ -505,63 +486,57 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
             if self.binance_provider:
                 crypto_prices = self.binance_provider.get_crypto_prices()
                 
-                for signal_id, signal in list(ACTIVE_SIGNALS_CACHE.items()):
-                    if signal['asset_type'] == 'crypto':
-                        symbol = signal['symbol']
-                        if symbol in crypto_prices:
-                            current_price = crypto_prices[symbol]['price']
-                            
-                            # SADECE GÜNCEL FİYAT DEĞİŞİR
-                            signal['current_price'] = current_price
-                            signal['price_update_time'] = datetime.now().isoformat()
+                for signal_id, signal in SIGNAL_STORE.find(asset_type='crypto'):
+                    symbol = signal['symbol']
+                    if symbol in crypto_prices:
+                        current_price = crypto_prices[symbol]['price']
+                        
+                        # SADECE GÜNCEL FİYAT DEĞİŞİR - fiyat aynıysa sinyal ve snapshot sürümü değişmez
+                        signal = SIGNAL_STORE.update_price(signal_id, current_price, datetime.now().isoformat())
+                        if signal is None:
+                            continue  # Bu arada sonuçlandı
+                        
+                        # TP/SL KONTROLÜ - TRADE SONUÇLANMA
+                        trade_result = self.check_trade_completion(signal, current_price)
+                        if trade_result:
+                            completed_trades.append(trade_result)
                             
-                            # TP/SL KONTROLÜ - TRADE SONUÇLANMA
-                            trade_result = self.check_trade_completion(signal, current_price)
-                            if trade_result:
-                                completed_trades.append(trade_result)
-                                
-                                # 🎯 TRADE COMPLETION + SYMBOL TRACKING TEMİZLE
-                                self.mark_trade_completed(
-                                    signal, 
-                                    trade_result['result_type'],
-                                    current_price,
-                                    trade_result.get('pip_gain', trade_result.get('pip_loss', 0))
-                                )
-                                
-                                # Cache'den sil - trade sonuçlandı
-                                del ACTIVE_SIGNALS_CACHE[signal_id]
-                                print(f"✅ Trade sonuçlandı: {symbol} - {trade_result['result']}")
+                            # 🎯 TRADE COMPLETION - depodan da silinir
+                            self.mark_trade_completed(
+                                signal, 
+                                trade_result['result_type'],
+                                current_price,
+                                trade_result.get('pip_gain', trade_result.get('pip_loss', 0))
+                            )
+                            print(f"✅ Trade sonuçlandı: {symbol} - {trade_result['result']}")
             
             # Forex fiyatları güncelle  
             if self.forex_provider:
                 forex_prices = self.forex_provider.get_forex_prices()
                 
-                for signal_id, signal in list(ACTIVE_SIGNALS_CACHE.items()):
-                    if signal['asset_type'] == 'forex':
-                        symbol = signal['symbol']
-                        if symbol in forex_prices:
-                            current_price = forex_prices[symbol]['price']
-                            
-                            # SADECE GÜNCEL FİYAT DEĞİŞİR
-                            signal['current_price'] = current_price
-                            signal['price_update_time'] = datetime.now().isoformat()
+                for signal_id, signal in SIGNAL_STORE.find(asset_type='forex'):
+                    symbol = signal['symbol']
+                    if symbol in forex_prices:
+                        current_price = forex_prices[symbol]['price']
+                        
+                        # SADECE GÜNCEL FİYAT DEĞİŞİR - fiyat aynıysa sinyal ve snapshot sürümü değişmez
+                        signal = SIGNAL_STORE.update_price(signal_id, current_price, datetime.now().isoformat())
+                        if signal is None:
+                            continue  # Bu arada sonuçlandı
+                        
+                        # TP/SL KONTROLÜ - TRADE SONUÇLANMA
+                        trade_result = self.check_trade_completion(signal, current_price)
+                        if trade_result:
+                            completed_trades.append(trade_result)
                             
-                            # TP/SL KONTROLÜ - TRADE SONUÇLANMA
-                            trade_result = self.check_trade_completion(signal, current_price)
-                            if trade_result:
-                                completed_trades.append(trade_result)
-                                
-                                # 🎯 TRADE COMPLETION + SYMBOL TRACKING TEMİZLE
-                                self.mark_trade_completed(
-                                    signal, 
-                                    trade_result['result_type'],
-                                    current_price,
-                                    trade_result.get('pip_gain', trade_result.get('pip_loss', 0))
-                                )
-                                
-                                # Cache'den sil - trade sonuçlandı
-                                del ACTIVE_SIGNALS_CACHE[signal_id]
-                                print(f"✅ Trade sonuçlandı: {symbol} - {trade_result['result']}")
+                            # 🎯 TRADE COMPLETION - depodan da silinir
+                            self.mark_trade_completed(
+                                signal, 
+                                trade_result['result_type'],
+                                current_price,
+                                trade_result.get('pip_gain', trade_result.get('pip_loss', 0))
+                            )
+                            print(f"✅ Trade sonuçlandı: {symbol} - {trade_result['result']}")
             
             # Sonuçlanan trade'leri kaydet
             if completed_trades and self.trade_monitor:
@@ -669,20 +644,161 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
         
         # Henüz sonuçlanmadı
         return None
+
+
+class TradingSignalHandler(BaseHTTPRequestHandler):
+    def setup(self):
+        # Bileşenler süreç başında bir kez kurulur - istek başına yeniden kurulum yok
+        super().setup()
+        (getattr(self.server, 'context', None) or get_app_context()).bind(self)
+    
+    def do_OPTIONS(self):
+        """CORS pre-flight requests"""
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+    
+    def do_GET(self):
+        """
+        GET requests handler
+        Sürümlü endpoint'ler RESPONSE_CACHE'ten: snapshot değişmediyse json.dumps yok, ETag eşleşirse 304
+        """
+        path = urlparse(self.path).path
+        query_params = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+        encoded = None
+        
+        try:
+            if path == '/' or path == '':
+                # Ana sayfa - API durumu
+                response = {
+                    'status': 'Trading Signal Server Running',
+                    'version': '2.0',
+                    'endpoints': [
+                        '/signals - Tüm sinyaller',
+                        '/signals?since=<version> - Sinyal değişiklikleri (delta)',
+                        '/crypto/signals - Kripto sinyalleri', 
+                        '/prices - Forex fiyatları',
+                        '/crypto/prices - Kripto fiyatları',
+                        '/statistics - Trade istatistikleri',
+                        '/statistics?since=<history_version> - Yeni kapanan trade\'ler (delta)',
+                        '/scheduler - Sinyal zamanlayıcı durumu',
+                        '/stream - Canlı olaylar (SSE)'
+                    ],
+                    'data_sources': {
+                        'crypto': 'Binance API',
+                        'forex': 'ExchangeRate API'
+                    },
+                    'strategies': ['KRO (Breakout+Retest)', 'LMO (Liquidity+Momentum)'],
+                    'features': ['Real Data Only', 'No Mock Data'],
+                    'timestamp': datetime.now().isoformat()
+                }
+                
+            elif path == '/signals' and 'since' in query_params:
+                # Delta: since sürümünden sonra değişen sinyaller (değişiklik yoksa boş listeler)
+                since = self.read_since(query_params)
+                if since is None:
+                    return
+                response = build_signal_delta(get_signal_snapshot(), since)
+                
+            elif path == '/signals':
+                # Ana signals endpoint - tam senkron ile aynı yapı, snapshot sürümü başına bir kez kodlanır
+                snapshot = get_signal_snapshot()
+                encoded = RESPONSE_CACHE.get('/signals', snapshot.version, lambda: build_signal_list(snapshot))
+                
+            elif path == '/crypto/signals':
+                # Sadece kripto sinyalleri - GERÇEK CACHE DATA
+                encoded = RESPONSE_CACHE.get('/crypto/signals', get_signal_snapshot().version,
+                                             self.get_crypto_signals_optimized)
+                
+            elif path == '/prices':
+                # Market verileri (forex fiyatları) - sağlayıcının fiyat sürümü değişince yeniden kodlanır
+                encoded = RESPONSE_CACHE.get('/prices', price_cache_version(self.forex_provider),
+                                             self.get_market_data)
+                
+            elif path == '/crypto/prices':
+                # Kripto fiyatları
+                encoded = RESPONSE_CACHE.get('/crypto/prices', price_cache_version(self.binance_provider),
+                                             self.get_crypto_prices)
+                
+            elif path == '/statistics' and 'since' in query_params:
+                # Delta: history_version'dan sonra kapanan trade'ler
+                since = self.read_since(query_params)
+                if since is None:
+                    return
+                statistics = get_signal_snapshot().extra.get('statistics') or build_trade_statistics()
+                response = build_statistics_delta(statistics, since)
+                
+            elif path == '/statistics':
+                # Trade istatistikleri - zamanlayıcının yayınladığı snapshot'tan
+                snapshot = get_signal_snapshot()
+                encoded = RESPONSE_CACHE.get('/statistics', snapshot.version,
+                                             lambda: self.get_snapshot_statistics(snapshot))
+                
+            elif path == '/stream':
+                # SSE: başlıklar yazılır, soket yayıncının yazıcı thread'ine devredilir
+                self.open_event_stream()
+                return
+                
+            elif path == '/scheduler':
+                # Sinyal zamanlayıcısı durumu
+                response = SIGNAL_SCHEDULER.get_status() if SIGNAL_SCHEDULER else {'running': False}
+                
+            else:
+                response = {'error': 'Endpoint not found'}
+            
+            RESPONSE_CACHE.send(self, encoded or EncodedResponse(response), CORS_HEADERS)
+            
+        except Exception as e:
+            print(f"❌ Request hatası: {e}")
+            error_response = {'error': str(e)}
+            RESPONSE_CACHE.send(self, EncodedResponse(error_response), CORS_HEADERS)
+    
+    def read_since(self, query_params):
+        """?since= değeri - tamsayı değilse 400 gönderilir ve None döner"""
+        value = query_params['since'][0]
+        try:
+            return int(value)
+        except ValueError:
+            error_response = {'error': f"since bir tamsayı olmalı: {value!r}"}
+            RESPONSE_CACHE.send(self, EncodedResponse(error_response), CORS_HEADERS, status=400)
+            return None
+    
+    def open_event_stream(self):
+        """/stream - istemci sınırı doluysa 503, aksi halde bağlantı EVENT_BROADCASTER'a geçer"""
+        if EVENT_BROADCASTER.client_count() >= EVENT_BROADCASTER.max_clients:
+            self.send_response(503)
+            self.send_header('Retry-After', '30')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        for name, value in dict(SSE_HEADERS, **CORS_HEADERS).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.flush()
+        
+        self.close_connection = True
+        self.detached = EVENT_BROADCASTER.add_client(self.connection, self.client_address)
+    
+    def get_snapshot_statistics(self, snapshot):
+        """Zamanlayıcının yayınladığı istatistikler + zaman damgası"""
+        response = dict(snapshot.extra.get('statistics') or build_trade_statistics())
+        response['timestamp'] = datetime.now().isoformat()
+        return response
     
     def get_real_signals(self):
         """SABİT sinyalleri döndür - Entry/TP/SL asla değişmez"""
         
-        # 1. Gerekirse yeni sinyal üret
-        self.generate_new_signals_if_needed()
-        
-        # 2. Sadece current price'ları güncelle
-        self.update_current_prices_only()
+        # Üretim ve fiyat güncelleme SignalScheduler'da - burada sadece snapshot okunur
+        snapshot = get_signal_snapshot()
+        scheduler_status = SIGNAL_SCHEDULER.get_status() if SIGNAL_SCHEDULER else {}
         
-        # 3. Aktif sinyalleri döndür
         active_signals = []
         
-        for signal_id, signal in ACTIVE_SIGNALS_CACHE.items():
+        for signal_id, signal in snapshot.signals.items():
             # Frontend için uygun format + FTMO LOT BILGILERI
             formatted_signal = {
                 'signal_id': signal_id,
@@ -724,7 +840,9 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
             'total_count': len(active_signals),
             'cache_info': {
                 'last_generation': datetime.fromtimestamp(LAST_SIGNAL_GENERATION).isoformat(),
-                'next_generation_in': max(0, SIGNAL_GENERATION_INTERVAL - (time.time() - LAST_SIGNAL_GENERATION)),
+                'next_generation_in': scheduler_status.get('next_run_in', max(0, SIGNAL_GENERATION_INTERVAL - (time.time() - LAST_SIGNAL_GENERATION))),
+                'last_generation_duration': scheduler_status.get('last_run_duration'),
+                'snapshot_version': snapshot.version,
                 'fixed_signals': True,
                 'only_prices_update': True
             },
@@ -733,12 +851,8 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
         }
 
     def get_crypto_signals(self):
-        """Crypto sinyalleri - cache'den al"""
-        self.generate_new_signals_if_needed()
-        self.update_current_prices_only()
-        
-        crypto_signals = [signal for signal in ACTIVE_SIGNALS_CACHE.values() 
-                         if signal['asset_type'] == 'crypto']
+        """Crypto sinyalleri - snapshot'tan al"""
+        crypto_signals = get_signal_snapshot().signal_list('crypto')
         
         return {
             'signals': crypto_signals,
@@ -748,12 +862,8 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
         }
     
     def get_forex_signals(self):
-        """Forex sinyalleri - cache'den al"""
-        self.generate_new_signals_if_needed() 
-        self.update_current_prices_only()
-        
-        forex_signals = [signal for signal in ACTIVE_SIGNALS_CACHE.values()
-                        if signal['asset_type'] == 'forex']
+        """Forex sinyalleri - snapshot'tan al"""
+        forex_signals = get_signal_snapshot().signal_list('forex')
         
         return {
             'signals': forex_signals,
@@ -805,88 +915,16 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
     
     def get_market_data(self):
         """Market verilerini döndür (Forex fiyatları) - Frontend formatında"""
-        try:
-            if self.forex_provider:
-                forex_data = self.forex_provider.get_forex_prices()
-                
-                # Veri kontrol et
-                if forex_data and len(forex_data) > 0:
-                    return {
-                        'prices': forex_data,
-                        'last_update': datetime.now().isoformat(),
-                        'api_status': 'live',
-                        'data_source': 'exchangerate-api'
-                    }
-                else:
-                    print("⚠️ Forex provider veri dönmedi, fallback kullanılıyor")
-                    # Fallback'e geç
-                    fallback_prices = self._get_emergency_fallback_prices()
-                    return {
-                        'prices': fallback_prices,
-                        'last_update': datetime.now().isoformat(),
-                        'api_status': 'fallback',
-                        'data_source': 'fallback'
-                    }
-            else:
-                # Fallback data
-                fallback_prices = self._get_emergency_fallback_prices()
-                return {
-                    'prices': fallback_prices,
-                    'last_update': datetime.now().isoformat(),
-                    'api_status': 'fallback',
-                    'data_source': 'fallback'
-                }
-                
-        except Exception as e:
-            print(f"❌ Market data error: {e}")
-            import traceback
-            print(f"❌ Market data traceback: {traceback.format_exc()}")
-            return {
-                'error': str(e),
-                'api_status': 'error',
-                'fallback_prices': self._get_emergency_fallback_prices()
-            }
+        return build_market_data_response(self.forex_provider)
     
     def get_crypto_prices(self):
         """Kripto fiyatları ve durum bilgisi"""
-        try:
-            if self.binance_provider:
-                crypto_prices = self.binance_provider.get_crypto_prices()
-                
-                return {
-                    'prices': crypto_prices,
-                    'api_status': 'live',  # Gerçek API'den geldiği için live
-                    'source': 'binance',
-                    'timestamp': datetime.now().isoformat(),
-                    'count': len(crypto_prices)
-                }
-            else:
-                return {
-                    'prices': {},
-                    'api_status': 'error',
-                    'source': 'none',
-                    'timestamp': datetime.now().isoformat(),
-                    'count': 0
-                }
-        except Exception as e:
-            print(f"❌ Crypto prices hatası: {e}")
-            return {
-                'prices': {},
-                'api_status': 'error',
-                'source': 'error',
-                'timestamp': datetime.now().isoformat(),
-                'count': 0
-            }
-
+        return build_crypto_prices_response(self.binance_provider)
+    
     def _get_emergency_fallback_prices(self):
         """❌ EMERGENCY FALLBACK DEVRE DIŞI - GERÇEK VERİ YOKSA HİÇ VERİ YOK"""
-        # Mock data yerine boş response döndür
-        return {
-            'error': 'No real market data available',
-            'source': 'no_emergency_fallback',
-            'timestamp': datetime.now().isoformat()
-        }
-
+        return build_emergency_fallback_prices()
+    
     def log_message(self, format, *args):
         """Reduced logging"""
         if 'GET /signals' in format % args:
@@ -896,17 +934,13 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
 
     def get_real_signals_optimized(self):
         """Gerçek verilerle optimize edilmiş sinyal üretimi"""
-        # Önce cache'den kontrol et
-        self.generate_new_signals_if_needed()
-        self.update_current_prices_only()
-        
         # ❌ Test signals devre dışı - false data önlenmesi
         # add_test_signals_to_cache()  # DEVRE DIŞI
         
         all_signals = []
         
-        # Cache'den aktif sinyalleri al
-        for signal_id, signal in ACTIVE_SIGNALS_CACHE.items():
+        # Snapshot'tan aktif sinyalleri al
+        for signal in get_signal_snapshot().signal_list():
             # Güvenilirlik skoru 6'dan yüksek olanları filtrele
             if signal.get('fixed_reliability', 0) > 6:
                 all_signals.append(signal)
@@ -922,17 +956,13 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
     
     def get_crypto_signals_optimized(self):
         """Gerçek verilerle optimize edilmiş kripto sinyalleri"""
-        # Önce cache'den kontrol et
-        self.generate_new_signals_if_needed()
-        self.update_current_prices_only()
-        
         # ❌ Test signals devre dışı - false data önlenmesi
         # add_test_signals_to_cache()  # DEVRE DIŞI
         
         crypto_signals = []
         
-        # Cache'den sadece crypto sinyalleri al
-        for signal_id, signal in ACTIVE_SIGNALS_CACHE.items():
+        # Snapshot'tan sadece crypto sinyalleri al
+        for signal in get_signal_snapshot().signal_list('crypto'):
             if (signal.get('asset_type') == 'crypto' and 
                 signal.get('fixed_reliability', 0) > 6):
                 crypto_signals.append(signal)
@@ -957,8 +987,6 @@ class TradingSignalHandler(BaseHTTPRequestHandler):
 
 def add_test_signals_to_cache():
     """Test amaçlı signal'ları cache'e ekle - DEVRE DIŞI (False data önlenmesi)"""
-    global ACTIVE_SIGNALS_CACHE
-    
     # ❌ TEST SIGNALS DEVRE DIŞI - FALSE DATA YARATMASIN
     return
     
@@ -1041,21 +1069,23 @@ def add_test_signals_to_cache():
     }
     
     # Cache'e ekle
-    for signal_id, signal in test_signals.items():
-        ACTIVE_SIGNALS_CACHE[signal_id] = signal
+    SIGNAL_STORE.add_many(test_signals)
         
     print(f"🎯 {len(test_signals)} test sinyali cache'e eklendi!")
 
 def start_server():
     """Server'ı başlat"""
+    global SIGNAL_SCHEDULER
+    
+    # Provider / strateji / trade monitor bir kez kurulur - handler'lar bu bağlamı paylaşır
+    context = get_app_context()
     
     # Providers'ı test et
     print("\n🔄 Providers test ediliyor...")
     
     try:
-        if get_forex_provider:
-            forex_provider = get_forex_provider()
-            forex_test = forex_provider.get_forex_prices()
+        if context.forex_provider:
+            forex_test = context.forex_provider.get_forex_prices()
             print(f"✅ Forex: {len(forex_test)} parite")
         else:
             print("❌ Forex provider yok")
@@ -1063,9 +1093,8 @@ def start_server():
         print(f"❌ Forex test hatası: {e}")
     
     try:
-        if get_binance_provider:
-            binance_provider = get_binance_provider()
-            crypto_test = binance_provider.get_crypto_prices()
+        if context.binance_provider:
+            crypto_test = context.binance_provider.get_crypto_prices()
             print(f"✅ Binance: {len(crypto_test)} crypto")
         else:
             print("❌ Binance provider yok")
@@ -1074,25 +1103,83 @@ def start_server():
     
     # Trade monitor'ı başlat
     try:
-        if get_trade_monitor:
-            trade_monitor = get_trade_monitor()
-            trade_monitor.start_monitoring()
+        if context.trade_monitor:
+            context.trade_monitor.start_monitoring()
             print("✅ Trade monitor başlatıldı")
     except Exception as e:
         print(f"❌ Trade monitor hatası: {e}")
     
+    # Sinyal motoru + arka plan zamanlayıcısı - HTTP istekleri sadece snapshot okur
+    engine_forex = context.forex_provider
+    engine_binance = context.binance_provider
+    
+    # Diskteki mum arşivi - yeniden başlatmada sadece son arşivlenmiş mumdan sonrası indirilir
+    if engine_binance:
+        try:
+            engine_binance.attach_archive(CandleArchive())
+            print(f"💾 Mum arşivi: {engine_binance.archive.directory}")
+        except OSError as e:
+            print(f"❌ Mum arşivi hatası: {e}")
+    
+    engine = SignalEngine(
+        forex_provider=engine_forex,
+        binance_provider=engine_binance,
+        crypto_strategies=context.crypto_strategies,
+        forex_strategies=context.forex_strategies,
+        trade_monitor=context.trade_monitor
+    )
+    SIGNAL_SCHEDULER = SignalScheduler(
+        generate_job=engine.generate_new_signals,
+        price_update_job=engine.update_current_prices_only,
+        snapshot_source=SIGNAL_STORE.snapshot,
+        generation_interval=SIGNAL_GENERATION_INTERVAL,
+        extra_source=lambda: {'statistics': build_trade_statistics()}
+    )
+    SIGNAL_SCHEDULER.on_publish(record_signal_deltas)
+    SIGNAL_SCHEDULER.on_publish(publish_snapshot_events)
+    SIGNAL_SCHEDULER.start()
+    
+    # /stream yayıncıları - fiyat snapshot'ı değişince olay (istemci yokken kaynak okunmaz)
+    EVENT_BROADCASTER.start()
+    price_version = lambda response: (response.get('api_status'), snapshot_version(response.get('prices') or {}))
+    publishers = [
+        PollingPublisher(EVENT_BROADCASTER, 'crypto_prices',
+                         lambda: build_crypto_prices_response(engine_binance), 1.0, price_version).start(),
+        PollingPublisher(EVENT_BROADCASTER, 'forex_prices',
+                         lambda: build_market_data_response(engine_forex), 5.0, price_version).start()
+    ]
+    
+    # Binance akışı (tek bağlantı): ticker okumaları bellekten, kline olayları mum deposuna
+    # REST sadece ilk doldurmada ve akış sağlıksızken kullanılır
+    price_stream = None
+    if PRICE_STREAM_AVAILABLE and engine_binance:
+        try:
+            intervals = [interval for interval, _ in engine.crypto_strategies.required_klines()] \
+                if engine.crypto_strategies else []
+            # 4h/1d/1w 15m serisinden türetilir - sadece baz interval akıştan
+            intervals = engine_binance.stream_intervals(intervals)
+            price_stream = BinanceKlineStreamer(engine_binance.candle_store, engine_binance.symbols, intervals).start()
+            engine_binance.attach_price_stream(price_stream)
+            print(f"✅ Binance akışı başlatıldı: {len(engine_binance.symbols)} sembol, kline {', '.join(intervals) or '-'}")
+        except Exception as e:
+            print(f"❌ Binance akış hatası: {e}")
+    
     # Server'ı başlat
     server_address = ('localhost', 8000)
-    httpd = HTTPServer(server_address, TradingSignalHandler)
+    httpd = PooledHTTPServer(server_address, TradingSignalHandler, context=context,
+                             workers=SERVER_WORKERS, request_timeout=SERVER_REQUEST_TIMEOUT)
     
-    print(f"\n🚀 Gerçek Veri Trading Server çalışıyor")
+    print(f"\n🚀 Gerçek Veri Trading Server çalışıyor ({SERVER_WORKERS} worker)")
     print(f"📍 http://localhost:8000")
     print(f"🔗 Endpoints:")
     print(f"   - /signals (tüm gerçek sinyaller)")
+    print(f"   - /signals?since=<version> (sadece değişen sinyaller)")
     print(f"   - /crypto-signals (Binance)")
     print(f"   - /forex-signals (ExchangeRate-API)")
     print(f"   - /trade-statistics")
     print(f"   - /market-data")
+    print(f"   - /scheduler (sinyal zamanlayıcı durumu)")
+    print(f"   - /stream (SSE - fiyat, sinyal, TP/SL, istatistik olayları)")
     print(f"\n⚡ KRO & LMO stratejileri gerçek verilerle aktif")
     print(f"🚫 Test signals devre dışı - sadece gerçek data")
     
@@ -1103,6 +1190,14 @@ def start_server():
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\n🛑 Server durduruldu")
+        SIGNAL_SCHEDULER.stop()
+        for publisher in publishers:
+            publisher.stop()
+        EVENT_BROADCASTER.stop()
+        if engine.crypto_strategies:
+            engine.crypto_strategies.shutdown()
+        if price_stream:
+            price_stream.stop_stream()
         httpd.server_close()
 
 if __name__ == '__main__':
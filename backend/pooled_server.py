@@ -0,0 +1,82 @@
+"""
+Worker Havuzlu HTTP Server
+Kabul döngüsü bağlantıyı alır, istek sabit boyutlu thread havuzunda işlenir:
+uzun bir /signals isteği veya yavaş bir istemci /crypto/prices'ı bloklamaz
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer
+from typing import Dict
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer + ThreadPoolExecutor
+    - workers: eşzamanlı işlenen istek sayısı (ThreadingMixIn gibi istek başına thread yok)
+    - request_timeout: okuma/yazmada takılan istemci worker'ı bu süreden fazla tutamaz
+    - context: handler'ların self.server.context ile eriştiği AppContext
+    - handler self.detached = True yaparsa soket kapatılmaz (ör. SSE bağlantısı yayıncıya devredildi)
+    """
+
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, context=None, workers: int = 16,
+                 request_timeout: float = 30):
+        self.context = context
+        self.workers = workers
+        self.request_timeout = request_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http-worker')
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.submitted = 0
+        self.active = 0
+        self.handled = 0
+        self.client_errors = 0  # Zaman aşımı / kopan istemci
+
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        """Kabul döngüsünde çağrılır - işleme havuza devredilir"""
+        request.settimeout(self.request_timeout)
+        with self._lock:
+            self.submitted += 1
+        self.executor.submit(self._process_in_worker, request, client_address)
+
+    def finish_request(self, request, client_address) -> bool:
+        """İsteği işle - handler soketi devraldıysa True"""
+        handler = self.RequestHandlerClass(request, client_address, self)
+        return getattr(handler, 'detached', False)
+
+    def _process_in_worker(self, request, client_address):
+        with self._lock:
+            self.active += 1
+        detached = False
+        try:
+            detached = self.finish_request(request, client_address)
+        except OSError:
+            with self._lock:
+                self.client_errors += 1
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            if not detached:
+                self.shutdown_request(request)
+            with self._lock:
+                self.active -= 1
+                self.handled += 1
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'active': self.active,
+                'queued': self.submitted - self.handled - self.active,
+                'handled': self.handled,
+                'client_errors': self.client_errors
+            }
@@ -14,11 +14,19 @@ import sys
 import os
 import threading
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 import requests
 from pathlib import Path
 
+from ttl_cache import snapshot_age
+from candle_archive import CandleArchive
+from app_context import AppContext
+from pooled_server import PooledHTTPServer
+from response_cache import ResponseCache, EncodedResponse
+from signal_store import SignalStore
+from config import SERVER_WORKERS, SERVER_REQUEST_TIMEOUT
+
 # Production logging setup
 def setup_production_logging():
     """Production logging kurulumu"""
@@ -64,8 +72,17 @@ except ImportError as e:
     production_logger.error(f"❌ Kritik modül yükleme hatası: {e}")
     sys.exit(1)
 
+# Binance WebSocket fiyat akışı (opsiyonel - yoksa REST)
+try:
+    from binance_websocket import BinanceKlineStreamer
+    from crypto_strategies import CryptoStrategyManager
+    PRICE_STREAM_AVAILABLE = True
+except ImportError:
+    PRICE_STREAM_AVAILABLE = False
+    production_logger.warning("⚠️ websocket-client bulunamadı, kripto fiyatları REST ile alınacak")
+
 # Production cache sistemi
-PRODUCTION_SIGNALS_CACHE = {}
+PRODUCTION_SIGNAL_STORE = SignalStore(max_signals=15)  # Maksimum 15 aktif sinyal (production için daha fazla)
 SIGNAL_GENERATION_INTERVAL = 180  # 3 dakikada bir (production için daha sık)
 LAST_SIGNAL_GENERATION = 0
 HEALTH_CHECK_INTERVAL = 60  # 1 dakikada bir health check
@@ -75,34 +92,83 @@ LAST_HEALTH_CHECK = 0
 MAX_CONSECUTIVE_ERRORS = 5
 CONSECUTIVE_ERRORS = 0
 RECOVERY_DELAY = 30  # 30 saniye recovery delay
+ERROR_COUNTER_LOCK = threading.Lock()  # CONSECUTIVE_ERRORS pool thread'leri arasında paylaşılır
+RECOVERY_LOCK = threading.Lock()  # Aynı anda tek recovery - diğer istekler beklemez
 
-class ProductionTradingHandler(BaseHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        # Initialize providers with auto-recovery
-        self.initialize_providers()
-        super().__init__(*args, **kwargs)
+# Eşzamanlı /signals istekleri üretimi tek seferde yapar - diğerleri mevcut cache'i okur
+SIGNAL_GENERATION_LOCK = threading.Lock()
+APP_CONTEXT = None  # Provider / strateji / trade monitor - süreçte bir kez kurulur
+RESPONSE_CACHE = ResponseCache('production')  # Sürüm başına bir kez kodlanmış JSON yanıtlar
+CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+
+def get_app_context():
+    """Handler'ların paylaştığı uygulama bağlamı (ilk çağrıda kurulur)"""
+    global APP_CONTEXT
+    if APP_CONTEXT is None:
+        APP_CONTEXT = AppContext({
+            'forex_provider': get_forex_provider,
+            'binance_provider': get_binance_provider,
+            'crypto_strategies': get_crypto_strategy_manager,
+            'forex_strategies': get_real_strategy_manager,
+            'trade_monitor': get_trade_monitor,
+            'ftmo_calculator': get_ftmo_calculator
+        }, log=production_logger.info).build()
+    return APP_CONTEXT
+
+def record_request_error():
+    """Ardışık hata sayacını artır - yeni değer döner"""
+    global CONSECUTIVE_ERRORS
+    with ERROR_COUNTER_LOCK:
+        CONSECUTIVE_ERRORS += 1
+        return CONSECUTIVE_ERRORS
+
+def reset_request_errors():
+    """Başarılı istekte sayacı sıfırla - sayaç zaten sıfırsa kilit alınmaz"""
+    global CONSECUTIVE_ERRORS
+    if CONSECUTIVE_ERRORS:
+        with ERROR_COUNTER_LOCK:
+            CONSECUTIVE_ERRORS = 0
+
+def trigger_auto_recovery(context):
+    """
+    Auto-recovery - aynı anda tek bir tane, arka plan thread'inde (pool worker'ı RECOVERY_DELAY beklemez)
+    Recovery zaten sürüyorsa False
+    """
+    if not RECOVERY_LOCK.acquire(blocking=False):
+        return False
+    production_logger.warning("🔄 Auto-recovery triggered - reinitializing providers")
+    threading.Thread(target=run_auto_recovery, args=(context,), daemon=True, name='auto-recovery').start()
+    return True
+
+def run_auto_recovery(context):
+    """Auto-recovery mechanism - RECOVERY_LOCK tutularak çağrılır, bitince bırakılır"""
+    global CONSECUTIVE_ERRORS
     
-    def initialize_providers(self):
-        """Provider'ları güvenli şekilde başlat"""
-        try:
-            self.forex_provider = get_forex_provider()
-            self.binance_provider = get_binance_provider()
-            self.crypto_strategies = get_crypto_strategy_manager(self.binance_provider)
-            self.forex_strategies = get_real_strategy_manager(self.forex_provider)
-            self.trade_monitor = get_trade_monitor()
-            self.ftmo_calculator = get_ftmo_calculator()
-            
-            production_logger.info("✅ Tüm provider'lar başarıyla başlatıldı")
-            
-        except Exception as e:
-            production_logger.error(f"❌ Provider başlatma hatası: {e}")
-            # Fallback mode
-            self.forex_provider = None
-            self.binance_provider = None
-            self.crypto_strategies = None
-            self.forex_strategies = None
-            self.trade_monitor = None
-            self.ftmo_calculator = None
+    try:
+        production_logger.info("🔄 Starting auto-recovery process...")
+        time.sleep(RECOVERY_DELAY)
+        
+        # Reinitialize providers - yeni bileşenler tek adımda değiştirilir, sonraki istekler onları bağlar
+        context.build()
+        RESPONSE_CACHE.invalidate()  # Eski bileşenlerle kodlanmış yanıtlar sunulmasın
+        
+        # Reset error counter
+        with ERROR_COUNTER_LOCK:
+            CONSECUTIVE_ERRORS = 0
+        
+        production_logger.info("✅ Auto-recovery completed successfully")
+        
+    except Exception as e:
+        production_logger.error(f"❌ Auto-recovery failed: {e}")
+    finally:
+        RECOVERY_LOCK.release()
+
+class ProductionTradingHandler(BaseHTTPRequestHandler):
+    def setup(self):
+        # Provider'lar süreç başında bir kez kurulur - istek başına yeniden kurulum yok
+        super().setup()
+        self.context = getattr(self.server, 'context', None) or get_app_context()
+        self.context.bind(self)
     
     def do_OPTIONS(self):
         """CORS pre-flight"""
@@ -117,79 +183,61 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
     
     def do_GET(self):
         """Production GET handler with error recovery"""
-        global CONSECUTIVE_ERRORS
-        
         try:
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
             path = urlparse(self.path).path
+            encoded = None
             
             # Health check endpoint
             if path == '/health':
                 response = self.get_health_status()
             elif path == '/signals':
-                response = self.get_production_signals()
+                # Üretim / fiyat güncellemesi sonrası depo sürümü değişmediyse yeniden kodlanmaz
+                self.refresh_production_signals()
+                encoded = RESPONSE_CACHE.get('/signals', PRODUCTION_SIGNAL_STORE.version,
+                                             self.get_production_signals)
             elif path == '/crypto-signals':
                 response = self.get_crypto_signals()
             elif path == '/forex-signals':
                 response = self.get_forex_signals()
             elif path == '/statistics':
-                response = self.get_trade_statistics()
+                # Trade'ler depoya tamamlanmadan önce trade monitor'e yazılır - depo sürümü yeterli
+                encoded = RESPONSE_CACHE.get('/statistics', PRODUCTION_SIGNAL_STORE.version,
+                                             self.get_trade_statistics)
             elif path == '/market-data':
                 response = self.get_market_data()
             elif path == '/crypto/prices':
-                response = self.get_crypto_prices()
+                # Sağlayıcının fiyat sürümü değişmediyse yeniden kodlanmaz
+                version = self.binance_provider.price_version() if self.binance_provider else None
+                encoded = RESPONSE_CACHE.get('/crypto/prices', version, self.get_crypto_prices)
             elif path == '/crypto/signals':
                 response = self.get_crypto_signals()
             else:
                 response = {'error': 'Endpoint not found'}
             
-            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+            # ETag + If-None-Match -> 304, gzip destekleyen istemciye sıkıştırılmış gövde
+            RESPONSE_CACHE.send(self, encoded or EncodedResponse(response), CORS_HEADERS)
             
             # Reset error counter on success
-            CONSECUTIVE_ERRORS = 0
+            reset_request_errors()
             
         except Exception as e:
-            CONSECUTIVE_ERRORS += 1
-            production_logger.error(f"❌ Request handling error (#{CONSECUTIVE_ERRORS}): {e}")
+            consecutive_errors = record_request_error()
+            production_logger.error(f"❌ Request handling error (#{consecutive_errors}): {e}")
             
             try:
                 error_response = {
                     'error': str(e),
                     'status': 'error',
                     'timestamp': datetime.now().isoformat(),
-                    'consecutive_errors': CONSECUTIVE_ERRORS
+                    'consecutive_errors': consecutive_errors
                 }
-                self.wfile.write(json.dumps(error_response).encode('utf-8'))
+                RESPONSE_CACHE.send(self, EncodedResponse(error_response), CORS_HEADERS)
             except:
                 pass  # Son çare - sessizce geç
             
-            # Auto-recovery trigger
-            if CONSECUTIVE_ERRORS >= MAX_CONSECUTIVE_ERRORS:
-                production_logger.warning("🔄 Auto-recovery triggered - reinitializing providers")
-                self.trigger_auto_recovery()
-    
-    def trigger_auto_recovery(self):
-        """Auto-recovery mechanism"""
-        global CONSECUTIVE_ERRORS
-        
-        try:
-            production_logger.info("🔄 Starting auto-recovery process...")
-            time.sleep(RECOVERY_DELAY)
-            
-            # Reinitialize providers
-            self.initialize_providers()
-            
-            # Reset error counter
-            CONSECUTIVE_ERRORS = 0
-            
-            production_logger.info("✅ Auto-recovery completed successfully")
-            
-        except Exception as e:
-            production_logger.error(f"❌ Auto-recovery failed: {e}")
+            # Auto-recovery trigger - recovery zaten sürüyorsa yenisi başlatılmaz
+            if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                trigger_auto_recovery(self.context)
     
     def get_health_status(self):
         """System health check"""
@@ -203,7 +251,8 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
             'timestamp': datetime.now().isoformat(),
             'uptime_seconds': current_time,
             'consecutive_errors': CONSECUTIVE_ERRORS,
-            'signal_cache_size': len(PRODUCTION_SIGNALS_CACHE),
+            'signal_cache_size': len(PRODUCTION_SIGNAL_STORE),
+            'signal_store': PRODUCTION_SIGNAL_STORE.get_stats(),
             'last_signal_generation': datetime.fromtimestamp(LAST_SIGNAL_GENERATION).isoformat() if LAST_SIGNAL_GENERATION > 0 else 'never',
             'providers': {
                 'forex': self.forex_provider is not None,
@@ -212,7 +261,9 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
                 'forex_strategies': self.forex_strategies is not None,
                 'trade_monitor': self.trade_monitor is not None,
                 'ftmo_calculator': self.ftmo_calculator is not None
-            }
+            },
+            'server': self.server.get_stats() if hasattr(self.server, 'get_stats') else {},
+            'response_cache': RESPONSE_CACHE.get_stats()
         }
         
         # Check if any provider is down
@@ -227,24 +278,33 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
         
         return health_status
     
+    def refresh_production_signals(self):
+        """Sinyal üretimi + fiyat güncelleme - başka bir istekte sürüyorsa beklemeden mevcut depo kullanılır"""
+        if SIGNAL_GENERATION_LOCK.acquire(blocking=False):
+            try:
+                # Generate new signals if needed
+                self.generate_production_signals()
+                
+                # Update current prices
+                self.update_production_prices()
+            except Exception as e:
+                production_logger.error(f"Production signals error: {e}")
+            finally:
+                SIGNAL_GENERATION_LOCK.release()
+    
     def get_production_signals(self):
         """Production signal generation with auto-recovery"""
         try:
-            # Generate new signals if needed
-            self.generate_production_signals()
-            
-            # Update current prices
-            self.update_production_prices()
-            
             # Get filtered signals (reliability > 6)
             filtered_signals = []
-            for signal_id, signal in PRODUCTION_SIGNALS_CACHE.items():
+            signals = PRODUCTION_SIGNAL_STORE.snapshot()
+            for signal_id, signal in signals.items():
                 if signal.get('fixed_reliability', 0) >= 6:
                     filtered_signals.append(signal)
             
             return {
                 'signals': filtered_signals,
-                'total_signals': len(PRODUCTION_SIGNALS_CACHE),
+                'total_signals': len(signals),
                 'filtered_signals': len(filtered_signals),
                 'last_update': datetime.now().isoformat(),
                 'api_status': 'live',
@@ -262,7 +322,7 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
     
     def generate_production_signals(self):
         """Production sinyal üretimi - GERÇEK STRATEJI"""
-        global PRODUCTION_SIGNALS_CACHE, LAST_SIGNAL_GENERATION
+        global LAST_SIGNAL_GENERATION
         
         current_time = time.time()
         
@@ -361,73 +421,61 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
             except Exception as e:
                 production_logger.error(f"Forex signal generation error: {e}")
             
-            # Cache'i güncelle
-            for signal_id, signal in new_signals.items():
-                PRODUCTION_SIGNALS_CACHE[signal_id] = signal
-            
-            # Maksimum 15 aktif sinyal tut (production için daha fazla)
-            if len(PRODUCTION_SIGNALS_CACHE) > 15:
-                sorted_signals = sorted(PRODUCTION_SIGNALS_CACHE.items(),
-                                      key=lambda x: x[1].get('creation_time', ''),
-                                      reverse=True)
-                PRODUCTION_SIGNALS_CACHE = dict(sorted_signals[:15])
+            # Depoyu güncelle - sınırı aşan en eski sinyaller atılır
+            PRODUCTION_SIGNAL_STORE.add_many(new_signals)
             
             LAST_SIGNAL_GENERATION = current_time
-            production_logger.info(f"✅ {len(new_signals)} yeni sinyal üretildi. Toplam: {len(PRODUCTION_SIGNALS_CACHE)}")
+            production_logger.info(f"✅ {len(new_signals)} yeni sinyal üretildi. Toplam: {len(PRODUCTION_SIGNAL_STORE)}")
     
     def update_production_prices(self):
         """Production fiyat güncelleme"""
-        global PRODUCTION_SIGNALS_CACHE
-        
-        completed_trades = []
-        
         try:
             # Crypto fiyatları
             if self.binance_provider:
                 crypto_prices = self.binance_provider.get_crypto_prices()
                 
-                for signal_id, signal in list(PRODUCTION_SIGNALS_CACHE.items()):
-                    if signal['asset_type'] == 'crypto':
-                        symbol = signal['symbol']
-                        if symbol in crypto_prices:
-                            current_price = crypto_prices[symbol]['price']
-                            signal['current_price'] = current_price
-                            signal['price_update_time'] = datetime.now().isoformat()
-                            
-                            # TP/SL kontrolü
-                            trade_result = self.check_trade_completion(signal, current_price)
-                            if trade_result:
-                                completed_trades.append(trade_result)
-                                del PRODUCTION_SIGNALS_CACHE[signal_id]
-                                production_logger.info(f"✅ Trade completed: {symbol} - {trade_result['result']}")
+                for signal_id, signal in PRODUCTION_SIGNAL_STORE.find(asset_type='crypto'):
+                    symbol = signal['symbol']
+                    if symbol in crypto_prices:
+                        current_price = crypto_prices[symbol]['price']
+                        signal = PRODUCTION_SIGNAL_STORE.update_price(signal_id, current_price, datetime.now().isoformat())
+                        if signal is None:
+                            continue
+                        
+                        # TP/SL kontrolü
+                        trade_result = self.check_trade_completion(signal, current_price)
+                        if trade_result:
+                            self.record_trade(trade_result)
+                            PRODUCTION_SIGNAL_STORE.complete(signal_id, trade_result)
+                            production_logger.info(f"✅ Trade completed: {symbol} - {trade_result['result']}")
             
             # Forex fiyatları
             if self.forex_provider:
                 forex_prices = self.forex_provider.get_forex_prices()
                 
-                for signal_id, signal in list(PRODUCTION_SIGNALS_CACHE.items()):
-                    if signal['asset_type'] == 'forex':
-                        symbol = signal['symbol']
-                        if symbol in forex_prices:
-                            current_price = forex_prices[symbol]['price']
-                            signal['current_price'] = current_price
-                            signal['price_update_time'] = datetime.now().isoformat()
-                            
-                            # TP/SL kontrolü
-                            trade_result = self.check_trade_completion(signal, current_price)
-                            if trade_result:
-                                completed_trades.append(trade_result)
-                                del PRODUCTION_SIGNALS_CACHE[signal_id]
-                                production_logger.info(f"✅ Trade completed: {symbol} - {trade_result['result']}")
-            
-            # Sonuçlanan trade'leri kaydet
-            if completed_trades and self.trade_monitor:
-                for trade in completed_trades:
-                    self.trade_monitor.record_completed_trade(trade)
+                for signal_id, signal in PRODUCTION_SIGNAL_STORE.find(asset_type='forex'):
+                    symbol = signal['symbol']
+                    if symbol in forex_prices:
+                        current_price = forex_prices[symbol]['price']
+                        signal = PRODUCTION_SIGNAL_STORE.update_price(signal_id, current_price, datetime.now().isoformat())
+                        if signal is None:
+                            continue
+                        
+                        # TP/SL kontrolü
+                        trade_result = self.check_trade_completion(signal, current_price)
+                        if trade_result:
+                            self.record_trade(trade_result)
+                            PRODUCTION_SIGNAL_STORE.complete(signal_id, trade_result)
+                            production_logger.info(f"✅ Trade completed: {symbol} - {trade_result['result']}")
                     
         except Exception as e:
             production_logger.error(f"Price update error: {e}")
     
+    def record_trade(self, trade_result):
+        """Sonuçlanan trade'i kaydet - depo sürümü ilerlemeden önce (/statistics o sürümle kodlanır)"""
+        if self.trade_monitor:
+            self.trade_monitor.record_completed_trade(trade_result)
+    
     def check_trade_completion(self, signal, current_price):
         """TP/SL kontrolü"""
         entry_price = signal['fixed_entry']
@@ -516,8 +564,8 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
     def get_crypto_signals(self):
         """Crypto sinyalleri"""
         try:
-            crypto_signals = [signal for signal in PRODUCTION_SIGNALS_CACHE.values() 
-                            if signal['asset_type'] == 'crypto' and signal.get('fixed_reliability', 0) >= 6]
+            crypto_signals = [signal for _, signal in PRODUCTION_SIGNAL_STORE.find(asset_type='crypto')
+                            if signal.get('fixed_reliability', 0) >= 6]
             
             return {
                 'signals': crypto_signals,
@@ -531,8 +579,8 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
     def get_forex_signals(self):
         """Forex sinyalleri"""
         try:
-            forex_signals = [signal for signal in PRODUCTION_SIGNALS_CACHE.values() 
-                           if signal['asset_type'] == 'forex' and signal.get('fixed_reliability', 0) >= 6]
+            forex_signals = [signal for _, signal in PRODUCTION_SIGNAL_STORE.find(asset_type='forex')
+                           if signal.get('fixed_reliability', 0) >= 6]
             
             return {
                 'signals': forex_signals,
@@ -579,7 +627,9 @@ class ProductionTradingHandler(BaseHTTPRequestHandler):
                 return {
                     'prices': prices,
                     'api_status': 'live',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': datetime.now().isoformat(),
+                    'price_age': snapshot_age(prices),  # Saniye - son iyi fiyatın yaşı
+                    'stale': any(p.get('stale') for p in prices.values())
                 }
             else:
                 return {'error': 'Binance provider unavailable'}
@@ -601,10 +651,36 @@ def start_production_server():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
-    server = HTTPServer(('0.0.0.0', 8000), ProductionTradingHandler)
+    # Provider / strateji / trade monitor bir kez kurulur - handler'lar bu bağlamı paylaşır
+    context = get_app_context()
+    
+    # Diskteki mum arşivi - yeniden başlatmada sadece son arşivlenmiş mumdan sonrası indirilir
+    try:
+        binance_provider = context.binance_provider
+        binance_provider.attach_archive(CandleArchive())
+        production_logger.info(f"💾 Candle archive: {binance_provider.archive.directory}")
+    except Exception as e:
+        production_logger.error(f"❌ Candle archive error: {e}")
+    
+    # Binance akışı (ticker + kline) - handler'lar aynı global provider'ı kullanır
+    price_stream = None
+    if PRICE_STREAM_AVAILABLE:
+        try:
+            binance_provider = context.binance_provider
+            # 4h/1d/1w 15m serisinden türetilir - sadece baz interval akıştan
+            intervals = binance_provider.stream_intervals(
+                [interval for interval, _ in CryptoStrategyManager.required_klines()])
+            price_stream = BinanceKlineStreamer(binance_provider.candle_store, binance_provider.symbols, intervals).start()
+            binance_provider.attach_price_stream(price_stream)
+            production_logger.info(f"📡 Binance stream started: {len(binance_provider.symbols)} symbols, klines {intervals}")
+        except Exception as e:
+            production_logger.error(f"❌ Binance price stream error: {e}")
+    
+    server = PooledHTTPServer(('0.0.0.0', 8000), ProductionTradingHandler, context=context,
+                              workers=SERVER_WORKERS, request_timeout=SERVER_REQUEST_TIMEOUT)
     
     production_logger.info("🚀 PRODUCTION Trading Signal Server started")
-    production_logger.info("🌐 Server: http://0.0.0.0:8000")
+    production_logger.info(f"🌐 Server: http://0.0.0.0:8000 ({SERVER_WORKERS} workers)")
     production_logger.info("💰 FTMO Mode: 10K Account Lot Calculator Active")
     production_logger.info("🔧 Features: Auto-Recovery, Error Handling, Logging")
     production_logger.info("⏰ Signal Interval: 3 minutes")
@@ -617,6 +693,8 @@ def start_production_server():
     except Exception as e:
         production_logger.error(f"❌ Server error: {e}")
     finally:
+        if price_stream:
+            price_stream.stop_stream()
         server.server_close()
         production_logger.info("✅ Production server stopped")
 
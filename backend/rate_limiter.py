@@ -0,0 +1,220 @@
+"""
+Ağırlık Bazlı Token Bucket Rate Limiter
+Binance istekleri sayıya göre değil ağırlığa (request weight) göre ölçer:
+- Endpoint + parametreye göre ağırlık tablosu
+- X-MBX-USED-WEIGHT-1M yanıt başlığından senkronizasyon
+- 429/418'de Retry-After süresince tüm istekler bekler
+- Çağıranlar {} almak yerine kuyrukta bekler; ucuz ve gecikmeye duyarlı istekler önce
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Optional
+
+# Öncelikler - küçük değer önce
+PRIORITY_HIGH = 0      # Fiyat / depth - gecikmeye duyarlı
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10      # Toplu kline doldurma
+
+USED_WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1M'
+
+
+class RateLimitTimeout(Exception):
+    """Ağırlık bütçesi beklenen süre içinde açılmadı - istek upstream'e hiç gönderilmedi"""
+
+
+def _tiered(value: int, tiers) -> int:
+    """tiers: [(üst sınır, ağırlık), ...] - value'yu karşılayan ilk kademe"""
+    for upper, weight in tiers:
+        if value <= upper:
+            return weight
+    return tiers[-1][1]
+
+
+def binance_request_weight(endpoint: str, params: Optional[Dict] = None) -> int:
+    """Binance Spot REST endpoint ağırlığı (api/v3)"""
+    params = params or {}
+
+    if endpoint == '/klines':
+        return 2
+    if endpoint == '/ticker/24hr':
+        if 'symbol' in params:
+            return 2
+        if 'symbols' in params:
+            count = str(params['symbols']).count(',') + 1
+            return _tiered(count, [(20, 2), (100, 40), (float('inf'), 80)])
+        return 80
+    if endpoint == '/depth':
+        limit = int(params.get('limit', 100))
+        return _tiered(limit, [(100, 5), (500, 25), (1000, 50), (float('inf'), 250)])
+    if endpoint in ('/ticker/price', '/ticker/bookTicker'):
+        return 2 if 'symbol' in params else 4
+    if endpoint in ('/exchangeInfo', '/account'):
+        return 20
+    if endpoint == '/avgPrice':
+        return 2
+    return 1
+
+
+def binance_request_priority(endpoint: str) -> int:
+    """Kline doldurmaları düşük, diğer her şey yüksek öncelik"""
+    return PRIORITY_LOW if endpoint == '/klines' else PRIORITY_HIGH
+
+
+class WeightedRateLimiter:
+    """
+    Token bucket: kapasite 'capacity' ağırlık, 'window' saniyede tamamen dolar
+    acquire() yeterli token yoksa bekler - sırayı (öncelik, geliş) belirler
+    """
+
+    def __init__(self, capacity: int = 5000, window: float = 60.0):
+        self.capacity = capacity
+        self.window = window
+        self.rate = capacity / window   # Saniyede eklenen token
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0       # 429/418 sonrası bekleme (monotonic)
+
+        self._cond = threading.Condition()
+        self._waiters = []              # Heap: [priority, seq, cancelled]
+        self._sequence = itertools.count()
+
+        # İstatistikler
+        self.acquired_weight = 0
+        self.acquired_requests = 0
+        self.waited_requests = 0
+        self.timeouts = 0
+        self.header_syncs = 0
+        self.bans = 0
+        self.last_used_weight = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _pop_cancelled(self):
+        while self._waiters and self._waiters[0][2]:
+            heapq.heappop(self._waiters)
+
+    def acquire(self, weight: int = 1, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> bool:
+        """
+        'weight' token al - gerekirse bekle
+        Sadece kuyruğun başındaki (en yüksek öncelikli, en eski) bekleyen token alabilir
+        timeout dolarsa False
+        """
+        weight = min(weight, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            entry = [priority, next(self._sequence), False]
+            heapq.heappush(self._waiters, entry)
+            waited = False
+
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                self._pop_cancelled()
+
+                if self._waiters[0] is entry and now >= self._blocked_until and self.tokens >= weight:
+                    heapq.heappop(self._waiters)
+                    self.tokens -= weight
+                    self.acquired_weight += weight
+                    self.acquired_requests += 1
+                    self.waited_requests += waited
+                    self._cond.notify_all()
+                    return True
+
+                # Bekleme süresi: ban bitişi veya eksik tokenların dolma süresi
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._waiters[0] is entry:
+                    delay = (weight - self.tokens) / self.rate
+                else:
+                    delay = None    # Öndeki bekleyen token alınca bildirir
+
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        entry[2] = True
+                        self.timeouts += 1
+                        self._cond.notify_all()
+                        return False
+                    delay = remaining if delay is None else min(delay, remaining)
+
+                waited = True
+                self._cond.wait(delay)
+
+    def update_from_headers(self, headers):
+        """
+        Sunucunun saydığı kullanılmış ağırlıkla senkronize ol
+        Yerel tahmin sunucudan iyimserse token azaltılır (asla artırılmaz)
+        """
+        if headers is None:
+            return
+        used = headers.get(USED_WEIGHT_HEADER)
+        if used is None:
+            return
+        try:
+            used = int(used)
+        except (TypeError, ValueError):
+            return
+
+        with self._cond:
+            self._refill(time.monotonic())
+            self.last_used_weight = used
+            self.tokens = min(self.tokens, max(0.0, self.capacity - used))
+            self.header_syncs += 1
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """429/418: Retry-After süresince (yoksa bir pencere) hiçbir istek gönderilmez"""
+        delay = self.window if retry_after is None else float(retry_after)
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self.tokens = 0.0
+            self.bans += 1
+            self._cond.notify_all()
+
+    def observe_response(self, response):
+        """Yanıt sonrası: ağırlık başlığıyla senkronize ol, 429/418'de Retry-After kadar dur"""
+        headers = getattr(response, 'headers', None)
+        self.update_from_headers(headers)
+        if response.status in (429, 418):
+            retry_after = headers.get('Retry-After') if headers is not None else None
+            try:
+                retry_after = float(retry_after) if retry_after is not None else None
+            except ValueError:
+                retry_after = None
+            self.penalize(retry_after)
+            print(f"🚫 Binance {response.status} - {retry_after or self.window}s istek gönderilmeyecek")
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                'capacity': self.capacity,
+                'available_weight': round(self.tokens, 1),
+                'queued': sum(1 for entry in self._waiters if not entry[2]),
+                'acquired_requests': self.acquired_requests,
+                'acquired_weight': self.acquired_weight,
+                'waited_requests': self.waited_requests,
+                'timeouts': self.timeouts,
+                'header_syncs': self.header_syncs,
+                'last_used_weight': self.last_used_weight,
+                'bans': self.bans,
+                'blocked_for': round(max(0.0, self._blocked_until - time.monotonic()), 1)
+            }
+
+
+# Global instance - Binance IP limiti süreç genelinde paylaşılır
+_binance_limiter = None
+_binance_limiter_lock = threading.Lock()
+
+
+def get_binance_rate_limiter(capacity: int = 5000) -> WeightedRateLimiter:
+    global _binance_limiter
+    with _binance_limiter_lock:
+        if _binance_limiter is None:
+            _binance_limiter = WeightedRateLimiter(capacity=capacity, window=60.0)
+        return _binance_limiter
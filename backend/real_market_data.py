@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import threading
 
+from ttl_cache import TTLCache
+
 class RealMarketDataProvider:
     """Gerçek piyasa verisi sağlayıcısı"""
     
@@ -28,16 +30,16 @@ class RealMarketDataProvider:
         }
         
         # Cache sistemi
-        self.cache = {}
-        self.cache_duration = 30  # 30 saniye
+        self.cache = TTLCache(ttl=30, max_bytes=8 * 1024 * 1024, name='real_market')  # 30 saniye
         
     def get_forex_prices(self) -> Dict:
         """Forex paritelerinin gerçek fiyatlarını çek"""
         cache_key = 'forex_prices'
         
         # Cache kontrolü
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]['data']
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         forex_data = {}
         symbols = {
@@ -110,10 +112,7 @@ class RealMarketDataProvider:
             return self._get_fallback_forex()
         
         # Cache'e kaydet
-        self.cache[cache_key] = {
-            'data': forex_data,
-            'timestamp': time.time()
-        }
+        self.cache.set(cache_key, forex_data)
         
         return forex_data
     
@@ -122,8 +121,9 @@ class RealMarketDataProvider:
         cache_key = 'crypto_prices'
         
         # Cache kontrolü
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]['data']
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         crypto_data = {}
         
@@ -157,10 +157,7 @@ class RealMarketDataProvider:
             return self._get_fallback_crypto()
         
         # Cache'e kaydet
-        self.cache[cache_key] = {
-            'data': crypto_data,
-            'timestamp': time.time()
-        }
+        self.cache.set(cache_key, crypto_data)
         
         return crypto_data
     
@@ -168,9 +165,10 @@ class RealMarketDataProvider:
         """Geçmiş mum verilerini çek"""
         cache_key = f'candles_{symbol}_{timeframe}_{limit}'
         
-        # Cache kontrolü (5 dakika cache)
-        if self._is_cache_valid(cache_key, duration=300):
-            return self.cache[cache_key]['data']
+        # Cache kontrolü
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         candles = []
         
@@ -213,10 +211,7 @@ class RealMarketDataProvider:
             candles = self._generate_realistic_candles(symbol, limit)
         
         # Cache'e kaydet
-        self.cache[cache_key] = {
-            'data': candles,
-            'timestamp': time.time()
-        }
+        self.cache.set(cache_key, candles, ttl=300)  # 5 dakika cache
         
         return candles
     
@@ -260,14 +255,6 @@ class RealMarketDataProvider:
         # Gerçek exchange rate yoksa candle üretme
         return []
     
-    def _is_cache_valid(self, cache_key: str, duration: int = None) -> bool:
-        """Cache geçerliliğini kontrol et"""
-        if cache_key not in self.cache:
-            return False
-        
-        cache_duration = duration or self.cache_duration
-        return (time.time() - self.cache[cache_key]['timestamp']) < cache_duration
-    
     def _get_fallback_forex(self) -> Dict:
         """❌ FALLBACK DEVRE DIŞI - GERÇEK VERİ YOKSA HİÇ VERİ YOK"""
         # Mock data yerine boş response döndür
@@ -8,6 +8,10 @@ import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+from candles import CandleSeries
+from indicators import rsi_series, atr_series, last_value
+from swing_points import swing_highs, swing_lows
+
 class RealTechnicalAnalysis:
     """Gerçek mum verilerinden teknik analiz"""
     
@@ -17,36 +21,21 @@ class RealTechnicalAnalysis:
         if len(candles) < lookback:
             return {'support_levels': [], 'resistance_levels': []}
         
-        recent_candles = candles[-lookback:]
-        support_levels = []
-        resistance_levels = []
-        
-        # Swing high/low noktalarını bul
-        for i in range(2, len(recent_candles) - 2):
-            current_high = recent_candles[i]['high']
-            current_low = recent_candles[i]['low']
-            
-            # Resistance (Swing High) - Önceki ve sonraki 2 mumdan yüksek
-            if (current_high > recent_candles[i-1]['high'] and 
-                current_high > recent_candles[i-2]['high'] and
-                current_high > recent_candles[i+1]['high'] and 
-                current_high > recent_candles[i+2]['high']):
-                resistance_levels.append({
-                    'level': current_high,
-                    'timestamp': recent_candles[i]['timestamp'],
-                    'touches': 1
-                })
-            
-            # Support (Swing Low) - Önceki ve sonraki 2 mumdan düşük
-            if (current_low < recent_candles[i-1]['low'] and 
-                current_low < recent_candles[i-2]['low'] and
-                current_low < recent_candles[i+1]['low'] and 
-                current_low < recent_candles[i+2]['low']):
-                support_levels.append({
-                    'level': current_low,
-                    'timestamp': recent_candles[i]['timestamp'],
-                    'touches': 1
-                })
+        recent_candles = CandleSeries.coerce(candles)[-lookback:]
+        
+        # Resistance (Swing High) - Önceki ve sonraki 2 mumdan yüksek
+        resistance_levels = [{
+            'level': float(recent_candles.high[i]),
+            'timestamp': int(recent_candles.timestamp[i]),
+            'touches': 1
+        } for i in swing_highs(recent_candles.high, 2, strict=True).tolist()]
+        
+        # Support (Swing Low) - Önceki ve sonraki 2 mumdan düşük
+        support_levels = [{
+            'level': float(recent_candles.low[i]),
+            'timestamp': int(recent_candles.timestamp[i]),
+            'touches': 1
+        } for i in swing_lows(recent_candles.low, 2, strict=True).tolist()]
         
         # Benzer seviyeleri birleştir ve touch sayısını artır
         def consolidate_levels(levels, tolerance=0.002):
@@ -153,11 +142,11 @@ class RealTechnicalAnalysis:
         if len(candles) < 20:
             return {'sweep_detected': False}
         
-        recent_candles = candles[-20:]
+        recent_candles = CandleSeries.coerce(candles)[-20:]
         
         # Son 20 mumun en yüksek ve en düşük seviyeleri
-        recent_highs = [c['high'] for c in recent_candles]
-        recent_lows = [c['low'] for c in recent_candles]
+        recent_highs = recent_candles['high'].tolist()
+        recent_lows = recent_candles['low'].tolist()
         
         highest_high = max(recent_highs)
         lowest_low = min(recent_lows)
@@ -192,23 +181,9 @@ class RealTechnicalAnalysis:
         if len(candles) < period + 1:
             return 0.01
         
-        true_ranges = []
-        for i in range(1, len(candles)):
-            high = candles[i]['high']
-            low = candles[i]['low']
-            prev_close = candles[i-1]['close']
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        if len(true_ranges) >= period:
-            return sum(true_ranges[-period:]) / period
-        else:
-            return sum(true_ranges) / len(true_ranges) if true_ranges else 0.01
+        candles = CandleSeries.coerce(candles)
+        atr = atr_series(candles.high, candles.low, candles.close, period)
+        return last_value(atr, 0.01)
     
     @staticmethod
     def calculate_rsi(prices: List[float], period: int = 14) -> float:
@@ -216,31 +191,8 @@ class RealTechnicalAnalysis:
         if len(prices) < period + 1:
             return 50.0  # Neutral RSI
         
-        # Fiyat değişimlerini hesapla
-        deltas = []
-        for i in range(1, len(prices)):
-            deltas.append(prices[i] - prices[i-1])
-        
-        # Gains ve losses ayır
-        gains = [delta if delta > 0 else 0 for delta in deltas]
-        losses = [-delta if delta < 0 else 0 for delta in deltas]
-        
-        # İlk ortalama
-        if len(gains) >= period:
-            avg_gain = sum(gains[-period:]) / period
-            avg_loss = sum(losses[-period:]) / period
-        else:
-            avg_gain = sum(gains) / len(gains) if gains else 0
-            avg_loss = sum(losses) / len(losses) if losses else 0
-        
-        # RSI hesapla
-        if avg_loss == 0:
-            return 100.0  # Hiç loss yok
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return round(rsi, 2)
+        rsi = rsi_series(prices, period, smoothing='sma')
+        return round(last_value(rsi, 50.0), 2)
 
 class KROStrategy:
     """
@@ -301,7 +253,7 @@ class KROStrategy:
             
             # Volume onayı (simulated but realistic)
             if len(candles) >= 20:
-                recent_volumes = [c['volume'] for c in candles[-20:]]
+                recent_volumes = candles['volume'][-20:].tolist()
                 avg_volume = sum(recent_volumes) / len(recent_volumes)
                 current_volume = candles[-1]['volume']
                 
@@ -440,12 +392,12 @@ class LMOStrategy:
             
             # ADIM 4: Multi-timeframe analiz
             # 4H için teknik indikatörler
-            prices_4h = [float(candle['close']) for candle in candles_4h]
+            prices_4h = candles_4h['close'].tolist()
             atr_4h = RealTechnicalAnalysis.calculate_atr(candles_4h)
             rsi_4h = RealTechnicalAnalysis.calculate_rsi(prices_4h)
             
             # 15M için momentum kontrolü
-            prices_15m = [float(candle['close']) for candle in candles_15m]
+            prices_15m = candles_15m['close'].tolist()
             rsi_15m = RealTechnicalAnalysis.calculate_rsi(prices_15m)
             
             # ADIM 5: Güvenilirlik skoru hesaplama
@@ -494,7 +446,7 @@ class LMOStrategy:
             
             # 4H Volume analizi
             if len(candles_4h) >= 20:
-                recent_volumes = [c['volume'] for c in candles_4h[-20:]]
+                recent_volumes = candles_4h['volume'][-20:].tolist()
                 avg_volume = sum(recent_volumes) / len(recent_volumes)
                 current_volume = candles_4h[-1]['volume']
                 
@@ -0,0 +1,55 @@
+"""
+Üst Zaman Dilimi Yeniden Örnekleme
+Baz seriden (15m / 1h / 1d) 4h / 1d / 1w OHLCV mumları - Binance hizalaması:
+UTC sınırları, haftalık mumlar Pazartesi 00:00 UTC
+Gruplama tek geçişte np.*.reduceat ile
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from candles import CandleSeries, INTERVAL_MS, bar_open_times
+
+# Türetilebilen interval -> baz interval
+# 1w için 1d: 15m/300 (75 saat) haftanın tamamını kapsamaz, 1d/120 kapsar
+RESAMPLE_BASES = {
+    '4h': '15m',
+    '1d': '15m',
+    '1w': '1d'
+}
+
+
+def resample(series: CandleSeries, interval: str, base_interval: Optional[str] = None) -> CandleSeries:
+    """
+    series mumlarını 'interval' mumlarına topla
+    - open: gruptaki ilk açılış, close: son kapanış, high/low: max/min, volume: toplam
+    - Baştaki eksik grup (seri mum ortasından başlıyorsa) atılır
+    - Son grup oluşmakta olan mum olarak kalır
+    base_interval verilirse kopuk (mum atlanmış) baz seri için ValueError
+    """
+    if not len(series):
+        return CandleSeries.empty()
+
+    timestamps = series.timestamp
+    if base_interval is not None and len(timestamps) > 1:
+        if np.any(np.diff(timestamps) != INTERVAL_MS[base_interval]):
+            raise ValueError(f"Kopuk {base_interval} serisinden {interval} türetilemez")
+
+    buckets = bar_open_times(timestamps, interval)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(timestamps)] - 1
+
+    resampled = CandleSeries(
+        buckets[starts],
+        series.open[starts],
+        np.maximum.reduceat(series.high, starts),
+        np.minimum.reduceat(series.low, starts),
+        series.close[ends],
+        np.add.reduceat(series.volume, starts)
+    )
+
+    # Seri grubun açılışından başlamıyorsa ilk üst mum eksik
+    if timestamps[0] != buckets[0]:
+        resampled = resampled[1:]
+    return resampled
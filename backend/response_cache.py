@@ -0,0 +1,157 @@
+"""
+Önceden Serileştirilmiş JSON Yanıt Cache'i
+Endpoint payload'ı snapshot sürümü başına bir kez JSON + (büyükse) gzip olarak kodlanır
+- Güçlü ETag (içerik hash'i), If-None-Match -> 304 (gövde yok)
+- Accept-Encoding: gzip -> önceden sıkıştırılmış gövde
+Serileştirme CPU'su istemci sayısından bağımsız: aynı sürüm için N istek = 1 json.dumps
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+from singleflight import SingleFlight
+
+GZIP_MIN_BYTES = 1024  # Daha küçük gövdelerde gzip başlığı kazancı yer
+GZIP_LEVEL = 6
+
+
+class EncodedResponse:
+    """Bir kez kodlanmış yanıt gövdesi - değiştirilmez, thread'ler arasında paylaşılır"""
+
+    __slots__ = ('body', 'gzip_body', 'etag', 'version', 'encoded_at')
+
+    def __init__(self, payload, version: Hashable = None, gzip_min_bytes: int = GZIP_MIN_BYTES):
+        self.body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.etag = '"%s"' % hashlib.blake2b(self.body, digest_size=12).hexdigest()
+        self.gzip_body = (gzip.compress(self.body, GZIP_LEVEL, mtime=0)
+                          if len(self.body) >= gzip_min_bytes else None)
+        self.version = version
+        self.encoded_at = time.time()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığı ETag ile eşleşiyor mu (liste, '*' ve W/ zayıf karşılaştırma)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Accept-Encoding gzip'e (veya '*') q > 0 ile izin veriyor mu"""
+    if not accept_encoding:
+        return False
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() not in ('gzip', '*'):
+            continue
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class ResponseCache:
+    """
+    get(key, version, build): sürüm değişmediyse kodlanmış yanıt, değiştiyse build() bir kez kodlanır
+    Aynı sürüm için eşzamanlı kodlamalar single-flight ile birleşir
+    """
+
+    def __init__(self, name: str = 'responses', gzip_min_bytes: int = GZIP_MIN_BYTES):
+        self.name = name
+        self.gzip_min_bytes = gzip_min_bytes
+        self._entries: Dict[str, EncodedResponse] = {}
+        self._lock = threading.Lock()
+        self.flights = SingleFlight(name)
+
+        # İstatistikler
+        self.hits = 0
+        self.encodes = 0
+        self.not_modified = 0
+        self.gzip_responses = 0
+
+    def get(self, key: str, version: Hashable, build: Callable[[], object]) -> EncodedResponse:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self.hits += 1
+                return entry
+        return self.flights.do((key, version), self._encode, key, version, build)
+
+    def _encode(self, key: str, version: Hashable, build: Callable[[], object]) -> EncodedResponse:
+        encoded = EncodedResponse(build(), version, self.gzip_min_bytes)
+        with self._lock:
+            self._entries[key] = encoded
+            self.encodes += 1
+        return encoded
+
+    def invalidate(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def send(self, handler, encoded: EncodedResponse, extra_headers: Optional[Dict[str, str]] = None,
+             status: int = 200) -> int:
+        """
+        BaseHTTPRequestHandler üzerinden gönder - durum kodu döner
+        If-None-Match eşleşirse 304 (gövde yok, sadece 200 yanıtlarda), istemci kabul ediyorsa gzip gövde
+        """
+        headers = {
+            'ETag': encoded.etag,
+            'Cache-Control': 'no-cache',  # Her seferinde doğrula - değişmediyse 304
+            'Vary': 'Accept-Encoding'
+        }
+        headers.update(extra_headers or {})
+
+        if status == 200 and etag_matches(handler.headers.get('If-None-Match'), encoded.etag):
+            with self._lock:
+                self.not_modified += 1
+            handler.send_response(304)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            return 304
+
+        body = encoded.body
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json; charset=utf-8')
+        if encoded.gzip_body is not None and accepts_gzip(handler.headers.get('Accept-Encoding')):
+            body = encoded.gzip_body
+            handler.send_header('Content-Encoding', 'gzip')
+            with self._lock:
+                self.gzip_responses += 1
+        handler.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+        return status
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.encodes
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'encodes': self.encodes,
+                'not_modified': self.not_modified,
+                'gzip_responses': self.gzip_responses,
+                'hit_rate': round(self.hits / total * 100, 1) if total else 0.0
+            }
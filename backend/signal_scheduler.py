@@ -0,0 +1,168 @@
+"""
+Arka Plan Sinyal Zamanlayıcısı
+Sinyal üretimini HTTP istek yolundan çıkarır - handler'lar sadece snapshot okur
+"""
+
+import copy
+import threading
+import time
+from datetime import datetime
+from types import MappingProxyType
+from typing import Callable, Dict, Optional
+
+
+class SignalSnapshot:
+    """Yayınlanmış, değiştirilemez sinyal görüntüsü"""
+
+    __slots__ = ('version', 'signals', 'published_at', 'extra')
+
+    def __init__(self, version: int, signals: Dict, published_at: float, extra: Optional[Dict] = None):
+        # Her sinyal derin kopyalanır ve read-only view olarak saklanır
+        frozen = {signal_id: MappingProxyType(copy.deepcopy(signal))
+                  for signal_id, signal in signals.items()}
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'signals', MappingProxyType(frozen))
+        object.__setattr__(self, 'published_at', published_at)
+        object.__setattr__(self, 'extra', MappingProxyType(copy.deepcopy(extra or {})))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SignalSnapshot değiştirilemez")
+
+    def signal_list(self, asset_type: str = None) -> list:
+        """JSON'a yazılabilir sinyal kopyaları"""
+        return [dict(signal) for signal in self.signals.values()
+                if asset_type is None or signal.get('asset_type') == asset_type]
+
+
+class SignalScheduler:
+    """
+    Sinyal üretimini ayrı bir thread'de SIGNAL_GENERATION_INTERVAL ile çalıştırır.
+    Fiyat güncellemesi (TP/SL kontrolü) daha kısa aralıkla aynı thread'de yapılır.
+    Her iş sonunda yeni bir SignalSnapshot yayınlanır.
+    """
+
+    def __init__(self, generate_job: Callable[[], None], price_update_job: Optional[Callable[[], None]],
+                 snapshot_source: Callable[[], Dict], generation_interval: float = 300,
+                 price_update_interval: float = 5, extra_source: Optional[Callable[[], Dict]] = None):
+        self.generate_job = generate_job
+        self.price_update_job = price_update_job
+        self.snapshot_source = snapshot_source
+        self.extra_source = extra_source
+        self.generation_interval = generation_interval
+        self.price_update_interval = price_update_interval
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._version = 0
+        self._snapshot = SignalSnapshot(0, {}, time.time())
+        self._listeners = []
+
+        # Durum bilgileri
+        self.last_run_started = 0.0
+        self.last_run_duration = None
+        self.last_run_error = None
+        self.next_run_time = time.time()
+        self.next_price_update_time = time.time()
+        self.run_count = 0
+
+    def start(self):
+        """Zamanlayıcı thread'ini başlat"""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name='SignalScheduler', daemon=True)
+        self._thread.start()
+        print(f"✅ Sinyal zamanlayıcısı başlatıldı (her {self.generation_interval}s)")
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Zamanlayıcıyı durdur"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def on_publish(self, callback: Callable[[SignalSnapshot, SignalSnapshot], None]):
+        """Her yayında callback(önceki, yeni) - zamanlayıcı thread'inde çağrılır"""
+        self._listeners.append(callback)
+
+    def trigger_now(self):
+        """Bir sonraki döngüde hemen üretim yap"""
+        self.next_run_time = time.time()
+
+    def get_snapshot(self) -> SignalSnapshot:
+        """Son yayınlanan snapshot - kilitsiz okuma (referans ataması atomik)"""
+        return self._snapshot
+
+    def get_status(self) -> Dict:
+        """Zamanlayıcı durum bilgisi"""
+        now = time.time()
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'run_count': self.run_count,
+            'last_run': datetime.fromtimestamp(self.last_run_started).isoformat() if self.last_run_started else None,
+            'last_run_duration': round(self.last_run_duration, 3) if self.last_run_duration is not None else None,
+            'last_run_error': self.last_run_error,
+            'next_run_time': datetime.fromtimestamp(self.next_run_time).isoformat(),
+            'next_run_in': round(max(0.0, self.next_run_time - now), 1),
+            'generation_interval': self.generation_interval,
+            'snapshot_version': self._snapshot.version
+        }
+
+    def run_generation_once(self):
+        """Üretim işini senkron çalıştır ve snapshot yayınla"""
+        self.last_run_started = time.time()
+        try:
+            self.generate_job()
+            self.last_run_error = None
+        except Exception as e:
+            self.last_run_error = str(e)
+            print(f"❌ Zamanlayıcı sinyal üretim hatası: {e}")
+        finally:
+            self.last_run_duration = time.time() - self.last_run_started
+            self.next_run_time = self.last_run_started + self.generation_interval
+            self.run_count += 1
+        self._publish()
+
+    def run_price_update_once(self):
+        """Fiyat güncelleme işini senkron çalıştır ve snapshot yayınla"""
+        if not self.price_update_job:
+            return
+        try:
+            self.price_update_job()
+        except Exception as e:
+            print(f"❌ Zamanlayıcı fiyat güncelleme hatası: {e}")
+        finally:
+            self.next_price_update_time = time.time() + self.price_update_interval
+        self._publish()
+
+    def _publish(self):
+        """Yeni snapshot yayınla - sinyaller ve ek veri öncekiyle aynıysa sürüm ilerlemez, dinleyiciler çağrılmaz"""
+        with self._lock:
+            previous = self._snapshot
+            signals = self.snapshot_source()
+            extra = self.extra_source() if self.extra_source else None
+            if signals == previous.signals and (extra or {}) == previous.extra:
+                return
+            self._version += 1
+            snapshot = SignalSnapshot(self._version, signals, time.time(), extra)
+            self._snapshot = snapshot
+        for callback in self._listeners:
+            try:
+                callback(previous, snapshot)
+            except Exception as e:
+                print(f"❌ Snapshot dinleyici hatası: {e}")
+
+    def _run_loop(self):
+        while not self._stop_event.is_set():
+            now = time.time()
+
+            if now >= self.next_run_time:
+                self.run_generation_once()
+            elif self.price_update_job and now >= self.next_price_update_time:
+                self.run_price_update_once()
+
+            next_due = self.next_run_time
+            if self.price_update_job:
+                next_due = min(next_due, self.next_price_update_time)
+            self._stop_event.wait(max(0.05, next_due - time.time()))
@@ -0,0 +1,225 @@
+"""
+İndeksli, Thread-Safe Sinyal Deposu
+Aktif sinyaller + kapanan trade geçmişi tek kilit altında
+- İkincil indeksler: symbol / asset_type / status -> {signal_id} (O(1) arama, tarama yok)
+- Copy-on-write: saklanan sinyal dict'leri değiştirilmez, güncelleme yeni dict yazar;
+  okuyucular snapshot() ile kilitsiz, değişmeyen bir görüntü alır
+- En yeni max_signals sinyal tutulur: ekleme sırası (OrderedDict) korunur, creation_time sıralaması yok
+"""
+
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+INDEXED_FIELDS = ('symbol', 'asset_type', 'status')
+
+
+class SignalStore:
+    """
+    add / add_many: yeni sinyaller (en yeniler sona), sınır aşılırsa en eskiler atılır
+    update(signal_id, **fields): alanları değişmiş yeni sinyal - indeksler güncellenir
+    update_price(signal_id, price, updated_at): fiyat değiştiyse fiyat + zaman damgası
+    complete(signal_id, trade): sinyali kaldır + trade geçmişine ekle (tek atomik adım)
+    """
+
+    def __init__(self, max_signals: int = 10, history_limit: int = 1000):
+        self.max_signals = max_signals
+        self.history_limit = history_limit
+        self._lock = threading.RLock()
+        self._signals: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._indexes: Dict[str, Dict[str, Set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        self._snapshot: Optional[Mapping[str, Dict]] = MappingProxyType({})
+
+        # Trade geçmişi - sadece eklenir; toplamlar ekleme sırasında tutulur
+        self._history: List[Dict] = []
+        self.history_version = 0   # Toplam kapanan trade (geçmiş kırpılsa da monoton)
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.total_pips = 0.0
+
+        # İstatistikler
+        self.version = 0           # Her yazmada artar
+        self.evicted = 0
+
+    # --- İç yardımcılar (kilit altında çağrılır) ---
+
+    def _index(self, signal_id: str, signal: Dict):
+        for field in INDEXED_FIELDS:
+            self._indexes[field].setdefault(signal.get(field), set()).add(signal_id)
+
+    def _unindex(self, signal_id: str, signal: Dict):
+        for field in INDEXED_FIELDS:
+            ids = self._indexes[field].get(signal.get(field))
+            if ids is not None:
+                ids.discard(signal_id)
+                if not ids:
+                    del self._indexes[field][signal.get(field)]
+
+    def _put(self, signal_id: str, signal: Dict):
+        previous = self._signals.pop(signal_id, None)
+        if previous is not None:
+            self._unindex(signal_id, previous)
+        self._signals[signal_id] = signal
+        self._index(signal_id, signal)
+
+    def _pop(self, signal_id: str) -> Optional[Dict]:
+        signal = self._signals.pop(signal_id, None)
+        if signal is not None:
+            self._unindex(signal_id, signal)
+        return signal
+
+    def _changed(self):
+        self.version += 1
+        self._snapshot = None  # Bir sonraki snapshot() yeniden kurar
+
+    # --- Yazma ---
+
+    def add(self, signal_id: str, signal: Dict) -> List[str]:
+        """Tek sinyal ekle - atılan (en eski) sinyal id'leri döner"""
+        return self.add_many({signal_id: signal})
+
+    def add_many(self, signals: Mapping[str, Dict]) -> List[str]:
+        """Sinyalleri sırayla ekle (sonraki = daha yeni), sınırı aşan en eskileri at"""
+        if not signals:
+            return []
+        with self._lock:
+            for signal_id, signal in signals.items():
+                self._put(signal_id, dict(signal))
+            evicted = []
+            while len(self._signals) > self.max_signals:
+                signal_id = next(iter(self._signals))
+                self._pop(signal_id)
+                evicted.append(signal_id)
+            self.evicted += len(evicted)
+            self._changed()
+            return evicted
+
+    def update(self, signal_id: str, **fields) -> Optional[Dict]:
+        """
+        Alanları güncellenmiş yeni sinyal (yerinde değiştirilmez) - sinyal yoksa None
+        Hiçbir alan değişmiyorsa yazma yok, sürüm ilerlemez - mevcut sinyal döner
+        """
+        with self._lock:
+            current = self._signals.get(signal_id)
+            if current is None:
+                return None
+            if all(name in current and current[name] == value for name, value in fields.items()):
+                return current
+            updated = dict(current, **fields)
+            if any(updated.get(field) != current.get(field) for field in INDEXED_FIELDS):
+                self._unindex(signal_id, current)
+                self._index(signal_id, updated)
+            self._signals[signal_id] = updated  # Sıra (yaş) korunur
+            self._changed()
+            return updated
+
+    def update_price(self, signal_id: str, current_price: float, updated_at: str) -> Optional[Dict]:
+        """Güncel fiyatı yaz - fiyat aynıysa price_update_time da yazılmaz (sinyal ve sürüm değişmez)"""
+        with self._lock:
+            current = self._signals.get(signal_id)
+            if current is None or current.get('current_price') == current_price:
+                return current
+            return self.update(signal_id, current_price=current_price, price_update_time=updated_at)
+
+    def remove(self, signal_id: str) -> Optional[Dict]:
+        """Sinyali kaldır - zaten yoksa None (tekrar çağrı güvenli)"""
+        with self._lock:
+            signal = self._pop(signal_id)
+            if signal is not None:
+                self._changed()
+            return signal
+
+    def complete(self, signal_id: str, trade: Dict) -> Optional[Dict]:
+        """Sinyali kaldır ve kapanan trade'i geçmişe ekle - kaldırılan sinyal döner"""
+        with self._lock:
+            signal = self._pop(signal_id)
+            self._history.append(trade)
+            if len(self._history) > self.history_limit:
+                del self._history[:len(self._history) - self.history_limit]
+            self.history_version += 1
+            outcome = trade.get('result_type') or trade.get('result')  # 'TP_HIT' / 'SL_HIT'
+            if outcome == 'TP_HIT':
+                self.winning_trades += 1
+            elif outcome == 'SL_HIT':
+                self.losing_trades += 1
+            self.total_pips += trade.get('pips_earned', 0) or 0
+            self._changed()
+            return signal
+
+    def clear(self):
+        """Aktif sinyalleri temizle - trade geçmişi korunur"""
+        with self._lock:
+            self._signals.clear()
+            for index in self._indexes.values():
+                index.clear()
+            self._changed()
+
+    # --- Okuma ---
+
+    def snapshot(self) -> Mapping[str, Dict]:
+        """signal_id -> sinyal, en eskiden en yeniye; değişmez görüntü (yazmalar yeni görüntü kurar)"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = MappingProxyType(dict(self._signals))
+            return self._snapshot
+
+    def get(self, signal_id: str) -> Optional[Dict]:
+        return self.snapshot().get(signal_id)
+
+    def ids_where(self, field: str, value) -> Set[str]:
+        """İndeksli alan (symbol / asset_type / status) için eşleşen id'ler"""
+        with self._lock:
+            return set(self._indexes[field].get(value, ()))
+
+    def find(self, symbol: str = None, asset_type: str = None, status: str = None) -> List[Tuple[str, Dict]]:
+        """Verilen alanların hepsine uyan (id, sinyal) çiftleri - en küçük indeks kümesinden"""
+        criteria = [(field, value) for field, value in
+                    (('symbol', symbol), ('asset_type', asset_type), ('status', status)) if value is not None]
+        with self._lock:
+            snapshot = self.snapshot()  # İndekslerle aynı anın görüntüsü
+            if not criteria:
+                return list(snapshot.items())
+            id_sets = [self._indexes[field].get(value, set()) for field, value in criteria]
+            ids = set.intersection(*sorted(id_sets, key=len))
+        return [(signal_id, snapshot[signal_id]) for signal_id in snapshot if signal_id in ids]
+
+    def has_active_signal(self, symbol: str) -> bool:
+        """Sembol için ACTIVE sinyal var mı - sembol indeksinden, tüm sinyaller taranmaz"""
+        with self._lock:
+            ids = self._indexes['symbol'].get(symbol)
+            return bool(ids) and any(self._signals[signal_id].get('status') == 'ACTIVE' for signal_id in ids)
+
+    def completed_trades(self, last: Optional[int] = None) -> List[Dict]:
+        with self._lock:
+            return list(self._history[-last:] if last else self._history)
+
+    def trade_totals(self) -> Dict:
+        with self._lock:
+            return {
+                'total_trades': self.history_version,
+                'winning_trades': self.winning_trades,
+                'losing_trades': self.losing_trades,
+                'total_pips': self.total_pips
+            }
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
+
+    def __contains__(self, signal_id) -> bool:
+        return signal_id in self.snapshot()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'signals': len(self._signals),
+                'max_signals': self.max_signals,
+                'symbols': len(self._indexes['symbol']),
+                'by_asset_type': {asset_type: len(ids) for asset_type, ids in self._indexes['asset_type'].items()},
+                'completed_trades': self.history_version,
+                'evicted': self.evicted,
+                'version': self.version
+            }
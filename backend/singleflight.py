@@ -0,0 +1,70 @@
+"""
+Single-flight İstek Birleştirme
+Aynı anahtar için eşzamanlı cache miss'ler tek upstream isteğini bekler ve sonucunu paylaşır
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    do(key, fn): anahtar için uçuşta çağrı yoksa fn çalışır (lider),
+    varsa çağıran liderin Future'ını bekler - sonuç ya da exception aynen paylaşılır
+    Tamamlanan çağrı unutulur; sonraki miss yeni bir istek başlatır (cache katmanın işi)
+    """
+
+    def __init__(self, name: str = ''):
+        self.name = name
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Future] = {}
+
+        # İstatistikler
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self.errors += 1
+                del self._flights[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._flights[key]
+        future.set_result(result)
+        return result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'name': self.name,
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'in_flight': len(self._flights)
+            }
@@ -0,0 +1,170 @@
+"""
+Incremental S/R Seviye İndeksi
+Her (sembol, timeframe, lookback) için pivotlar mum kapandıkça güncellenir:
+- Swing pivot 'window' bar sonra (sağ komşular kapanınca) bir kez eklenir
+- Lookback penceresinden çıkan pivotlar baştan atılır
+- Konsolide seviyeler sadece pivot seti değişince yeniden kurulur, fiyat sıralı tutulur
+"""
+
+from collections import deque
+from typing import Dict
+
+import numpy as np
+
+from candles import CandleSeries
+from swing_points import swing_highs, swing_lows
+from sr_levels import level_set, volume_importance, SortedLevels
+
+# Volume importance genel penceresi (±20 bar) - bu kadar sağ bağlam kapanınca skor kesinleşir
+IMPORTANCE_CONTEXT = 20
+
+
+def _copy_level_set(levels: Dict) -> Dict:
+    """Çağıranın değiştirebileceği kopya - liste ve sıralı kitap aynı dict'leri paylaşır"""
+    copies = {}
+
+    def copy(level):
+        key = id(level)
+        if key not in copies:
+            copies[key] = dict(level)
+        return copies[key]
+
+    result = {}
+    for side in ('support', 'resistance'):
+        result[f'{side}_levels'] = [copy(level) for level in levels[f'{side}_levels']]
+        result[f'{side}_sorted'] = SortedLevels([copy(level) for level in levels[f'{side}_sorted'].levels],
+                                                presorted=True)
+    return result
+
+
+class SRLevelIndex:
+    """
+    find_support_resistance'ın incremental karşılığı
+    Sadece kapanmış mumlar işlenir - oluşan son mum pivot onayına ve volume skoruna girmez
+    Durum son işlenmiş kapanmış barın açılış zamanıyla saklanır (IncrementalRSI gibi)
+    """
+
+    def __init__(self, lookback: int = 50, window: int = 3, tolerance: float = 0.015, count: int = 6):
+        self.lookback = lookback
+        self.window = window
+        self.tolerance = tolerance
+        self.count = count
+
+        self._highs = deque()   # Zaman sıralı onaylı pivotlar
+        self._lows = deque()
+        self._last_closed_ts = None
+        self._levels = None     # Son kurulan seviye seti
+
+        # İstatistikler
+        self.full_rebuilds = 0
+        self.incremental_updates = 0
+        self.level_rebuilds = 0
+        self.pivots_added = 0
+        self.pivots_expired = 0
+
+    def update(self, candles) -> Dict:
+        """
+        Seriyi indekse işle, find_support_resistance ile aynı yapıda seviye seti döndür
+        (+ support_sorted / resistance_sorted fiyat sıralı kitaplar)
+        """
+        klines = CandleSeries.coerce(candles)
+        n = len(klines)
+        if n < self.lookback or n < 2:
+            self._reset()
+            return {'support_levels': [], 'resistance_levels': [],
+                    'support_sorted': SortedLevels([]), 'resistance_sorted': SortedLevels([])}
+
+        timestamps = klines.timestamp
+        closed = n - 1                      # Son mum oluşmakta
+        window_start = n - self.lookback
+        last_candidate = closed - 1 - self.window
+
+        # Önceki son kapanmış bar bu seride yoksa (ilk çağrı / kopukluk) tam kurulum
+        previous = self._previous_closed_index(timestamps, closed)
+        changed = previous is None
+        if previous is None:
+            self._reset()
+            self.full_rebuilds += 1
+            first_candidate = window_start
+        else:
+            self.incremental_updates += 1
+            # previous'a kadar kapanmış barlarla onaylanabilen adaylar zaten tarandı
+            first_candidate = previous - self.window + 1
+
+        first_candidate = max(first_candidate, window_start, self.window)
+        volumes = klines.volume[:closed].tolist()
+
+        # Sağ bağlamı önceki hesapta eksik olan pivotların volume skoru yeni barlarla güncellenir
+        if previous is not None and previous < closed - 1:
+            for pivots, values in ((self._highs, klines.high), (self._lows, klines.low)):
+                for position in range(len(pivots) - 1, -1, -1):
+                    index = int(np.searchsorted(timestamps, pivots[position]['timestamp']))
+                    if index + IMPORTANCE_CONTEXT <= previous + 1:
+                        break   # Bu ve daha eski pivotların skoru kesinleşmiş
+                    pivots[position] = self._pivot(klines, volumes, index, values)
+                    changed = True
+
+        if last_candidate >= first_candidate:
+            # Sadece yeni onaylanabilen adaylar taranır - komşularıyla birlikte dilim
+            offset = first_candidate - self.window
+            segment = slice(offset, last_candidate + self.window + 1)
+            for pivots, values, finder in ((self._highs, klines.high, swing_highs),
+                                           (self._lows, klines.low, swing_lows)):
+                for index in finder(values[segment], self.window).tolist():
+                    pivots.append(self._pivot(klines, volumes, index + offset, values))
+                    self.pivots_added += 1
+                    changed = True
+
+        self._last_closed_ts = int(timestamps[closed - 1])
+
+        # Lookback penceresinden çıkan pivotlar
+        start_ts = int(timestamps[window_start])
+        for pivots in (self._highs, self._lows):
+            while pivots and pivots[0]['timestamp'] < start_ts:
+                pivots.popleft()
+                self.pivots_expired += 1
+                changed = True
+
+        if changed or self._levels is None:
+            self._levels = level_set(list(self._lows), list(self._highs), self.tolerance, self.count)
+            self.level_rebuilds += 1
+
+        return _copy_level_set(self._levels)
+
+    def _previous_closed_index(self, timestamps: np.ndarray, closed: int):
+        """Önceki güncellemedeki son kapanmış barın bu serideki indeksi - yoksa None"""
+        if self._last_closed_ts is None:
+            return None
+        k = int(np.searchsorted(timestamps, self._last_closed_ts))
+        if k >= closed or timestamps[k] != self._last_closed_ts:
+            return None
+        return k
+
+    def _pivot(self, klines: CandleSeries, volumes, index: int, values: np.ndarray) -> Dict:
+        importance = volume_importance(volumes, index)
+        return {
+            'level': float(values[index]),
+            'timestamp': int(klines.timestamp[index]),
+            'touches': 1,
+            'volume': float(klines.volume[index]),
+            'volume_importance': importance,
+            'volume_cluster_strength': importance['cluster_strength']
+        }
+
+    def _reset(self):
+        self._highs.clear()
+        self._lows.clear()
+        self._last_closed_ts = None
+        self._levels = None
+
+    def get_stats(self) -> Dict:
+        return {
+            'lookback': self.lookback,
+            'resistance_pivots': len(self._highs),
+            'support_pivots': len(self._lows),
+            'full_rebuilds': self.full_rebuilds,
+            'incremental_updates': self.incremental_updates,
+            'level_rebuilds': self.level_rebuilds,
+            'pivots_added': self.pivots_added,
+            'pivots_expired': self.pivots_expired
+        }
@@ -0,0 +1,203 @@
+"""
+S/R Seviye Konsolidasyonu - Sweep Line
+Pivotlar fiyata göre bir kez sıralanır, yüzde toleransla tek geçişte birleştirilir
+Her O(n²) "her pivot x her küme" karşılaştırmasının yerine geçer
+Seçilen seviyeler ayrıca fiyat sıralı tutulur - kırılım araması ikili arama (bisect)
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence
+
+
+def _importance(level: Dict) -> float:
+    return level['volume_importance']['importance_score']
+
+
+def volume_importance(volumes: Sequence[float], pivot_index: int, lookback_window: int = 5) -> Dict:
+    """
+    🎯 Volume Cluster Analysis - S/R Seviyelerin Önemini Hesapla
+    Swing High/Low etrafındaki volume kümelenmesini analiz eder
+    volumes: mum hacimleri (liste), pivot_index bu listedeki pivot
+    """
+    if pivot_index < lookback_window or pivot_index >= len(volumes) - lookback_window:
+        return {'cluster_strength': 1.0, 'relative_volume': 1.0, 'importance_score': 1.0}
+
+    # Pivot noktası ve çevresindeki ±lookback_window volume'ler
+    pivot_volume = volumes[pivot_index]
+    surrounding_volumes = volumes[pivot_index - lookback_window:pivot_index + lookback_window + 1]
+
+    # Genel volume ortalaması (büyük pencere)
+    general_window = min(20, len(volumes))
+    start_idx = max(0, pivot_index - general_window)
+    end_idx = min(len(volumes), pivot_index + general_window)
+    general_volumes = volumes[start_idx:end_idx]
+
+    avg_general_volume = sum(general_volumes) / len(general_volumes) if general_volumes else 1
+    avg_surrounding_volume = sum(surrounding_volumes) / len(surrounding_volumes) if surrounding_volumes else 1
+
+    # Volume Cluster Strength: Çevre volume'ün genel volume'e oranı
+    cluster_strength = avg_surrounding_volume / avg_general_volume if avg_general_volume > 0 else 1.0
+
+    # Relative Volume: Pivot volume'ün çevre volume'e oranı
+    relative_volume = pivot_volume / avg_surrounding_volume if avg_surrounding_volume > 0 else 1.0
+
+    # Importance Score: Birleşik önem skoru (1.0-5.0 arası)
+    importance_score = min(5.0, (cluster_strength * 0.6 + relative_volume * 0.4))
+
+    return {
+        'cluster_strength': round(cluster_strength, 2),
+        'relative_volume': round(relative_volume, 2),
+        'importance_score': round(importance_score, 2),
+        'pivot_volume': pivot_volume,
+        'avg_surrounding_volume': round(avg_surrounding_volume, 2),
+        'avg_general_volume': round(avg_general_volume, 2)
+    }
+
+
+def consolidate_levels(levels: Sequence[Dict], tolerance: float = 0.015) -> List[Dict]:
+    """
+    Volume + importance ağırlıklı seviye birleştirme
+    - Fiyata göre sıralı tarama: sıradaki pivot, açık kümenin seviyesine tolerans içindeyse birleşir
+    - Seviye: volume * importance_score ağırlıklı ortalama
+    - touches ve volume toplanır, en yüksek volume_importance korunur
+    - timestamp: kümenin en eski pivotu
+    Dönüş fiyata göre artan sırada (girdi dict'leri değiştirilmez)
+    """
+    if not levels:
+        return []
+
+    consolidated = []
+    current = None
+
+    for level in sorted(levels, key=lambda item: item['level']):
+        price = level['level']
+
+        if current is not None and abs(price - current['level']) / current['level'] < tolerance:
+            current_weight = current['volume'] * _importance(current)
+            new_weight = level['volume'] * _importance(level)
+            total_weight = current_weight + new_weight
+
+            if total_weight > 0:
+                current['level'] = (current['level'] * current_weight + price * new_weight) / total_weight
+            current['touches'] += level.get('touches', 1)
+            current['volume'] = current['volume'] + level['volume']
+            current['timestamp'] = min(current['timestamp'], level['timestamp'])
+
+            # Volume importance'ı birleştir (daha yüksek olanı al)
+            if _importance(level) > _importance(current):
+                current['volume_importance'] = level['volume_importance']
+                current['volume_cluster_strength'] = level['volume_cluster_strength']
+            continue
+
+        current = dict(level)
+        consolidated.append(current)
+
+    return consolidated
+
+
+def calculate_priority(level: Dict) -> float:
+    """Öncelik: touches * volume_importance_score * volume"""
+    return level['touches'] * _importance(level) * (level['volume'] / 1000000)  # Volume normalizasyonu
+
+
+def top_levels(levels: Sequence[Dict], count: int = 6) -> List[Dict]:
+    """Volume Importance bazlı akıllı sıralama - en önemli 'count' seviye"""
+    return sorted(levels, key=calculate_priority, reverse=True)[:count]
+
+
+class SortedLevels:
+    """
+    Fiyata göre artan sıralı seviyeler
+    En yakın kırılmış seviye her aday sıralanmadan ikili aramayla bulunur
+    """
+
+    def __init__(self, levels: Sequence[Dict], presorted: bool = False):
+        self.levels = list(levels) if presorted else sorted(levels, key=lambda item: item['level'])
+        self.prices = [level['level'] for level in self.levels]
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def broken_resistance(self, price: float, tolerance: float) -> Optional[Dict]:
+        """price > level * (1 + tolerance) olan en yakın (en yüksek) seviye"""
+        upper = 1 + tolerance
+        j = min(bisect_left(self.prices, price / upper), len(self.prices) - 1)
+        # Eşikteki kayan nokta farkı için koşul doğrudan kontrol edilir
+        while j >= 0 and not price > self.prices[j] * upper:
+            j -= 1
+        return self.levels[j] if j >= 0 else None
+
+    def broken_support(self, price: float, tolerance: float) -> Optional[Dict]:
+        """price < level * (1 - tolerance) olan en yakın (en düşük) seviye"""
+        lower = 1 - tolerance
+        j = max(bisect_right(self.prices, price / lower) - 1, 0)
+        while j < len(self.prices) and not price < self.prices[j] * lower:
+            j += 1
+        return self.levels[j] if j < len(self.prices) else None
+
+
+def level_set(support: Sequence[Dict], resistance: Sequence[Dict],
+              tolerance: float = 0.015, count: int = 6) -> Dict:
+    """
+    Pivotlardan S/R seviye seti
+    - support_levels / resistance_levels: öncelik sıralı ilk 'count' seviye
+    - support_sorted / resistance_sorted: aynı seviyeler fiyat sıralı (SortedLevels)
+    Konsolidasyon zaten fiyat sıralı döner - ikinci sıralama gerekmez
+    """
+    result = {}
+    for side, pivots in (('support', support), ('resistance', resistance)):
+        consolidated = consolidate_levels(pivots, tolerance=tolerance)
+        top = top_levels(consolidated, count)
+        chosen = {id(level) for level in top}
+        result[f'{side}_levels'] = top
+        result[f'{side}_sorted'] = SortedLevels([level for level in consolidated if id(level) in chosen],
+                                                presorted=True)
+    return result
+
+
+def sorted_levels_by_priority(sr_levels: Dict) -> Dict[str, Dict[str, SortedLevels]]:
+    """'priority' etiketli seviye listelerinden öncelik başına fiyat sıralı kitaplar"""
+    books = {}
+    for side in ('support_levels', 'resistance_levels'):
+        grouped = {}
+        for level in sr_levels.get(side, []):
+            grouped.setdefault(level.get('priority'), []).append(level)
+        for priority, levels in grouped.items():
+            books.setdefault(priority, {})[side] = SortedLevels(levels)
+    return books
+
+
+def cluster_equal_levels(swings: Sequence[Dict], tolerance: float) -> List[Dict]:
+    """
+    Equal High/Low kümeleri (liquidity havuzları)
+    swings: {'price', 'index', 'volume'} - fiyata göre sıralanıp tek geçişte gruplanır
+    Her swing tam olarak bir kümeye girer - tekrar eden küme yok
+    Dönüş en eski swing indeksine göre sıralı: {'level', 'touches', 'volume', 'first_index'}
+    """
+    if not swings:
+        return []
+
+    clusters = []
+    anchor = None
+    members = []
+
+    def close_cluster():
+        clusters.append({
+            'level': sum(s['price'] for s in members) / len(members),
+            'touches': len(members),
+            'volume': sum(s['volume'] for s in members),
+            'first_index': min(s['index'] for s in members)
+        })
+
+    for swing in sorted(swings, key=lambda item: item['price']):
+        if anchor is not None and abs(swing['price'] - anchor) / anchor < tolerance:
+            members.append(swing)
+            continue
+        if members:
+            close_cluster()
+        anchor = swing['price']
+        members = [swing]
+
+    close_cluster()
+    clusters.sort(key=lambda cluster: cluster['first_index'])
+    return clusters
@@ -0,0 +1,89 @@
+"""
+Swing High/Low Tespiti - O(n)
+Kayan pencere max/min (van Herk / Gil-Werman, NumPy) ile pivot indeksleri
+Tüm stratejilerin iç içe döngülü swing taramalarının ortak yerine geçer
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+
+def sliding_max(values: Sequence[float], window: int) -> np.ndarray:
+    """
+    out[j] = max(values[j:j + window]), j = 0 .. n - window
+    Blok başına ön ek / son ek maksimumları - pencere genişliğinden bağımsız O(n)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if window < 1:
+        raise ValueError("Pencere genişliği en az 1 olmalı")
+    if n < window:
+        return np.empty(0)
+    if window == 1:
+        return values.copy()
+
+    # Blok uzunluğunun katına -inf ile tamamla
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[:n] = values
+    grid = padded.reshape(blocks, window)
+
+    prefix = np.maximum.accumulate(grid, axis=1).ravel()
+    suffix = np.maximum.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    starts = np.arange(n - window + 1)
+    return np.maximum(suffix[starts], prefix[starts + window - 1])
+
+
+def sliding_min(values: Sequence[float], window: int) -> np.ndarray:
+    """out[j] = min(values[j:j + window])"""
+    return -sliding_max(-np.asarray(values, dtype=np.float64), window)
+
+
+def _neighbour_extremes(values: np.ndarray, left: int, right: int, use_max: bool):
+    """
+    Her aday pivot i (left <= i < n - right) için sol ve sağ komşu penceresinin uç değeri
+    Sol: values[i - left:i], Sağ: values[i + 1:i + right + 1]
+    """
+    slide = sliding_max if use_max else sliding_min
+    n = len(values)
+    candidates = np.arange(left, n - right)
+    left_ext = slide(values, left)[candidates - left]
+    right_ext = slide(values, right)[candidates + 1]
+    extreme = np.maximum(left_ext, right_ext) if use_max else np.minimum(left_ext, right_ext)
+    return candidates, extreme
+
+
+def swing_highs(values: Sequence[float], left: int, right: int = None, strict: bool = False) -> np.ndarray:
+    """
+    Swing high indeksleri: solda 'left', sağda 'right' komşuya göre tepe
+    strict=False: hiçbir komşu daha yüksek değil (values[i] >= komşular)
+    strict=True: tüm komşulardan kesin yüksek (values[i] > komşular)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    right = left if right is None else right
+    if len(values) < left + right + 1:
+        return np.empty(0, dtype=np.int64)
+
+    candidates, neighbour_max = _neighbour_extremes(values, left, right, use_max=True)
+    current = values[candidates]
+    mask = current > neighbour_max if strict else current >= neighbour_max
+    return candidates[mask]
+
+
+def swing_lows(values: Sequence[float], left: int, right: int = None, strict: bool = False) -> np.ndarray:
+    """
+    Swing low indeksleri
+    strict=False: hiçbir komşu daha düşük değil (values[i] <= komşular)
+    strict=True: tüm komşulardan kesin düşük (values[i] < komşular)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    right = left if right is None else right
+    if len(values) < left + right + 1:
+        return np.empty(0, dtype=np.int64)
+
+    candidates, neighbour_min = _neighbour_extremes(values, left, right, use_max=False)
+    current = values[candidates]
+    mask = current < neighbour_min if strict else current <= neighbour_min
+    return candidates[mask]
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Binance WebSocket Fiyat Akışı Testleri
+Yerel WebSocket sunucusu (Binance combined stream yerine) ile:
+akıştan fiyat, yeniden bağlanma, akış sağlıksızken REST'e düşme, kline upsert'leri
+"""
+
+import base64
+import contextlib
+import hashlib
+import io
+import json
+import socket
+import struct
+import threading
+import time
+
+from binance_websocket import BinanceWebSocketStreamer, BinanceKlineStreamer
+from binance_data import BinanceDataProvider
+from candle_store import CandleStore
+from candles import CandleSeries
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+SYMBOLS = ['BTCUSDT', 'ETHUSDT']
+
+def ticker_message(symbol, price):
+    return {'stream': f'{symbol.lower()}@ticker',
+            'data': {'e': '24hrTicker', 's': symbol, 'c': str(price), 'P': '1.25', 'q': '5000000',
+                     'h': str(price * 1.02), 'l': str(price * 0.98)}}
+
+def book_message(symbol, bid, ask):
+    return {'stream': f'{symbol.lower()}@bookTicker',
+            'data': {'s': symbol, 'b': str(bid), 'B': '1.0', 'a': str(ask), 'A': '2.0'}}
+
+class LocalStreamServer:
+    """
+    Minimal RFC 6455 sunucusu - her bağlantıya mesajları gönderir
+    drop_first=True: ilk bağlantı mesajlardan sonra kapatılır (kopma simülasyonu)
+    """
+
+    def __init__(self, messages, drop_first=False):
+        self.messages = messages
+        self.drop_first = drop_first
+        self.paths = []
+        self._stop = threading.Event()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen(5)
+        self._sock.settimeout(0.1)
+        self.port = self._sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}"
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break   # Sunucu kapatıldı
+            self.paths.append(None)
+            threading.Thread(target=self._handle, args=(conn, len(self.paths) - 1), daemon=True).start()
+
+    def _handle(self, conn, number):
+        request = b''
+        while b'\r\n\r\n' not in request:
+            request += conn.recv(4096)
+        lines = request.decode().split('\r\n')
+        self.paths[number] = lines[0].split(' ')[1]
+        key = next(line.split(':', 1)[1].strip() for line in lines if line.lower().startswith('sec-websocket-key'))
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        conn.sendall(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+
+        for message in self.messages:
+            payload = json.dumps(message).encode()
+            header = bytes([0x81, len(payload)]) if len(payload) < 126 else \
+                bytes([0x81, 126]) + struct.pack('!H', len(payload))
+            conn.sendall(header + payload)
+
+        if self.drop_first and number == 0:
+            conn.sendall(bytes([0x88, 0x00]))  # Close frame
+            time.sleep(0.05)
+            conn.close()
+            return
+
+        # Bağlantı açık kalır, yeni mesaj gönderilmez - istemcinin close frame'ine cevap verilir
+        conn.settimeout(0.1)
+        while not self._stop.is_set():
+            try:
+                data = conn.recv(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if not data or data[0] & 0x0f == 0x8:
+                try:
+                    conn.sendall(bytes([0x88, 0x00]))
+                except OSError:
+                    pass
+                break
+        conn.close()
+
+    def close(self):
+        self._stop.set()
+        self._sock.close()
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+def make_provider(streamer, rest_calls):
+    provider = BinanceDataProvider()
+    provider.symbols = list(SYMBOLS)
+
+    def fake_request(endpoint, params=None, signed=False):
+        rest_calls.append((endpoint, params))
+        return [{'symbol': symbol, 'lastPrice': '10.0', 'priceChangePercent': '0.5', 'volume': '100',
+                 'highPrice': '11.0', 'lowPrice': '9.0'} for symbol in SYMBOLS]
+
+    provider._make_request = fake_request
+    provider.attach_price_stream(streamer)
+    return provider
+
+def kline_message(symbol, interval, open_time, close, closed):
+    return {'stream': f'{symbol.lower()}@kline_{interval}',
+            'data': {'e': 'kline', 's': symbol,
+                     'k': {'t': open_time, 'i': interval, 'o': '100.0', 'h': str(max(close, 101.0)),
+                           'l': '99.0', 'c': str(close), 'v': '12.5', 'x': closed}}}
+
+def backfill(count, start=1700000000000, step=900000):
+    """REST ile doldurulmuş gibi seri: son mum oluşmakta"""
+    return CandleSeries([start + i * step for i in range(count)], [100.0] * count, [101.0] * count,
+                        [99.0] * count, [100.0] * count, [10.0] * count)
+
+def all_messages():
+    return [ticker_message('BTCUSDT', 65000.0), book_message('BTCUSDT', 64999.5, 65000.5),
+            ticker_message('ETHUSDT', 3200.0), book_message('ETHUSDT', 3199.9, 3200.1)]
+
+def test_prices_served_from_stream_without_rest():
+    """Sağlıklı akışta get_crypto_prices REST'e hiç gitmez, fiyat yaşı döner"""
+    server = LocalStreamServer(all_messages())
+    streamer = BinanceWebSocketStreamer(SYMBOLS, base_url=server.url).start()
+    try:
+        assert wait_until(lambda: streamer.messages >= 4)
+        assert server.paths[0] == ('/stream?streams=btcusdt@ticker/btcusdt@bookTicker/'
+                                   'ethusdt@ticker/ethusdt@bookTicker')
+
+        rest_calls = []
+        provider = make_provider(streamer, rest_calls)
+        prices = provider.get_crypto_prices()
+
+        assert rest_calls == []
+        assert prices['BTC/USD']['price'] == 65000.0
+        assert prices['BTC/USD']['bid'] == 64999.5 and prices['BTC/USD']['ask'] == 65000.5
+        assert prices['ETH/USD']['source'] == 'binance_websocket'
+        assert 0 <= prices['ETH/USD']['price_age'] < 5 and prices['ETH/USD']['stale'] is False
+    finally:
+        streamer.stop_stream()
+        server.close()
+
+def test_price_log_rate_limited_per_symbol():
+    """Aynı saniyedeki yüzlerce ticker mesajı sembol başına tek fiyat logu yazar"""
+    streamer = BinanceWebSocketStreamer(SYMBOLS)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for i in range(200):
+            for symbol in SYMBOLS:
+                streamer.on_message(None, json.dumps(ticker_message(symbol, 100.0 + i)))
+    lines = [line for line in output.getvalue().splitlines() if line.startswith('💰')]
+    assert len(lines) == len(SYMBOLS)
+    assert streamer.messages == 400 and streamer.prices['BTCUSDT']['price'] == 299.0
+
+def test_reconnects_with_backoff():
+    """Sunucu bağlantıyı kapatınca akış yeniden bağlanır"""
+    server = LocalStreamServer(all_messages(), drop_first=True)
+    streamer = BinanceWebSocketStreamer(SYMBOLS, base_url=server.url)
+    streamer.initial_backoff = 0.05
+    streamer.start()
+    try:
+        assert wait_until(lambda: streamer.connects >= 2)
+        assert streamer.reconnects >= 1
+        assert wait_until(streamer.is_healthy)
+    finally:
+        streamer.stop_stream()
+        server.close()
+    assert not streamer._thread.is_alive()
+
+def test_falls_back_to_rest_when_stream_unhealthy():
+    """Mesaj kesilince (stale) ve akış hiç yokken REST kullanılır - sadece öncelikli semboller"""
+    server = LocalStreamServer(all_messages())
+    streamer = BinanceWebSocketStreamer(SYMBOLS, base_url=server.url, stale_after=0.2).start()
+    try:
+        assert wait_until(lambda: streamer.messages >= 4)
+        rest_calls = []
+        provider = make_provider(streamer, rest_calls)
+        assert provider.get_crypto_prices()['BTC/USD']['source'] == 'binance_websocket'
+
+        time.sleep(0.3)
+        assert not streamer.is_healthy()
+        prices = provider.get_crypto_prices()
+        assert len(rest_calls) == 1
+        endpoint, params = rest_calls[0]
+        assert endpoint == '/ticker/24hr' and json.loads(params['symbols']) == SYMBOLS
+        assert prices['BTC/USD']['price'] == 10.0
+    finally:
+        streamer.stop_stream()
+        server.close()
+
+def test_store_upsert_patches_series():
+    """Oluşan mum yerinde güncellenir, yeni mum eklenir, eski mum / kopukluk işlenmez"""
+    store = CandleStore()
+    series = backfill(50)
+    store.put('BTCUSDT', '15m', series, 50)
+    last = int(series.timestamp[-1])
+
+    before = store.get('BTCUSDT', '15m', 50)
+    assert store.upsert('BTCUSDT', '15m', last, 100.0, 103.0, 99.0, 102.0, 20.0) == 'updated'
+    assert store.get('BTCUSDT', '15m', 50).close[-1] == 102.0
+
+    assert store.upsert('BTCUSDT', '15m', last + 900000, 102.0, 102.5, 101.0, 101.5, 1.0) == 'appended'
+    after = store.get('BTCUSDT', '15m', 50)
+    assert len(after) == 50 and int(after.timestamp[-1]) == last + 900000
+    assert len(before) == 50 and int(before.timestamp[-1]) == last   # Eski görünüm kaymaz
+
+    # Kapasite dolana kadar ekle - pencere korunur
+    for i in range(2, 200):
+        store.upsert('BTCUSDT', '15m', last + i * 900000, 1.0, 1.0, 1.0, float(i), 1.0)
+    latest = store.get('BTCUSDT', '15m', 50)
+    assert len(latest) == 50 and latest.close[-1] == 199.0
+    assert latest.timestamp.tolist() == sorted(latest.timestamp.tolist())
+
+    assert store.upsert('BTCUSDT', '15m', last, 1.0, 1.0, 1.0, 1.0, 1.0) == 'ignored'
+    assert store.upsert('ETHUSDT', '15m', last, 1.0, 1.0, 1.0, 1.0, 1.0) == 'skipped'
+    assert store.upsert('BTCUSDT', '15m', last + 300 * 900000, 1.0, 1.0, 1.0, 1.0, 1.0) == 'gap'
+    assert store.get('BTCUSDT', '15m', 50) is None     # Kopukluk: REST ile tamamlanacak
+
+def test_store_upsert_keeps_published_forming_bar():
+    """Okuyucuya verilmiş görünümdeki oluşan mum sonraki güncellemeyle değişmez (copy-on-write)"""
+    store = CandleStore()
+    series = backfill(50)
+    store.put('BTCUSDT', '15m', series, 50)
+    last = int(series.timestamp[-1])
+
+    store.upsert('BTCUSDT', '15m', last, 100.0, 101.0, 99.0, 100.5, 10.0)
+    published = store.get('BTCUSDT', '15m', 50)
+    row = [float(getattr(published, field)[-1]) for field in ('open', 'high', 'low', 'close', 'volume')]
+
+    assert store.upsert('BTCUSDT', '15m', last, 100.0, 104.0, 98.0, 103.0, 30.0) == 'updated'
+    assert store.upsert('BTCUSDT', '15m', last, 100.0, 105.0, 97.0, 104.0, 40.0) == 'updated'
+    assert [float(getattr(published, field)[-1]) for field in ('open', 'high', 'low', 'close', 'volume')] == row
+
+    latest = store.get('BTCUSDT', '15m', 50)
+    assert (latest.high[-1], latest.low[-1], latest.close[-1], latest.volume[-1]) == (105.0, 97.0, 104.0, 40.0)
+    assert latest.close[:-1].tolist() == published.close[:-1].tolist()
+
+def test_kline_stream_replaces_rest_polling():
+    """Doldurmadan sonra get_klines REST'e gitmez, kapanan mum olayı yayınlanır"""
+    series = backfill(300)
+    last = int(series.timestamp[-1])
+    messages = all_messages() + [
+        kline_message('BTCUSDT', '15m', last, 104.0, False),
+        kline_message('BTCUSDT', '15m', last, 105.0, True),
+        kline_message('BTCUSDT', '15m', last + 900000, 106.0, False)
+    ]
+    server = LocalStreamServer(messages)
+
+    rest_calls = []
+    provider = make_provider(None, rest_calls)
+    provider.candle_store.put('BTCUSDT', '15m', series, 300)
+
+    streamer = BinanceKlineStreamer(provider.candle_store, SYMBOLS, ['15m', '4h'], base_url=server.url)
+    closed = []
+    streamer.on_candle_closed(lambda symbol, interval, candle: closed.append((symbol, interval, candle)))
+    provider.attach_price_stream(streamer)
+    streamer.start()
+    try:
+        assert wait_until(lambda: streamer.kline_events >= 3)
+        assert 'btcusdt@kline_15m' in server.paths[0] and 'ethusdt@kline_4h' in server.paths[0]
+
+        klines = provider.get_klines('BTC/USD', '15m', 100)
+        assert len(klines) == 100
+        assert int(klines.timestamp[-2]) == last and klines.close[-2] == 105.0
+        assert int(klines.timestamp[-1]) == last + 900000 and klines.close[-1] == 106.0
+        assert provider.get_crypto_prices()['BTC/USD']['source'] == 'binance_websocket'
+        assert rest_calls == []
+
+        assert closed == [('BTCUSDT', '15m', {'timestamp': last, 'open': 100.0, 'high': 105.0,
+                                               'low': 99.0, 'close': 105.0, 'volume': 12.5})]
+        assert provider.candle_store.get_stats()['stream_upserts'] == 3
+    finally:
+        streamer.stop_stream()
+        server.close()
+
+if __name__ == "__main__":
+    test_prices_served_from_stream_without_rest()
+    test_price_log_rate_limited_per_symbol()
+    test_reconnects_with_backoff()
+    test_falls_back_to_rest_when_stream_unhealthy()
+    test_store_upsert_patches_series()
+    test_store_upsert_keeps_published_forming_bar()
+    test_kline_stream_replaces_rest_polling()
+    print("✅ Binance fiyat akışı testleri geçti")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diskteki Mum Arşivi Testleri
+Append-only binary dosya, sadece kapanmış mumlar, yarım kayıt toleransı,
+warm restart'ta sadece eksik mumların indirilmesi (kayıtlı /klines fixture'ı ile, ağsız)
+"""
+
+import json
+import shutil
+import tempfile
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from http_client import HTTPResponse
+from binance_data import BinanceDataProvider
+from candle_archive import CandleArchive, RECORD_DTYPE
+from candles import CandleSeries, INTERVAL_MS, bar_open_time
+from rate_limiter import WeightedRateLimiter
+
+STEP_4H = INTERVAL_MS['4h']
+
+def kline_fixture(count, interval='4h', end_ms=None):
+    """Binance /klines satırları - son satır şu an oluşan mum"""
+    step = INTERVAL_MS[interval]
+    last_open = bar_open_time(end_ms or int(time.time() * 1000), interval)
+    rows = []
+    price = 100.0
+    for i in range(count):
+        open_time = last_open - (count - 1 - i) * step
+        close = price + ((i * 7919) % 13 - 6) * 0.25
+        rows.append([open_time, f"{price:.2f}", f"{max(price, close) + 0.5:.2f}", f"{min(price, close) - 0.5:.2f}",
+                     f"{close:.2f}", f"{100 + i % 17:.1f}", open_time + step - 1, "0", 10, "0", "0", "0"])
+        price = close
+    return rows
+
+class FixtureHTTP:
+    """/klines isteklerini fixture satırlarından yanıtlar - Binance startTime/limit semantiği"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, params=None):
+        query = {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+        self.requests.append(query)
+        limit = int(query.get('limit', 500))
+        if 'startTime' in query:
+            rows = [row for row in self.rows if row[0] >= int(query['startTime'])][:limit]
+        else:
+            rows = self.rows[-limit:]
+        return HTTPResponse(200, {}, json.dumps(rows).encode(), url)
+
+def make_provider(http, archive):
+    provider = BinanceDataProvider()
+    provider.http = http
+    provider.rate_limiter = WeightedRateLimiter(capacity=5000)
+    provider.attach_archive(archive)
+    return provider
+
+def test_append_only_closed_candles_and_reload():
+    directory = tempfile.mkdtemp()
+    try:
+        archive = CandleArchive(directory)
+        series = CandleSeries.from_binance(kline_fixture(50))
+        now_ms = int(series.timestamp[-1]) + 1000     # Son mum oluşuyor
+
+        assert archive.append('BTCUSDT', '4h', series, now_ms) == 49
+        assert archive.append('BTCUSDT', '4h', series, now_ms) == 0      # Tekrar yazılmaz
+        assert archive.path('BTCUSDT', '4h').stat().st_size == 49 * RECORD_DTYPE.itemsize
+
+        loaded = CandleArchive(directory).load('BTCUSDT', '4h', 20)
+        assert loaded == series[29:49]
+
+        # Mum kapanınca sadece o eklenir
+        assert archive.append('BTCUSDT', '4h', series, now_ms + STEP_4H) == 1
+        assert archive.last_timestamp('BTCUSDT', '4h') == int(series.timestamp[-1])
+    finally:
+        shutil.rmtree(directory)
+
+def test_partial_record_and_gap_handling():
+    directory = tempfile.mkdtemp()
+    try:
+        archive = CandleArchive(directory)
+        series = CandleSeries.from_binance(kline_fixture(30))
+        archive.append('ETHUSDT', '4h', series[:20], int(series.timestamp[20]))
+
+        # Çökme: yarım kalmış kayıt - yok sayılır, sonraki append üzerine yazar
+        with open(archive.path('ETHUSDT', '4h'), 'ab') as f:
+            f.write(b'\x00' * 17)
+        archive = CandleArchive(directory)
+        assert len(archive.load('ETHUSDT', '4h')) == 20
+        assert archive.append('ETHUSDT', '4h', series, int(series.timestamp[-1]) + 1) == 9
+        assert archive.load('ETHUSDT', '4h') == series[:29]
+
+        # Stream'den kopuk mum yazılmaz, örtüşmeyen REST serisi arşivi sıfırdan yazar
+        far = int(series.timestamp[-1]) + 10 * STEP_4H
+        candle = {'timestamp': far, 'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0}
+        assert archive.append_candle('ETHUSDT', '4h', candle) == 0
+        later = CandleSeries.from_binance(kline_fixture(5, end_ms=far))
+        assert archive.append('ETHUSDT', '4h', later, far + 1) == 4
+        assert archive.load('ETHUSDT', '4h') == later[:4]
+    finally:
+        shutil.rmtree(directory)
+
+def test_compaction_keeps_recent_records():
+    directory = tempfile.mkdtemp()
+    try:
+        archive = CandleArchive(directory, max_records=100, keep_records=60)
+        series = CandleSeries.from_binance(kline_fixture(150))
+        for end in range(10, 151, 10):
+            archive.append('BNBUSDT', '4h', series[:end], int(series.timestamp[end - 1]) + STEP_4H)
+        loaded = archive.load('BNBUSDT', '4h')
+        assert archive.compactions >= 1 and len(loaded) <= 100
+        assert loaded == series[150 - len(loaded):]
+    finally:
+        shutil.rmtree(directory)
+
+def test_warm_restart_fetches_only_the_gap():
+    """İlk çalıştırma tam çeker ve arşivler; yeniden başlatma sadece kesinti süresindeki mumları indirir"""
+    directory = tempfile.mkdtemp()
+    try:
+        rows = kline_fixture(400)
+
+        # İlk çalıştırma: 6 mum önce kapanmış (kesinti öncesi durum)
+        before = FixtureHTTP(rows[:-6])
+        first = make_provider(before, CandleArchive(directory))
+        first.get_klines('BTC/USD', '4h', 200)
+        assert len(before.requests) == 1 and before.requests[0]['limit'] == '200'
+
+        # Yeniden başlatma: boş depo, aynı arşiv
+        after = FixtureHTTP(rows)
+        restarted = make_provider(after, CandleArchive(directory))
+        start = time.perf_counter()
+        klines = restarted.get_klines('BTC/USD', '4h', 200)
+        elapsed = time.perf_counter() - start
+
+        assert len(after.requests) == 1
+        request = after.requests[0]
+        assert int(request['startTime']) == rows[-7][0] and int(request['limit']) <= 10
+        assert klines == CandleSeries.from_binance(rows[-200:])
+        print(f"⚡ Warm restart: 1 istek ({request['limit']} mum), {elapsed * 1000:.1f}ms")
+
+        # Aynı pencere artık depodan - istek yok
+        restarted.get_klines('BTC/USD', '4h', 200)
+        assert len(after.requests) == 1
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    test_append_only_closed_candles_and_reload()
+    test_partial_record_and_gap_handling()
+    test_compaction_keeps_recent_records()
+    test_warm_restart_fetches_only_the_gap()
+    print("✅ Mum arşivi testleri geçti")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mum Sınırına Hizalı Cache Süresi Testleri
+Kapanmış geçmiş mum kapanışında eskir, oluşan mum interval'e orantılı aralıkla yenilenir
+"""
+
+import candle_store
+from candle_store import CandleStore, CLOSE_SETTLE_SECONDS
+from candles import CandleSeries, INTERVAL_MS, bar_open_time
+
+WEEK = 7 * 24 * 3600
+MONDAY = 1700438400  # 2023-11-20 00:00 UTC - haftalık mum açılışı
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+def series_at(now, interval, count=10):
+    step = INTERVAL_MS[interval]
+    last_open = bar_open_time(int(now * 1000), interval)
+    return CandleSeries.from_dicts([{'timestamp': last_open - (count - 1 - i) * step, 'open': 1.0, 'high': 1.0,
+                                     'low': 1.0, 'close': 1.0, 'volume': 1.0} for i in range(count)])
+
+def count_refreshes(interval, poll_seconds=60, duration=WEEK):
+    """duration boyunca poll_seconds'da bir get - miss olursa yeniden kaydedilir"""
+    clock = FakeClock(MONDAY + 1800)
+    original = candle_store.time
+    candle_store.time = clock
+    try:
+        store = CandleStore(max_age=120)
+        store.put('BTCUSDT', interval, series_at(clock.now, interval), 10)
+        refreshes = 0
+        end = clock.now + duration
+        while clock.now < end:
+            clock.now += poll_seconds
+            if store.get('BTCUSDT', interval, 10) is None:
+                store.put('BTCUSDT', interval, series_at(clock.now, interval), 10)
+                refreshes += 1
+        return refreshes
+    finally:
+        candle_store.time = original
+
+def test_expiry_aligned_to_bar_close():
+    store = CandleStore(max_age=120)
+
+    # Haftanın ortasında çekilen 1w seri: oluşan mum 7 saatte bir yenilenir
+    fetched = MONDAY + 3 * 24 * 3600
+    assert store.expires_at('1w', fetched) == fetched + 7 * 3600
+
+    # Kapanışa 1 saat kala çekildiyse kapanış anında (+ pay) eskir
+    fetched = MONDAY + WEEK - 3600
+    assert store.expires_at('1w', fetched) == MONDAY + WEEK + CLOSE_SETTLE_SECONDS
+
+    # 4h: 10 dk, 15m: max_age (2 dk)
+    fetched = MONDAY + 60
+    assert store.expires_at('4h', fetched) == fetched + 600
+    assert store.expires_at('15m', fetched) == fetched + 120
+
+    # Fallback seri ve bilinmeyen interval sabit max_age
+    assert store.expires_at('1w', fetched, source='fallback') == fetched + 120
+    assert store.expires_at('7m', fetched) == fetched + 120
+
+def test_new_bar_is_picked_up_right_after_close():
+    """4h mum kapanınca seri bir sonraki yenileme aralığını beklemeden eskir"""
+    clock = FakeClock(MONDAY + 4 * 3600 - 30)
+    original = candle_store.time
+    candle_store.time = clock
+    try:
+        store = CandleStore(max_age=120)
+        store.put('BTCUSDT', '4h', series_at(clock.now, '4h'), 10)
+        clock.now = MONDAY + 4 * 3600 + 1
+        assert store.get('BTCUSDT', '4h', 10) is not None
+        clock.now = MONDAY + 4 * 3600 + CLOSE_SETTLE_SECONDS
+        assert store.get('BTCUSDT', '4h', 10) is None
+    finally:
+        candle_store.time = original
+
+def test_weekly_refreshes_per_week():
+    """Eski sabit 120s TTL: dakikalık sorguda haftada ~5040 yenileme"""
+    weekly = count_refreshes('1w')
+    daily = count_refreshes('1d')
+    four_hour = count_refreshes('4h')
+    print(f"⚡ Haftalık yenileme: 1w {weekly}, 1d {daily}, 4h {four_hour} (eski: ~{WEEK // 120})")
+    assert weekly <= 30
+    assert daily <= 7 * 24 + 7
+    assert four_hour <= 7 * 24 * 6 + 42
+
+if __name__ == "__main__":
+    test_expiry_aligned_to_bar_close()
+    test_new_bar_is_picked_up_right_after_close()
+    test_weekly_refreshes_per_week()
+    print("✅ Mum sınırı cache testleri geçti")
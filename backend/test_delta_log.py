@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sürümlü Delta Endpoint Testleri
+?since=<sürüm> sadece değişenleri döndürür, çok geride kalan istemci tam senkron alır
+"""
+
+import json
+import threading
+from http.client import HTTPConnection
+
+import main
+from app_context import AppContext
+from delta_log import DeltaLog
+from pooled_server import PooledHTTPServer
+from signal_scheduler import SignalScheduler
+from signal_store import SignalStore
+
+def make_signal(symbol, price):
+    return {'symbol': symbol, 'asset_type': 'crypto', 'current_price': price, 'status': 'ACTIVE'}
+
+def request(port, path):
+    connection = HTTPConnection('127.0.0.1', port, timeout=5)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+def get_json(port, path):
+    status, body = request(port, path)
+    assert status == 200, body
+    return body
+
+def test_delta_merge_rules():
+    log = DeltaLog()
+    log.record(1, added=['a', 'b'])
+    log.record(2, updated=['a'])
+    log.record(3)                             # Değişiklik yok - kayıt yok, sürüm ilerler
+    log.record(4, added=['c'], removed=['b'])
+    log.record(5, removed=['c'])              # Eklenip silinen istemciye gitmez
+    log.record(4, added=['x'])                # Eski sürüm yok sayılır
+
+    changes, version = log.since(0)
+    assert version == 5
+    assert changes == {'added': {'a'}, 'updated': set(), 'removed': set()}
+
+    changes, _ = log.since(1)
+    assert changes == {'added': set(), 'updated': {'a'}, 'removed': {'b'}}
+
+    changes, _ = log.since(5)
+    assert changes == {'added': set(), 'updated': set(), 'removed': set()}
+
+    # Okuyucunun snapshot'ı günlükten geride: delta snapshot sürümünde kesilir
+    changes, version = log.since(1, until=2)
+    assert version == 2 and changes['updated'] == {'a'} and not changes['removed']
+
+    # Sunucu yeniden başladı (istemci sürümü ileride) -> tam senkron
+    assert log.since(9) is None
+
+def test_too_far_behind_needs_resync():
+    log = DeltaLog(max_entries=3)
+    for version in range(1, 6):
+        log.record(version, updated=['s'])
+    assert log.floor == 2
+    assert log.since(1) is None
+    assert log.since(2)[0]['updated'] == {'s'}
+    assert log.get_stats()['resyncs'] == 1
+
+def test_statistics_delta_only_new_trades():
+    history = [{'signal_id': f's{i}', 'result': 'TP_HIT'} for i in range(25)]
+    statistics = {'win_rate': 100.0, 'total_trades': 25, 'recent_history': history[-10:], 'history_version': 25}
+
+    response = main.build_statistics_delta(statistics, 25)
+    assert response['full'] is False and response['new_trades'] == []
+    assert 'recent_history' not in response
+
+    response = main.build_statistics_delta(statistics, 22)
+    assert [t['signal_id'] for t in response['new_trades']] == ['s22', 's23', 's24']
+
+    # recent_history'den fazla geride veya ileride -> tam yanıt
+    assert main.build_statistics_delta(statistics, 10)['full'] is True
+    assert main.build_statistics_delta(statistics, 30)['recent_history'] == history[-10:]
+    assert main.build_statistics_delta(statistics, -1)['full'] is True
+
+def test_signals_since_endpoint():
+    signals = {f'S{i}': make_signal(f'COIN{i}/USD', 100.0 + i) for i in range(10)}
+    scheduler = SignalScheduler(lambda: None, None, lambda: signals)
+    main.SIGNAL_SCHEDULER = scheduler
+    main.SIGNAL_DELTAS = DeltaLog()
+    scheduler.on_publish(main.record_signal_deltas)
+
+    context = AppContext({}, log=lambda _: None).build()
+    server = PooledHTTPServer(('127.0.0.1', 0), main.TradingSignalHandler, context=context, workers=2)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    port = server.server_address[1]
+    try:
+        scheduler.run_generation_once()
+        first = get_json(port, '/signals')
+        assert first['full'] is True and first['count'] == 10
+        version = first['version']
+
+        # Düz /signals ile tam senkron aynı listeyi ve sürümü verir
+        resync = get_json(port, '/signals?since=999')
+        assert resync['full'] is True and resync['version'] == version
+        assert resync['signals'] == first['signals']
+
+        # Değişiklik yok: sürüm ilerlemez, boş delta
+        scheduler.run_generation_once()
+        assert scheduler.get_snapshot().version == version
+        steady = get_json(port, f'/signals?since={version}')
+        assert steady['full'] is False and steady['added'] == steady['updated'] == steady['removed'] == []
+        full_size = len(json.dumps(first))
+        steady_size = len(json.dumps(steady))
+        print(f"⚡ Tam yanıt {full_size} bayt, değişiklik yokken delta {steady_size} bayt")
+        assert steady_size * 5 < full_size
+
+        # Bir fiyat güncellemesi, bir kapanan, bir yeni sinyal
+        signals = dict(signals)
+        signals['S1'] = make_signal('COIN1/USD', 150.0)
+        del signals['S2']
+        signals['S10'] = make_signal('COIN10/USD', 110.0)
+        scheduler.run_generation_once()
+
+        delta = get_json(port, f'/signals?since={version}')
+        assert delta['full'] is False and delta['version'] == version + 1
+        assert [s['signal_id'] for s in delta['added']] == ['S10']
+        assert delta['updated'] == [dict(signals['S1'], signal_id='S1')]
+        assert delta['removed'] == ['S2']
+
+        # Negatif since -> tam senkron; tamsayı olmayan / boş since -> 400
+        assert get_json(port, '/signals?since=-1')['full'] is True
+        for path in ('/signals?since=abc', '/signals?since=', '/statistics?since=1.5'):
+            status, body = request(port, path)
+            assert status == 400 and 'since' in body['error']
+    finally:
+        main.SIGNAL_SCHEDULER = None
+        server.shutdown()
+        server.server_close()
+
+class FakeBinance:
+    def __init__(self, prices):
+        self.prices = prices
+
+    def get_crypto_prices(self):
+        return {symbol: {'price': price} for symbol, price in self.prices.items()}
+
+def test_price_tick_without_moves_is_empty_delta():
+    prices = {f'COIN{i}/USD': 100.0 + i for i in range(10)}
+    main.SIGNAL_STORE = SignalStore()
+    for symbol, price in prices.items():
+        main.SIGNAL_STORE.add(f'{symbol}_ID', dict(make_signal(symbol, price), signal_id=f'{symbol}_ID',
+                                                   creation_time='2024-01-01T00:00:00', fixed_entry=price,
+                                                   fixed_tp=price * 1.5, fixed_sl=price * 0.5,
+                                                   fixed_signal_type='BUY'))
+    binance = FakeBinance(prices)
+    engine = main.SignalEngine(binance_provider=binance)
+    scheduler = SignalScheduler(lambda: None, engine.update_current_prices_only, main.SIGNAL_STORE.snapshot)
+    main.SIGNAL_SCHEDULER = scheduler
+    main.SIGNAL_DELTAS = DeltaLog()
+    scheduler.on_publish(main.record_signal_deltas)
+    try:
+        scheduler.run_price_update_once()
+        version = scheduler.get_snapshot().version
+
+        # Fiyat turu, fiyatlar aynı: price_update_time değişiklik sayılmaz - boş delta
+        scheduler.run_price_update_once()
+        delta = main.build_signal_delta(scheduler.get_snapshot(), version)
+        assert delta['full'] is False and delta['added'] == delta['updated'] == delta['removed'] == []
+
+        # Tek fiyat oynadı: sadece o sinyal güncellendi
+        binance.prices = dict(prices, **{'COIN3/USD': 104.0})
+        scheduler.run_price_update_once()
+        delta = main.build_signal_delta(scheduler.get_snapshot(), version)
+        assert delta['full'] is False
+        assert [(s['signal_id'], s['current_price']) for s in delta['updated']] == [('COIN3/USD_ID', 104.0)]
+    finally:
+        main.SIGNAL_SCHEDULER = None
+
+if __name__ == "__main__":
+    test_delta_merge_rules()
+    test_too_far_behind_needs_resync()
+    test_statistics_delta_only_new_trades()
+    test_signals_since_endpoint()
+    test_price_tick_without_moves_is_empty_delta()
+    print("✅ Sürümlü delta testleri geçti")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SSE Yayın Kanalı Testleri
+Birleştirme, yavaş istemcinin düşürülmesi, /stream'in worker tutmaması, sinyal fark olayları
+"""
+
+import json
+import socket
+import threading
+import time
+from http.client import HTTPConnection
+
+import main
+from app_context import AppContext
+from event_stream import EventBroadcaster, PollingPublisher, format_event
+from pooled_server import PooledHTTPServer
+from signal_scheduler import SignalScheduler
+
+class FakeBinance:
+    def __init__(self):
+        self.price = 100.0
+
+    def price_version(self):
+        return ('tick', self.price)
+
+    def get_crypto_prices(self):
+        return {'BTC/USD': {'price': self.price, 'timestamp': f'tick-{self.price}', 'stale': False}}
+
+def read_events(sock, count, timeout=3.0):
+    """Soketten 'count' adet SSE olayı oku - [(event, data)]"""
+    sock.settimeout(timeout)
+    buffer = b''
+    events = []
+    deadline = time.time() + timeout
+    while len(events) < count and time.time() < deadline:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        buffer += chunk
+        while b'\n\n' in buffer:
+            frame, buffer = buffer.split(b'\n\n', 1)
+            fields = dict(line.split(b': ', 1) for line in frame.split(b'\n') if b': ' in line)
+            if b'event' in fields:
+                events.append((fields[b'event'].decode(), json.loads(fields[b'data'])))
+    return events
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+def test_format_event():
+    assert format_event('tick', b'{"a": 1}', 7) == b'event: tick\nid: 7\ndata: {"a": 1}\n\n'
+    assert format_event('x', b'a\nb') == b'event: x\ndata: a\ndata: b\n\n'
+
+def test_coalescing_keeps_latest_price():
+    broadcaster = EventBroadcaster()
+    server_side, client_side = socket.socketpair()
+    try:
+        broadcaster.add_client(server_side)
+        # Yazıcı thread çalışmıyor: olaylar istemci kuyruğunda birleşir
+        for price in range(100):
+            broadcaster.publish('crypto_prices', {'price': price}, key='crypto_prices')
+        broadcaster.publish('signal_added', {'signal_id': 'a'})
+        broadcaster.publish('signal_added', {'signal_id': 'b'})
+        assert broadcaster.get_stats()['coalesced'] == 99
+
+        broadcaster.start()
+        events = read_events(client_side, 3)
+        assert events == [('crypto_prices', {'price': 99}), ('signal_added', {'signal_id': 'a'}),
+                          ('signal_added', {'signal_id': 'b'})]
+    finally:
+        broadcaster.stop()
+        client_side.close()
+
+def test_new_client_gets_latest_keyed_events():
+    broadcaster = EventBroadcaster()
+    first_server, first_client = socket.socketpair()
+    late_server, late_client = socket.socketpair()
+    try:
+        broadcaster.add_client(first_server)
+        broadcaster.publish('crypto_prices', {'price': 1}, key='crypto_prices')
+        broadcaster.publish('crypto_prices', {'price': 2}, key='crypto_prices')
+        broadcaster.publish('statistics', {'win_rate': 50.0}, key='statistics')
+        broadcaster.publish('signal_added', {'signal_id': 'a'})
+        broadcaster.start()
+        assert read_events(first_client, 3) == [('crypto_prices', {'price': 2}), ('statistics', {'win_rate': 50.0}),
+                                                 ('signal_added', {'signal_id': 'a'})]
+
+        # Diğer istemciler bağlıyken katılan istemci fiyat değişmeden son anahtarlı olayları alır
+        broadcaster.add_client(late_server)
+        events = read_events(late_client, 2)
+        assert events == [('crypto_prices', {'price': 2}), ('statistics', {'win_rate': 50.0})]
+        # Anahtarsız olay tekrar gönderilmez - sıradaki olay yeni yayın
+        broadcaster.publish('signal_added', {'signal_id': 'b'})
+        assert read_events(late_client, 1) == [('signal_added', {'signal_id': 'b'})]
+    finally:
+        broadcaster.stop()
+        first_client.close()
+        late_client.close()
+
+def test_slow_client_dropped_publisher_never_blocks():
+    broadcaster = EventBroadcaster(max_buffer_bytes=64 * 1024).start()
+    slow_server, slow_client = socket.socketpair()
+    fast_server, fast_client = socket.socketpair()
+    try:
+        slow_server.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        broadcaster.add_client(slow_server)
+        broadcaster.add_client(fast_server)
+
+        # Hızlı istemci okur, yavaş istemci hiç okumaz
+        received = []
+        reader = threading.Thread(target=lambda: received.extend(read_events(fast_client, 500, timeout=5)))
+        reader.start()
+
+        payload = {'signal': 'x' * 2000}
+        start = time.perf_counter()
+        for i in range(500):
+            broadcaster.publish('signal_added', dict(payload, n=i))
+            time.sleep(0.0005)
+        elapsed = time.perf_counter() - start
+        reader.join()
+        print(f"⚡ 500 olay yayını: {elapsed * 1000:.1f}ms, hızlı istemci {len(received)} olay aldı")
+
+        assert wait_for(lambda: broadcaster.get_stats()['dropped_slow'] == 1)
+        assert broadcaster.client_count() == 1
+        assert len(received) == 500 and received[-1][1]['n'] == 499
+    finally:
+        broadcaster.stop()
+        slow_client.close()
+        fast_client.close()
+
+def test_polling_publisher_only_on_change():
+    broadcaster = EventBroadcaster()
+    binance = FakeBinance()
+    reads = []
+
+    def source():
+        reads.append(1)
+        return main.build_crypto_prices_response(binance)
+
+    publisher = PollingPublisher(broadcaster, 'crypto_prices', source, 1.0,
+                                 lambda response: response['prices']['BTC/USD']['timestamp'])
+    # İstemci yokken kaynak okunmaz
+    assert not publisher.poll_once() and not reads
+
+    server_side, client_side = socket.socketpair()
+    try:
+        broadcaster.add_client(server_side)
+        assert publisher.poll_once()
+        assert not publisher.poll_once()
+        binance.price = 101.0
+        assert publisher.poll_once()
+        assert broadcaster.get_stats()['published'] == 2 and len(reads) == 3
+    finally:
+        broadcaster.stop()
+        client_side.close()
+
+def test_scheduler_publishes_signal_diffs():
+    signals = {'a': {'symbol': 'BTC/USD', 'signal_type': 'BUY'}}
+    diffs = []
+    scheduler = SignalScheduler(lambda: None, None, lambda: signals)
+    scheduler.on_publish(lambda previous, snapshot: diffs.append(
+        (sorted(snapshot.signals.keys() - previous.signals.keys()),
+         sorted(previous.signals.keys() - snapshot.signals.keys()))))
+
+    scheduler.run_generation_once()
+    signals = {'b': {'symbol': 'ETH/USD', 'signal_type': 'SELL'}}
+    scheduler.run_generation_once()
+    assert diffs == [(['a'], []), (['b'], ['a'])]
+
+def test_stream_endpoint_does_not_hold_worker():
+    binance = FakeBinance()
+    context = AppContext({'binance_provider': lambda: binance}, log=lambda _: None).build()
+    main.EVENT_BROADCASTER = EventBroadcaster(heartbeat=0.2).start()
+    server = PooledHTTPServer(('127.0.0.1', 0), main.TradingSignalHandler, context=context, workers=2)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    port = server.server_address[1]
+    streams = []
+    try:
+        # Worker sayısından fazla akış açılır - hiçbiri worker tutmaz
+        for _ in range(4):
+            stream = socket.create_connection(('127.0.0.1', port))
+            stream.sendall(b'GET /stream HTTP/1.1\r\nHost: localhost\r\n\r\n')
+            stream.settimeout(3)
+            head = b''
+            while b'\r\n\r\n' not in head:
+                head += stream.recv(1)
+            assert b'200' in head.split(b'\r\n')[0] and b'text/event-stream' in head
+            streams.append(stream)
+
+        assert wait_for(lambda: main.EVENT_BROADCASTER.client_count() == 4)
+        assert wait_for(lambda: server.get_stats()['active'] == 0)
+
+        connection = HTTPConnection('127.0.0.1', port, timeout=5)
+        connection.request('GET', '/crypto/prices')
+        assert json.loads(connection.getresponse().read())['prices']['BTC/USD']['price'] == 100.0
+        connection.close()
+
+        main.publish_snapshot_events(
+            main.SignalSnapshot(1, {}, time.time()),
+            main.SignalSnapshot(2, {'s1': {'symbol': 'BTC/USD'}}, time.time(), {'statistics': {'win_rate': 50.0}}))
+        for stream in streams:
+            events = read_events(stream, 2)
+            assert events[0] == ('signal_added', {'symbol': 'BTC/USD', 'signal_id': 's1'})
+            assert events[1][0] == 'statistics' and events[1][1]['win_rate'] == 50.0
+
+        # Kapanan istemci yazıcı thread'de fark edilir
+        streams.pop().close()
+        assert wait_for(lambda: main.EVENT_BROADCASTER.client_count() == 3)
+    finally:
+        for stream in streams:
+            stream.close()
+        main.EVENT_BROADCASTER.stop()
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    test_format_event()
+    test_coalescing_keeps_latest_price()
+    test_new_client_gets_latest_keyed_events()
+    test_slow_client_dropped_publisher_never_blocks()
+    test_polling_publisher_only_on_change()
+    test_scheduler_publishes_signal_diffs()
+    test_stream_endpoint_does_not_hold_worker()
+    print("✅ SSE yayın kanalı testleri geçti")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Keep-alive HTTP Havuzu Testleri
+Yerel HTTPS sunucusu (self-signed sertifika, openssl) ile:
+bağlantı yeniden kullanımı, havuz sınırı, kapanan bağlantıda tekrar, el sıkışma benchmark'ı
+"""
+
+import json
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from http_client import PooledHTTPClient
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # Keep-alive
+
+    def setup(self):
+        super().setup()
+        # Başlık ve gövde ayrı yazılır - Nagle gecikmesi keep-alive ölçümünü bozmasın
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.connections += 1
+
+    def do_GET(self):
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class LocalHTTPSServer:
+    """Self-signed sertifikalı yerel HTTPS sunucusu - idle_timeout sonra boşta bağlantıyı kapatır"""
+
+    def __init__(self, idle_timeout=None):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cert = os.path.join(self.tmpdir, 'cert.pem')
+        key = os.path.join(self.tmpdir, 'key.pem')
+        subprocess.run([shutil.which('openssl'), 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+                        '-keyout', key, '-out', self.cert, '-days', '1', '-subj', '/CN=localhost',
+                        '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1'],
+                       check=True, capture_output=True)
+
+        handler = type('Handler', (_Handler,), {'timeout': idle_timeout})
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.httpd.connections = 0
+        self.httpd.daemon_threads = True
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.cert, key)
+        self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+        self.url = f"https://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def connections(self):
+        return self.httpd.connections
+
+    def client_context(self):
+        return ssl.create_default_context(cafile=self.cert)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+def test_sequential_requests_reuse_one_connection():
+    server = LocalHTTPSServer()
+    client = PooledHTTPClient(ssl_context=server.client_context())
+    try:
+        for i in range(50):
+            response = client.get(f"{server.url}/api/v3/klines", params={'symbol': 'BTCUSDT', 'i': i})
+            assert response.status == 200
+            assert response.json()['path'] == f"/api/v3/klines?symbol=BTCUSDT&i={i}"
+
+        stats = client.get_stats()[f"https://127.0.0.1:{server.httpd.server_address[1]}"]
+        assert stats['requests'] == 50
+        assert stats['connections_created'] == 1 and stats['connections_reused'] == 49
+        assert stats['avg_latency_ms'] > 0 and stats['p95_latency_ms'] > 0
+        assert server.connections == 1
+    finally:
+        client.close()
+        server.close()
+
+def test_concurrent_requests_bounded_by_pool_size():
+    """8 thread aynı anda - host başına en fazla pool_size bağlantı açılır"""
+    server = LocalHTTPSServer()
+    client = PooledHTTPClient(pool_size=4, ssl_context=server.client_context())
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(10):
+                assert client.get(f"{server.url}/depth").status == 200
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        stats = list(client.get_stats().values())[0]
+        assert stats['requests'] == 80
+        assert stats['connections_created'] <= 4
+        assert server.connections <= 4
+    finally:
+        client.close()
+        server.close()
+
+def test_retries_when_server_closed_idle_connection():
+    """Sunucu boşta bağlantıyı kapatınca istek yeni bağlantıyla tekrarlanır"""
+    server = LocalHTTPSServer(idle_timeout=0.2)
+    client = PooledHTTPClient(ssl_context=server.client_context())
+    try:
+        assert client.get(f"{server.url}/a").status == 200
+        time.sleep(0.5)
+        assert client.get(f"{server.url}/b").json()['path'] == '/b'
+        stats = list(client.get_stats().values())[0]
+        assert stats['connections_created'] == 2 and stats['errors'] == 0
+    finally:
+        client.close()
+        server.close()
+
+def test_benchmark_handshake_savings():
+    """urlopen (her istekte TCP + TLS) vs havuz (tek el sıkışma)"""
+    server = LocalHTTPSServer()
+    context = server.client_context()
+    client = PooledHTTPClient(ssl_context=context)
+    count = 40
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            with urllib.request.urlopen(f"{server.url}/ticker", timeout=5, context=context) as response:
+                response.read()
+        urlopen_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(count):
+            client.get(f"{server.url}/ticker").json()
+        pooled_time = time.perf_counter() - start
+
+        print(f"⚡ {count} HTTPS istek: urlopen {urlopen_time * 1000:.1f}ms | havuz {pooled_time * 1000:.1f}ms | "
+              f"{urlopen_time / pooled_time:.1f}x, bağlantı {server.connections}")
+        assert server.connections == count + 1
+        assert pooled_time < urlopen_time
+    finally:
+        client.close()
+        server.close()
+
+if __name__ == "__main__":
+    test_sequential_requests_reuse_one_connection()
+    test_concurrent_requests_bounded_by_pool_size()
+    test_retries_when_server_closed_idle_connection()
+    test_benchmark_handshake_savings()
+    print("✅ HTTP havuz testleri geçti")
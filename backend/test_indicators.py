@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vektörel İndikatör Testleri
+- Eski skaler RSI/ATR/momentum çıktılarıyla eşdeğerlik
+- 1000 mumluk seride hız karşılaştırması
+"""
+
+import random
+import time
+
+from candles import CandleSeries
+from crypto_strategies import CryptoTechnicalAnalysis
+from real_strategies import RealTechnicalAnalysis
+from advanced_strategies import TechnicalIndicators
+from indicators import rsi_series, atr_series, momentum_series, IncrementalRSI
+
+# ---- Eski skaler implementasyonlar (referans) ----
+
+def reference_rsi(prices, period=14):
+    if len(prices) < period + 1:
+        return 50
+    gains = []
+    losses = []
+    for i in range(1, len(prices)):
+        change = prices[i] - prices[i-1]
+        if change > 0:
+            gains.append(change)
+            losses.append(0)
+        else:
+            gains.append(0)
+            losses.append(abs(change))
+    avg_gain = sum(gains[-period:]) / period
+    avg_loss = sum(losses[-period:]) / period
+    if avg_loss == 0:
+        return 100
+    rs = avg_gain / avg_loss
+    return round(100 - (100 / (1 + rs)), 2)
+
+def reference_wilder_rsi(prices, period=14):
+    gains = [max(prices[i] - prices[i-1], 0) for i in range(1, len(prices))]
+    losses = [max(prices[i-1] - prices[i], 0) for i in range(1, len(prices))]
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    for i in range(period, len(gains)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    if avg_loss == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+def reference_atr(candles, period=14):
+    true_ranges = []
+    for i in range(1, len(candles)):
+        high = candles[i]['high']
+        low = candles[i]['low']
+        prev_close = candles[i-1]['close']
+        true_ranges.append(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+    return sum(true_ranges[-period:]) / period
+
+def reference_momentum(candles, lookback=20):
+    """Eski analyze_crypto_momentum hesabı: dict mumlardan son 'lookback' kapanış"""
+    prices = [c['close'] for c in candles[-lookback:]]
+    return (prices[-1] - prices[0]) / prices[0] * 100
+
+def make_candles(count, seed=42):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(count):
+        open_price = price
+        price *= 1 + rng.gauss(0, 0.01)
+        candles.append({
+            'timestamp': i * 900000,
+            'open': open_price,
+            'high': max(open_price, price) * (1 + abs(rng.gauss(0, 0.003))),
+            'low': min(open_price, price) * (1 - abs(rng.gauss(0, 0.003))),
+            'close': price,
+            'volume': rng.uniform(1000, 5000)
+        })
+    return candles
+
+# ---- Eşdeğerlik ----
+
+def test_rsi_matches_scalar():
+    """Tüm RSI wrapper'ları eski skaler sonuçla aynı"""
+    for seed in range(20):
+        count = 15 + seed * 13
+        prices = [c['close'] for c in make_candles(count, seed)]
+        expected = reference_rsi(prices)
+        for func in (CryptoTechnicalAnalysis.calculate_rsi, TechnicalIndicators.rsi,
+                     RealTechnicalAnalysis.calculate_rsi):
+            assert abs(func(prices) - expected) <= 0.01, (func.__qualname__, count)
+
+    # Kenar durumlar: kısa seri ve kayıpsız seri
+    assert CryptoTechnicalAnalysis.calculate_rsi([1.0, 2.0]) == 50
+    assert CryptoTechnicalAnalysis.calculate_rsi([float(i) for i in range(30)]) == 100
+    assert RealTechnicalAnalysis.calculate_rsi([5.0] * 30) == 100.0
+
+def test_rsi_series_per_bar():
+    """Seri değerleri her prefix için skaler hesapla aynı"""
+    prices = [c['close'] for c in make_candles(200)]
+    sma = rsi_series(prices, smoothing='sma')
+    wilder = rsi_series(prices, smoothing='wilder')
+    for i in range(15, len(prices)):
+        assert abs(round(sma[i], 2) - reference_rsi(prices[:i + 1])) <= 0.01
+        assert abs(wilder[i] - reference_wilder_rsi(prices[:i + 1])) < 1e-9
+
+def test_atr_matches_scalar():
+    """ATR wrapper'ları eski skaler sonuçla aynı"""
+    for seed in range(10):
+        candles = make_candles(20 + seed * 17, seed)
+        expected = reference_atr(candles)
+        series = CandleSeries.from_dicts(candles)
+        assert abs(CryptoTechnicalAnalysis.calculate_crypto_atr(series) - expected) < 1e-12
+        assert abs(RealTechnicalAnalysis.calculate_atr(candles) - expected) < 1e-12
+        assert TechnicalIndicators.calculate_atr(series) == round(expected, 6)
+
+def test_momentum_matches_scalar():
+    """20 mumluk momentum eski hesapla aynı"""
+    candles = make_candles(100)
+    expected = round(reference_momentum(candles), 2)
+    assert CryptoTechnicalAnalysis.analyze_crypto_momentum(candles)['momentum'] == expected
+
+def test_incremental_rsi_matches_full():
+    """Kayan pencere + oluşan son bar: incremental RSI tam geçmişle hesaplananla aynı"""
+    history = CandleSeries.from_dicts(make_candles(400))
+    window = 200
+    calculator = IncrementalRSI(14)
+    # Referans: ilk pencerenin başından itibaren tüm geçmiş - incremental durum oradan başlar
+    reference = rsi_series(history.close[1:window + 150], smoothing='wilder')
+
+    for end in range(window, window + 150):
+        # Son bar oluşmakta: önce yarım kapanışla, sonra gerçek kapanışla gelir
+        view = history[end - window + 1:end + 1]
+        forming = CandleSeries(view.timestamp, view.open, view.high, view.low,
+                               view.close.copy(), view.volume)
+        forming.close[-1] = (view.close[-1] + view.close[-2]) / 2
+        calculator.update(forming.timestamp, forming.close)
+        values = calculator.update(view.timestamp, view.close)
+
+        assert len(values) == len(view)
+        assert abs(values[-1] - reference[end - 1]) < 1e-9
+
+    assert calculator.full_recomputes == 1
+
+def test_rsi_series_enables_divergence():
+    """Gerçek RSI serisi ile fiyat HH / RSI LH divergence'ı yakalanabilir"""
+    from advanced_momentum_analysis import RSIDivergenceDetector
+
+    # Güçlü yükseliş -> tepe, geri çekilme, yavaş yükselişle daha yüksek tepe
+    prices = [100 + i * 0.1 for i in range(30)]
+    prices += [103 + i * 1.5 for i in range(10)]             # 1. tepe (hızlı)
+    prices += [118 - i * 1.0 for i in range(10)]             # geri çekilme
+    prices += [108 + i * 1.2 for i in range(10)]             # 2. tepe (yavaş, daha yüksek)
+    prices += [119.5 - i * 0.8 for i in range(10)]
+    rsi_values = [50.0 if v != v else v for v in rsi_series(prices).tolist()]
+
+    constant = RSIDivergenceDetector.detect_rsi_divergence(prices, [60.0] * len(prices), lookback=50)
+    real = RSIDivergenceDetector.detect_rsi_divergence(prices, rsi_values, lookback=50)
+    assert not constant['divergence_detected']
+    assert real['divergence_detected'] and real['type'] == 'BEARISH'
+
+# ---- Benchmark ----
+
+def benchmark_indicators(count=1000, repeat=3):
+    """Her bar için indikatör: skaler döngü (her prefix) vs tek geçişte seri"""
+    candles = make_candles(count)
+    series = CandleSeries.from_dicts(candles)
+    prices = series.close.tolist()
+
+    def best_of(func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    results = {}
+
+    scalar = best_of(lambda: [reference_rsi(prices[:i + 1]) for i in range(count)])
+    vector = best_of(lambda: rsi_series(series.close, smoothing='wilder'))
+    results['rsi'] = (scalar, vector)
+
+    scalar = best_of(lambda: [reference_atr(candles[:i + 1]) for i in range(15, count)])
+    vector = best_of(lambda: atr_series(series.high, series.low, series.close))
+    results['atr'] = (scalar, vector)
+
+    scalar = best_of(lambda: [reference_momentum(candles[:i + 1]) for i in range(19, count)])
+    vector = best_of(lambda: momentum_series(series.close, 19))
+    results['momentum'] = (scalar, vector)
+
+    for name, (scalar, vector) in results.items():
+        print(f"⚡ {name:9s} skaler: {scalar * 1000:9.2f}ms | vektörel: {vector * 1000:7.3f}ms | {scalar / vector:8.1f}x")
+    return results
+
+def test_benchmark_speedup():
+    """1000 mumda RSI, ATR ve momentum serisi en az 20x hızlı"""
+    results = benchmark_indicators()
+    for name in ('rsi', 'atr', 'momentum'):
+        scalar, vector = results[name]
+        assert scalar / vector >= 20, f"{name}: {scalar / vector:.1f}x"
+
+if __name__ == "__main__":
+    test_rsi_matches_scalar()
+    test_rsi_series_per_bar()
+    test_atr_matches_scalar()
+    test_momentum_matches_scalar()
+    test_incremental_rsi_matches_full()
+    test_rsi_series_enables_divergence()
+    test_benchmark_speedup()
+    print("✅ İndikatör testleri geçti")
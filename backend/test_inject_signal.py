@@ -94,7 +94,7 @@ def inject_test_signals():
     
     print(f"📊 {len(test_signals)} test sinyali hazırlandı")
     
-    # Manuel cache injection - bu global ACTIVE_SIGNALS_CACHE'e direkt eklenmeli
+    # Manuel cache injection - main.SIGNAL_STORE'a direkt eklenmeli
     print("🔧 Manuel cache injection yapılıyor...")
     
     # Cache'i main.py'da manuel güncelle
@@ -102,17 +102,17 @@ def inject_test_signals():
     
     # Global cache'e ekle
     for signal_id, signal in test_signals.items():
-        main.ACTIVE_SIGNALS_CACHE[signal_id] = signal
+        main.SIGNAL_STORE.add(signal_id, signal)
         print(f"✅ {signal['symbol']} sinyali cache'e eklendi")
     
-    print(f"\n📊 Cache Status: {len(main.ACTIVE_SIGNALS_CACHE)} aktif sinyal")
+    print(f"\n📊 Cache Status: {len(main.SIGNAL_STORE)} aktif sinyal")
     
     # Test et
     print("\n🔍 Cache Test:")
-    for signal_id, signal in main.ACTIVE_SIGNALS_CACHE.items():
+    for signal_id, signal in main.SIGNAL_STORE.snapshot().items():
         print(f"   {signal['symbol']} {signal['signal_type']} - Reliability: {signal['fixed_reliability']}")
     
-    return len(main.ACTIVE_SIGNALS_CACHE)
+    return len(main.SIGNAL_STORE)
 
 if __name__ == '__main__':
     count = inject_test_signals()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Paralel Sembol Analizi Testi
+CryptoStrategyManager.analyze_symbols - prefetch + process pool + timeout
+"""
+
+import random
+import time
+
+import crypto_strategies
+from candles import CandleSeries
+from crypto_strategies import CryptoStrategyManager, CryptoKROStrategy, CryptoLMOStrategy
+
+_original_analyze = crypto_strategies._analyze_prefetched_symbol
+
+def hanging_analyze(symbol, *args):
+    """Process worker'da BTCUSDT analizi takılır - diğerleri normal"""
+    if symbol == 'BTCUSDT':
+        time.sleep(30)
+    return _original_analyze(symbol, *args)
+
+class SlowKlineProvider:
+    """Her get_klines çağrısında sabit gecikme - gerçek HTTP round-trip taklidi"""
+
+    def __init__(self, delay: float = 0.2, delays=None):
+        self.delay = delay
+        self.delays = delays or {}  # Sembol bazında gecikme
+        self.calls = 0
+
+    def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100):
+        self.calls += 1
+        time.sleep(self.delays.get(symbol, self.delay))
+        rng = random.Random(f"{symbol}_{interval}")
+        price = 100.0
+        klines = []
+        for i in range(limit):
+            price *= 1 + rng.uniform(-0.01, 0.01)
+            klines.append({
+                'timestamp': i * 60000,
+                'open': price,
+                'high': price * 1.005,
+                'low': price * 0.995,
+                'close': price,
+                'volume': 1000 + rng.random() * 500
+            })
+        return CandleSeries.from_dicts(klines)
+
+def without_ids(signals):
+    """Sinyal id'si zaman damgası içerir - karşılaştırmada yok sayılır"""
+    return [{key: value for key, value in signal.items() if key != 'id'} for signal in signals]
+
+def test_analyze_symbols_parallel():
+    """15 sembol seri analizden çok daha hızlı tamamlanmalı"""
+    provider = SlowKlineProvider(delay=0.2)
+    manager = CryptoStrategyManager(provider)
+    prices = {f"SYM{i}USDT": 100.0 for i in range(15)}
+
+    try:
+        start = time.time()
+        results = manager.analyze_symbols(prices)
+        elapsed = time.time() - start
+    finally:
+        manager.shutdown()
+
+    intervals = {tf for tf, _ in CryptoKROStrategy.REQUIRED_KLINES + CryptoLMOStrategy.REQUIRED_KLINES}
+    serial_time = len(prices) * len(intervals) * provider.delay
+
+    print(f"⚡ Paralel: {elapsed:.2f}s | Seri tahmini: {serial_time:.2f}s | HTTP çağrı: {provider.calls}")
+    assert set(results) == set(prices)
+    assert provider.calls == len(prices) * len(intervals)
+    assert elapsed < serial_time / 2
+
+def test_analyze_symbols_timeout():
+    """Süre sınırını aşan sembol atlanmalı, diğerleri etkilenmemeli"""
+    provider = SlowKlineProvider(delay=0.0, delays={'BTCUSDT': 0.5})
+    manager = CryptoStrategyManager(provider)
+    manager.symbol_timeout = 0.1
+
+    try:
+        results = manager.analyze_symbols({'BTCUSDT': 100.0, 'ETHUSDT': 100.0})
+        expected = manager.analyze_symbols({'ETHUSDT': 100.0})
+    finally:
+        manager.shutdown()
+
+    # Yavaş sembol atlandı, hızlı sembolün sinyalleri tek başına analizdekiyle aynı
+    assert set(results) == {'ETHUSDT'} and results['ETHUSDT']
+    assert without_ids(results['ETHUSDT']) == without_ids(expected['ETHUSDT'])
+
+def test_hung_compute_worker_recycles_pool():
+    """Takılan analiz sadece kendi süresi kadar bekletir, pool yenilenir, kalan semboller sonuç alır"""
+    provider = SlowKlineProvider(delay=0.0)
+    crypto_strategies._analyze_prefetched_symbol = hanging_analyze
+    manager = CryptoStrategyManager(provider)
+    manager.compute_workers = 2
+    manager.symbol_timeout = 1.0
+    prices = {symbol: 100.0 for symbol in ('BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'ADAUSDT')}
+
+    try:
+        start = time.time()
+        results = manager.analyze_symbols(prices)
+        elapsed = time.time() - start
+        hung_pool_workers = manager._compute_pool_workers
+    finally:
+        crypto_strategies._analyze_prefetched_symbol = _original_analyze
+        manager.shutdown()
+
+    print(f"⚡ Takılan worker ile toplu analiz: {elapsed:.2f}s, pool yenileme: {manager.pool_recycles}")
+    assert set(results) == set(prices) and results['BTCUSDT'] == []
+    reference = CryptoStrategyManager(provider)
+    try:
+        expected = reference.analyze_symbols({symbol: 100.0 for symbol in prices if symbol != 'BTCUSDT'})
+    finally:
+        reference.shutdown()
+    assert all(without_ids(results[symbol]) == without_ids(signals) for symbol, signals in expected.items())
+    assert manager.pool_recycles == 1 and hung_pool_workers == 2
+    assert elapsed < 5
+
+if __name__ == "__main__":
+    test_analyze_symbols_parallel()
+    test_analyze_symbols_timeout()
+    test_hung_compute_worker_recycles_pool()
+    print("✅ Paralel analiz testleri geçti")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Worker Havuzlu Server + Uygulama Bağlamı Testleri
+Uzun istek / yavaş istemci diğer istekleri bloklamaz, bileşenler istek başına yeniden kurulmaz
+"""
+
+import json
+import socket
+import threading
+import time
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler
+
+from app_context import AppContext
+from pooled_server import PooledHTTPServer
+
+class CountingFactory:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.value
+
+class SlowAwareHandler(BaseHTTPRequestHandler):
+    """/slow 1 saniye sürer (uzun /signals karşılığı), /fast bağlamdaki provider'ı döndürür"""
+
+    def setup(self):
+        super().setup()
+        self.server.context.bind(self)
+
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(1.0)
+        body = json.dumps({'path': self.path, 'provider': self.binance_provider}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(context, workers=4, request_timeout=2):
+    server = PooledHTTPServer(('127.0.0.1', 0), SlowAwareHandler, context=context,
+                              workers=workers, request_timeout=request_timeout)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    return server
+
+def fetch(server, path):
+    connection = HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    try:
+        connection.request('GET', path)
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+def test_context_built_once_and_shared():
+    binance = CountingFactory('binance')
+    strategies = CountingFactory('strategies')
+    logs = []
+    context = AppContext({'binance_provider': binance, 'crypto_strategies': strategies,
+                          'forex_provider': None, 'forex_strategies': CountingFactory('unused')},
+                         log=logs.append).build()
+
+    # Provider yoksa bağımlı strateji yöneticisi kurulmaz
+    assert context.forex_strategies is None
+    assert context.get_status() == {'forex_provider': False, 'binance_provider': True,
+                                    'crypto_strategies': True, 'forex_strategies': False}
+
+    server = start_server(context)
+    try:
+        for _ in range(20):
+            assert fetch(server, '/fast')['provider'] == 'binance'
+        assert binance.calls == 1 and strategies.calls == 1
+        assert len(logs) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_failing_component_does_not_break_others():
+    def broken():
+        raise RuntimeError("API erişilemiyor")
+
+    logs = []
+    context = AppContext({'binance_provider': broken, 'trade_monitor': CountingFactory('monitor')},
+                         log=logs.append).build()
+    assert context.binance_provider is None and context.trade_monitor == 'monitor'
+    assert any('binance_provider' in line for line in logs)
+
+def test_rebuild_swaps_components_atomically():
+    generation = [0]
+
+    def binance():
+        generation[0] += 1
+        time.sleep(0.05)  # Yavaş kurulum - bu sırada bağlanan handler'lar eski bağlamı görür
+        return ('binance', generation[0])
+
+    context = AppContext({'binance_provider': binance, 'crypto_strategies': lambda provider: ('strategies', provider)},
+                         log=lambda _: None).build()
+    mismatched = []
+
+    class Handler:
+        pass
+
+    def reader(stop):
+        while not stop.is_set():
+            handler = Handler()
+            context.bind(handler)
+            if handler.crypto_strategies[1] != handler.binance_provider:
+                mismatched.append(handler.binance_provider)
+
+    stop = threading.Event()
+    readers = [threading.Thread(target=reader, args=(stop,)) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for _ in range(5):
+        context.build()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert not mismatched and context.build_count == 6
+    assert context.binance_provider == ('binance', 6)
+
+def test_slow_request_and_slow_client_do_not_block():
+    context = AppContext({'binance_provider': CountingFactory('binance')}, log=lambda _: None).build()
+    server = start_server(context, workers=4, request_timeout=0.5)
+    try:
+        # Hiç veri göndermeyen istemci + uzun süren istek
+        idle = socket.create_connection(server.server_address)
+        slow = threading.Thread(target=fetch, args=(server, '/slow'))
+        slow.start()
+        time.sleep(0.1)
+
+        start = time.perf_counter()
+        assert fetch(server, '/fast')['path'] == '/fast'
+        elapsed = time.perf_counter() - start
+        print(f"⚡ Uzun istek sürerken /fast: {elapsed * 1000:.1f}ms")
+        assert elapsed < 0.5
+
+        slow.join()
+        idle.close()
+        # Yavaş istemcinin worker'ı request_timeout sonunda serbest kalır
+        deadline = time.time() + 2
+        while server.get_stats()['active'] and time.time() < deadline:
+            time.sleep(0.05)
+        stats = server.get_stats()
+        assert stats['active'] == 0 and stats['handled'] == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    test_context_built_once_and_shared()
+    test_failing_component_does_not_break_others()
+    test_rebuild_swaps_components_atomically()
+    test_slow_request_and_slow_client_do_not_block()
+    print("✅ Worker havuzlu server testleri geçti")
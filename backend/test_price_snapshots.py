@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stale-while-revalidate Fiyat Snapshot Testleri
+Soft TTL sonrası son iyi değer beklemeden döner (yaşıyla), upstream hatası onu bozmaz,
+hard TTL sonrası bloklayan istek; fallback verisi cache'e yazılmaz
+"""
+
+import json
+import threading
+import time
+
+from http_client import HTTPResponse
+from binance_data import BinanceDataProvider
+from forex_data import ForexDataProvider
+from rate_limiter import WeightedRateLimiter
+
+class ScriptedHTTP:
+    """Yanıtı test sırasında değiştirilebilen istemci - 'delay' upstream gecikmesi"""
+
+    def __init__(self, body, status=200, delay=0.0):
+        self.set(body, status, delay)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def set(self, body, status=200, delay=0.0):
+        self.body = json.dumps(body).encode()
+        self.status = status
+        self.delay = delay
+
+    def get(self, url, headers=None, timeout=None, params=None):
+        with self.lock:
+            self.requests += 1
+        time.sleep(self.delay)
+        return HTTPResponse(self.status, {}, self.body, url)
+
+def ticker(price):
+    return [{'symbol': 'BTCUSDT', 'lastPrice': str(price), 'priceChangePercent': '1.0', 'volume': '10',
+             'highPrice': str(price), 'lowPrice': str(price)}]
+
+def wait_for(condition, timeout=3):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def make_binance(http, soft=0.1, hard=5):
+    provider = BinanceDataProvider(price_soft_ttl=soft, price_hard_ttl=hard)
+    provider.http = http
+    provider.rate_limiter = WeightedRateLimiter(capacity=5000)
+    return provider
+
+def test_stale_snapshot_served_during_upstream_hiccup():
+    http = ScriptedHTTP(ticker(100))
+    provider = make_binance(http)
+
+    fresh = provider.get_crypto_prices()['BTC/USD']
+    assert fresh['price'] == 100.0 and fresh['stale'] is False and fresh['price_age'] == 0.0
+
+    # Upstream yavaş ve hatalı - istekler beklemeden eski değeri alır
+    time.sleep(0.15)
+    http.set({'code': -1003}, status=503, delay=0.5)
+    latencies = []
+    for _ in range(200):
+        start = time.perf_counter()
+        snapshot = provider.get_crypto_prices()['BTC/USD']
+        latencies.append(time.perf_counter() - start)
+        assert snapshot['price'] == 100.0 and snapshot['stale'] is True
+        assert snapshot['price_age'] >= 0.1 and snapshot['source'] != 'fallback'
+    latencies.sort()
+    assert latencies[int(len(latencies) * 0.99)] < 0.05
+
+    # Tek arka plan yenilemesi denendi, hata son iyi değeri bozmadı
+    assert wait_for(lambda: provider.cache.get_stats()['refresh_errors'] == 1)
+    assert http.requests == 2
+
+    # Upstream düzelince arka plan yenilemesi yeni fiyatı yazar
+    http.set(ticker(101))
+    provider.get_crypto_prices()
+    assert wait_for(lambda: provider.get_crypto_prices()['BTC/USD']['price'] == 101.0)
+    assert provider.get_crypto_prices()['BTC/USD']['stale'] is False
+
+def test_hard_limit_blocks_and_fallback_is_not_cached():
+    http = ScriptedHTTP({}, status=500)
+    provider = make_binance(http, soft=0.05, hard=0.1)
+
+    assert all(item['source'] == 'fallback' for item in provider.get_crypto_prices().values())
+    assert provider.cache.get_stale('crypto_prices') is None
+
+    http.set(ticker(50))
+    assert provider.get_crypto_prices()['BTC/USD']['price'] == 50.0
+
+    # Hard TTL geçince eski değer sunulmaz - bloklayan istek
+    time.sleep(0.15)
+    http.set(ticker(51))
+    snapshot = provider.get_crypto_prices()['BTC/USD']
+    assert snapshot['price'] == 51.0 and snapshot['stale'] is False
+
+def test_forex_snapshot_stale_while_revalidate():
+    http = ScriptedHTTP({'rates': {'EUR': 0.5, 'GBP': 0.8, 'JPY': 150.0, 'CAD': 1.4}})
+    provider = ForexDataProvider(price_soft_ttl=0.1, price_hard_ttl=5)
+    provider.http = http
+
+    assert provider.get_forex_prices()['EURUSD']['price'] == 2.0
+    time.sleep(0.15)
+    http.set({}, status=429, delay=0.3)
+
+    start = time.perf_counter()
+    snapshot = provider.get_forex_prices()
+    assert time.perf_counter() - start < 0.05
+    assert snapshot['EURUSD']['price'] == 2.0 and snapshot['EURUSD']['stale'] is True
+    assert wait_for(lambda: provider.cache.get_stats()['refresh_errors'] == 1)
+    assert provider.get_forex_prices()['EURUSD']['source'] == 'exchangerate-api'
+
+def test_price_version_tracks_writes_and_age():
+    http = ScriptedHTTP(ticker(100))
+    provider = make_binance(http, soft=5, hard=10)
+
+    provider.get_crypto_prices()
+    version = provider.price_version(age_bucket=0.1)
+    requests = http.requests
+    for _ in range(1000):
+        assert provider.price_version(age_bucket=0.1) in (version, (version[0], version[1] + 1))
+    assert http.requests == requests  # Sürüm fiyat okumaz
+
+    # Yaş dilimi ilerleyince sürüm değişir - price_age yeniden kodlanır
+    time.sleep(0.15)
+    aged = provider.price_version(age_bucket=0.1)
+    assert aged[0] == version[0] and aged[1] > version[1]
+
+    # Yeni yazma yeni sürüm
+    http.set(ticker(101))
+    provider.cache.pop('crypto_prices')
+    provider.get_crypto_prices()
+    assert provider.price_version(age_bucket=0.1)[0] != version[0]
+
+if __name__ == "__main__":
+    test_stale_snapshot_served_during_upstream_hiccup()
+    test_hard_limit_blocks_and_fallback_is_not_cached()
+    test_forex_snapshot_stale_while_revalidate()
+    test_price_version_tracks_writes_and_age()
+    print("✅ Fiyat snapshot testleri geçti")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ağırlık Bazlı Rate Limiter Testleri
+Endpoint ağırlıkları, token bekleme, öncelik sırası, başlık senkronizasyonu, 429 Retry-After,
+kuyruk zaman aşımında cache'e yazılmama
+"""
+
+import threading
+import time
+
+from http_client import HTTPResponse
+from rate_limiter import (WeightedRateLimiter, binance_request_weight, binance_request_priority,
+                          PRIORITY_HIGH, PRIORITY_LOW, RateLimitTimeout)
+from binance_data import BinanceDataProvider
+from candles import CandleSeries
+
+class FakeHTTP:
+    """Sabit yanıt dönen istemci - gönderilen URL'leri kaydeder"""
+
+    def __init__(self, status=200, headers=None, body=b'[]'):
+        self.status = status
+        self.headers = headers or {}
+        self.body = body
+        self.urls = []
+
+    def get(self, url, headers=None, timeout=None, params=None):
+        self.urls.append(url)
+        return HTTPResponse(self.status, self.headers, self.body, url)
+
+def make_provider(limiter, http):
+    provider = BinanceDataProvider.__new__(BinanceDataProvider)
+    provider.base_url = "https://api.binance.com/api/v3"
+    provider.api_key = None
+    provider.secret_key = None
+    provider.request_count = 0
+    provider.rate_limiter = limiter
+    provider.rate_limit_wait = 1
+    provider.http = http
+    return provider
+
+def test_endpoint_weights():
+    assert binance_request_weight('/ticker/24hr') == 80
+    assert binance_request_weight('/ticker/24hr', {'symbol': 'BTCUSDT'}) == 2
+    assert binance_request_weight('/ticker/24hr', {'symbols': '["BTCUSDT","ETHUSDT"]'}) == 2
+    assert binance_request_weight('/ticker/24hr', {'symbols': ','.join(['"X"'] * 50)}) == 40
+    assert binance_request_weight('/depth', {'symbol': 'BTCUSDT', 'limit': 100}) == 5
+    assert binance_request_weight('/depth', {'symbol': 'BTCUSDT', 'limit': 500}) == 25
+    assert binance_request_weight('/depth', {'limit': 5000}) == 250
+    assert binance_request_weight('/klines', {'symbol': 'BTCUSDT', 'limit': 300}) == 2
+    assert binance_request_priority('/klines') == PRIORITY_LOW
+    assert binance_request_priority('/depth') == PRIORITY_HIGH
+
+def test_waits_for_tokens_instead_of_failing():
+    limiter = WeightedRateLimiter(capacity=10, window=1.0)  # 10 token/s
+    assert limiter.acquire(10)
+
+    start = time.monotonic()
+    assert limiter.acquire(5)
+    elapsed = time.monotonic() - start
+    assert 0.4 <= elapsed < 1.0
+
+    # Dolmayacak kadar kısa timeout - False, sıra kuyrukta kalmaz
+    assert limiter.acquire(10, timeout=0.05) is False
+    stats = limiter.get_stats()
+    assert stats['timeouts'] == 1 and stats['queued'] == 0 and stats['waited_requests'] == 1
+
+def test_high_priority_overtakes_queued_backfill():
+    """Boş bucket'ta önce gelen kline doldurmaları, sonra gelen fiyat isteğinin arkasında kalır"""
+    limiter = WeightedRateLimiter(capacity=10, window=1.0)
+    assert limiter.acquire(10)
+    order = []
+
+    def worker(name, priority):
+        limiter.acquire(4, priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=worker, args=(f'kline{i}', PRIORITY_LOW)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    ticker = threading.Thread(target=worker, args=('ticker', PRIORITY_HIGH))
+    ticker.start()
+    for thread in threads + [ticker]:
+        thread.join(5)
+
+    assert order[0] == 'ticker'
+    assert sorted(order[1:]) == ['kline0', 'kline1', 'kline2']
+
+def test_resync_from_used_weight_header():
+    limiter = WeightedRateLimiter(capacity=1000, window=60.0)
+    http = FakeHTTP(headers={'X-MBX-USED-WEIGHT-1M': '990'})
+    provider = make_provider(limiter, http)
+
+    assert provider._make_request('/klines', {'symbol': 'BTCUSDT', 'interval': '1h', 'limit': 100}) == []
+    stats = limiter.get_stats()
+    assert stats['last_used_weight'] == 990 and stats['header_syncs'] == 1
+    assert stats['available_weight'] <= 11
+
+    # Sunucu daha az sayıyorsa yerel bütçe artırılmaz
+    limiter.update_from_headers({'X-MBX-USED-WEIGHT-1M': '0'})
+    assert limiter.get_stats()['available_weight'] <= 12
+
+def test_429_pauses_all_requests_for_retry_after():
+    limiter = WeightedRateLimiter(capacity=1000, window=60.0)
+    http = FakeHTTP(status=429, headers={'Retry-After': '0.3'}, body=b'{}')
+    provider = make_provider(limiter, http)
+
+    assert provider._make_request('/depth', {'symbol': 'BTCUSDT', 'limit': 100}) == {}
+    assert limiter.get_stats()['bans'] == 1
+
+    # Ban sırasında istek gönderilmez - Retry-After dolunca devam
+    limiter.rate = 10000.0
+    start = time.monotonic()
+    http.status = 200
+    assert provider._make_request('/ticker/24hr', {'symbol': 'BTCUSDT'}) == {}
+    assert time.monotonic() - start >= 0.25
+    assert len(http.urls) == 2
+
+def test_queue_timeout_is_not_cached():
+    """Bütçe açılmazsa istek gönderilmez; boş yanıt gibi parse edilmez, depoya/cache'e yazılmaz"""
+    limiter = WeightedRateLimiter(capacity=10, window=60.0)
+    assert limiter.acquire(10)
+    http = FakeHTTP()
+    provider = BinanceDataProvider()
+    provider.rate_limiter = limiter
+    provider.rate_limit_wait = 0.05
+    provider.http = http
+
+    try:
+        provider._make_request('/klines', {'symbol': 'BTCUSDT', 'interval': '1h', 'limit': 100})
+        assert False, "RateLimitTimeout bekleniyordu"
+    except RateLimitTimeout:
+        pass
+
+    # Seri yok: fallback döner ama saklanmaz - sonraki çağrı yeniden dener
+    assert len(provider.get_klines('BTC/USD', '1h', 100)) == 100
+    assert provider.candle_store.get_entry('BTCUSDT', '1h') is None
+
+    # Eski seri var: o döner, tazeliği değişmez
+    count = 120
+    series = CandleSeries([1700000000000 + i * 3600000 for i in range(count)], [1.0] * count, [1.0] * count,
+                          [1.0] * count, [float(i) for i in range(count)], [1.0] * count)
+    provider.candle_store.put('ETHUSDT', '1h', series, count, fetched_at=0)
+    klines = provider.get_klines('ETH/USD', '1h', 100)
+    assert len(klines) == 100 and klines.close[-1] == 119.0
+    assert provider.candle_store.get_entry('ETHUSDT', '1h')['fetched_at'] == 0
+
+    # Ticker: fallback cache'e yazılmaz
+    provider.get_crypto_prices()
+    assert provider.cache.get_stale('crypto_prices') is None
+    assert http.urls == []
+    assert limiter.get_stats()['timeouts'] >= 4
+
+if __name__ == "__main__":
+    test_endpoint_weights()
+    test_waits_for_tokens_instead_of_failing()
+    test_high_priority_overtakes_queued_backfill()
+    test_resync_from_used_weight_header()
+    test_429_pauses_all_requests_for_retry_after()
+    test_queue_timeout_is_not_cached()
+    print("✅ Rate limiter testleri geçti")
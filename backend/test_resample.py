@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Üst Zaman Dilimi Yeniden Örnekleme Testleri
+15m serisinden 4h / 1d, 1d serisinden 1w - UTC sınırları, Pazartesi başlayan haftalar
+Referans: datetime ile bağımsız saf Python toplama (Binance mumlarının karşılığı)
+"""
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from http_client import HTTPResponse
+from binance_data import BinanceDataProvider
+from candles import CandleSeries, INTERVAL_MS, bar_open_time
+from rate_limiter import WeightedRateLimiter
+from resample import resample
+
+STEP_15M = INTERVAL_MS['15m']
+
+def bucket_start(open_time, interval):
+    """Mumun ait olduğu üst mumun açılışı - datetime ile (candles modülünden bağımsız)"""
+    dt = datetime.fromtimestamp(open_time / 1000, tz=timezone.utc)
+    if interval == '4h':
+        dt = dt.replace(hour=dt.hour // 4 * 4, minute=0)
+    elif interval == '1d':
+        dt = dt.replace(hour=0, minute=0)
+    elif interval == '1w':
+        dt = (dt - timedelta(days=dt.weekday())).replace(hour=0, minute=0)
+    return int(dt.timestamp() * 1000)
+
+def base_rows(count, end_ms):
+    """15m /klines satırları - hacimler 1/4'ün katı (toplamlar float'ta tam)"""
+    last_open = bar_open_time(end_ms, '15m')
+    rows = []
+    price = 100.0
+    for i in range(count):
+        open_time = last_open - (count - 1 - i) * STEP_15M
+        close = round(price + ((i * 7919) % 13 - 6) * 0.25, 2)
+        high = max(price, close) + (i % 5) * 0.25
+        low = min(price, close) - (i % 3) * 0.25
+        rows.append([open_time, f"{price:.2f}", f"{high:.2f}", f"{low:.2f}", f"{close:.2f}",
+                     f"{(100 + i % 17) / 4}", open_time + STEP_15M - 1, "0", 10, "0", "0", "0"])
+        price = close
+    return rows
+
+def aggregate_rows(rows, interval):
+    """Binance'in vereceği üst mumlar: gruptaki ilk open, max high, min low, son close, toplam hacim"""
+    groups = {}
+    for row in rows:
+        groups.setdefault(bucket_start(row[0], interval), []).append(row)
+    step = INTERVAL_MS[interval]
+    result = []
+    for start, group in sorted(groups.items()):
+        result.append([start, group[0][1], f"{max(float(r[2]) for r in group):.2f}",
+                       f"{min(float(r[3]) for r in group):.2f}", group[-1][4],
+                       f"{sum(float(r[5]) for r in group)}", start + step - 1, "0", 10, "0", "0", "0"])
+    return result
+
+class FixtureHTTP:
+    """interval bazında /klines fixture'ı - Binance startTime/limit semantiği"""
+
+    def __init__(self, rows_by_interval):
+        self.rows_by_interval = rows_by_interval
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, params=None):
+        query = {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+        self.requests.append(query)
+        rows = self.rows_by_interval[query['interval']]
+        limit = int(query.get('limit', 500))
+        if 'startTime' in query:
+            rows = [row for row in rows if row[0] >= int(query['startTime'])][:limit]
+        else:
+            rows = rows[-limit:]
+        return HTTPResponse(200, {}, json.dumps(rows).encode(), url)
+
+def test_resample_matches_utc_aggregation():
+    # Pazar 02:15 UTC'den başlayan 15m serisi - ilk 4h ve 1d grubu eksik
+    sunday = int(datetime(2024, 3, 10, 2, 15, tzinfo=timezone.utc).timestamp() * 1000)
+    rows = base_rows(4 * 96, sunday + (4 * 96 - 1) * STEP_15M)
+    series = CandleSeries.from_binance(rows)
+
+    for interval in ('4h', '1d'):
+        resampled = resample(series, interval, '15m')
+        complete_head = [row for row in rows if row[0] >= resampled.timestamp[0]]
+        assert resampled == CandleSeries.from_binance(aggregate_rows(complete_head, interval))
+        assert resampled.timestamp[0] == bucket_start(rows[0][0], interval) + INTERVAL_MS[interval]
+
+    # Haftalık: Pazartesi 00:00 UTC hizası (epoch Perşembe)
+    daily = CandleSeries.from_binance(aggregate_rows(rows, '1d'))
+    weekly = resample(daily[1:], '1w', '1d')
+    assert datetime.fromtimestamp(weekly.timestamp[0] / 1000, tz=timezone.utc).weekday() == 0
+    monday_rows = [row for row in aggregate_rows(rows, '1d') if row[0] >= weekly.timestamp[0]]
+    assert weekly == CandleSeries.from_binance(aggregate_rows(monday_rows, '1w'))
+
+def test_gap_in_base_series_is_rejected():
+    rows = base_rows(64, int(time.time() * 1000))
+    del rows[20]
+    try:
+        resample(CandleSeries.from_binance(rows), '4h', '15m')
+        assert False, "Kopuk seri kabul edildi"
+    except ValueError:
+        pass
+
+def test_provider_derives_higher_timeframes_without_requests():
+    """Doldurulmuş 4h/1d/1w seriler eskiyince REST yerine 15m serisinden türetilir"""
+    rows_15m = base_rows(400 * 96, int(time.time() * 1000))
+    rows_1d = aggregate_rows(rows_15m, '1d')
+    fixture = {'15m': rows_15m, '4h': aggregate_rows(rows_15m, '4h'), '1d': rows_1d,
+               '1w': aggregate_rows(rows_1d, '1w')}
+    http = FixtureHTTP(fixture)
+    provider = BinanceDataProvider()
+    provider.http = http
+    provider.rate_limiter = WeightedRateLimiter(capacity=5000)
+
+    provider.get_klines('BTC/USD', '15m', 300)
+    requests_before = len(http.requests)
+
+    # Birkaç mum önce çekilmiş, eskimiş üst seriler (son mumları o anki yarım halleri)
+    windows = {'4h': 200, '1d': 120, '1w': 52}
+    for interval, window in windows.items():
+        stale = CandleSeries.from_binance(fixture[interval][-window - 2:-2])
+        provider.candle_store.put('BTCUSDT', interval, stale, window, 'api', fetched_at=0)
+
+    start = time.perf_counter()
+    for interval, window in windows.items():
+        klines = provider.get_klines('BTC/USD', interval, window)
+        assert klines == CandleSeries.from_binance(fixture[interval][-window:]), interval
+    elapsed = time.perf_counter() - start
+
+    assert len(http.requests) == requests_before
+    assert provider.get_request_stats()['resampled_updates'] == 3
+    print(f"⚡ 4h/1d/1w 15m serisinden türetildi: 0 REST isteği, {elapsed * 1000:.1f}ms")
+
+    # Sadece baz interval akışa abone olur
+    assert provider.stream_intervals(['15m', '1d', '1w', '4h']) == ['15m']
+    assert provider.stream_intervals(['1w', '4h']) == ['1w', '4h']
+
+if __name__ == "__main__":
+    test_resample_matches_utc_aggregation()
+    test_gap_in_base_series_is_rejected()
+    test_provider_derives_higher_timeframes_without_requests()
+    print("✅ Yeniden örnekleme testleri geçti")
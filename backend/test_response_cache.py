@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Önceden Serileştirilmiş Yanıt Cache'i Testleri
+Sürüm başına tek json.dumps, ETag / If-None-Match -> 304, gzip gövde
+"""
+
+import gzip
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+
+import main
+from app_context import AppContext
+from pooled_server import PooledHTTPServer
+from response_cache import ResponseCache, accepts_gzip, etag_matches
+from signal_scheduler import SignalScheduler
+from signal_store import SignalStore
+
+class FakeBinance:
+    """Sabit fiyat snapshot'ı - 'tick' ile fiyat değişir"""
+
+    def __init__(self):
+        self.price = 100.0
+        self.calls = 0
+
+    def price_version(self):
+        return ('tick', self.price)
+
+    def get_crypto_prices(self):
+        self.calls += 1
+        return {f'COIN{i}/USD': {'price': self.price + i, 'timestamp': f'tick-{self.price}', 'change_24h': 1.5,
+                                 'price_age': 0.4, 'stale': False, 'source': 'binance_websocket'}
+                for i in range(30)}
+
+def request(port, path, headers=None):
+    connection = HTTPConnection('127.0.0.1', port, timeout=5)
+    try:
+        connection.request('GET', path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+def test_encoded_once_per_version():
+    cache = ResponseCache('test')
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {'signals': list(range(500))}
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: cache.get('/signals', 7, build), range(200)))
+    assert len(builds) == 1
+    assert len({id(encoded) for encoded in results}) == 1
+    assert json.loads(results[0].body) == {'signals': list(range(500))}
+    assert gzip.decompress(results[0].gzip_body) == results[0].body
+
+    # Yeni sürüm yeniden kodlanır; aynı içerik aynı ETag'i verir
+    again = cache.get('/signals', 8, build)
+    assert len(builds) == 2 and again.etag == results[0].etag
+    assert cache.get_stats()['encodes'] == 2
+
+def test_conditional_and_encoding_headers():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"abd"', '"abc"') and not etag_matches(None, '"abc"')
+
+    assert accepts_gzip('gzip, deflate, br')
+    assert accepts_gzip('br;q=1.0, gzip;q=0.8')
+    assert not accepts_gzip('gzip;q=0') and not accepts_gzip('identity') and not accepts_gzip(None)
+
+def test_http_304_and_gzip_with_main_handler():
+    binance = FakeBinance()
+    context = AppContext({'binance_provider': lambda: binance}, log=lambda _: None).build()
+    main.RESPONSE_CACHE = ResponseCache('main')
+    server = PooledHTTPServer(('127.0.0.1', 0), main.TradingSignalHandler, context=context, workers=4)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    port = server.server_address[1]
+    try:
+        status, headers, body = request(port, '/crypto/prices')
+        assert status == 200 and headers['Access-Control-Allow-Origin'] == '*'
+        etag = headers['ETag']
+        assert json.loads(body)['prices']['COIN0/USD']['price'] == 100.0
+
+        # Aynı snapshot: 50 istemci isteği, tek kodlama; ETag'li istekler gövdesiz 304
+        for _ in range(50):
+            status, headers, body = request(port, '/crypto/prices', {'If-None-Match': etag})
+            assert status == 304 and body == b'' and headers['ETag'] == etag
+
+        status, headers, body = request(port, '/crypto/prices', {'Accept-Encoding': 'gzip'})
+        assert status == 200 and headers['Content-Encoding'] == 'gzip'
+        assert int(headers['Content-Length']) == len(body)
+        assert json.loads(gzip.decompress(body))['count'] == 30
+
+        stats = main.RESPONSE_CACHE.get_stats()
+        assert binance.calls == 1  # Sürüm sağlayıcıdan - fiyatlar istek başına okunmaz
+        assert stats['encodes'] == 1 and stats['not_modified'] == 50 and stats['gzip_responses'] == 1
+        print(f"⚡ 52 istek, {stats['encodes']} kodlama, {stats['not_modified']} x 304")
+
+        # Fiyat değişince yeni ETag
+        binance.price = 101.0
+        status, headers, body = request(port, '/crypto/prices', {'If-None-Match': etag})
+        assert status == 200 and headers['ETag'] != etag
+        assert main.RESPONSE_CACHE.get_stats()['encodes'] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_signals_304_when_prices_unchanged():
+    binance = FakeBinance()
+    main.SIGNAL_STORE = SignalStore()
+    main.SIGNAL_STORE.add('COIN0_ID', {'signal_id': 'COIN0_ID', 'symbol': 'COIN0/USD', 'asset_type': 'crypto',
+                                       'status': 'ACTIVE', 'creation_time': '2024-01-01T00:00:00',
+                                       'fixed_entry': 90.0, 'fixed_tp': 120.0, 'fixed_sl': 80.0,
+                                       'fixed_signal_type': 'BUY', 'signal_type': 'BUY', 'current_price': 90.0})
+    engine = main.SignalEngine(binance_provider=binance)
+    scheduler = SignalScheduler(lambda: None, engine.update_current_prices_only, main.SIGNAL_STORE.snapshot,
+                                extra_source=lambda: {'statistics': main.build_trade_statistics()})
+    main.SIGNAL_SCHEDULER = scheduler
+    main.RESPONSE_CACHE = ResponseCache('main')
+    context = AppContext({}, log=lambda _: None).build()
+    server = PooledHTTPServer(('127.0.0.1', 0), main.TradingSignalHandler, context=context, workers=2)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    port = server.server_address[1]
+    try:
+        scheduler.run_price_update_once()
+        etags = {}
+        for path in ('/signals', '/statistics'):
+            status, headers, body = request(port, path)
+            assert status == 200
+            etags[path] = headers['ETag']
+        assert json.loads(request(port, '/signals')[2])['signals'][0]['current_price'] == 100.0
+
+        # Fiyatlar değişmeden fiyat turu: sürüm aynı, ETag'li istekler 304
+        version = scheduler.get_snapshot().version
+        scheduler.run_price_update_once()
+        assert scheduler.get_snapshot().version == version
+        for path, etag in etags.items():
+            status, headers, body = request(port, path, {'If-None-Match': etag})
+            assert status == 304 and body == b''
+
+        # Fiyat değişince yeni sürüm, yeni ETag
+        binance.price = 101.0
+        scheduler.run_price_update_once()
+        status, headers, body = request(port, '/signals', {'If-None-Match': etags['/signals']})
+        assert status == 200 and json.loads(body)['signals'][0]['current_price'] == 101.0
+    finally:
+        main.SIGNAL_SCHEDULER = None
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    test_encoded_once_per_version()
+    test_conditional_and_encoding_headers()
+    test_http_304_and_gzip_with_main_handler()
+    test_signals_304_when_prices_unchanged()
+    print("✅ Yanıt cache testleri geçti")
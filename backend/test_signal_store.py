@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İndeksli Sinyal Deposu Testleri
+İndeks aramaları, en yeni N tutma, copy-on-write snapshot, eşzamanlı yazma / okuma
+"""
+
+import threading
+import time
+
+import main
+from signal_store import SignalStore
+
+def make_signal(symbol, asset_type='crypto', status='ACTIVE', entry=100.0, signal_type='BUY'):
+    return {'signal_id': f'{symbol}_ID', 'id': f'RAW_{symbol}', 'symbol': symbol, 'asset_type': asset_type,
+            'status': status, 'creation_time': '2024-01-01T00:00:00',
+            'fixed_entry': entry, 'fixed_tp': entry * 1.1, 'fixed_sl': entry * 0.9,
+            'fixed_signal_type': signal_type, 'signal_type': signal_type,
+            'fixed_strategy': 'KRO', 'fixed_reliability': 8, 'current_price': entry}
+
+class FakeProvider:
+    def __init__(self, prices):
+        self.prices = prices
+
+    def get_crypto_prices(self):
+        return {symbol: {'price': price} for symbol, price in self.prices.items()}
+
+def test_indexes_and_lookups():
+    store = SignalStore()
+    store.add_many({'b1': make_signal('BTC/USD'), 'e1': make_signal('ETH/USD'),
+                    'f1': make_signal('EURUSD', asset_type='forex'),
+                    'p1': make_signal('XRP/USD', status='PENDING')})
+
+    assert store.has_active_signal('BTC/USD') and store.has_active_signal('EURUSD')
+    assert not store.has_active_signal('XRP/USD') and not store.has_active_signal('DOGE/USD')
+    assert [signal_id for signal_id, _ in store.find(asset_type='crypto')] == ['b1', 'e1', 'p1']
+    assert [signal_id for signal_id, _ in store.find(asset_type='crypto', status='ACTIVE')] == ['b1', 'e1']
+    assert store.ids_where('symbol', 'EURUSD') == {'f1'}
+
+    # Durum değişikliği indeksleri günceller
+    store.update('p1', status='ACTIVE')
+    assert store.has_active_signal('XRP/USD')
+    store.remove('b1')
+    assert not store.has_active_signal('BTC/USD') and store.ids_where('symbol', 'BTC/USD') == set()
+    assert store.remove('b1') is None
+    assert store.get_stats()['by_asset_type'] == {'crypto': 2, 'forex': 1}
+
+def test_keeps_newest_without_sorting():
+    store = SignalStore(max_signals=3)
+    store.add_many({f's{i}': make_signal(f'C{i}/USD') for i in range(3)})
+    evicted = store.add_many({'s3': make_signal('C3/USD'), 's4': make_signal('C4/USD')})
+    assert evicted == ['s0', 's1']
+    assert list(store.snapshot()) == ['s2', 's3', 's4']
+    assert store.ids_where('symbol', 'C0/USD') == set()
+
+    # Fiyat güncellemesi yaşı değiştirmez - en eski yine ilk atılır
+    store.update('s2', current_price=123.0)
+    assert store.add('s5', make_signal('C5/USD')) == ['s2']
+    assert store.get_stats()['evicted'] == 3
+
+def test_copy_on_write_snapshot():
+    store = SignalStore()
+    original = make_signal('BTC/USD')
+    store.add('b1', original)
+    before = store.snapshot()
+
+    original['current_price'] = -1  # Çağıranın dict'i depoyu etkilemez
+    updated = store.update('b1', current_price=150.0)
+    after = store.snapshot()
+
+    assert before['b1']['current_price'] == 100.0
+    assert after['b1']['current_price'] == 150.0 and updated is after['b1']
+    assert store.snapshot() is after  # Yazma yoksa görüntü yeniden kurulmaz
+
+    # Değişmeyen alanlar / aynı fiyat: yazma yok, sürüm ilerlemez
+    version = store.version
+    assert store.update('b1', current_price=150.0) is updated
+    assert store.update_price('b1', 150.0, '2024-01-01T00:00:05') is updated
+    assert store.version == version and 'price_update_time' not in updated
+    assert store.update_price('b1', 151.0, '2024-01-01T00:00:05')['price_update_time'] == '2024-01-01T00:00:05'
+    assert store.version == version + 1
+    try:
+        after['x'] = {}
+        assert False, "snapshot değiştirilebilir olmamalı"
+    except TypeError:
+        pass
+
+def test_concurrent_writers_and_readers():
+    store = SignalStore(max_signals=50)
+    errors = []
+    stop = threading.Event()
+
+    def writer(offset):
+        for i in range(500):
+            signal_id = f'w{offset}_{i}'
+            store.add(signal_id, make_signal(f'S{offset}_{i % 20}'))
+            store.update(signal_id, current_price=float(i))
+            if i % 3 == 0:
+                store.remove(signal_id)
+
+    def reader():
+        while not stop.is_set():
+            try:
+                for signal_id, signal in store.snapshot().items():
+                    assert signal['symbol']
+                for signal_id, signal in store.find(asset_type='crypto', status='ACTIVE'):
+                    assert signal['status'] == 'ACTIVE'
+            except Exception as e:  # pragma: no cover - sadece hata kaydı
+                errors.append(e)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    writers = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors
+    assert len(store) <= 50
+    # İndeksler depo içeriğiyle tutarlı
+    indexed = store.ids_where('asset_type', 'crypto')
+    assert indexed == set(store.snapshot())
+
+def test_has_active_signal_constant_time():
+    store = SignalStore(max_signals=5000)
+    store.add_many({f's{i}': make_signal(f'C{i}/USD') for i in range(5000)})
+    start = time.perf_counter()
+    for i in range(5000):
+        store.has_active_signal(f'C{i}/USD')
+    elapsed = time.perf_counter() - start
+    print(f"⚡ 5000 sinyalde 5000 has_active_signal: {elapsed * 1000:.1f}ms")
+    assert elapsed < 0.5
+
+def test_engine_closes_trade_through_store():
+    store = SignalStore()
+    main.SIGNAL_STORE = store
+    store.add('BTC/USD_ID', make_signal('BTC/USD', entry=100.0))
+    store.add('ETH/USD_ID', make_signal('ETH/USD', entry=10.0))
+
+    engine = main.SignalEngine(binance_provider=FakeProvider({'BTC/USD': 111.0, 'ETH/USD': 10.5}))
+    assert engine.has_active_trade_for_symbol('BTC/USD')
+    engine.update_current_prices_only()
+
+    # BTC TP'ye ulaştı: depodan silindi, geçmişe eklendi; ETH sadece fiyat güncellendi
+    assert 'BTC/USD_ID' not in store and not engine.has_active_trade_for_symbol('BTC/USD')
+    assert store.get('ETH/USD_ID')['current_price'] == 10.5
+    statistics = main.build_trade_statistics()
+    assert statistics['total_trades'] == 1 and statistics['winning_trades'] == 1
+    assert statistics['active_signals'] == 1 and statistics['history_version'] == 1
+    assert statistics['recent_history'][0]['symbol'] == 'BTC/USD'
+
+if __name__ == "__main__":
+    test_indexes_and_lookups()
+    test_keeps_newest_without_sorting()
+    test_copy_on_write_snapshot()
+    test_concurrent_writers_and_readers()
+    test_has_active_signal_constant_time()
+    test_engine_closes_trade_through_store()
+    print("✅ Sinyal deposu testleri geçti")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Single-flight Testleri
+Eşzamanlı cache miss'ler tek upstream isteği gönderir, sonuç ve hata paylaşılır
+"""
+
+import json
+import threading
+import time
+import urllib.parse
+
+from http_client import HTTPResponse
+from singleflight import SingleFlight
+from binance_data import BinanceDataProvider
+from rate_limiter import WeightedRateLimiter
+
+class SlowHTTP:
+    """Her isteği 'delay' saniye bekletip sabit gövde döner - istek sayısını kaydeder"""
+
+    def __init__(self, body, delay=0.2):
+        self.body = json.dumps(body).encode()
+        self.delay = delay
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None, params=None):
+        with self.lock:
+            self.urls.append(url)
+        time.sleep(self.delay)
+        return HTTPResponse(200, {}, self.body, url)
+
+class KlineHTTP(SlowHTTP):
+    """/klines isteğinin 'limit' parametresi kadar mum döner"""
+
+    def __init__(self, delay=0.2):
+        super().__init__([], delay)
+
+    def get(self, url, headers=None, timeout=None, params=None):
+        response = super().get(url, headers, timeout, params)
+        limit = int(urllib.parse.parse_qs(urllib.parse.urlparse(url).query)['limit'][0])
+        start = 1700000000000
+        body = [[start + i * 3600000, '1', '2', '0.5', str(i), '10', start + (i + 1) * 3600000 - 1,
+                 '15', 5, '5', '7', '0'] for i in range(limit)]
+        return HTTPResponse(200, {}, json.dumps(body).encode(), response.url)
+
+def run_concurrently(fn, count=8):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+def make_provider(http):
+    provider = BinanceDataProvider()
+    provider.http = http
+    provider.rate_limiter = WeightedRateLimiter(capacity=5000)
+    return provider
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight('test')
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        time.sleep(0.2)
+        return {'value': 42}
+
+    results = run_concurrently(lambda: flights.do('key', fetch))
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+
+    stats = flights.get_stats()
+    assert stats['calls'] == 8 and stats['executions'] == 1 and stats['coalesced'] == 7
+    assert stats['in_flight'] == 0
+
+    # Tamamlanan uçuş unutulur - sonraki çağrı yeniden çalışır
+    flights.do('key', fetch)
+    assert len(executions) == 2
+
+def test_error_is_shared_and_not_remembered():
+    flights = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError('upstream down')
+
+    def call():
+        try:
+            flights.do('key', failing)
+        except ValueError as e:
+            return str(e)
+
+    assert run_concurrently(call, 4) == ['upstream down'] * 4
+    assert flights.get_stats()['errors'] == 1
+    assert flights.do('key', lambda: 'ok') == 'ok'
+
+def test_concurrent_price_misses_send_one_ticker_request():
+    ticker = [{'symbol': 'BTCUSDT', 'lastPrice': '100', 'priceChangePercent': '1.5', 'volume': '10',
+               'highPrice': '101', 'lowPrice': '99'}]
+    http = SlowHTTP(ticker)
+    provider = make_provider(http)
+
+    results = run_concurrently(provider.get_crypto_prices)
+    assert len(http.urls) == 1
+    assert all(result['BTC/USD']['price'] == 100.0 for result in results)
+    assert provider.get_request_stats()['singleflight']['coalesced'] == 7
+
+def test_concurrent_kline_misses_send_one_request():
+    start = 1700000000000
+    klines = [[start + i * 3600000, '1', '2', '0.5', '1.5', '10', start + (i + 1) * 3600000 - 1,
+               '15', 5, '5', '7', '0'] for i in range(100)]
+    http = SlowHTTP(klines)
+    provider = make_provider(http)
+
+    results = run_concurrently(lambda: provider.get_klines('ETH/USD', '1h', 100))
+    assert len(http.urls) == 1
+    assert all(len(result) == 100 for result in results)
+    assert provider.request_count == 1
+
+def test_kline_misses_with_different_limits_share_one_request():
+    """Aynı (symbol, interval) için farklı limitli miss'ler tek istekte en büyük limiti çeker"""
+    http = KlineHTTP()
+    provider = make_provider(http)
+    load = provider._load_klines
+
+    def slow_load(*args):
+        time.sleep(0.1)  # Lider talepleri toplamadan önce tüm çağıranlar kaydolsun
+        return load(*args)
+
+    provider._load_klines = slow_load
+    limits = [100, 300, 50, 200] * 2
+    results = run_concurrently(lambda: provider.get_klines('ETH/USD', '1h', limits.pop()))
+    assert len(http.urls) == 1 and 'limit=300' in http.urls[0]
+    assert sorted(len(result) for result in results) == [50, 50, 100, 100, 200, 200, 300, 300]
+    assert all(result.close[-1] == 299.0 for result in results)
+
+def test_late_wider_kline_miss_is_not_truncated():
+    """Uçuş küçük limitle başladıysa sonradan katılan büyük limit kısa seri almaz"""
+    http = KlineHTTP(delay=0.3)
+    provider = make_provider(http)
+    results = {}
+    first = threading.Thread(target=lambda: results.update(small=provider.get_klines('ETH/USD', '1h', 100)))
+    first.start()
+    time.sleep(0.1)
+    results['wide'] = provider.get_klines('ETH/USD', '1h', 300)
+    first.join(5)
+
+    assert len(results['small']) == 100 and len(results['wide']) == 300
+    assert [url for url in http.urls if 'limit=300' in url] and len(http.urls) == 2
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_execution()
+    test_error_is_shared_and_not_remembered()
+    test_concurrent_price_misses_send_one_ticker_request()
+    test_concurrent_kline_misses_send_one_request()
+    test_kline_misses_with_different_limits_share_one_request()
+    test_late_wider_kline_miss_is_not_truncated()
+    print("✅ Single-flight testleri geçti")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental S/R İndeks Testleri
+Mum mum güncellenen indeks = sıfırdan kurulan indeks, bisect kırılım = eski sıralı tarama
+"""
+
+import random
+
+from candles import CandleSeries
+from sr_index import SRLevelIndex
+from sr_levels import SortedLevels
+from crypto_strategies import CryptoTechnicalAnalysis
+
+def make_candles(count, seed, interval_ms=900000):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(count):
+        open_price = price
+        price = max(1.0, price + rng.gauss(0, 1.5))
+        candles.append({
+            'timestamp': 1700000000000 + i * interval_ms,
+            'open': open_price,
+            'high': max(open_price, price) + rng.uniform(0, 1),
+            'low': min(open_price, price) - rng.uniform(0, 1),
+            'close': price,
+            'volume': rng.uniform(1e5, 1e7)
+        })
+    return CandleSeries.from_dicts(candles)
+
+def level_tuples(levels):
+    return [(level['level'], level['timestamp'], level['touches'], level['volume'],
+             level['volume_importance']['importance_score']) for level in levels]
+
+def assert_same_levels(actual, expected):
+    for side in ('support', 'resistance'):
+        assert level_tuples(actual[f'{side}_levels']) == level_tuples(expected[f'{side}_levels'])
+        assert level_tuples(actual[f'{side}_sorted'].levels) == level_tuples(expected[f'{side}_sorted'].levels)
+
+def reference_breakout(current_price, sr_levels, tolerance=0.008):
+    """Eski implementasyon: priority başına mesafeye göre sırala, ilk kırılanı al"""
+    for priority in ['HIGH', 'MEDIUM', 'LOW']:
+        resistances = sorted([r for r in sr_levels['resistance_levels'] if r.get('priority') == priority],
+                             key=lambda r: abs(r['level'] - current_price))
+        for resistance in resistances:
+            if current_price > resistance['level'] * (1 + tolerance):
+                return 'RESISTANCE_BREAK', resistance['level'], priority
+        supports = sorted([s for s in sr_levels['support_levels'] if s.get('priority') == priority],
+                          key=lambda s: abs(s['level'] - current_price))
+        for support in supports:
+            if current_price < support['level'] * (1 - tolerance):
+                return 'SUPPORT_BREAK', support['level'], priority
+    return None, None, None
+
+def test_incremental_matches_full_rebuild():
+    """Her yeni mumda incremental güncelleme, aynı seride sıfırdan kurulumla aynı seviyeler"""
+    for seed in range(5):
+        series = make_candles(420, seed)
+        index = SRLevelIndex(lookback=150)
+
+        for end in range(200, 421, 7):
+            # CandleStore gibi pencereye kırpılmış seri (300 mum), son mum oluşmakta
+            klines = series[max(0, end - 300):end]
+            incremental = index.update(klines)
+            fresh = SRLevelIndex(lookback=150).update(klines)
+            assert_same_levels(incremental, fresh)
+
+        stats = index.get_stats()
+        assert stats['full_rebuilds'] == 1
+        assert stats['pivots_expired'] > 0
+
+def test_forming_bar_does_not_rebuild_levels():
+    """Yeni mum kapanmadıkça (sadece son mum değişir) seviyeler yeniden kurulmaz"""
+    series = make_candles(200, 11)
+    index = SRLevelIndex(lookback=100)
+    first = index.update(series)
+
+    forming = series.to_dicts()
+    forming[-1]['high'] *= 1.05
+    forming[-1]['volume'] *= 3
+    second = index.update(CandleSeries.from_dicts(forming))
+
+    assert index.level_rebuilds == 1
+    assert_same_levels(second, first)
+
+    # Dönen seviyeler kopya - çağıranın etiketlemesi indeksi değiştirmez
+    for level in second['support_levels']:
+        level['priority'] = 'LOW'
+    assert all('priority' not in level for level in index.update(series)['support_levels'])
+
+def test_index_levels_are_window_pivots():
+    """Pivotlar sadece lookback penceresinden ve kapanmış mumlardan"""
+    series = make_candles(300, 5)
+    levels = SRLevelIndex(lookback=100).update(series)
+    window_start = int(series.timestamp[-100])
+    last_closed = int(series.timestamp[-2])
+
+    for side in ('support_sorted', 'resistance_sorted'):
+        book = levels[side]
+        assert book.prices == sorted(book.prices)
+        assert all(window_start <= level['timestamp'] < last_closed for level in book.levels)
+    assert len(levels['support_levels']) <= 6
+
+def test_bisect_breakout_matches_sorted_scan():
+    """detect_crypto_breakout (bisect) eski 'mesafeye göre sırala' taramasıyla aynı seviyeyi bulur"""
+    rng = random.Random(3)
+    for trial in range(300):
+        sr_levels = {'support_levels': [], 'resistance_levels': []}
+        for priority in ('HIGH', 'MEDIUM', 'LOW'):
+            for side in ('support_levels', 'resistance_levels'):
+                for _ in range(rng.randint(0, 6)):
+                    sr_levels[side].append({'level': rng.uniform(90, 110), 'touches': 1, 'priority': priority,
+                                            'volume_importance': {'importance_score': 1.0}})
+        price = rng.uniform(88, 112)
+
+        result = CryptoTechnicalAnalysis.detect_crypto_breakout(price, sr_levels)
+        expected = reference_breakout(price, sr_levels)
+        priority = result['broken_level_info']['priority'] if result['broken_level_info'] else None
+        assert (result['breakout_type'], result['broken_level'], priority) == expected
+
+def test_sorted_levels_boundaries():
+    book = SortedLevels([{'level': 100.0}, {'level': 105.0}, {'level': 95.0}])
+    assert book.broken_resistance(101.0, 0.008)['level'] == 100.0
+    assert book.broken_resistance(100.5, 0.008)['level'] == 95.0
+    assert book.broken_resistance(95.0, 0.008) is None
+    assert book.broken_support(99.0, 0.008)['level'] == 100.0
+    assert book.broken_support(105.0, 0.008) is None
+    assert SortedLevels([]).broken_support(1.0, 0.008) is None
+
+if __name__ == "__main__":
+    test_incremental_matches_full_rebuild()
+    test_forming_bar_does_not_rebuild_levels()
+    test_index_levels_are_window_pivots()
+    test_bisect_breakout_matches_sorted_scan()
+    test_sorted_levels_boundaries()
+    print("✅ Incremental S/R indeks testleri geçti")
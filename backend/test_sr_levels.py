@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+S/R Konsolidasyon Testleri
+Sweep-line birleştirme + tekrarsız equal high/low kümeleri
+"""
+
+import random
+
+from sr_levels import consolidate_levels, top_levels, calculate_priority, cluster_equal_levels
+
+def make_level(price, volume, importance, timestamp):
+    return {
+        'level': price,
+        'timestamp': timestamp,
+        'touches': 1,
+        'volume': volume,
+        'volume_importance': {'importance_score': importance},
+        'volume_cluster_strength': importance
+    }
+
+def make_levels(count, seed):
+    rng = random.Random(seed)
+    return [make_level(100 + rng.uniform(-10, 10), rng.uniform(1e5, 1e7), rng.uniform(0.5, 5), i)
+            for i in range(count)]
+
+def test_consolidation_merges_within_tolerance():
+    """Yakın pivotlar ağırlıklı ortalamayla birleşir, touch/volume toplanır"""
+    levels = [
+        make_level(100.0, 1000.0, 1.0, 5),
+        make_level(101.0, 3000.0, 1.0, 2),
+        make_level(110.0, 500.0, 2.0, 9)
+    ]
+    merged = consolidate_levels(levels, tolerance=0.015)
+
+    assert len(merged) == 2
+    assert abs(merged[0]['level'] - 100.75) < 1e-9      # (100*1000 + 101*3000) / 4000
+    assert merged[0]['touches'] == 2
+    assert merged[0]['volume'] == 4000.0
+    assert merged[0]['timestamp'] == 2                  # en eski pivot
+    assert levels[0]['touches'] == 1                    # girdi değişmez
+
+def test_consolidation_keeps_highest_importance():
+    levels = [make_level(100.0, 1000.0, 1.0, 0), make_level(100.5, 1000.0, 4.0, 1)]
+    merged = consolidate_levels(levels, tolerance=0.015)
+    assert merged[0]['volume_importance']['importance_score'] == 4.0
+
+def test_consolidated_levels_are_separated():
+    """Sonuç fiyata göre sıralı, toplam touch korunur, ilk 6 öncelik sırasında"""
+    for seed in range(20):
+        levels = make_levels(60, seed)
+        merged = consolidate_levels(levels, tolerance=0.015)
+
+        prices = [level['level'] for level in merged]
+        assert prices == sorted(prices)
+        assert sum(level['touches'] for level in merged) == len(levels)
+
+        top = top_levels(merged)
+        assert len(top) == min(6, len(merged))
+        priorities = [calculate_priority(level) for level in top]
+        assert priorities == sorted(priorities, reverse=True)
+
+def test_equal_level_clusters_are_deduplicated():
+    """Her swing tam bir kümede, kümeler en eski swing'e göre sıralı"""
+    swings = [
+        {'price': 100.0, 'index': 4, 'volume': 10.0},
+        {'price': 101.0, 'index': 1, 'volume': 20.0},
+        {'price': 130.0, 'index': 0, 'volume': 5.0},
+        {'price': 100.5, 'index': 9, 'volume': 30.0}
+    ]
+    clusters = cluster_equal_levels(swings, tolerance=0.025)
+
+    assert len(clusters) == 2
+    assert [c['first_index'] for c in clusters] == [0, 1]
+    assert clusters[1]['touches'] == 3
+    assert clusters[1]['volume'] == 60.0
+    assert abs(clusters[1]['level'] - 100.5) < 1e-9
+    assert sum(c['touches'] for c in clusters) == len(swings)
+    assert cluster_equal_levels([], 0.025) == []
+
+if __name__ == "__main__":
+    test_consolidation_merges_within_tolerance()
+    test_consolidation_keeps_highest_importance()
+    test_consolidated_levels_are_separated()
+    test_equal_level_clusters_are_deduplicated()
+    print("✅ S/R konsolidasyon testleri geçti")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Swing Point Testleri
+Kayan pencere max/min tabanlı O(n) tespit ile eski iç içe döngülerin eşdeğerliği
+"""
+
+import random
+import time
+
+from swing_points import sliding_max, sliding_min, swing_highs, swing_lows
+
+def reference_swings(values, left, right, strict, highs=True):
+    """Eski implementasyonlardaki döngü"""
+    found = []
+    for i in range(left, len(values) - right):
+        is_swing = True
+        for j in range(i - left, i + right + 1):
+            if j == i:
+                continue
+            if highs:
+                beaten = values[j] >= values[i] if strict else values[j] > values[i]
+            else:
+                beaten = values[j] <= values[i] if strict else values[j] < values[i]
+            if beaten:
+                is_swing = False
+                break
+        if is_swing:
+            found.append(i)
+    return found
+
+def make_series(count, seed):
+    rng = random.Random(seed)
+    # Yuvarlama ile eşit değerler (ties) oluşsun - strict/non-strict farkı test edilsin
+    return [round(100 + rng.gauss(0, 3), 0) for _ in range(count)]
+
+def test_sliding_window_extremes():
+    """sliding_max/min her pencere için doğrudan max/min ile aynı"""
+    values = make_series(97, 1)
+    for window in (1, 2, 3, 5, 7, 20, 97):
+        expected_max = [max(values[j:j + window]) for j in range(len(values) - window + 1)]
+        expected_min = [min(values[j:j + window]) for j in range(len(values) - window + 1)]
+        assert sliding_max(values, window).tolist() == expected_max
+        assert sliding_min(values, window).tolist() == expected_min
+    assert len(sliding_max(values, 98)) == 0
+
+def test_swings_match_nested_loops():
+    """Tüm pencere genişlikleri ve karşılaştırma türlerinde eski döngüyle aynı pivotlar"""
+    for seed in range(25):
+        values = make_series(30 + seed * 7, seed)
+        for window in (2, 3, 5, 20):
+            for strict in (False, True):
+                assert swing_highs(values, window, strict=strict).tolist() == \
+                    reference_swings(values, window, window, strict, highs=True)
+                assert swing_lows(values, window, strict=strict).tolist() == \
+                    reference_swings(values, window, window, strict, highs=False)
+
+def test_asymmetric_and_short_series():
+    """Farklı sol/sağ pencere ve kısa seri"""
+    values = make_series(60, 7)
+    assert swing_highs(values, 5, 2).tolist() == reference_swings(values, 5, 2, False)
+    assert swing_lows(values, 1, 4, strict=True).tolist() == reference_swings(values, 1, 4, True, highs=False)
+    assert swing_highs([1.0, 2.0, 1.0], 3).tolist() == []
+
+def test_benchmark_period_20():
+    """period=20 (TechnicalIndicators) - 5000 mumda eski döngüden hızlı"""
+    values = make_series(5000, 3)
+
+    start = time.perf_counter()
+    expected = reference_swings(values, 20, 20, False)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = swing_highs(values, 20).tolist()
+    vector_time = time.perf_counter() - start
+
+    print(f"⚡ swing period=20: döngü {loop_time * 1000:.1f}ms | O(n) {vector_time * 1000:.2f}ms | {loop_time / vector_time:.0f}x")
+    assert found == expected
+    assert vector_time < loop_time
+
+if __name__ == "__main__":
+    test_sliding_window_extremes()
+    test_swings_match_nested_loops()
+    test_asymmetric_and_short_series()
+    test_benchmark_period_20()
+    print("✅ Swing point testleri geçti")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TTL + LRU Cache Testleri
+Kayıt başına TTL, bayt bütçesinde LRU tahliyesi, sayaçlar, stale-while-revalidate
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from ttl_cache import TTLCache, estimate_size
+from candles import CandleSeries
+from forex_data import ForexDataProvider
+
+def test_per_entry_ttl_and_counters():
+    cache = TTLCache(ttl=0.1, name='test')
+    cache.set('short', {'price': 1.0})
+    cache.set('long', [1, 2, 3], ttl=5)
+
+    assert cache.get('short') == {'price': 1.0}
+    assert 'short' in cache
+    time.sleep(0.15)
+    assert cache.get('short') is None
+    assert cache.get('long') == [1, 2, 3]
+    assert cache.get('missing', 'default') == 'default'
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 2 and stats['misses'] == 2 and stats['expirations'] == 1
+    assert stats['entries'] == 1 and stats['bytes'] == estimate_size([1, 2, 3])
+
+def test_lru_eviction_under_byte_budget():
+    """Bütçe aşılınca en az kullanılan atılır - okunan kayıt sona taşınır"""
+    size = estimate_size(np.zeros(1000))
+    cache = TTLCache(ttl=60, max_bytes=size * 3)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, np.zeros(1000))
+    cache.get('a')
+    cache.set('d', np.zeros(1000))
+
+    assert cache.get('b') is None
+    assert all(cache.get(key) is not None for key in ('a', 'c', 'd'))
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1 and stats['bytes'] <= stats['max_bytes']
+
+    # Bütçeden büyük kayıt saklanmaz, diğerleri korunur
+    cache.set('huge', np.zeros(10000))
+    assert cache.get('huge') is None and len(cache) == 3
+
+def test_candle_series_size_accounting():
+    series = CandleSeries.from_dicts([{'timestamp': i, 'open': 1, 'high': 2, 'low': 0, 'close': 1, 'volume': 5}
+                                      for i in range(500)])
+    assert estimate_size(series) >= series.nbytes
+    cache = TTLCache(ttl=60)
+    cache.set('klines', series)
+    assert cache.get_stats()['bytes'] == estimate_size(series)
+
+def test_stale_while_revalidate():
+    """TTL sonrası eski değer hemen döner, tek arka plan yenilemesi çalışır"""
+    cache = TTLCache(ttl=0.05, stale_ttl=5, name='swr')
+    loads = []
+    release = threading.Event()
+
+    def loader():
+        loads.append(1)
+        if len(loads) > 1:
+            release.wait(2)
+        return {'version': len(loads)}
+
+    assert cache.get_or_load('prices', loader) == {'version': 1}
+    time.sleep(0.1)
+
+    start = time.perf_counter()
+    for _ in range(5):
+        assert cache.get_or_load('prices', loader) == {'version': 1}
+    assert time.perf_counter() - start < 0.1   # Yavaş loader'ı beklemedi
+    release.set()
+
+    deadline = time.time() + 2
+    while cache.get('prices') is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get('prices') == {'version': 2}
+    assert len(loads) == 2
+
+    stats = cache.get_stats()
+    assert stats['stale_hits'] == 5 and stats['refreshes'] == 1
+
+    # Yenileme hatası eski değeri bozmaz
+    time.sleep(0.1)
+    cache.get_or_load('prices', lambda: 1 / 0)
+    while cache.get_stats()['refreshing'] and time.time() < deadline + 2:
+        time.sleep(0.01)
+    assert cache.get_stale('prices')[0] == {'version': 2}
+    assert cache.get_stats()['refresh_errors'] == 1
+
+def test_provider_uses_bounded_cache():
+    provider = ForexDataProvider()
+    first = provider.get_historical_data('EURUSD', '1h', 50)
+    assert provider.get_historical_data('EURUSD', '1h', 50) is first
+    assert provider.cache.age('forex_history_EURUSD_1h_50') < 1
+    assert provider.cache.get_stats()['hits'] == 1
+
+if __name__ == "__main__":
+    test_per_entry_ttl_and_counters()
+    test_lru_eviction_under_byte_budget()
+    test_candle_series_size_accounting()
+    test_stale_while_revalidate()
+    test_provider_uses_bounded_cache()
+    print("✅ TTL cache testleri geçti")
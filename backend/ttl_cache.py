@@ -0,0 +1,270 @@
+"""
+Sınırlı TTL + LRU Cache
+Provider cache'leri için ortak bileşen:
+- Kayıt başına TTL (set sırasında)
+- Bayt bütçesi aşılınca önce süresi dolanlar, sonra en az kullanılanlar atılır
+- Hit / miss / eviction sayaçları
+- İsteğe bağlı stale-while-revalidate: TTL sonrası stale_ttl boyunca eski değer
+  hemen döner, yenileme arka planda yapılır
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+
+def estimate_size(value, _depth: int = 0) -> int:
+    """Yaklaşık bellek (bayt) - numpy/CandleSeries için nbytes, kaplar için özyinelemeli"""
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes + 64
+    size = sys.getsizeof(value)
+    if _depth > 8:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    return size
+
+
+def snapshot_with_age(snapshot: Dict, age: float, stale: bool) -> Dict:
+    """Fiyat snapshot'ının kopyası - her kayda price_age (saniye) ve stale eklenir, cache'teki değer değişmez"""
+    return {key: dict(item, price_age=round(age, 1), stale=stale) if isinstance(item, dict) else item
+            for key, item in snapshot.items()}
+
+
+def snapshot_age(snapshot: Dict) -> Optional[float]:
+    """Snapshot'taki en eski fiyatın yaşı (saniye) - price_age yoksa None"""
+    ages = [item['price_age'] for item in snapshot.values() if isinstance(item, dict) and 'price_age' in item]
+    return max(ages) if ages else None
+
+
+def snapshot_version(snapshot: Dict, stale_bucket: float = 10) -> int:
+    """
+    Snapshot içeriğinin sürümü - fiyat / zaman damgası / stale değişince değişir
+    price_age her okumada artar, sürüme girmez; stale snapshot'ta stale_bucket saniyede bir ilerler
+    """
+    return hash(tuple(
+        (key, item.get('price'), item.get('timestamp'), item.get('stale'),
+         int(item.get('price_age') or 0) // stale_bucket if item.get('stale') else 0)
+        if isinstance(item, dict) else (key, repr(item))
+        for key, item in snapshot.items()))
+
+
+def snapshot_age_version(sequence: Hashable, written_at: Optional[float], age_bucket: float = 1.0) -> Tuple:
+    """
+    Snapshot okunmadan / hash'lenmeden fiyat sürümü - sequence her yazmada değişir
+    Son yazmadan beri geçen süre age_bucket dilimleriyle sürüme girer: price_age / stale en geç bir dilim eskir
+    """
+    age = time.time() - (written_at or 0.0)
+    return sequence, int(age // age_bucket)
+
+
+class _Entry:
+    __slots__ = ('value', 'stored_at', 'expires_at', 'stale_until', 'size')
+
+    def __init__(self, value, stored_at: float, ttl: float, stale_ttl: float, size: int):
+        self.value = value
+        self.stored_at = stored_at
+        self.expires_at = stored_at + ttl
+        self.stale_until = self.expires_at + stale_ttl
+        self.size = size
+
+
+class TTLCache:
+    """
+    Thread-safe TTL + LRU cache
+    get() sadece taze değer döner; get_stale() stale penceresindeki değeri yaşıyla döner
+    get_or_load() SWR modunda eskimiş değeri döndürüp arka planda yeniler
+    """
+
+    def __init__(self, ttl: float = 60, max_bytes: int = 16 * 1024 * 1024, stale_ttl: float = 0,
+                 name: str = '', sizeof: Callable = estimate_size):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl     # 0 = SWR kapalı
+        self.name = name
+        self.sizeof = sizeof
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()       # Arka planda yenilenen anahtarlar
+        self.bytes = 0
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        """Taze kayıt var mı (sayaçları etkilemez)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.time() < entry.expires_at
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    def _lookup(self, key, now: float) -> Optional[_Entry]:
+        """Stale penceresi de geçmişse kaydı sil - lock altında çağrılır"""
+        entry = self._entries.get(key)
+        if entry is not None and now >= entry.stale_until:
+            self._remove(key)
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key, default=None):
+        """Taze değer - yoksa / süresi dolduysa default"""
+        now = time.time()
+        with self._lock:
+            entry = self._lookup(key, now)
+            if entry is None or now >= entry.expires_at:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def get_stale(self, key) -> Optional[Tuple[object, float, bool]]:
+        """(değer, yaş saniye, stale mi) - TTL geçmiş ama stale penceresindeyse de döner"""
+        now = time.time()
+        with self._lock:
+            entry = self._lookup(key, now)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            stale = now >= entry.expires_at
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return entry.value, now - entry.stored_at, stale
+
+    def age(self, key) -> Optional[float]:
+        """Kaydın yaşı (saniye) - yoksa None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else time.time() - entry.stored_at
+
+    def stored_at(self, key) -> Optional[float]:
+        """Kaydın yazıldığı an (epoch) - yoksa None; değer kopyalanmaz, sayaçlar değişmez"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry.stored_at
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        size = self.sizeof(value)
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                self.evictions += 1    # Bütçeden büyük kayıt saklanmaz
+                return
+            self._entries[key] = _Entry(value, now, self.ttl if ttl is None else ttl, self.stale_ttl, size)
+            self.bytes += size
+            if self.bytes > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        """Önce stale penceresi de geçmiş kayıtlar, sonra en az kullanılanlar"""
+        for key in [k for k, entry in self._entries.items() if now >= entry.stale_until]:
+            self._remove(key)
+            self.expirations += 1
+        while self.bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._entries[key].value
+            self._remove(key)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def get_or_load(self, key, loader: Callable, ttl: Optional[float] = None):
+        """
+        Taze değer varsa onu, yoksa loader() sonucunu kaydedip döndür
+        SWR: değer stale penceresindeyse hemen döner, loader arka plan thread'inde çalışır
+        Arka plan loader'ı exception atarsa eski değer stale_until'e kadar kullanılmaya devam eder
+        """
+        if self.stale_ttl > 0:
+            cached = self.get_stale(key)
+            if cached is not None:
+                value, age, stale = cached
+                if stale:
+                    self.refresh_in_background(key, loader, ttl)
+                return value
+        else:
+            value = self.get(key)
+            if value is not None:
+                return value
+
+        value = loader()
+        self.set(key, value, ttl)
+        return value
+
+    def refresh_in_background(self, key, loader: Callable, ttl: Optional[float] = None) -> bool:
+        """
+        loader() sonucunu arka plan thread'inde kaydet - anahtar başına tek yenileme
+        loader exception atarsa mevcut değer korunur; zaten yenileniyorsa False
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.set(key, loader(), ttl)
+                with self._lock:
+                    self.refreshes += 1
+            except Exception as e:
+                with self._lock:
+                    self.refresh_errors += 1
+                print(f"⚠️ {self.name or 'cache'} arka plan yenileme hatası {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True, name=f'cache-refresh-{self.name}').start()
+        return True
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'name': self.name,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+                'refreshes': self.refreshes,
+                'refresh_errors': self.refresh_errors,
+                'refreshing': len(self._refreshing)
+            }
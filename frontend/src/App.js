@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import TradingCard from './components/TradingCard';
 import CryptoCard from './components/CryptoCard';
 import TradeStatistics from './components/TradeStatistics';
@@ -22,29 +22,64 @@ function App() {
   const [recentTrades, setRecentTrades] = useState([]);
   // KRİTİK: Symbol bazlı istatistikler
   const [symbolStatistics, setSymbolStatistics] = useState({});
+  // /signals snapshot'ı: signal_id -> sinyal + sürüm (sonraki istekler ?since= ile sadece değişenleri alır)
+  const signalStateRef = useRef({ version: null, signals: {} });
 
   // Backend'e bağlan ve verileri çek
   useEffect(() => {
     // İlk veri yükleme
     loadInitialData();
     
-    // Her 15 saniyede fiyatları güncelle
-    const priceInterval = setInterval(updatePrices, 15000);
+    // Polling sadece canlı akış (SSE) yokken / koptuğunda
+    let pollingIntervals = [];
+    const startPolling = () => {
+      if (pollingIntervals.length > 0) return;
+      pollingIntervals = [
+        setInterval(updatePrices, 15000),          // Forex fiyatları
+        setInterval(updateSignals, 30000),         // Sinyaller
+        setInterval(updateCryptoPrices, 5000),     // Kripto fiyatları
+        setInterval(updateTradeStatistics, 30000)  // Trade istatistikleri
+      ];
+    };
+    const stopPolling = () => {
+      pollingIntervals.forEach(clearInterval);
+      pollingIntervals = [];
+    };
+    
+    if (typeof EventSource === 'undefined') {
+      startPolling();
+      return stopPolling;
+    }
+    
+    // Canlı olay akışı: fiyat tick'leri, yeni / kapanan sinyaller, istatistikler sunucudan itilir
+    const events = new EventSource('http://localhost:8000/stream');
+    let wasConnected = false;
     
-    // Her 30 saniyede sinyalleri güncelle
-    const signalInterval = setInterval(updateSignals, 30000);
+    events.onopen = () => {
+      stopPolling();
+      // Yeniden bağlanınca aradaki değişiklikleri kaçırmamak için tam senkron
+      if (wasConnected) {
+        updatePrices();
+        updateSignals();
+        updateCryptoPrices();
+        updateTradeStatistics();
+      }
+      wasConnected = true;
+    };
     
-    // Her 5 saniyede kripto fiyatları güncelle (WebSocket)
-    const cryptoInterval = setInterval(updateCryptoPrices, 5000);
+    // EventSource kendisi yeniden bağlanır - o arada polling
+    events.onerror = () => startPolling();
     
-    // Her 30 saniyede trade istatistiklerini güncelle
-    const statsInterval = setInterval(updateTradeStatistics, 30000);
+    events.addEventListener('crypto_prices', event => applyCryptoPrices(JSON.parse(event.data)));
+    events.addEventListener('forex_prices', event => applyForexPrices(JSON.parse(event.data)));
+    events.addEventListener('statistics', event => applyTradeStatistics(JSON.parse(event.data)));
+    ['signal_added', 'signal_removed', 'trade_closed'].forEach(name =>
+      events.addEventListener(name, () => updateSignals())
+    );
 
     return () => {
-      clearInterval(priceInterval);
-      clearInterval(signalInterval);
-      clearInterval(cryptoInterval);
-      clearInterval(statsInterval);
+      events.close();
+      stopPolling();
     };
   }, []); // Dependency array'i temizle - sadece mount/unmount'ta çalışır
 
@@ -86,8 +121,15 @@ function App() {
   const updatePrices = async () => {
     try {
       const pricesResponse = await fetch('http://localhost:8000/prices');
-      const pricesData = await pricesResponse.json();
-      
+      applyForexPrices(await pricesResponse.json());
+    } catch (error) {
+      console.error('Fiyat güncelleme hatası:', error);
+      setConnectionStatus('hata');
+    }
+  };
+
+  // /prices yanıtı veya 'forex_prices' olayı
+  const applyForexPrices = (pricesData) => {
       setTradingData(prev => {
         const newData = { ...prev };
         
@@ -120,26 +162,37 @@ function App() {
       } else {
         setConnectionStatus('hata');
       }
-      
-    } catch (error) {
-      console.error('Fiyat güncelleme hatası:', error);
-      setConnectionStatus('hata');
-    }
   };
 
   const updateSignals = async () => {
     try {
-      // Forex sinyallerini çek
-      const forexResponse = await fetch('http://localhost:8000/signals');
-      const forexSignalsData = await forexResponse.json();
+      // İlk istekte tam liste, sonra sadece son sürümden beri değişenler
+      const signalState = signalStateRef.current;
+      const url = signalState.version === null
+        ? 'http://localhost:8000/signals'
+        : `http://localhost:8000/signals?since=${signalState.version}`;
+      const response = await fetch(url);
+      const signalsData = await response.json();
+      if (!response.ok) {
+        throw new Error(signalsData.error || `HTTP ${response.status}`);
+      }
       
-      // Kripto sinyallerini çek
-      const cryptoResponse = await fetch('http://localhost:8000/crypto/signals');
-      const cryptoSignalsData = await cryptoResponse.json();
+      if (signalsData.full) {
+        // Tam senkron - yerel listeyi baştan kur
+        signalState.signals = {};
+        signalsData.signals.forEach(signal => { signalState.signals[signal.signal_id] = signal; });
+      } else {
+        [...signalsData.added, ...signalsData.updated].forEach(signal => {
+          signalState.signals[signal.signal_id] = signal;
+        });
+        signalsData.removed.forEach(signalId => { delete signalState.signals[signalId]; });
+      }
+      signalState.version = signalsData.version;
       
       // State'leri güncelle
-      const allForexSignals = forexSignalsData.signals || [];
-      const allCryptoSignals = cryptoSignalsData.signals || [];
+      const allSignals = Object.values(signalState.signals);
+      const allForexSignals = allSignals.filter(signal => signal.asset_type === 'forex');
+      const allCryptoSignals = allSignals.filter(signal => signal.asset_type === 'crypto');
       
       setCryptoSignals(allCryptoSignals);
       
@@ -182,24 +235,32 @@ function App() {
   const updateCryptoPrices = async () => {
     try {
       const cryptoResponse = await fetch('http://localhost:8000/crypto/prices');
-      const cryptoPricesData = await cryptoResponse.json();
-      
-      if (cryptoPricesData.prices) {
-        setCryptoData(cryptoPricesData.prices);
-        setCryptoStatus(cryptoPricesData.api_status === 'live' ? 'Binance Canlı' : 'Bağlantı Hatası');
-      }
-      
+      applyCryptoPrices(await cryptoResponse.json());
     } catch (error) {
       console.error('Kripto fiyat güncelleme hatası:', error);
       setCryptoStatus('Bağlantı Hatası');
     }
   };
 
+  // /crypto/prices yanıtı veya 'crypto_prices' olayı
+  const applyCryptoPrices = (cryptoPricesData) => {
+    if (cryptoPricesData.prices) {
+      setCryptoData(cryptoPricesData.prices);
+      setCryptoStatus(cryptoPricesData.api_status === 'live' ? 'Binance Canlı' : 'Bağlantı Hatası');
+    }
+  };
+
   const updateTradeStatistics = async () => {
     try {
       const statsResponse = await fetch('http://localhost:8000/statistics');
-      const statsData = await statsResponse.json();
-      
+      applyTradeStatistics(await statsResponse.json());
+    } catch (error) {
+      console.error('İstatistik güncelleme hatası:', error);
+    }
+  };
+
+  // /statistics yanıtı veya 'statistics' olayı
+  const applyTradeStatistics = (statsData) => {
       // Genel istatistikler
       if (statsData.general_statistics) {
         setTradeStatistics(statsData.general_statistics);
@@ -260,10 +321,6 @@ function App() {
           return newData;
         });
       }
-      
-    } catch (error) {
-      console.error('İstatistik güncelleme hatası:', error);
-    }
   };
 
   return (